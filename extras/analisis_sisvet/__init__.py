@@ -0,0 +1,104 @@
+"""
+Paquete de apoyo del generador de análisis completo de SisVet.
+
+Los nombres públicos se importan de su módulo la primera vez que se usan, de modo
+que `import analisis_sisvet` no carga NumPy, SQLite ni los lectores de volcados
+hasta que algo los necesita.
+"""
+
+import importlib
+
+# Nombre público: módulo que lo define (en orden de módulo)
+_EXPORTACIONES = {
+    "ContadorFrecuentes": "auditoria",
+    "analizar_auditoria": "auditoria",
+    "analizar_auditoria_en_cache": "auditoria",
+    "CacheSecciones": "cache_secciones",
+    "comprimir": "compresion",
+    "minificar_html": "compresion",
+    "optimizar_archivo": "compresion",
+    "ErrorConexiones": "conexiones",
+    "analizar_conexiones": "conexiones",
+    "auditar_conexiones": "conexiones",
+    "detectar_consultas_en_bucle": "consultas_bucle",
+    "viajes_estimados": "consultas_bucle",
+    "ErrorDatos": "datos",
+    "cargar_datos": "datos",
+    "EMISORES": "emisores",
+    "ErrorEmision": "emisores",
+    "emitir": "emisores",
+    "aplicar_escaneo": "escaner",
+    "escanear_repositorio": "escaner",
+    "PASOS": "generacion",
+    "preparar_datos": "generacion",
+    "render": "generacion",
+    "rutas_predeterminadas": "generacion",
+    "datos_graficas": "graficas",
+    "lttb": "graficas",
+    "reducir_series": "graficas",
+    "analizar_sql": "indices",
+    "asesorar_indices": "indices",
+    "generar_lote": "lote",
+    "leer_clinica": "lote",
+    "leer_manifiesto": "lote",
+    "ErrorMatriz": "matriz_funcional",
+    "clasificar": "matriz_funcional",
+    "clasificar_en_cache": "matriz_funcional",
+    "leer_perfiles": "matriz_funcional",
+    "calcular_ocupacion": "ocupacion_citas",
+    "ErrorPlantilla": "plantillas",
+    "Plantilla": "plantillas",
+    "compilar": "plantillas",
+    "escapar": "plantillas",
+    "ErrorProyeccion": "proyeccion",
+    "simular": "proyeccion",
+    "simular_en_cache": "proyeccion",
+    "ErrorRecordatorios": "recordatorios",
+    "analizar_recordatorios": "recordatorios",
+    "ErrorRepresentacion": "representacion",
+    "construir": "representacion",
+    "formatear": "representacion",
+    "ErrorReproduccion": "reproduccion",
+    "reproducir": "reproduccion",
+    "reproducir_en_cache": "reproduccion",
+    "SECCIONES": "secciones",
+    "claves_secciones": "secciones",
+    "escribir_html": "secciones",
+    "generar_fragmentos": "secciones",
+    "iterar_html": "secciones",
+    "iterar_seccion": "secciones",
+    "precalentar_cache": "secciones",
+    "ServidorVistaPrevia": "servidor",
+    "preparar_publicacion": "servidor",
+    "servir": "servidor",
+    "ErrorSinteticos": "sinteticos",
+    "generar_sinteticos": "sinteticos",
+    "planificar": "sinteticos",
+    "ErrorBackend": "sql_backend",
+    "extraer_sentencias": "sql_backend",
+    "pesos_funciones": "sql_backend",
+    "TablaColumnar": "tabla_columnar",
+    "cargar_tablas": "tabla_columnar",
+    "DocumentoVivo": "vigilancia",
+    "pasos_afectados": "vigilancia",
+    "vigilar": "vigilancia",
+    "ErrorVolcado": "volcado_sql",
+    "iterar_filas": "volcado_sql",
+    "leer_esquema": "volcado_sql",
+}
+
+__all__ = list(_EXPORTACIONES)
+
+
+def __getattr__(nombre):
+    modulo = _EXPORTACIONES.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(f".{modulo}", __name__), nombre)
+    # Las siguientes consultas ya no pasan por __getattr__
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,243 @@
+"""
+ANÁLISIS DE LA BITÁCORA DE AUDITORÍA
+Recorre en streaming el volcado de `audit_logs` y calcula cuántas escrituras hay
+por tabla, por usuario y por acción en cada periodo (hora, día o mes), los campos
+que más se escriben y los registros (tabla, id_registro) más modificados.
+
+La memoria no depende del número de filas:
+
+- las filas se leen de una en una con volcado_sql y no se guardan
+- `datos_antiguos` nunca se decodifica y `datos_nuevos` solo si se piden los
+  campos escritos; del JSON solo se usan las claves de primer nivel
+- los registros más modificados se buscan con el algoritmo Space-Saving, que
+  sigue a lo sumo `capacidad` claves: cualquier registro con más del
+  1/`capacidad` de las escrituras aparece con certeza, con su error máximo
+
+Los contadores por periodo crecen con el número de tablas, usuarios y periodos
+distintos, no con las filas. Desde extras/:
+
+    python -m analisis_sisvet.auditoria ../bd/sisvet_audit_logs.sql --periodo mes
+"""
+
+import argparse
+import hashlib
+import heapq
+import itertools
+import json
+import marshal
+import os
+import sys
+import time
+import tracemalloc
+
+from .cifras import resumir
+from .volcado_sql import ErrorVolcado, iterar_filas
+
+# Incrementar al cambiar el análisis para descartar los resultados guardados
+VERSION_AUDITORIA = 2
+
+TABLA = "audit_logs"
+
+# Claves seguidas por Space-Saving para encontrar los registros más modificados
+CAPACIDAD_FRECUENTES = 1000
+
+# Clave de cada periodo a partir de created_at
+PERIODOS = {
+    "hora": lambda momento: momento.strftime("%Y-%m-%d %H:00"),
+    "dia": lambda momento: momento.date().isoformat(),
+    "mes": lambda momento: momento.strftime("%Y-%m"),
+}
+
+# Dimensiones por las que se cuentan las escrituras y su posición en la fila
+_DIMENSIONES = ("tabla", "id_usuario", "accion")
+
+
+class ContadorFrecuentes:
+    """Elementos más frecuentes de un flujo con memoria acotada (Space-Saving).
+
+    Se siguen como mucho `capacidad` elementos. Un elemento nuevo con el contador
+    lleno sustituye al de menor cuenta y hereda esa cuenta como error, así que las
+    cuentas son cotas superiores y cuenta - error es una cota inferior.
+    """
+
+    def __init__(self, capacidad=CAPACIDAD_FRECUENTES):
+        self.capacidad = capacidad
+        self.total = 0
+        self.cuentas = {}
+        self.errores = {}
+        # Montículo perezoso de (cuenta, orden, elemento): las entradas desactualizadas se
+        # corrigen al sacarlas. Con cuentas iguales desempata el orden de llegada, así que
+        # nunca se comparan elementos (un id NULL frente a uno numérico no se puede comparar)
+        self._monticulo = []
+        self._orden = itertools.count()
+
+    def agregar(self, elemento):
+        self.total += 1
+        if elemento in self.cuentas:
+            self.cuentas[elemento] += 1
+            return
+        if len(self.cuentas) < self.capacidad:
+            self.cuentas[elemento] = 1
+            self.errores[elemento] = 0
+            heapq.heappush(self._monticulo, (1, next(self._orden), elemento))
+            return
+        while True:
+            cuenta, _, minimo = heapq.heappop(self._monticulo)
+            actual = self.cuentas[minimo]
+            if actual == cuenta:
+                break
+            heapq.heappush(self._monticulo, (actual, next(self._orden), minimo))
+        del self.cuentas[minimo]
+        del self.errores[minimo]
+        self.cuentas[elemento] = cuenta + 1
+        self.errores[elemento] = cuenta
+        heapq.heappush(self._monticulo, (cuenta + 1, next(self._orden), elemento))
+
+    def mas_frecuentes(self, n=10):
+        """[(elemento, cuenta, error)] de los `n` elementos con más cuenta"""
+        return [(elemento, cuenta, self.errores[elemento])
+                for elemento, cuenta in sorted(self.cuentas.items(), key=lambda par: -par[1])[:n]]
+
+
+def _claves_json(texto):
+    """Claves de primer nivel de un objeto JSON; [] si no es un objeto válido.
+
+    json.loads (en C) es varias veces más rápido que recorrer el texto en Python
+    saltando los valores, incluso para quedarse solo con las claves.
+    """
+    try:
+        valor = json.loads(texto)
+    except ValueError:
+        return []
+    return list(valor) if isinstance(valor, dict) else []
+
+
+def analizar_auditoria(ruta, periodo="dia", campos=True, capacidad=CAPACIDAD_FRECUENTES):
+    """Recorre el volcado de audit_logs de `ruta` y devuelve los agregados.
+
+    Sin `campos` no se decodifica ningún JSON. El resultado tiene el total de
+    escrituras, el rango de fechas, {dimensión: {valor: {periodo: escrituras}}},
+    los campos escritos por tabla y los registros más modificados.
+    """
+    clave_periodo = PERIODOS[periodo]
+    columnas = ["tabla", "id_registro", "id_usuario", "accion", "created_at"] + (["datos_nuevos"] if campos else [])
+    por_dimension = {dimension: {} for dimension in _DIMENSIONES}
+    campos_escritos = {}
+    frecuentes = ContadorFrecuentes(capacidad)
+    total = 0
+    primero = ultimo = None
+    esquema = {}
+
+    for _, fila in iterar_filas(ruta, tablas={TABLA}, esquema=esquema, columnas={TABLA: columnas}):
+        if total == 0:
+            if TABLA not in esquema:
+                raise ErrorVolcado(f"{ruta}: las filas de {TABLA} llegan antes de su CREATE TABLE")
+            nombres = [c["nombre"] for c in esquema[TABLA]["columnas"]]
+            posiciones = [nombres.index(dimension) for dimension in _DIMENSIONES]
+            p_tabla, p_registro, p_fecha = (nombres.index(c) for c in ("tabla", "id_registro", "created_at"))
+            p_nuevos = nombres.index("datos_nuevos")
+        total += 1
+        momento = fila[p_fecha]
+        if momento is not None:
+            clave = clave_periodo(momento)
+            if primero is None or momento < primero:
+                primero = momento
+            if ultimo is None or momento > ultimo:
+                ultimo = momento
+        else:
+            clave = "sin fecha"
+        for dimension, posicion in zip(_DIMENSIONES, posiciones):
+            serie = por_dimension[dimension].setdefault(fila[posicion], {})
+            serie[clave] = serie.get(clave, 0) + 1
+        frecuentes.agregar((fila[p_tabla], fila[p_registro]))
+
+        if campos and fila[p_nuevos]:
+            contador = campos_escritos.setdefault(fila[p_tabla], {})
+            for campo in _claves_json(fila[p_nuevos]):
+                contador[campo] = contador.get(campo, 0) + 1
+
+    return {
+        "total": total,
+        "periodo": periodo,
+        "desde": primero.isoformat(sep=" ") if primero else None,
+        "hasta": ultimo.isoformat(sep=" ") if ultimo else None,
+        "escrituras": por_dimension,
+        "campos_escritos": campos_escritos,
+        "registros_frecuentes": [
+            {"tabla": tabla, "id_registro": id_registro, "escrituras": cuenta, "error": error}
+            for (tabla, id_registro), cuenta, error in frecuentes.mas_frecuentes()
+        ],
+    }
+
+
+def _ruta_cache(ruta, directorio_cache, periodo):
+    identificador = hashlib.sha256(f"{os.path.abspath(ruta)}:{periodo}".encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directorio_cache, f"auditoria-{identificador}.marshal")
+
+
+def analizar_auditoria_en_cache(ruta, directorio_cache, periodo="dia"):
+    """analizar_auditoria() guardando el resultado por mtime y tamaño del volcado.
+
+    Devuelve (resultado, desde_cache).
+    """
+    estado = os.stat(ruta)
+    firma = (estado.st_mtime_ns, estado.st_size)
+    ruta_cache = _ruta_cache(ruta, directorio_cache, periodo)
+    try:
+        with open(ruta_cache, "rb") as archivo:
+            cache = marshal.loads(archivo.read())
+        if cache.get("version") == VERSION_AUDITORIA and cache.get("firma") == firma:
+            return cache["resultado"], True
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    resultado = analizar_auditoria(ruta, periodo)
+    os.makedirs(directorio_cache, exist_ok=True)
+    temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(marshal.dumps({"version": VERSION_AUDITORIA, "firma": firma, "resultado": resultado}))
+    os.replace(temporal, ruta_cache)
+    return resultado, False
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Escrituras por tabla, usuario y acción de audit_logs")
+    parser.add_argument("volcado", help="volcado SQL con la tabla audit_logs")
+    parser.add_argument("--periodo", choices=sorted(PERIODOS), default="dia")
+    parser.add_argument("--sin-campos", action="store_true", help="no decodifica el JSON de datos_nuevos")
+    parser.add_argument("--memoria", action="store_true", help="mide el pico de memoria (más lento)")
+    argumentos = parser.parse_args(argumentos)
+
+    if argumentos.memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    try:
+        resultado = analizar_auditoria(argumentos.volcado, argumentos.periodo, not argumentos.sin_campos)
+    except ErrorVolcado as error:
+        print(f"❌ {error}")
+        return 1
+    segundos = time.perf_counter() - inicio
+    tamano = os.path.getsize(argumentos.volcado)
+    print(f"{resultado['total']:,} escrituras del {resultado['desde']} al {resultado['hasta']} en {segundos:.2f} s "
+          f"({tamano / (1024 * 1024) / segundos:.1f} MB/s, {resultado['total'] / segundos:,.0f} filas/s)")
+    if argumentos.memoria:
+        print(f"Pico de memoria: {tracemalloc.get_traced_memory()[1] / (1024 * 1024):.2f} MB")
+        tracemalloc.stop()
+
+    for dimension, escrituras in resultado["escrituras"].items():
+        print(f"\nPor {dimension} (pico por {argumentos.periodo}):")
+        for valor, resumen in list(resumir(escrituras).items())[:10]:
+            print(f"  {str(valor) or '(vacío)':<24} {resumen['total']:>10,}  pico {resumen['pico']:,} "
+                  f"el {resumen['periodo_pico']}")
+    print("\nRegistros más modificados:")
+    for registro in resultado["registros_frecuentes"]:
+        print(f"  {registro['tabla']}#{registro['id_registro']}: {registro['escrituras']:,} escrituras"
+              + (f" (±{registro['error']:,})" if registro["error"] else ""))
+    for tabla, contador in resultado["campos_escritos"].items():
+        principales = sorted(contador.items(), key=lambda par: -par[1])[:8]
+        print(f"\nCampos más escritos en {tabla}: " + ", ".join(f"{campo} ({n})" for campo, n in principales))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
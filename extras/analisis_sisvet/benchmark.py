@@ -0,0 +1,292 @@
+"""
+BENCHMARK DEL GENERADOR
+Mide cómo escala la generación del análisis con datos sintéticos de 8, 100, 1.000 y
+10.000 competidores (con listas de funcionalidades y módulos cada vez mayores):
+tiempo total y por sección, pico de memoria (tracemalloc) y bytes de salida por
+sección. También mide la sección de competencia con su plantilla compilada y con
+la versión escrita a mano con f-strings que sustituyó, para seguir el coste de
+las plantillas. Los resultados se guardan en JSON para comparar ejecuciones y
+detectar regresiones por encima de un umbral. Desde extras/:
+
+    python -m analisis_sisvet.benchmark --guardar base.json
+    python -m analisis_sisvet.benchmark --comparar base.json --umbral 0.2
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from .datos import cargar_datos
+from .escaner import aplicar_escaneo, escanear_repositorio
+from .secciones import SECCIONES, seccion_competencia
+
+# Incrementar al cambiar los datos sintéticos o las métricas: los resultados dejan de ser comparables
+VERSION_BENCHMARK = 1
+
+# (competidores, funcionalidades por competidor, módulos implementados)
+ESCALAS = ((8, 10, 13), (100, 25, 50), (1000, 50, 100), (10000, 100, 200))
+
+DIRECTORIO_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "datos")
+
+
+class _Descarte:
+    """Destino de escritura que solo cuenta lo escrito, para no medir el disco"""
+
+    def __init__(self):
+        self.caracteres = 0
+
+    def write(self, texto):
+        self.caracteres += len(texto)
+        return len(texto)
+
+
+def datos_sinteticos(datos, competidores, funcionalidades, modulos):
+    """Amplía los datos reales a `competidores` competidores con `funcionalidades` cada uno"""
+    base = datos["competidores"]
+    ampliados = []
+    for i in range(competidores):
+        competidor = base[i % len(base)]
+        extra = [f"Funcionalidad {j + 1}" for j in range(max(0, funcionalidades - len(competidor["funcionalidades"])))]
+        ampliados.append(dict(
+            competidor,
+            nombre=competidor["nombre"] if i < len(base) else f"{competidor['nombre']} {i // len(base)}",
+            funcionalidades=(competidor["funcionalidades"] + extra)[:funcionalidades],
+        ))
+    proyecto = datos["proyecto_sisvet"]
+    extra = [f"Módulo {j + 1}" for j in range(max(0, modulos - len(proyecto["modulos_implementados"])))]
+    proyecto = dict(proyecto, modulos_implementados=(proyecto["modulos_implementados"] + extra)[:modulos])
+    return dict(datos, competidores=ampliados, proyecto_sisvet=proyecto)
+
+
+def competencia_fstring(datos):
+    """Sección de competencia escrita a mano con f-strings, como antes de las plantillas (sin escapar)"""
+    competidores = datos["competidores"]
+    yield f"""
+            <!-- ANÁLISIS DE COMPETENCIA -->
+            <section id="competencia" class="section">
+                <h2>🏆 Análisis de la Competencia</h2>
+
+                <p class="highlight">
+                    <strong>Mercado Analizado:</strong> Se analizaron {len(competidores)} competidores principales en el mercado latinoamericano y global de software veterinario. El mercado está valorado en aproximadamente <strong>$450 millones USD anuales</strong> en Latinoamérica con un crecimiento del 12% anual.
+                </p>
+
+                <h3>📊 Competidores Principales</h3>
+
+                <table>
+                    <tr>
+                        <th>Software</th>
+                        <th>País</th>
+                        <th>Precio Mensual (USD)</th>
+                        <th>Puntuación</th>
+                        <th>Market Share</th>
+                        <th>Trial</th>
+                    </tr>
+"""
+
+    for comp in competidores:
+        yield f"""
+                    <tr>
+                        <td><strong>{comp['nombre']}</strong></td>
+                        <td>{comp['pais']}</td>
+                        <td>${comp['precio_usd_min']} - ${comp['precio_usd_max']}</td>
+                        <td>
+                            <div class="progress-bar">
+                                <div class="progress-fill" style="width: {comp['puntuacion']*10}%">{comp['puntuacion']}/10</div>
+                            </div>
+                        </td>
+                        <td>{comp['market_share']}%</td>
+                        <td><span class="badge badge-info">{comp['trial']}</span></td>
+                    </tr>
+"""
+
+    yield """
+                </table>
+
+                <div class="chart-container">
+                    <canvas id="marketShareChart"></canvas>
+                </div>
+
+                <div class="chart-container">
+                    <canvas id="priceComparisonChart"></canvas>
+                </div>
+
+                <h3>🔍 Análisis Detallado por Competidor</h3>
+"""
+
+    for comp in competidores:
+        yield f"""
+                <div class="card">
+                    <h4>{comp['nombre']}</h4>
+                    <p><strong>Origen:</strong> {comp['pais']}</p>
+                    <p><strong>Precio:</strong> <span class="price-tag">${comp['precio_usd_min']}-${comp['precio_usd_max']} USD/mes</span></p>
+                    <p><strong>Puntuación:</strong> {comp['puntuacion']}/10</p>
+                    <p><strong>Funcionalidades:</strong></p>
+                    <div style="display: flex; flex-wrap: wrap; gap: 5px; margin-top: 10px;">
+"""
+
+        for func in comp['funcionalidades'][:8]:
+            yield f'                        <span class="badge badge-info">{func}</span>\n'
+
+        yield """
+                    </div>
+                </div>
+"""
+
+    yield """
+            </section>
+"""
+
+
+def _mejor_tiempo(seccion, datos, repeticiones):
+    """Mejor tiempo de `repeticiones` generaciones de `seccion` y sus fragmentos"""
+    mejor = float("inf")
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        fragmentos = list(seccion(datos))
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, fragmentos
+
+
+def medir_plantillas(datos, repeticiones=3):
+    """Compara la sección de competencia con plantilla compilada y con f-strings escritos a mano.
+
+    `relacion` es el tiempo de la plantilla dividido por el de los f-strings; al ser
+    un cociente medido en la misma ejecución, se puede comparar entre máquinas.
+    `iguales` indica si ambas generan el mismo HTML (difieren si algún valor necesita escaparse).
+    """
+    plantilla, con_plantilla = _mejor_tiempo(seccion_competencia, datos, repeticiones)
+    fstring, con_fstring = _mejor_tiempo(competencia_fstring, datos, repeticiones)
+    return {
+        "plantilla_segundos": plantilla,
+        "fstring_segundos": fstring,
+        "relacion": plantilla / fstring,
+        "iguales": "".join(con_plantilla) == "".join(con_fstring),
+    }
+
+
+def medir_escala(datos, repeticiones=3):
+    """Tiempo (el mejor de `repeticiones`) y bytes de cada sección, y pico de memoria del documento"""
+    secciones = {}
+    total_segundos = 0.0
+    total_bytes = 0
+    for id_seccion, seccion, _ in SECCIONES:
+        mejor, fragmentos = _mejor_tiempo(seccion, datos, repeticiones)
+        tamano = sum(len(fragmento.encode("utf-8")) for fragmento in fragmentos)
+        secciones[id_seccion] = {"segundos": mejor, "bytes": tamano}
+        total_segundos += mejor
+        total_bytes += tamano
+
+    # El pico se mide aparte: tracemalloc ralentiza la ejecución
+    destino = _Descarte()
+    tracemalloc.start()
+    for _, seccion, _ in SECCIONES:
+        for fragmento in seccion(datos):
+            destino.write(fragmento)
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {"segundos": total_segundos, "pico_bytes": pico, "bytes": total_bytes, "secciones": secciones,
+            "plantillas": medir_plantillas(datos, repeticiones)}
+
+
+def ejecutar(escalas=ESCALAS, repeticiones=3, directorio_datos=DIRECTORIO_DATOS, repositorio=None):
+    """Ejecuta el benchmark en todas las escalas y devuelve los resultados listos para JSON"""
+    datos, _ = cargar_datos(directorio_datos)
+    if repositorio is not None:
+        datos = aplicar_escaneo(datos, escanear_repositorio(repositorio)[0])
+    resultados = {}
+    for competidores, funcionalidades, modulos in escalas:
+        sinteticos = datos_sinteticos(datos, competidores, funcionalidades, modulos)
+        medicion = medir_escala(sinteticos, repeticiones)
+        medicion.update(competidores=competidores, funcionalidades=funcionalidades, modulos=modulos)
+        resultados[str(competidores)] = medicion
+    return {
+        "version": VERSION_BENCHMARK,
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "resultados": resultados,
+    }
+
+
+def comparar(base, actual, umbral=0.2):
+    """Lista de regresiones de `actual` frente a `base`: métricas que crecen más que `umbral`.
+
+    Se comparan el tiempo y el pico de memoria de cada escala, el tiempo de cada
+    sección y la relación entre la plantilla de competencia y sus f-strings; los
+    tiempos por debajo de 1 ms se ignoran porque son puro ruido.
+    """
+    if base.get("version") != actual.get("version"):
+        raise ValueError(f"versiones de benchmark distintas: {base.get('version')} y {actual.get('version')}")
+    regresiones = []
+
+    def revisar(nombre, anterior, nuevo, minimo=0.0):
+        if anterior > minimo and nuevo > anterior * (1 + umbral):
+            regresiones.append(f"{nombre}: {anterior:.4g} → {nuevo:.4g} (+{(nuevo / anterior - 1) * 100:.0f}%)")
+
+    for escala, medicion in actual["resultados"].items():
+        anterior = base["resultados"].get(escala)
+        if anterior is None:
+            continue
+        revisar(f"{escala} competidores, segundos", anterior["segundos"], medicion["segundos"], 0.001)
+        revisar(f"{escala} competidores, pico de memoria", anterior["pico_bytes"], medicion["pico_bytes"])
+        for id_seccion, seccion in medicion["secciones"].items():
+            if id_seccion in anterior["secciones"]:
+                revisar(f"{escala} competidores, sección {id_seccion}",
+                        anterior["secciones"][id_seccion]["segundos"], seccion["segundos"], 0.001)
+        if "plantillas" in anterior and anterior["plantillas"]["fstring_segundos"] > 0.001:
+            revisar(f"{escala} competidores, plantilla frente a f-strings",
+                    anterior["plantillas"]["relacion"], medicion["plantillas"]["relacion"])
+    return regresiones
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark del generador del análisis a distintas escalas")
+    parser.add_argument("--guardar", metavar="JSON", help="guarda los resultados en este archivo")
+    parser.add_argument("--comparar", metavar="JSON", help="compara con unos resultados guardados antes")
+    parser.add_argument("--umbral", type=float, default=0.2, help="crecimiento que se considera regresión (0.2 = 20%%)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="repeticiones de cada medida de tiempo")
+    parser.add_argument("--competidores", help="escalas a medir, p. ej. 8,100 (por defecto todas)")
+    argumentos = parser.parse_args(argumentos)
+
+    escalas = ESCALAS
+    if argumentos.competidores:
+        elegidas = {int(n) for n in argumentos.competidores.split(",")}
+        escalas = tuple(escala for escala in ESCALAS if escala[0] in elegidas)
+
+    repositorio = os.path.dirname(os.path.dirname(DIRECTORIO_DATOS))
+    resultado = ejecutar(escalas, argumentos.repeticiones, repositorio=repositorio)
+    print(f"{'Competidores':>12} {'Func.':>6} {'Tiempo':>10} {'Pico mem.':>11} {'Salida':>11}")
+    for escala, medicion in resultado["resultados"].items():
+        print(f"{escala:>12} {medicion['funcionalidades']:>6} {medicion['segundos'] * 1000:>8.1f} ms "
+              f"{medicion['pico_bytes'] / 1024 / 1024:>8.2f} MB {medicion['bytes'] / 1024 / 1024:>8.2f} MB")
+    print(f"\n{'Competencia':>12} {'Plantilla':>12} {'F-strings':>12} {'Relación':>9} {'Mismo HTML':>11}")
+    for escala, medicion in resultado["resultados"].items():
+        plantillas = medicion["plantillas"]
+        print(f"{escala:>12} {plantillas['plantilla_segundos'] * 1000:>9.2f} ms {plantillas['fstring_segundos'] * 1000:>9.2f} ms "
+              f"{plantillas['relacion']:>8.2f}x {'sí' if plantillas['iguales'] else 'no':>11}")
+
+    if argumentos.guardar:
+        with open(argumentos.guardar, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+        print(f"💾 Resultados guardados en {argumentos.guardar}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(base, resultado, argumentos.umbral)
+        if regresiones:
+            print(f"❌ {len(regresiones)} regresiones de más del {argumentos.umbral:.0%}:")
+            for regresion in regresiones:
+                print(f"   {regresion}")
+            return 1
+        print(f"✅ Sin regresiones de más del {argumentos.umbral:.0%} frente a {argumentos.comparar}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
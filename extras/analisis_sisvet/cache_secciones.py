@@ -0,0 +1,167 @@
+"""
+CACHÉ INCREMENTAL DE SECCIONES
+Guarda en disco el HTML ya generado de cada sección, identificado por una huella
+de los datos que usa la sección y del código que la genera. Al volver a generar
+el análisis solo se reconstruyen las secciones cuyos datos o plantilla cambiaron.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+import tempfile
+from contextlib import contextmanager
+
+from .plantillas import VERSION_COMPILADOR, Plantilla
+
+# Incrementar para invalidar todas las secciones guardadas (p. ej. al cambiar el formato de la caché)
+VERSION_PLANTILLAS = 1
+
+
+def huella_datos(valor):
+    """Calcula la huella SHA-256 de los datos de una sección.
+
+    marshal es mucho más rápido que JSON canónico y es reversible, así que datos
+    distintos nunca comparten huella. Se usa la versión 0 del formato, que no marca
+    los objetos compartidos ni el texto internado: los mismos valores medidos en
+    esta ejecución o leídos de la caché de un paso dan la misma huella. Los tipos
+    que marshal no admite pasan por JSON.
+    """
+    try:
+        serializado = marshal.dumps(valor, 0)
+    except ValueError:
+        serializado = json.dumps(valor, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    return hashlib.sha256(serializado).digest()
+
+
+def huella_codigo(funcion):
+    """Calcula la huella del código de una función (cambia al editar su plantilla).
+
+    Incluye las funciones auxiliares y las constantes globales que usa, también las
+    de otros módulos: editar un auxiliar cambia la huella de las secciones que lo usan.
+    De las plantillas que usa entra la huella de su archivo, sin compilarlas, y la
+    versión del compilador: si cambia lo que genera compilar(), cambia el HTML.
+    """
+    h = hashlib.sha256()
+    pendientes = [funcion]
+    vistas = set()
+    while pendientes:
+        actual = pendientes.pop()
+        if actual.__code__ in vistas:
+            continue
+        vistas.add(actual.__code__)
+        h.update(marshal.dumps(actual.__code__, 0))
+        # En orden: el de un set cambia de un proceso a otro con la aleatorización de los hash
+        for nombre in sorted(_nombres_globales(actual.__code__)):
+            valor = actual.__globals__.get(nombre)
+            if isinstance(valor, type(funcion)):
+                pendientes.append(valor)
+            elif isinstance(valor, Plantilla):
+                h.update(f"{nombre}:{VERSION_COMPILADOR}:{valor.huella()}".encode("utf-8"))
+            elif isinstance(valor, (str, int, float, tuple, frozenset, dict)):
+                try:
+                    h.update(nombre.encode("utf-8") + marshal.dumps(valor, 0))
+                except ValueError:
+                    pass
+    return h.digest()
+
+
+def _nombres_globales(codigo):
+    """Nombres que usa el código, incluidos los de sus funciones anidadas y comprensiones"""
+    nombres = set(codigo.co_names)
+    for constante in codigo.co_consts:
+        if isinstance(constante, type(codigo)):
+            nombres |= _nombres_globales(constante)
+    return nombres
+
+
+class CacheSecciones:
+    """Caché en disco de fragmentos HTML por sección"""
+
+    # limpiar=False conserva todas las versiones de cada sección: lo necesitan los lotes,
+    # en los que análisis con datos distintos comparten la caché al mismo tiempo.
+    # `claves` son claves ya calculadas por sección ({id_seccion: clave}), p. ej. por
+    # el proceso que reparte los análisis, para no volver a calcular las huellas
+    def __init__(self, directorio, limpiar=True, claves=None):
+        self.directorio = directorio
+        self.limpiar = limpiar
+        self.claves = dict(claves or {})
+        self.reutilizadas = []
+        self.regeneradas = []
+        # Archivos de las secciones buscadas, para borrar después los que nadie usó
+        self.usados = set()
+        self._huellas = {}
+        os.makedirs(directorio, exist_ok=True)
+
+    def clave(self, id_seccion, generador, dependencias, datos):
+        """Clave de la sección a partir de su plantilla y de los datos de los que depende"""
+        if id_seccion in self.claves:
+            return self.claves[id_seccion]
+        h = hashlib.sha256(f"{VERSION_PLANTILLAS}:{id_seccion}".encode("utf-8"))
+        h.update(huella_codigo(generador))
+        for nombre in dependencias:
+            # Varias secciones comparten datos: cada huella se calcula una sola vez
+            # mientras el valor sea el mismo objeto
+            valor = datos.get(nombre)
+            anterior = self._huellas.get(nombre)
+            if anterior is None or anterior[0] is not valor:
+                anterior = self._huellas[nombre] = (valor, huella_datos(valor))
+            h.update(nombre.encode("utf-8"))
+            h.update(anterior[1])
+        return h.hexdigest()[:32]
+
+    def _ruta(self, id_seccion, clave):
+        return os.path.join(self.directorio, f"{id_seccion}-{clave}.html")
+
+    def existe(self, id_seccion, clave):
+        """Indica si la sección ya está guardada, sin contarla como reutilizada"""
+        return os.path.exists(self._ruta(id_seccion, clave))
+
+    def buscar(self, id_seccion, clave):
+        """Devuelve la ruta del fragmento guardado o None si hay que regenerarlo"""
+        ruta = self._ruta(id_seccion, clave)
+        self.usados.add(os.path.basename(ruta))
+        if os.path.exists(ruta):
+            self.reutilizadas.append(id_seccion)
+            return ruta
+        self.regeneradas.append(id_seccion)
+        return None
+
+    @contextmanager
+    def guardar(self, id_seccion, clave):
+        """Abre un archivo temporal para la sección y lo publica al terminar sin errores"""
+        descriptor, temporal = tempfile.mkstemp(prefix=f".{id_seccion}-", suffix=".tmp", dir=self.directorio)
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8", newline="") as archivo:
+                yield archivo
+            os.replace(temporal, self._ruta(id_seccion, clave))
+        except BaseException:
+            os.unlink(temporal)
+            raise
+        if self.limpiar:
+            self._limpiar(id_seccion, clave)
+
+    def _limpiar(self, id_seccion, clave_vigente):
+        """Elimina las versiones anteriores de la sección"""
+        vigente = os.path.basename(self._ruta(id_seccion, clave_vigente))
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith(".html") or nombre == vigente:
+                continue
+            if nombre[:-len(".html")].rsplit("-", 1)[0] == id_seccion:
+                os.unlink(os.path.join(self.directorio, nombre))
+
+    def conservar(self, usados):
+        """Elimina las secciones guardadas cuyo archivo no está en `usados` y devuelve cuántas borró.
+
+        Es la limpieza de las cachés con limpiar=False: `usados` reúne los `usados`
+        de todas las CacheSecciones que trabajaron sobre el directorio.
+        """
+        borradas = 0
+        for nombre in os.listdir(self.directorio):
+            if nombre.endswith(".html") and not nombre.startswith(".") and nombre not in usados:
+                try:
+                    os.unlink(os.path.join(self.directorio, nombre))
+                except FileNotFoundError:
+                    continue
+                borradas += 1
+        return borradas
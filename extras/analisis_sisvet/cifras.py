@@ -0,0 +1,38 @@
+"""
+CIFRAS DERIVADAS DE LOS ANÁLISIS
+Cálculos pequeños sobre los resultados ya preparados que necesitan tanto las
+secciones HTML como la representación intermedia. Viven aquí, y no en el módulo
+de su análisis, porque esos módulos cargan servidores simulados, lectores de
+volcados o NumPy: este solo usa la biblioteca estándar y una regeneración con
+todo en caché lo importa sin arrastrar nada más.
+"""
+
+import math
+
+# Hora del cron del job de recordatorios (reminderJobs.js)
+HORA_JOB = 9
+
+
+def resumir(escrituras):
+    """{valor: {"total", "periodos", "pico", "periodo_pico"}} de una dimensión de analizar_auditoria()"""
+    resumen = {}
+    for valor, serie in escrituras.items():
+        periodo_pico = max(serie, key=serie.get)
+        resumen[valor] = {
+            "total": sum(serie.values()),
+            "periodos": len(serie),
+            "pico": serie[periodo_pico],
+            "periodo_pico": periodo_pico,
+        }
+    return dict(sorted(resumen.items(), key=lambda par: -par[1]["total"]))
+
+
+def primer_mes(fracciones, minimo):
+    """Primer mes (desde 1) en el que la fracción llega a `minimo`, o None"""
+    return next((mes for mes, fraccion in enumerate(fracciones, 1) if fraccion >= minimo), None)
+
+
+def hora_fin(minutos):
+    """Hora a la que termina un envío que empieza a las HORA_JOB:00 y dura `minutos`"""
+    total = HORA_JOB * 60 + math.ceil(minutos)
+    return f"{total // 60 % 24:02d}:{total % 60:02d}" + (" (+1 día)" if total >= 24 * 60 else "")
@@ -0,0 +1,356 @@
+"""
+LÍNEA DE COMANDOS DEL GENERADOR
+Subcomandos del generador de análisis (sin subcomando se usa render):
+
+    render   genera el documento HTML y, con --formatos, JSON, Markdown y CSV (o uno por clínica con --lote)
+    scan     escanea el repositorio e imprime sus cifras
+    bench    mide cada paso de la preparación y la generación con y sin caché
+    watch    mantiene el documento al día regenerando las secciones afectadas por cada cambio
+    serve    sirve el documento desde memoria con recarga en vivo en cada regeneración
+
+Este módulo solo importa la biblioteca estándar ligera al cargarse; cada
+subcomando importa lo que necesita, así que `--help` y una regeneración con
+todo en caché arrancan sin cargar NumPy ni los lectores de volcados.
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+
+SUBCOMANDOS = ("render", "scan", "bench", "watch", "serve")
+
+
+def entero_positivo(texto):
+    """Tipo de argparse para enteros mayores que cero"""
+    try:
+        valor = int(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba un entero: {texto!r}") from None
+    if valor < 1:
+        raise argparse.ArgumentTypeError(f"debe ser al menos 1: {valor}")
+    return valor
+
+
+def imprimir_optimizacion(optimizacion):
+    """Imprime el ahorro de la minificación y de cada versión comprimida"""
+    originales = optimizacion["bytes_originales"]
+    print(f"🗜️  Minificado: {originales:,} → {optimizacion['bytes']:,} bytes "
+          f"(-{1 - optimizacion['bytes'] / originales:.1%}) en {optimizacion['segundos_minificacion'] * 1000:.1f} ms")
+    for formato, comprimido in optimizacion["comprimidos"].items():
+        print(f"🗜️  {comprimido['ruta']}: {comprimido['bytes']:,} bytes "
+              f"(-{1 - comprimido['bytes'] / originales:.1%}) en {comprimido['segundos'] * 1000:.1f} ms")
+    if "br" not in optimizacion["comprimidos"]:
+        print("   (sin .br: instala el paquete brotli para generarlo)")
+
+
+def imprimir_contenido(datos):
+    """Imprime la lista de lo que incluye el documento según los análisis que se pudieron hacer"""
+    print("\n📋 El documento incluye:")
+    print("   ✓ Resumen ejecutivo")
+    print("   ✓ Análisis técnico detallado")
+    if "conexiones" in datos:
+        print("   ✓ Conexiones a la base de datos con y sin pool")
+    if "reproduccion" in datos:
+        print("   ✓ Latencia de las consultas por sentencia y endpoint")
+    if "recordatorios" in datos:
+        print("   ✓ Capacidad del job de recordatorios")
+    if "ocupacion_citas" in datos:
+        print("   ✓ Mapa de ocupación de la agenda")
+    if "auditoria" in datos:
+        print("   ✓ Actividad de la bitácora de auditoría")
+    print(f"   ✓ Análisis de {len(datos['competidores'])} competidores")
+    print("   ✓ Matrices de comparación funcional")
+    if "clasificacion_funcional" in datos:
+        print("   ✓ Clasificación ponderada por perfil de clínica")
+    print("   ✓ Estimaciones de costos detalladas")
+    if "proyeccion_simulada" in datos:
+        print("   ✓ Proyecciones financieras Monte Carlo (P10/P50/P90)")
+    else:
+        print("   ✓ Proyecciones financieras (conservador y optimista)")
+    print("   ✓ Plan de mercado completo")
+    print("   ✓ Estrategia de ventas door-to-door")
+    print("   ✓ 3 cuestionarios de mercado listos para usar")
+    print("   ✓ Recomendaciones estratégicas priorizadas")
+    print("   ✓ Roadmap de desarrollo")
+    print("   ✓ 8 gráficas interactivas")
+    print("\n🌐 Abre el archivo HTML en tu navegador para ver el análisis completo.")
+    print("=" * 80)
+
+
+def generar_en_lote(rutas, ruta_manifiesto, directorio_salida, procesos, minificar=False):
+    """Genera el análisis de cada clínica del manifiesto e imprime tiempos y rendimiento"""
+    from .datos import ErrorDatos
+    from .lote import generar_lote, leer_manifiesto
+
+    print("🚀 Generando análisis en lote...")
+    print("=" * 80)
+    try:
+        reportes = leer_manifiesto(ruta_manifiesto, rutas["datos"])
+    except ErrorDatos as error:
+        print(f"❌ Manifiesto inválido: {error}")
+        return 1
+
+    resultados, resumen = generar_lote(reportes, directorio_salida, rutas, procesos, minificar=minificar)
+    for resultado in resultados:
+        if "error" in resultado:
+            print(f"❌ {resultado['nombre']}: {resultado['error']}")
+        else:
+            print(f"✅ {resultado['nombre']}: {resultado['ruta']} ({resultado['bytes']:,} bytes, "
+                  f"{resultado['segundos'] * 1000:.1f} ms, {resultado['reutilizadas']} secciones de caché)")
+    print("=" * 80)
+    print(f"♻️  Secciones comunes generadas una vez: {resumen['secciones_comunes']} "
+          f"({resumen['segundos_comunes'] * 1000:.1f} ms)")
+    if resumen["secciones_borradas"]:
+        print(f"🧹 Secciones sin usar borradas de la caché: {resumen['secciones_borradas']}")
+    print(f"⏱️  {resumen['reportes']} análisis en {resumen['segundos']:.2f} s con {resumen['procesos']} procesos: "
+          f"{resumen['reportes_por_segundo']:.1f} análisis/s, {resumen['mb_por_segundo']:.1f} MB/s")
+    return 1 if resumen["errores"] else 0
+
+
+def comando_render(rutas, argumentos):
+    """Genera el archivo HTML del análisis e imprime el resumen"""
+    if argumentos.lote:
+        return generar_en_lote(rutas, argumentos.lote, argumentos.salida, argumentos.procesos, argumentos.minificar)
+    from .cache_secciones import CacheSecciones
+    from .datos import ErrorDatos
+    from .emisores import EMISORES, emitir
+    from .generacion import preparar_datos
+    from .representacion import construir
+
+    formatos = [formato.strip() for formato in argumentos.formatos.split(",") if formato.strip()]
+    desconocidos = [formato for formato in formatos if formato not in EMISORES]
+    # Validar antes de preparar los datos para no esperar a un error de escritura
+    if not formatos or desconocidos:
+        print(f"❌ Formatos inválidos: {argumentos.formatos} (disponibles: {', '.join(EMISORES)})")
+        return 2
+
+    print("🚀 Generando análisis completo del sistema veterinario...")
+    print("=" * 80)
+    try:
+        datos = preparar_datos(rutas, avisar=print)
+    except ErrorDatos as error:
+        print(f"❌ Datos del análisis inválidos: {error}")
+        return 1
+
+    cache = None if argumentos.sin_cache else CacheSecciones(rutas["cache"])
+    # Todos los formatos salen de la misma RI en una sola pasada por sus secciones
+    base = argumentos.archivo or f"ANALISIS_COMPLETO_SISVET_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if base.endswith(".html"):
+        base = base[:-len(".html")]
+    try:
+        if os.path.dirname(base):
+            os.makedirs(os.path.dirname(base), exist_ok=True)
+        salidas = emitir(construir(datos), base, formatos, cache)
+    except OSError as error:
+        print(f"❌ No se pudo escribir el análisis en {base}: {error}")
+        return 1
+
+    if "html" in salidas:
+        ruta_salida = salidas["html"]["rutas"][0]
+        print(f"✅ Análisis generado exitosamente: {ruta_salida}")
+        print(f"📊 Tamaño del archivo: {os.path.getsize(ruta_salida):,} bytes")
+    for formato, salida in salidas.items():
+        if formato != "html":
+            print(f"✅ {formato}: {', '.join(salida['rutas']) or 'sin archivos'} "
+                  f"({salida['bytes']:,} bytes en {salida['segundos'] * 1000:.1f} ms)")
+    if argumentos.minificar and "html" in salidas:
+        from .compresion import optimizar_archivo
+        try:
+            imprimir_optimizacion(optimizar_archivo(ruta_salida))
+        except OSError as error:
+            print(f"❌ No se pudo minificar {ruta_salida}: {error}")
+            return 1
+    if cache is not None and "html" in salidas:
+        print(f"♻️  Secciones reutilizadas de caché: {len(cache.reutilizadas)}, regeneradas: {len(cache.regeneradas)}"
+              + (f" ({', '.join(cache.regeneradas)})" if cache.regeneradas else ""))
+    imprimir_contenido(datos)
+    return 0
+
+
+def comando_scan(rutas, argumentos):
+    """Escanea el repositorio e imprime líneas por lenguaje y módulo, tablas y consultas en bucle"""
+    import json
+
+    from .escaner import escanear_repositorio
+
+    inicio = time.perf_counter()
+    escaneo, reescaneados = escanear_repositorio(argumentos.repositorio or rutas["repositorio"], rutas["cache"])
+    duracion = (time.perf_counter() - inicio) * 1000
+    if argumentos.json:
+        print(json.dumps(escaneo, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"🔎 {escaneo['archivos']} archivos ({reescaneados} reescaneados) en {duracion:.1f} ms: "
+          f"{escaneo['lineas_codigo']:,} líneas de código, {escaneo['db_tablas']} tablas")
+    for titulo, cifras in (("Lenguaje", escaneo["lenguajes"]), ("Módulo", escaneo["modulos"])):
+        print(f"\n{titulo:<24} {'archivos':>9} {'líneas de código':>17}")
+        for nombre, cifra in sorted(cifras.items(), key=lambda elemento: -elemento[1]["lineas_codigo"]):
+            print(f"{nombre:<24} {cifra['archivos']:>9} {cifra['lineas_codigo']:>17,}")
+    if escaneo["consultas_en_bucle"]:
+        print(f"\n{len(escaneo['consultas_en_bucle'])} funciones con consultas dentro de bucles (N+1):")
+        for funcion in escaneo["consultas_en_bucle"]:
+            filas = max(funcion["viajes"])
+            print(f"  {funcion['archivo']}:{funcion['linea']} {funcion['funcion']}: "
+                  f"{funcion['viajes'][filas]:,} viajes a la base de datos con {filas:,} elementos")
+    return 0
+
+
+class _Descarte:
+    """Destino de escritura que solo cuenta lo escrito, para no medir el disco"""
+
+    def write(self, texto):
+        return len(texto)
+
+
+def comando_bench(rutas, argumentos):
+    """Mide cada paso de la preparación y la generación del documento con y sin caché de secciones"""
+    from .cache_secciones import CacheSecciones
+    from .datos import ErrorDatos
+    from .generacion import PASOS, preparar_datos, render
+    from .secciones import TAM_BLOQUE_ESCRITURA, volcar
+
+    mediciones = {id_paso: [] for id_paso, _ in PASOS}
+    mediciones.update({"render sin caché": [], "render con caché": []})
+    try:
+        for _ in range(argumentos.repeticiones):
+            tiempos = {}
+            datos = preparar_datos(rutas, tiempos=tiempos)
+            for id_paso, segundos in tiempos.items():
+                mediciones[id_paso].append(segundos)
+            for nombre, cache in (("render sin caché", False), ("render con caché", CacheSecciones(rutas["cache"]))):
+                inicio = time.perf_counter()
+                volcar((_Descarte(),), render(rutas, datos, cache), TAM_BLOQUE_ESCRITURA)
+                mediciones[nombre].append(time.perf_counter() - inicio)
+    except ErrorDatos as error:
+        print(f"❌ Datos del análisis inválidos: {error}")
+        return 1
+    except OSError as error:
+        print(f"❌ No se pudo completar la medición: {error}")
+        return 1
+
+    # La primera repetición incluye las importaciones perezosas de cada paso
+    print(f"{'paso':<20} {'primera (ms)':>13} {'mediana (ms)':>13}")
+    for nombre, segundos in mediciones.items():
+        mediana = sorted(segundos)[len(segundos) // 2]
+        print(f"{nombre:<20} {segundos[0] * 1000:>13.1f} {mediana * 1000:>13.1f}")
+    total = sum(segundos[0] for nombre, segundos in mediciones.items() if nombre != "render sin caché")
+    print(f"\nPrimera regeneración con caché en este proceso: {total * 1000:.1f} ms "
+          f"(más el arranque del intérprete). Para el escalado con datos sintéticos: "
+          f"python -m analisis_sisvet.benchmark")
+    return 0
+
+
+def comando_watch(rutas, argumentos):
+    """Genera el documento y lo regenera cada vez que cambian sus entradas, hasta Ctrl+C"""
+    from .datos import ErrorDatos
+    from .vigilancia import vigilar
+
+    try:
+        vigilar(argumentos.archivo, rutas, argumentos.espera / 1000, argumentos.sondeo, argumentos.intervalo)
+    except ErrorDatos as error:
+        print(f"❌ Datos del análisis inválidos: {error}")
+        return 1
+    except OSError as error:
+        print(f"❌ No se pudo generar {argumentos.archivo}: {error}")
+        return 1
+    except KeyboardInterrupt:
+        print("\n👋 Vigilancia terminada")
+    return 0
+
+
+def comando_serve(rutas, argumentos):
+    """Sirve el documento con recarga en vivo mientras se vigilan sus entradas, hasta Ctrl+C"""
+    import asyncio
+
+    from .datos import ErrorDatos
+    from .servidor import servir
+
+    try:
+        asyncio.run(servir(rutas, argumentos.anfitrion, argumentos.puerto, argumentos.espera / 1000,
+                           argumentos.sondeo, argumentos.intervalo, argumentos.archivo))
+    except ErrorDatos as error:
+        print(f"❌ Datos del análisis inválidos: {error}")
+        return 1
+    except OSError as error:
+        print(f"❌ No se pudo abrir el servidor en {argumentos.anfitrion}:{argumentos.puerto}: {error}")
+        return 1
+    except KeyboardInterrupt:
+        print("👋 Servidor detenido")
+    return 0
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        description="Genera el análisis completo del sistema veterinario",
+        epilog="Sin subcomando se ejecuta render: `generar_analisis_completo.py --minificar` equivale a "
+               "`generar_analisis_completo.py render --minificar`.",
+    )
+    subcomandos = parser.add_subparsers(dest="comando", metavar="{render,scan,bench,watch,serve}")
+
+    render = subcomandos.add_parser("render", help="genera el documento HTML (por defecto)")
+    render.add_argument("--archivo", help="ruta del documento (por defecto ANALISIS_COMPLETO_SISVET_<fecha>.html)")
+    render.add_argument("--formatos", default="html", metavar="LISTA",
+                        help="formatos separados por comas: html, json, md, csv (por defecto html); "
+                             "comparten --archivo sin la extensión")
+    render.add_argument("--sin-cache", action="store_true", help="regenera todas las secciones sin usar la caché")
+    render.add_argument("--lote", metavar="MANIFIESTO",
+                        help="genera un análisis por cada clínica del manifiesto (JSON o TOML)")
+    render.add_argument("--salida", default=".", help="directorio de los análisis del lote (por defecto el actual)")
+    render.add_argument("--procesos", type=entero_positivo, help="procesos del lote (por defecto uno por CPU)")
+    render.add_argument("--minificar", action="store_true",
+                        help="minifica el HTML y escribe junto a él las versiones .gz y .br")
+
+    scan = subcomandos.add_parser("scan", help="escanea el repositorio e imprime sus cifras")
+    scan.add_argument("--repositorio", help="raíz del repositorio (por defecto la que contiene extras/)")
+    scan.add_argument("--json", action="store_true", help="imprime el escaneo completo en JSON")
+
+    bench = subcomandos.add_parser("bench", help="mide cada paso de la preparación y de la generación")
+    bench.add_argument("--repeticiones", type=entero_positivo, default=5, help="repeticiones de la medición (por defecto 5)")
+
+    # Opciones de la vigilancia de las entradas, comunes a watch y serve
+    vigilancia = argparse.ArgumentParser(add_help=False)
+    vigilancia.add_argument("--espera", type=float, default=100, metavar="MS",
+                            help="milisegundos sin eventos que cierran una ráfaga de cambios (por defecto 100)")
+    vigilancia.add_argument("--sondeo", action="store_true",
+                            help="compara mtime y tamaño periódicamente en lugar de usar inotify")
+    vigilancia.add_argument("--intervalo", type=float, default=0.5, metavar="S",
+                            help="segundos entre comprobaciones con --sondeo o sin inotify (por defecto 0.5)")
+
+    watch = subcomandos.add_parser("watch", parents=[vigilancia],
+                                   help="regenera el documento al cambiar los datos, los volcados o el backend")
+    watch.add_argument("--archivo", default="ANALISIS_COMPLETO_SISVET.html",
+                       help="ruta fija del documento (por defecto ANALISIS_COMPLETO_SISVET.html)")
+
+    serve = subcomandos.add_parser("serve", parents=[vigilancia],
+                                   help="sirve el documento desde memoria con recarga en vivo")
+    serve.add_argument("--anfitrion", default="127.0.0.1",
+                       help="dirección en la que escuchar (por defecto 127.0.0.1; 0.0.0.0 para toda la red)")
+    serve.add_argument("--puerto", type=int, default=8000, help="puerto HTTP (por defecto 8000)")
+    serve.add_argument("--archivo", help="escribe también el documento en esta ruta en cada regeneración")
+    return parser
+
+
+def main(argumentos=None, rutas=None):
+    """Punto de entrada de la línea de comandos; devuelve el código de salida"""
+    argumentos = list(sys.argv[1:] if argumentos is None else argumentos)
+    # Sin subcomando se genera el documento, como antes de que hubiera subcomandos
+    if not argumentos or (argumentos[0] not in SUBCOMANDOS and argumentos[0] not in ("-h", "--help")):
+        argumentos.insert(0, "render")
+    argumentos = crear_parser().parse_args(argumentos)
+    if rutas is None:
+        from .generacion import rutas_predeterminadas
+        rutas = rutas_predeterminadas()
+    comandos = {
+        "render": comando_render,
+        "scan": comando_scan,
+        "bench": comando_bench,
+        "watch": comando_watch,
+        "serve": comando_serve,
+    }
+    return comandos[argumentos.comando](rutas, argumentos)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
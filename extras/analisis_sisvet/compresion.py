@@ -0,0 +1,213 @@
+"""
+MINIFICACIÓN Y COMPRESIÓN DE LA SALIDA
+Reduce el HTML generado antes de publicarlo: minifica el CSS y el marcado (sin
+comentarios ni sangrías), convierte los atributos style="..." repetidos en clases
+y escribe junto al archivo las versiones .gz y .br que un servidor puede entregar
+tal cual (Content-Encoding) sin comprimir en cada petición.
+
+Brotli es opcional: si el paquete `brotli` no está instalado solo se escribe el .gz.
+"""
+
+import gzip
+import re
+import time
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+# Etiquetas de bloque: el espacio en blanco junto a ellas no se muestra y se elimina
+_BLOQUES = {
+    "doctype", "html", "head", "body", "meta", "link", "title", "style", "script",
+    "div", "p", "ul", "ol", "li", "table", "thead", "tbody", "tfoot", "tr", "td", "th",
+    "h1", "h2", "h3", "h4", "h5", "h6", "nav", "section", "header", "footer", "main",
+    "br", "hr", "form", "fieldset", "legend", "label", "select", "option", "blockquote",
+}
+
+# Comentarios, bloques cuyo contenido no es HTML (se tratan aparte) y etiquetas
+_MARCADO = re.compile(
+    r"<!--.*?-->|<(script|style|pre|textarea)\b[^>]*>.*?</\1\s*>|<[!/]?[a-zA-Z][^>]*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_NOMBRE = re.compile(r"<[!/]?([a-zA-Z][a-zA-Z0-9]*)")
+_ESPACIOS = re.compile(r"[ \t\r\n\f]+")
+_ESTILO = re.compile(r' style="([^"]*)"')
+_CLASE = re.compile(r' class="([^"]*)"')
+
+_CSS_COMENTARIOS = re.compile(r"/\*.*?\*/", re.DOTALL)
+_CSS_SEPARADORES = re.compile(r"\s*([{};,>])\s*")
+_CSS_DOS_PUNTOS = re.compile(r":\s+")
+
+NIVEL_GZIP = 9
+NIVEL_BROTLI = 11
+
+
+def minificar_css(css):
+    """CSS sin comentarios ni espacios innecesarios"""
+    css = _CSS_COMENTARIOS.sub("", css)
+    css = _ESPACIOS.sub(" ", css)
+    css = _CSS_SEPARADORES.sub(r"\1", css)
+    # Solo tras los dos puntos: antes pueden separar un selector de una pseudoclase
+    css = _CSS_DOS_PUNTOS.sub(":", css)
+    return css.replace(";}", "}").strip()
+
+
+def _minificar_script(codigo):
+    """Quita sangrías, líneas vacías y comentarios de línea completa.
+
+    Se conservan los saltos de línea: el código puede depender de la inserción
+    automática de punto y coma.
+    """
+    lineas = (linea.strip() for linea in codigo.splitlines())
+    return "\n".join(linea for linea in lineas if linea and not linea.startswith("//"))
+
+
+def _declaraciones(estilo):
+    return minificar_css(estilo).rstrip(";")
+
+
+def _regla(clase, declaraciones):
+    return f".{clase}{{{declaraciones.replace(';', '!important;')}!important}}"
+
+
+def _clases_para_estilos(etiquetas, clases_usadas):
+    """{declaraciones: clase} de los estilos en línea cuyo paso a clase ahorra bytes"""
+    usos = {}
+    for etiqueta in etiquetas:
+        estilo = _ESTILO.search(etiqueta)
+        if estilo:
+            declaraciones = _declaraciones(estilo.group(1))
+            usos[declaraciones] = usos.get(declaraciones, 0) + 1
+
+    clases = {}
+    numero = 1
+    for declaraciones, veces in sorted(usos.items(), key=lambda uso: -uso[1]):
+        while f"e{numero}" in clases_usadas:
+            numero += 1
+        clase = f"e{numero}"
+        # style="..." en cada uso frente a la clase más su regla en la hoja de estilos
+        if veces > 1 and veces * (len(declaraciones) + 9 - len(clase)) > len(_regla(clase, declaraciones)):
+            clases[declaraciones] = clase
+            numero += 1
+    return clases
+
+
+def _sustituir_estilo(etiqueta, clases):
+    estilo = _ESTILO.search(etiqueta)
+    if not estilo:
+        return etiqueta
+    clase = clases.get(_declaraciones(estilo.group(1)))
+    if clase is None:
+        return etiqueta[:estilo.start()] + f' style="{_declaraciones(estilo.group(1))}"' + etiqueta[estilo.end():]
+    existente = _CLASE.search(etiqueta)
+    if existente is None:
+        return etiqueta[:estilo.start()] + f' class="{clase}"' + etiqueta[estilo.end():]
+    etiqueta = etiqueta[:estilo.start()] + etiqueta[estilo.end():]
+    existente = _CLASE.search(etiqueta)
+    return etiqueta[:existente.end() - 1] + f" {clase}" + etiqueta[existente.end() - 1:]
+
+
+def minificar_html(texto):
+    """HTML minificado con los estilos en línea repetidos convertidos en clases.
+
+    El resultado se muestra igual: solo se quita el espacio en blanco que el
+    navegador no representa y las clases nuevas llevan !important para ganar, como
+    el atributo style al que sustituyen, a las reglas de la hoja de estilos.
+    """
+    # Alternancia texto / marcado; los comentarios desaparecen y el texto de sus lados se une
+    piezas = []
+    posicion = 0
+    for marcado in _MARCADO.finditer(texto):
+        intermedio = texto[posicion:marcado.start()]
+        if piezas and piezas[-1][0] is None:
+            piezas[-1] = (None, piezas[-1][1] + intermedio)
+        else:
+            piezas.append((None, intermedio))
+        posicion = marcado.end()
+        contenido = marcado.group(0)
+        if contenido.startswith("<!--") and not contenido.startswith("<!--[if"):
+            continue
+        nombre = _NOMBRE.match(contenido)
+        piezas.append((nombre.group(1).lower() if nombre else "!--", contenido))
+    piezas.append((None, texto[posicion:]))
+
+    etiquetas = [contenido for nombre, contenido in piezas if nombre not in (None, "script", "style", "pre", "textarea")]
+    clases_usadas = set()
+    for etiqueta in etiquetas:
+        clase = _CLASE.search(etiqueta)
+        if clase:
+            clases_usadas.update(clase.group(1).split())
+    clases = _clases_para_estilos(etiquetas, clases_usadas)
+    reglas = "".join(_regla(clase, declaraciones) for declaraciones, clase in clases.items())
+
+    salida = []
+    for i, (nombre, contenido) in enumerate(piezas):
+        if nombre is None:
+            anterior = piezas[i - 1][0] if i else "html"
+            siguiente = piezas[i + 1][0] if i + 1 < len(piezas) else "html"
+            contenido = _ESPACIOS.sub(" ", contenido)
+            if anterior in _BLOQUES:
+                contenido = contenido.lstrip(" ")
+            if siguiente in _BLOQUES:
+                contenido = contenido.rstrip(" ")
+        elif nombre in ("style", "script"):
+            apertura = contenido.index(">") + 1
+            cierre = contenido.rindex("<")
+            cuerpo = contenido[apertura:cierre]
+            if nombre == "style":
+                cuerpo = minificar_css(cuerpo) + reglas
+                reglas = ""
+            else:
+                cuerpo = _minificar_script(cuerpo)
+            contenido = _ESPACIOS.sub(" ", contenido[:apertura]) + cuerpo + contenido[cierre:]
+        elif nombre not in ("pre", "textarea", "!--"):
+            contenido = _sustituir_estilo(contenido, clases)
+        salida.append(contenido)
+    return "".join(salida)
+
+
+def comprimir(contenido, ruta):
+    """Escribe `ruta`.gz y, si brotli está disponible, `ruta`.br.
+
+    Devuelve {formato: {"ruta", "bytes", "segundos"}} de las versiones escritas.
+    """
+    comprimidos = {}
+    inicio = time.perf_counter()
+    # mtime=0: el .gz solo cambia si cambia el contenido
+    comprimidos["gz"] = (gzip.compress(contenido, compresslevel=NIVEL_GZIP, mtime=0), time.perf_counter() - inicio)
+    if brotli is not None:
+        inicio = time.perf_counter()
+        comprimido = brotli.compress(contenido, mode=brotli.MODE_TEXT, quality=NIVEL_BROTLI)
+        comprimidos["br"] = (comprimido, time.perf_counter() - inicio)
+
+    resultados = {}
+    for formato, (comprimido, segundos) in comprimidos.items():
+        with open(f"{ruta}.{formato}", "wb") as archivo:
+            archivo.write(comprimido)
+        resultados[formato] = {"ruta": f"{ruta}.{formato}", "bytes": len(comprimido), "segundos": segundos}
+    return resultados
+
+
+def optimizar_archivo(ruta, minificar=True):
+    """Minifica el HTML de `ruta` en su sitio y escribe sus versiones comprimidas.
+
+    Devuelve los bytes originales y finales, el tiempo de minificación y el
+    resultado de comprimir().
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        texto = archivo.read()
+    bytes_originales = len(texto.encode("utf-8"))
+    inicio = time.perf_counter()
+    if minificar:
+        texto = minificar_html(texto)
+    segundos_minificacion = time.perf_counter() - inicio
+    contenido = texto.encode("utf-8")
+    with open(ruta, "wb") as archivo:
+        archivo.write(contenido)
+    return {
+        "bytes_originales": bytes_originales,
+        "bytes": len(contenido),
+        "segundos_minificacion": segundos_minificacion,
+        "comprimidos": comprimir(contenido, ruta),
+    }
@@ -0,0 +1,642 @@
+"""
+CICLO DE VIDA DE LAS CONEXIONES A MYSQL
+backend/config/db.js abre una conexión nueva con mysql.createConnection en cada
+llamada a conectarDB(), y los controladores, el middleware de autenticación y el
+job de recordatorios la llaman en cada petición. Este módulo:
+
+- inventaría las llamadas a conectarDB() y comprueba si la conexión se cierra en
+  todos los caminos: en un `finally` que la cubre, solo en el camino normal
+  (se pierde con una excepción o un `return` anticipado) o nunca
+- cuenta por ruta las conexiones que se abren (checkAuth abre la suya antes que
+  el controlador) y los viajes fijos a la base de datos
+- mide con un servidor local que habla el protocolo de MySQL (saludo, autenticación
+  mysql_native_password, COM_QUERY, COM_QUIT) cuánto cuesta abrir, consultar y
+  cerrar, sin retardo y con un RTT inyectado en el servidor
+- con esas medidas modela la latencia y el rendimiento de abrir una conexión por
+  petición frente a un pool, para varios RTT y tasas de peticiones
+
+El servidor responde igual a cualquier consulta: mide el protocolo y la red, no a
+MySQL. El retardo inyectado simula la red: el saludo llega 2 RTT después de abrir
+el socket (el handshake de TCP y el propio saludo) y cada respuesta 1 RTT después
+de la petición. Desde extras/:
+
+    python -m analisis_sisvet.conexiones --rtt 0.2 1 5 20 --tasas 10 100 500
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import marshal
+import math
+import os
+import re
+import socket
+import socketserver
+import statistics
+import struct
+import sys
+import threading
+import time
+
+from .sql_backend import ARCHIVOS_SQL, LLAMADA_BD, cierre_js, enmascarar_js, funciones_js, leer_rutas
+
+# Incrementar al cambiar la medición para descartar las medidas guardadas
+VERSION_CONEXIONES = 1
+
+# RTT (ms) y tasas de peticiones (por segundo) del modelo
+RTTS_MS = (0.2, 1.0, 5.0, 20.0)
+TASAS = (10, 100, 500)
+
+# connectionLimit por defecto de mysql2.createPool y max_connections por defecto de MySQL
+TAM_POOL = 10
+MAX_CONEXIONES = 151
+
+# RTT inyectado y peticiones simuladas en la medición
+RTT_PRUEBA_MS = 2.0
+REPETICIONES = 20
+
+# Espera en cola del pool, como fracción del tiempo de servicio, que se considera aceptable
+ESPERA_ACEPTABLE = 0.1
+
+_CONECTAR = re.compile(r"\bconectarDB\s*\(")
+_CREAR_CONEXION = re.compile(r"\bmysql\s*\.\s*createConnection\s*\(")
+_CREAR_POOL = re.compile(r"\bmysql\s*\.\s*createPool\s*\(")
+_SALIDA_PROCESO = re.compile(r"\bprocess\s*\.\s*exit\s*\(")
+_ASIGNADA = re.compile(r"(\w+)\s*=\s*(?:await\s+)?$")
+_TRY = re.compile(r"\btry\s*\{")
+_TRY_SIGUIENTE = re.compile(r"[\s;]*(?=try\s*\{)")
+_FINALLY = re.compile(r"finally\s*\{")
+_SALIDA = re.compile(r"\b(?:return|throw)\b")
+
+# Protocolo cliente/servidor de MySQL
+_COM_QUIT = 0x01
+_COM_QUERY = 0x03
+_COM_PING = 0x0E
+_CAPACIDADES = (0x00000001 | 0x00000008 | 0x00000200 | 0x00002000 | 0x00008000  # contraseña larga, base de
+                | 0x00020000 | 0x00080000)  # datos, protocolo 4.1, transacciones, autenticación segura, plugin
+_PLUGIN = b"mysql_native_password"
+_UTF8MB4 = 45
+
+
+class ErrorConexiones(ValueError):
+    """El backend no se puede auditar o el servidor de pruebas respondió con un error"""
+
+
+# ---------------------------------------------------------------------------
+# Auditoría estática de conectarDB()
+# ---------------------------------------------------------------------------
+
+def _saltar_espacios(codigo, posicion):
+    return posicion + len(codigo[posicion:]) - len(codigo[posicion:].lstrip())
+
+
+def _bloques_try(enmascarado, desde, hasta):
+    """[(inicio, fin, finally)] de los try del tramo; finally es (inicio, fin) o None"""
+    bloques = []
+    for bloque in _TRY.finditer(enmascarado, desde, hasta):
+        fin = cierre_js(enmascarado, bloque.end() - 1)
+        posicion = _saltar_espacios(enmascarado, fin + 1)
+        if enmascarado.startswith("catch", posicion):
+            posicion = _saltar_espacios(enmascarado, posicion + 5)
+            if enmascarado.startswith("(", posicion):
+                posicion = _saltar_espacios(enmascarado, cierre_js(enmascarado, posicion) + 1)
+            posicion = _saltar_espacios(enmascarado, cierre_js(enmascarado, posicion) + 1)
+        final = None
+        encontrado = _FINALLY.match(enmascarado, posicion)
+        if encontrado:
+            final = (encontrado.end() - 1, cierre_js(enmascarado, encontrado.end() - 1))
+        bloques.append((bloque.start(), fin, final))
+    return bloques
+
+
+def _salidas_sin_cierre(codigo, enmascarado, posicion, fin, cierres):
+    """Líneas de los return/throw tras `posicion` sin un cierre desde la salida anterior"""
+    lineas = []
+    anterior = posicion
+    for salida in _SALIDA.finditer(enmascarado, posicion, fin):
+        if not any(anterior < c < salida.start() for c in cierres):
+            lineas.append(codigo.count("\n", 0, salida.start()) + 1)
+        anterior = salida.start()
+    return lineas
+
+
+def auditar_llamadas(codigo):
+    """Llamadas a conectarDB() del código y cómo se cierra cada conexión.
+
+    Devuelve [{"funcion", "linea", "variable", "cierre", "salidas_sin_cierre",
+    "consultas"}]. "cierre" es "finally" (se cierra en todos los caminos),
+    "explícito" (solo en el camino normal: una excepción la deja abierta) o
+    "sin cierre"; "salidas_sin_cierre" son los return/throw posteriores que no van
+    precedidos de un cierre y "consultas" los viajes fijos de la función.
+    """
+    enmascarado = enmascarar_js(codigo)
+    funciones = funciones_js(codigo)
+    limites = [inicio for inicio, _ in funciones[1:]] + [len(codigo)]
+    llamadas = []
+    for (inicio, nombre), fin in zip(funciones, limites):
+        for llamada in _CONECTAR.finditer(enmascarado, inicio, fin):
+            if re.search(r"(?:function|const|let|var)\s*$", enmascarado[max(inicio, llamada.start() - 20):llamada.start()]):
+                continue
+            asignada = _ASIGNADA.search(enmascarado, max(inicio, llamada.start() - 60), llamada.start())
+            variable = asignada.group(1) if asignada else None
+            tras_llamada = cierre_js(enmascarado, llamada.end() - 1) + 1
+            cierres = []
+            if variable:
+                cierres = [m.start() for m in re.finditer(r"\b" + variable + r"\s*\??\.\s*(?:end|release|destroy)\s*\(",
+                                                          enmascarado[:fin]) if m.start() > tras_llamada]
+            # El try que cubre la conexión la contiene o empieza justo después de abrirla
+            siguiente = _TRY_SIGUIENTE.match(enmascarado, tras_llamada)
+            cubren = [(a, b, f) for a, b, f in _bloques_try(enmascarado, inicio, fin)
+                      if a < llamada.start() < b or (siguiente and a == siguiente.end())]
+            en_finally = any(f and any(f[0] < c < f[1] for c in cierres) for _, _, f in cubren)
+            if en_finally:
+                cierre, salidas = "finally", []
+            elif cierres:
+                cierre, salidas = "explícito", _salidas_sin_cierre(codigo, enmascarado, tras_llamada, fin, cierres)
+            else:
+                cierre, salidas = "sin cierre", []
+            llamadas.append({
+                "funcion": nombre,
+                "linea": codigo.count("\n", 0, llamada.start()) + 1,
+                "variable": variable,
+                "cierre": cierre,
+                "salidas_sin_cierre": salidas,
+                "consultas": len(LLAMADA_BD.findall(enmascarado, inicio, fin)),
+            })
+    return llamadas
+
+
+def auditar_conexiones(backend, archivos=ARCHIVOS_SQL):
+    """Configuración de config/db.js, llamadas a conectarDB() y coste de cada ruta.
+
+    Devuelve {"configuracion": {"pool", "sale_del_proceso"}, "llamadas": [...]
+    con "archivo" relativo a backend/, "rutas": [{"metodo", "ruta", "conexiones",
+    "consultas"}]}. Los viajes de una ruta son los fijos de sus funciones: las
+    consultas dentro de bucles cuentan una vez.
+    """
+    ruta_db = os.path.join(backend, "config", "db.js")
+    try:
+        with open(ruta_db, encoding="utf-8") as archivo:
+            db = enmascarar_js(archivo.read())
+    except OSError as error:
+        raise ErrorConexiones(f"{ruta_db}: {error.strerror}") from error
+    configuracion = {
+        "pool": bool(_CREAR_POOL.search(db)) and not _CREAR_CONEXION.search(db),
+        "sale_del_proceso": bool(_SALIDA_PROCESO.search(db)),
+    }
+
+    llamadas = []
+    for patron in archivos:
+        for ruta in sorted(glob.glob(os.path.join(backend, patron))):
+            with open(ruta, encoding="utf-8") as archivo:
+                codigo = archivo.read()
+            relativa = os.path.relpath(ruta, backend).replace(os.sep, "/")
+            for llamada in auditar_llamadas(codigo):
+                llamada["archivo"] = relativa
+                llamadas.append(llamada)
+
+    por_funcion = {}
+    for llamada in llamadas:
+        coste = por_funcion.setdefault((llamada["archivo"], llamada["funcion"]), {"conexiones": 0, "consultas": 0})
+        coste["conexiones"] += 1
+        coste["consultas"] = llamada["consultas"]
+    rutas = []
+    for ruta in leer_rutas(backend):
+        costes = [por_funcion[funcion] for funcion in ruta["funciones"] if funcion in por_funcion]
+        rutas.append({
+            "metodo": ruta["metodo"],
+            "ruta": ruta["ruta"],
+            "conexiones": sum(c["conexiones"] for c in costes),
+            "consultas": sum(c["consultas"] for c in costes),
+        })
+    return {"configuracion": configuracion, "llamadas": llamadas, "rutas": rutas}
+
+
+# ---------------------------------------------------------------------------
+# Servidor y cliente del protocolo de MySQL
+# ---------------------------------------------------------------------------
+
+def _leer(conexion, n):
+    partes = []
+    while n:
+        parte = conexion.recv(n)
+        if not parte:
+            return None
+        partes.append(parte)
+        n -= len(parte)
+    return b"".join(partes)
+
+
+def _leer_paquete(conexion):
+    """(secuencia, carga) del siguiente paquete o None si se cerró la conexión"""
+    cabecera = _leer(conexion, 4)
+    if cabecera is None:
+        return None
+    longitud = int.from_bytes(cabecera[:3], "little")
+    carga = _leer(conexion, longitud) if longitud else b""
+    return None if carga is None else (cabecera[3], carga)
+
+
+def _paquete(secuencia, carga):
+    return len(carga).to_bytes(3, "little") + bytes((secuencia & 0xFF,)) + carga
+
+
+def _cadena_lenenc(texto):
+    return bytes((len(texto),)) + texto
+
+
+_OK = b"\x00\x00\x00" + struct.pack("<HH", 0x0002, 0)
+_EOF = b"\xfe" + struct.pack("<HH", 0, 0x0002)
+_COLUMNA = (b"".join(_cadena_lenenc(t) for t in (b"def", b"", b"", b"", b"1", b""))
+            + b"\x0c" + struct.pack("<HIBHB", 63, 1, 0x08, 0x0081, 0) + b"\x00\x00")
+
+
+class _ManejadorMySQL(socketserver.BaseRequestHandler):
+    """Una conexión del servidor de pruebas: saludo, autenticación y comandos"""
+
+    def _responder(self, *paquetes, viajes=1):
+        time.sleep(self.server.retardo * viajes)
+        self.request.sendall(b"".join(paquetes))
+
+    def handle(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sal = bytes(33 + b % 94 for b in os.urandom(20))
+        saludo = (b"\x0a" + b"8.0.0-sisvet\x00" + struct.pack("<I", threading.get_ident() & 0xFFFFFFFF)
+                  + sal[:8] + b"\x00" + struct.pack("<HBHH", _CAPACIDADES & 0xFFFF, _UTF8MB4, 0x0002,
+                                                    _CAPACIDADES >> 16)
+                  + bytes((21,)) + b"\x00" * 10 + sal[8:] + b"\x00" + _PLUGIN + b"\x00")
+        self._responder(_paquete(0, saludo), viajes=2)
+        respuesta = _leer_paquete(self.request)
+        if respuesta is None:
+            return
+        self._responder(_paquete(respuesta[0] + 1, _OK))
+        while True:
+            paquete = _leer_paquete(self.request)
+            if paquete is None:
+                return
+            secuencia, carga = paquete
+            if carga[:1] == bytes((_COM_QUIT,)):
+                # El cliente espera a que el servidor cierre el socket
+                time.sleep(self.server.retardo)
+                return
+            if carga[:1] == bytes((_COM_QUERY,)) and carga[1:].lstrip().upper().startswith(b"SELECT"):
+                self._responder(_paquete(secuencia + 1, b"\x01"), _paquete(secuencia + 2, _COLUMNA),
+                                _paquete(secuencia + 3, _EOF), _paquete(secuencia + 4, _cadena_lenenc(b"1")),
+                                _paquete(secuencia + 5, _EOF))
+            elif carga[:1] in (bytes((_COM_QUERY,)), bytes((_COM_PING,))):
+                self._responder(_paquete(secuencia + 1, _OK))
+            else:
+                self._responder(_paquete(secuencia + 1, b"\xff" + struct.pack("<H", 1047) + b"#08S01Unknown command"))
+
+
+class ServidorMySQL(socketserver.ThreadingTCPServer):
+    """Servidor local que habla el protocolo de MySQL con `rtt_ms` de retardo inyectado.
+
+    Se usa como gestor de contexto; `direccion` es el (host, puerto) en el que escucha.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, rtt_ms=0.0):
+        super().__init__(("127.0.0.1", 0), _ManejadorMySQL)
+        self.retardo = rtt_ms / 1000
+        self.direccion = self.server_address
+        self._hilo = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.shutdown()
+        self.server_close()
+        self._hilo.join()
+
+
+def _autenticacion(contrasena, sal):
+    """Respuesta de mysql_native_password: SHA1(c) XOR SHA1(sal + SHA1(SHA1(c)))"""
+    if not contrasena:
+        return b""
+    primera = hashlib.sha1(contrasena).digest()
+    segunda = hashlib.sha1(sal + hashlib.sha1(primera).digest()).digest()
+    return bytes(a ^ b for a, b in zip(primera, segunda))
+
+
+class ClienteMySQL:
+    """Cliente mínimo del protocolo de MySQL: conecta, consulta y cierra como mysql2"""
+
+    def __init__(self, direccion, usuario=b"root", contrasena=b"sisvet", base=b"sisvet"):
+        self._socket = socket.create_connection(direccion)
+        self._socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        saludo = self._recibir()[1]
+        fin_version = saludo.index(b"\x00", 1)
+        sal = saludo[fin_version + 5:fin_version + 13] + saludo[fin_version + 32:fin_version + 44]
+        token = _autenticacion(contrasena, sal)
+        respuesta = (struct.pack("<IIB", _CAPACIDADES, 1 << 24, _UTF8MB4) + b"\x00" * 23 + usuario + b"\x00"
+                     + bytes((len(token),)) + token + base + b"\x00" + _PLUGIN + b"\x00")
+        self._socket.sendall(_paquete(1, respuesta))
+        self._comprobar(self._recibir()[1])
+
+    def _recibir(self):
+        paquete = _leer_paquete(self._socket)
+        if paquete is None:
+            raise ErrorConexiones("el servidor cerró la conexión")
+        return paquete
+
+    @staticmethod
+    def _comprobar(carga):
+        if carga[:1] == b"\xff":
+            raise ErrorConexiones(f"error {struct.unpack('<H', carga[1:3])[0]}: {carga[9:].decode('utf-8', 'replace')}")
+        return carga
+
+    def consultar(self, sql):
+        """Envía COM_QUERY y devuelve las filas (listas de bytes) o [] si la respuesta es un OK"""
+        self._socket.sendall(_paquete(0, bytes((_COM_QUERY,)) + sql.encode("utf-8")))
+        primera = self._comprobar(self._recibir()[1])
+        if primera[:1] == b"\x00":
+            return []
+        for _ in range(primera[0]):
+            self._recibir()
+        self._recibir()
+        filas = []
+        while True:
+            carga = self._comprobar(self._recibir()[1])
+            if carga[:1] == b"\xfe" and len(carga) < 9:
+                return filas
+            fila, posicion = [], 0
+            while posicion < len(carga):
+                fila.append(carga[posicion + 1:posicion + 1 + carga[posicion]])
+                posicion += 1 + carga[posicion]
+            filas.append(fila)
+
+    def cerrar(self):
+        """Envía COM_QUIT y espera a que el servidor cierre, como connection.end()"""
+        self._socket.sendall(_paquete(0, bytes((_COM_QUIT,))))
+        while self._socket.recv(4096):
+            pass
+        self._socket.close()
+
+
+# ---------------------------------------------------------------------------
+# Medición y modelo
+# ---------------------------------------------------------------------------
+
+def _medir_peticiones(rtt_ms, repeticiones, consultas):
+    """Medianas (ms) de abrir, consultar y cerrar, y peticiones por segundo sin y con conexión reutilizada"""
+    abrir, consultar, cerrar, sin_pool = [], [], [], []
+    with ServidorMySQL(rtt_ms) as servidor:
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            cliente = ClienteMySQL(servidor.direccion)
+            conectado = time.perf_counter()
+            for _ in range(consultas):
+                cliente.consultar("SELECT 1")
+            consultado = time.perf_counter()
+            cliente.cerrar()
+            fin = time.perf_counter()
+            abrir.append(conectado - inicio)
+            consultar.append((consultado - conectado) / max(consultas, 1))
+            cerrar.append(fin - consultado)
+            # mysql2 envía la respuesta HTTP antes de que termine connection.end()
+            sin_pool.append(consultado - inicio)
+        cliente = ClienteMySQL(servidor.direccion)
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            for _ in range(consultas):
+                cliente.consultar("SELECT 1")
+        con_pool = (time.perf_counter() - inicio) / repeticiones
+        cliente.cerrar()
+    return {
+        "conexion_ms": statistics.median(abrir) * 1000,
+        "consulta_ms": statistics.median(consultar) * 1000,
+        "cierre_ms": statistics.median(cerrar) * 1000,
+        "peticiones_por_segundo": {"sin_pool": 1 / statistics.median(sin_pool), "con_pool": 1 / con_pool},
+    }
+
+
+def medir_protocolo(consultas=3, rtt_ms=RTT_PRUEBA_MS, repeticiones=REPETICIONES):
+    """Mide con el servidor de pruebas peticiones de `consultas` viajes sin retardo y con `rtt_ms`.
+
+    Devuelve {"consultas", "rtt_prueba_ms", "repeticiones", "sin_retardo",
+    "con_retardo", "viajes": {"conexion", "consulta", "cierre"}}: los viajes de
+    cada fase son el tiempo que añade el RTT dividido entre el RTT.
+    """
+    sin_retardo = _medir_peticiones(0.0, repeticiones * 5, consultas)
+    con_retardo = _medir_peticiones(rtt_ms, repeticiones, consultas)
+    return {
+        "consultas": consultas,
+        "rtt_prueba_ms": rtt_ms,
+        "repeticiones": repeticiones,
+        "sin_retardo": sin_retardo,
+        "con_retardo": con_retardo,
+        "viajes": {
+            fase: round((con_retardo[f"{fase}_ms"] - sin_retardo[f"{fase}_ms"]) / rtt_ms, 2)
+            for fase in ("conexion", "consulta", "cierre")
+        },
+    }
+
+
+def _erlang_c(servidores, carga):
+    """Probabilidad de esperar en una cola M/M/c con `carga` = λ·S erlangs"""
+    bloqueo = 1.0
+    for n in range(1, servidores + 1):
+        bloqueo = carga * bloqueo / (n + carga * bloqueo)
+    return servidores * bloqueo / (servidores - carga * (1 - bloqueo))
+
+
+def _espera_pool(tam_pool, carga, servicio):
+    """Espera media en la cola del pool (s) o None si el pool está saturado"""
+    if carga >= tam_pool:
+        return None
+    return _erlang_c(tam_pool, carga) * servicio / (tam_pool - carga)
+
+
+def modelar(medidas, conexiones, consultas, rtts_ms=RTTS_MS, tasas=TASAS, tam_pool=TAM_POOL,
+            max_conexiones=MAX_CONEXIONES):
+    """Latencia y capacidad de una conexión por petición frente a un pool.
+
+    Cada fase cuesta lo medido sin retardo más sus viajes medidos por el RTT. Sin
+    pool una petición abre `conexiones` conexiones una tras otra y hace `consultas`
+    viajes; cada conexión sigue abierta en MySQL mientras se cierra, y por la ley
+    de Little hay tasa · vida conexiones abiertas a la vez. Con pool la petición
+    solo hace sus consultas y espera turno en una cola M/M/c de `tam_pool`
+    conexiones. Devuelve una fila por (RTT, tasa).
+    """
+    base = medidas["sin_retardo"]
+    viajes = medidas["viajes"]
+    filas = []
+    for rtt in rtts_ms:
+        conexion, consulta, cierre = (
+            (base[f"{fase}_ms"] + viajes[fase] * rtt) / 1000 for fase in ("conexion", "consulta", "cierre")
+        )
+        latencia_sin_pool = conexiones * conexion + consultas * consulta
+        vida = latencia_sin_pool + conexiones * cierre
+        servicio = consultas * consulta
+        pool_recomendado = 1
+        for tasa in tasas:
+            carga = tasa * servicio
+            while (_espera_pool(pool_recomendado, carga, servicio) or math.inf) > ESPERA_ACEPTABLE * servicio:
+                pool_recomendado += 1
+            espera = _espera_pool(tam_pool, carga, servicio)
+            filas.append({
+                "rtt_ms": rtt,
+                "tasa": tasa,
+                "sin_pool": {
+                    "latencia_ms": latencia_sin_pool * 1000,
+                    "conexiones_abiertas": tasa * vida,
+                    "aperturas_por_segundo": tasa * conexiones,
+                    "saturado": tasa * vida >= max_conexiones,
+                },
+                "con_pool": {
+                    "latencia_ms": None if espera is None else (servicio + espera) * 1000,
+                    "ocupacion": carga / tam_pool,
+                    "saturado": espera is None,
+                    "pool_recomendado": pool_recomendado,
+                },
+                "ahorro_ms": None if espera is None else (latencia_sin_pool - servicio - espera) * 1000,
+                "maximo_sin_pool": max_conexiones / vida,
+                "maximo_con_pool": tam_pool / servicio if servicio else None,
+            })
+    return filas
+
+
+def _leer_cache(ruta, firma):
+    try:
+        with open(ruta, "rb") as archivo:
+            cache = marshal.loads(archivo.read())
+        if cache.get("version") == VERSION_CONEXIONES and cache.get("firma") == firma:
+            return cache["resultado"]
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    return None
+
+
+def _guardar_cache(ruta, firma, resultado):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(marshal.dumps({"version": VERSION_CONEXIONES, "firma": firma, "resultado": resultado}))
+    os.replace(temporal, ruta)
+
+
+def _firma_backend(backend, archivos):
+    """(ruta, mtime, tamaño) de los archivos que lee la auditoría"""
+    rutas = [os.path.join(backend, "index.js"), os.path.join(backend, "config", "db.js")]
+    for patron in archivos + ("routes/*.js",):
+        rutas.extend(sorted(glob.glob(os.path.join(backend, patron))))
+    firma = []
+    for ruta in rutas:
+        try:
+            estado = os.stat(ruta)
+        except OSError:
+            continue
+        firma.append((os.path.abspath(ruta), estado.st_mtime_ns, estado.st_size))
+    return tuple(firma)
+
+
+def analizar_conexiones(backend, directorio_cache=None, rtts_ms=RTTS_MS, tasas=TASAS, tam_pool=TAM_POOL,
+                        max_conexiones=MAX_CONEXIONES, rtt_prueba_ms=RTT_PRUEBA_MS, repeticiones=REPETICIONES):
+    """Auditoría de conectarDB(), medidas del protocolo y modelo con y sin pool.
+
+    Con `directorio_cache` la auditoría se guarda por mtime y tamaño de los archivos
+    del backend y las medidas por consultas, RTT de prueba y repeticiones, para que
+    el análisis no cambie de una ejecución a otra. Devuelve (resultado, medidas_desde_cache).
+    """
+    firma = _firma_backend(backend, ARCHIVOS_SQL)
+    ruta_auditoria = os.path.join(directorio_cache, "conexiones-auditoria.marshal") if directorio_cache else None
+    auditoria = _leer_cache(ruta_auditoria, firma) if ruta_auditoria else None
+    if auditoria is None:
+        auditoria = auditar_conexiones(backend)
+        if ruta_auditoria:
+            _guardar_cache(ruta_auditoria, firma, auditoria)
+    con_base = [r for r in auditoria["rutas"] if r["conexiones"]]
+    conexiones = statistics.fmean(r["conexiones"] for r in con_base) if con_base else 1.0
+    consultas = statistics.fmean(r["consultas"] for r in con_base) if con_base else 1.0
+
+    parametros = (round(consultas), rtt_prueba_ms, repeticiones)
+    ruta_medidas = os.path.join(directorio_cache, "conexiones-medidas.marshal") if directorio_cache else None
+    medidas = _leer_cache(ruta_medidas, parametros) if ruta_medidas else None
+    desde_cache = medidas is not None
+    if medidas is None:
+        medidas = medir_protocolo(*parametros)
+        if ruta_medidas:
+            _guardar_cache(ruta_medidas, parametros, medidas)
+
+    auditoria.update({
+        "conexiones_por_peticion": conexiones,
+        "consultas_por_peticion": consultas,
+        "tam_pool": tam_pool,
+        "max_conexiones": max_conexiones,
+        "medidas": medidas,
+        "modelo": modelar(medidas, conexiones, consultas, rtts_ms, tasas, tam_pool, max_conexiones),
+    })
+    return auditoria, desde_cache
+
+
+def _milisegundos(valor):
+    return "saturado" if valor is None else f"{valor:,.1f} ms"
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Ciclo de vida de las conexiones a MySQL y modelo con y sin pool")
+    parser.add_argument("--backend", default=os.path.join("..", "backend"), help="directorio del backend")
+    parser.add_argument("--rtt", type=float, nargs="+", default=list(RTTS_MS), metavar="MS", help="RTT del modelo")
+    parser.add_argument("--tasas", type=float, nargs="+", default=list(TASAS), metavar="N",
+                        help="peticiones por segundo del modelo")
+    parser.add_argument("--pool", type=int, default=TAM_POOL, help="conexiones del pool")
+    parser.add_argument("--max-conexiones", type=int, default=MAX_CONEXIONES, help="max_connections de MySQL")
+    parser.add_argument("--rtt-prueba", type=float, default=RTT_PRUEBA_MS, metavar="MS",
+                        help="RTT inyectado en el servidor de pruebas")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES, help="peticiones medidas con retardo")
+    parser.add_argument("--json", action="store_true", help="imprime el resultado completo en JSON")
+    argumentos = parser.parse_args(argumentos)
+
+    inicio = time.perf_counter()
+    try:
+        resultado, _ = analizar_conexiones(argumentos.backend, None, argumentos.rtt, argumentos.tasas, argumentos.pool,
+                                           argumentos.max_conexiones, argumentos.rtt_prueba, argumentos.repeticiones)
+    except (ErrorConexiones, OSError) as error:
+        print(f"❌ {error}")
+        return 1
+    segundos = time.perf_counter() - inicio
+    if argumentos.json:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        return 0
+
+    configuracion = resultado["configuracion"]
+    print(f"config/db.js: {'pool' if configuracion['pool'] else 'una conexión nueva por llamada'}"
+          + (", process.exit() si falla la conexión" if configuracion["sale_del_proceso"] else ""))
+    cierres = {}
+    for llamada in resultado["llamadas"]:
+        cierres[llamada["cierre"]] = cierres.get(llamada["cierre"], 0) + 1
+    print(f"{len(resultado['llamadas'])} llamadas a conectarDB(): "
+          + ", ".join(f"{n} {cierre}" for cierre, n in sorted(cierres.items())))
+    for llamada in resultado["llamadas"]:
+        if llamada["cierre"] != "finally":
+            print(f"  {llamada['archivo']}:{llamada['linea']} {llamada['funcion']}: {llamada['cierre']}"
+                  + (f", sale sin cerrar en las líneas {llamada['salidas_sin_cierre']}" if llamada["salidas_sin_cierre"] else ""))
+    print(f"Por petición: {resultado['conexiones_por_peticion']:.2f} conexiones y "
+          f"{resultado['consultas_por_peticion']:.2f} viajes fijos")
+
+    medidas = resultado["medidas"]
+    print(f"\nServidor de pruebas ({medidas['consultas']} consultas por petición, RTT {medidas['rtt_prueba_ms']} ms):")
+    for clave, titulo in (("sin_retardo", "sin retardo"), ("con_retardo", f"RTT {medidas['rtt_prueba_ms']} ms")):
+        fase = medidas[clave]
+        print(f"  {titulo:<14} abrir {fase['conexion_ms']:.3f} ms, consulta {fase['consulta_ms']:.3f} ms, "
+              f"cerrar {fase['cierre_ms']:.3f} ms; {fase['peticiones_por_segundo']['sin_pool']:,.0f} pet/s sin pool, "
+              f"{fase['peticiones_por_segundo']['con_pool']:,.0f} con conexión reutilizada")
+    print("  viajes: " + ", ".join(f"{fase} {n}" for fase, n in medidas["viajes"].items()))
+
+    print(f"\n{'RTT':>8} {'pet/s':>7} {'sin pool':>12} {'abiertas':>9} {'con pool':>12} {'ocupación':>10} {'pool rec.':>9}")
+    for fila in resultado["modelo"]:
+        print(f"{fila['rtt_ms']:>6.1f}ms {fila['tasa']:>7,.0f} {_milisegundos(fila['sin_pool']['latencia_ms']):>12} "
+              f"{fila['sin_pool']['conexiones_abiertas']:>9.1f} {_milisegundos(fila['con_pool']['latencia_ms']):>12} "
+              f"{fila['con_pool']['ocupacion']:>10.0%} {fila['con_pool']['pool_recomendado']:>9}")
+    print(f"\nAnálisis en {segundos:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
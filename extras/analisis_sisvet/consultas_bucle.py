@@ -0,0 +1,184 @@
+"""
+CONSULTAS DENTRO DE BUCLES (N+1)
+Busca en el código del backend las llamadas a la base de datos (execute, query,
+beginTransaction, commit) que se hacen dentro de un bucle: for, for...of, while,
+do...while y los callbacks de forEach, map, etc. Cada una supone un viaje de ida
+y vuelta a MySQL por elemento, de modo que el número de viajes de la función crece
+con las filas que devuelve la consulta anterior (el patrón N+1) o con los
+elementos que llegan en la petición.
+
+Para cada función se cuentan los viajes fijos (llamadas fuera de bucles) y los de
+cada bucle, y se estiman los viajes totales para N filas: fijos + Σ consultas del
+bucle · N^profundidad. El análisis es estático y por archivo, así que el escáner
+del repositorio lo guarda en su caché junto al resto de cifras de cada archivo.
+"""
+
+import re
+
+from .sql_backend import LLAMADA_BD, cierre_js, enmascarar_js, funciones_js, sentencias_js
+
+# Filas para las que se estiman los viajes de cada función
+FILAS_ESTIMACION = (10, 100, 1000)
+
+_BUCLE = re.compile(r"\b(?:(for)\s*(?:await\s*)?\(|(while)\s*\(|(do)\s*\{)|\.\s*(forEach|map|flatMap|filter|reduce|some|every|find)\s*\(")
+_COLECCION_FOR = re.compile(r"\b(?:of|in)\s+([\w.$\[\]]+)\s*$|<=?\s*([\w.$\[\]]+?)\.length\b")
+_CONTADOR_FIJO = re.compile(r"^\s*(?:let|var)?\s*(\w+)\s*=\s*(\d+)\s*;\s*\1\s*(<=?)\s*(\d+)\s*;")
+_OBJETO_METODO = re.compile(r"([\w$][\w.$\[\]]*)\s*$")
+_TABLA_SQL = re.compile(r"\b(?:FROM|INTO|UPDATE|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+_OPERACION_SQL = re.compile(r"\s*\(?\s*(\w+)")
+
+
+def _bucles(enmascarado):
+    """[{"inicio", "fin", "tipo", "coleccion", "iteraciones"}] de los bucles del código"""
+    bucles = []
+    for bucle in _BUCLE.finditer(enmascarado):
+        tipo = next(grupo for grupo in bucle.groups() if grupo)
+        coleccion = iteraciones = None
+        if tipo in ("for", "while"):
+            apertura = bucle.end() - 1
+            cierre = cierre_js(enmascarado, apertura)
+            cabecera = enmascarado[apertura + 1:cierre]
+            if tipo == "while" and enmascarado[cierre + 1:].lstrip().startswith(";"):
+                # El while de un do...while: el cuerpo ya se tomó con el do
+                continue
+            cuerpo = cierre + 1 + (len(enmascarado[cierre + 1:]) - len(enmascarado[cierre + 1:].lstrip()))
+            fin = cierre_js(enmascarado, cuerpo) if enmascarado.startswith("{", cuerpo) else enmascarado.find(";", cuerpo)
+            if tipo == "for":
+                encontrada = _COLECCION_FOR.search(cabecera.split(";")[1] if cabecera.count(";") == 2 else cabecera)
+                if encontrada:
+                    coleccion = encontrada.group(1) or encontrada.group(2)
+                contador = _CONTADOR_FIJO.match(cabecera)
+                if contador:
+                    iteraciones = int(contador.group(4)) - int(contador.group(2)) + (contador.group(3) == "<=")
+                tipo = "for...of" if re.search(r"\bof\b", cabecera) else tipo
+            inicio = bucle.start()
+        elif tipo == "do":
+            inicio = bucle.start()
+            fin = cierre_js(enmascarado, bucle.end() - 1)
+            tipo = "do...while"
+        else:
+            inicio = bucle.start()
+            fin = cierre_js(enmascarado, bucle.end() - 1)
+            objeto = _OBJETO_METODO.search(enmascarado, max(0, bucle.start() - 120), bucle.start())
+            coleccion = objeto.group(1) if objeto else None
+        bucles.append({"inicio": inicio, "fin": fin, "tipo": tipo, "coleccion": coleccion, "iteraciones": iteraciones})
+    return bucles
+
+
+def _llamadas(codigo, enmascarado, sentencias):
+    """[{"posicion", "metodo", "sql"}] de las llamadas a la base de datos, con su SQL si se conoce"""
+    llamadas = []
+    for llamada in LLAMADA_BD.finditer(enmascarado):
+        apertura = llamada.end() - 1
+        cierre = cierre_js(enmascarado, apertura)
+        sql = next((s["sql"] for s in sentencias if apertura < s["inicio"] < cierre), None)
+        if sql is None and llamada.group(1) in ("execute", "query"):
+            variable = re.match(r"\s*(\w+)", codigo[apertura + 1:cierre])
+            if variable:
+                anteriores = [s for s in sentencias if s["variable"] == variable.group(1) and s["inicio"] < apertura]
+                sql = anteriores[-1]["sql"] if anteriores else None
+        llamadas.append({"posicion": llamada.start(), "metodo": llamada.group(1), "sql": sql})
+    return llamadas
+
+
+def _describir(sql, metodo):
+    if sql is None:
+        return metodo if metodo in ("beginTransaction", "commit") else "SQL dinámico"
+    tablas = list(dict.fromkeys(_TABLA_SQL.findall(sql)))
+    return f"{_OPERACION_SQL.match(sql).group(1).upper()} {', '.join(tablas[:3])}".strip()
+
+
+def _origen(codigo, coleccion, inicio_funcion, posicion, llamadas):
+    """De dónde sale la colección del bucle: una consulta anterior, la petición u otra cosa"""
+    if not coleccion:
+        return None
+    nombre = re.escape(coleccion.split(".")[0].split("[")[0])
+    if re.match(r"req\b", coleccion):
+        return "petición"
+    tramo = codigo[inicio_funcion:posicion]
+    asignacion = None
+    for asignacion in re.finditer(r"(?:const|let|var)\s*(?:\[\s*" + nombre + r"\b[^\]]*\]|" + nombre + r")\s*=\s*", tramo):
+        pass
+    if asignacion is None:
+        if re.search(r"\{[^}]*\b" + nombre + r"\b[^}]*\}\s*=\s*req\.(?:body|query|params)", tramo):
+            return "petición"
+        return None
+    desde = inicio_funcion + asignacion.end()
+    llamada = next((l for l in llamadas if desde <= l["posicion"] < desde + 200 and l["metodo"] in ("execute", "query")), None)
+    if llamada is not None:
+        return _describir(llamada["sql"], llamada["metodo"])
+    if re.match(r"\s*req\.(?:body|query|params)", codigo[desde:]):
+        return "petición"
+    return None
+
+
+def detectar_consultas_en_bucle(codigo):
+    """Funciones con llamadas a la base de datos dentro de bucles.
+
+    Devuelve [{"funcion", "linea", "viajes_fijos", "bucles": [{"linea", "tipo",
+    "coleccion", "origen", "iteraciones", "profundidad", "secuencial",
+    "consultas": [{"linea", "descripcion"}]}], "viajes": {N: viajes}}].
+    """
+    enmascarado = enmascarar_js(codigo)
+    funciones = funciones_js(codigo)
+    limites = [inicio for inicio, _ in funciones[1:]] + [len(codigo)]
+    llamadas = _llamadas(codigo, enmascarado, sentencias_js(codigo))
+    bucles = _bucles(enmascarado)
+
+    resultado = []
+    for (inicio, nombre), fin in zip(funciones, limites):
+        propias = [l for l in llamadas if inicio <= l["posicion"] < fin]
+        if not propias:
+            continue
+        fijos = 0
+        por_bucle = {}
+        for llamada in propias:
+            contenedores = [b for b in bucles if b["inicio"] < llamada["posicion"] < b["fin"] and b["inicio"] >= inicio]
+            if not contenedores:
+                fijos += 1
+                continue
+            interior = max(contenedores, key=lambda b: b["inicio"])
+            entrada = por_bucle.setdefault(interior["inicio"], {"bucle": interior, "profundidad": 0, "consultas": []})
+            # Los bucles de recuento fijo no crecen con las filas
+            entrada["profundidad"] = sum(1 for b in contenedores if b["iteraciones"] is None)
+            entrada["fijas"] = 1
+            for b in contenedores:
+                entrada["fijas"] *= b["iteraciones"] or 1
+            anterior = enmascarado[max(inicio, llamada["posicion"] - 60):llamada["posicion"]]
+            entrada["consultas"].append({
+                "linea": codigo.count("\n", 0, llamada["posicion"]) + 1,
+                "descripcion": _describir(llamada["sql"], llamada["metodo"]),
+                "secuencial": "await" in anterior,
+            })
+        if not por_bucle:
+            continue
+
+        detalle = []
+        for entrada in sorted(por_bucle.values(), key=lambda e: e["bucle"]["inicio"]):
+            bucle = entrada["bucle"]
+            detalle.append({
+                "linea": codigo.count("\n", 0, bucle["inicio"]) + 1,
+                "tipo": bucle["tipo"],
+                "coleccion": bucle["coleccion"],
+                "origen": _origen(codigo, bucle["coleccion"], inicio, bucle["inicio"], propias),
+                "iteraciones": bucle["iteraciones"],
+                "profundidad": entrada["profundidad"],
+                "multiplicador": entrada["fijas"],
+                # Con await dentro de un for/while cada viaje espera al anterior
+                "secuencial": bucle["tipo"] in ("for", "for...of", "while", "do...while")
+                and any(c["secuencial"] for c in entrada["consultas"]),
+                "consultas": [{"linea": c["linea"], "descripcion": c["descripcion"]} for c in entrada["consultas"]],
+            })
+        resultado.append({
+            "funcion": nombre,
+            "linea": codigo.count("\n", 0, inicio) + 1,
+            "viajes_fijos": fijos,
+            "bucles": detalle,
+            "viajes": {n: viajes_estimados(fijos, detalle, n) for n in FILAS_ESTIMACION},
+        })
+    return resultado
+
+
+def viajes_estimados(fijos, bucles, filas):
+    """Viajes a la base de datos de una función cuando cada bucle recorre `filas` elementos"""
+    return fijos + sum(len(b["consultas"]) * b["multiplicador"] * filas ** b["profundidad"] for b in bucles)
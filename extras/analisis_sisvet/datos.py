@@ -0,0 +1,277 @@
+"""
+CARGA DE DATOS DEL ANÁLISIS
+Lee los datos del análisis (proyecto, competencia y series de las gráficas) desde
+archivos JSON o TOML de un directorio, los valida contra un esquema y guarda una
+instantánea compilada (marshal) para que las siguientes ejecuciones no tengan que
+volver a interpretar ni validar los archivos.
+
+Cada archivo del directorio es una tabla cuyas claves de primer nivel se combinan
+en un único diccionario de datos. Así cada mercado puede tener su propio directorio.
+"""
+
+import hashlib
+import json
+import marshal
+import os
+
+# Incrementar al cambiar ESQUEMA para invalidar las instantáneas existentes
+VERSION_ESQUEMA = 4
+
+EXTENSIONES = (".json", ".toml")
+
+NUMERO = (int, float)
+
+_SERIE = {"nombre": str, "valores": [NUMERO], "color": str, "fondo": str}
+
+ESQUEMA = {
+    "proyecto_sisvet": {
+        "nombre": str,
+        "version": str,
+        "estado": str,
+        "lineas_codigo": int,
+        "stack_tech": {
+            "frontend": [str],
+            "backend": [str],
+            "auth": [str],
+            "email": [str],
+            "otros": [str],
+        },
+        "modulos_implementados": [str],
+        "db_tablas": int,
+        "fortalezas": [str],
+        "debilidades": [str],
+    },
+    "competidores": [{
+        "nombre": str,
+        "pais": str,
+        "precio_min": NUMERO,
+        "precio_max": NUMERO,
+        "moneda": str,
+        "precio_usd_min": NUMERO,
+        "precio_usd_max": NUMERO,
+        "trial": str,
+        "puntuacion": NUMERO,
+        "market_share": NUMERO,
+        "funcionalidades": [str],
+    }],
+    "matriz_funcional": {
+        "escala": NUMERO,
+        "funcionalidades": [{"nombre": str, "corto": str}],
+        "productos": [{"nombre": str, "corto": str, "puntuaciones": [NUMERO]}],
+        "perfiles": [{"nombre": str, "descripcion": str, "peso_defecto": NUMERO, "pesos": dict}],
+    },
+    "graficas": {
+        "proyeccion_ingresos": {"etiquetas": [str], "escenarios": [_SERIE]},
+    },
+}
+
+# Tablas que un mercado puede omitir; si aparecen, se validan igual que ESQUEMA
+ESQUEMA_OPCIONAL = {
+    "proyeccion": {
+        "meses": int,
+        "trayectorias": int,
+        "semilla": int,
+        "costos_fijos_mxn": NUMERO,
+        "concentracion_planes": NUMERO,
+        "planes": [{"nombre": str, "precio_mxn": NUMERO, "proporcion": NUMERO}],
+        "altas": {"inicio": NUMERO, "crecimiento_mensual": NUMERO, "maximo": NUMERO, "incertidumbre": NUMERO},
+        "churn": {"media": NUMERO, "desviacion": NUMERO},
+    },
+}
+
+
+class ErrorDatos(ValueError):
+    """Los archivos de datos no existen, no se pueden leer o no cumplen el esquema"""
+
+
+def _nombre_tipo(esperado):
+    if esperado is NUMERO:
+        return "número"
+    return {str: "texto", int: "entero", dict: "tabla", list: "lista"}.get(esperado, str(esperado))
+
+
+def validar(valor, esquema, ruta):
+    """Comprueba recursivamente que `valor` cumpla `esquema`; las claves adicionales se permiten"""
+    if isinstance(esquema, dict):
+        if not isinstance(valor, dict):
+            raise ErrorDatos(f"{ruta}: se esperaba {_nombre_tipo(dict)}")
+        for clave, subesquema in esquema.items():
+            if clave not in valor:
+                raise ErrorDatos(f"{ruta}.{clave}: campo obligatorio ausente")
+            validar(valor[clave], subesquema, f"{ruta}.{clave}")
+    elif isinstance(esquema, list):
+        if not isinstance(valor, list):
+            raise ErrorDatos(f"{ruta}: se esperaba {_nombre_tipo(list)}")
+        for i, elemento in enumerate(valor):
+            validar(elemento, esquema[0], f"{ruta}[{i}]")
+    # bool es subclase de int, pero True no es un precio ni una puntuación válida
+    elif isinstance(valor, bool) or not isinstance(valor, esquema):
+        raise ErrorDatos(f"{ruta}: se esperaba {_nombre_tipo(esquema)}, se encontró {type(valor).__name__}")
+
+
+def validar_datos(datos):
+    """Valida los datos combinados contra ESQUEMA, ESQUEMA_OPCIONAL y las reglas entre campos"""
+    for clave, esquema in ESQUEMA.items():
+        if clave not in datos:
+            raise ErrorDatos(f"{clave}: ningún archivo de datos define esta clave")
+        validar(datos[clave], esquema, clave)
+    for clave, esquema in ESQUEMA_OPCIONAL.items():
+        if clave in datos:
+            validar(datos[clave], esquema, clave)
+
+    graficas = datos["graficas"]
+    puntos = graficas.get("puntos_maximos")
+    if puntos is not None and (isinstance(puntos, bool) or not isinstance(puntos, int) or puntos < 3):
+        raise ErrorDatos("graficas.puntos_maximos: se esperaba un entero de al menos 3")
+    etiquetas = graficas["proyeccion_ingresos"]["etiquetas"]
+    for i, serie in enumerate(graficas["proyeccion_ingresos"]["escenarios"]):
+        if len(serie["valores"]) != len(etiquetas):
+            raise ErrorDatos(
+                f"graficas.proyeccion_ingresos.escenarios[{i}].valores: {len(serie['valores'])} valores "
+                f"para {len(etiquetas)} etiquetas"
+            )
+    validar_matriz(datos["matriz_funcional"])
+
+    proyeccion = datos.get("proyeccion")
+    if proyeccion is not None:
+        if proyeccion["meses"] < 1 or proyeccion["trayectorias"] < 1:
+            raise ErrorDatos("proyeccion: meses y trayectorias deben ser al menos 1")
+        if not proyeccion["planes"] or any(plan["proporcion"] <= 0 for plan in proyeccion["planes"]):
+            raise ErrorDatos("proyeccion.planes: se espera al menos un plan y proporciones positivas")
+        if not 0 < proyeccion["churn"]["media"] < 1:
+            raise ErrorDatos("proyeccion.churn.media: se esperaba una fracción entre 0 y 1")
+
+
+def validar_matriz(matriz):
+    """Reglas de la matriz funcional: una puntuación por funcionalidad dentro de la escala y pesos conocidos"""
+    nombres = [funcionalidad["nombre"] for funcionalidad in matriz["funcionalidades"]]
+    if not nombres or not matriz["productos"]:
+        raise ErrorDatos("matriz_funcional: se espera al menos una funcionalidad y un producto")
+    if len(set(nombres)) != len(nombres):
+        raise ErrorDatos("matriz_funcional.funcionalidades: hay nombres repetidos")
+    escala = matriz["escala"]
+    for i, producto in enumerate(matriz["productos"]):
+        puntuaciones = producto["puntuaciones"]
+        if len(puntuaciones) != len(nombres):
+            raise ErrorDatos(f"matriz_funcional.productos[{i}].puntuaciones: {len(puntuaciones)} puntuaciones "
+                             f"para {len(nombres)} funcionalidades")
+        if any(not 0 <= puntuacion <= escala for puntuacion in puntuaciones):
+            raise ErrorDatos(f"matriz_funcional.productos[{i}].puntuaciones: fuera de la escala 0-{escala:g}")
+        for campo in ("color", "fondo"):
+            if campo in producto and not isinstance(producto[campo], str):
+                raise ErrorDatos(f"matriz_funcional.productos[{i}].{campo}: se esperaba texto")
+    conocidas = set(nombres)
+    for i, perfil in enumerate(matriz["perfiles"]):
+        for nombre, peso in perfil["pesos"].items():
+            if nombre not in conocidas:
+                raise ErrorDatos(f"matriz_funcional.perfiles[{i}].pesos: funcionalidad desconocida '{nombre}'")
+            if isinstance(peso, bool) or not isinstance(peso, NUMERO) or peso < 0:
+                raise ErrorDatos(f"matriz_funcional.perfiles[{i}].pesos.{nombre}: se esperaba un número no negativo")
+        if perfil["peso_defecto"] < 0:
+            raise ErrorDatos(f"matriz_funcional.perfiles[{i}].peso_defecto: se esperaba un número no negativo")
+
+
+def leer_archivo(ruta):
+    """Interpreta un archivo JSON o TOML y devuelve su tabla de primer nivel"""
+    try:
+        if ruta.endswith(".toml"):
+            import tomllib
+            with open(ruta, "rb") as archivo:
+                contenido = tomllib.load(archivo)
+        else:
+            with open(ruta, encoding="utf-8") as archivo:
+                contenido = json.load(archivo)
+    except (OSError, ValueError) as error:
+        raise ErrorDatos(f"{ruta}: {error}") from error
+    if not isinstance(contenido, dict):
+        raise ErrorDatos(f"{ruta}: el archivo debe contener una tabla en el primer nivel")
+    return contenido
+
+
+def _archivos_datos(directorio):
+    try:
+        nombres = sorted(n for n in os.listdir(directorio) if n.endswith(EXTENSIONES))
+    except OSError as error:
+        raise ErrorDatos(f"{directorio}: {error}") from error
+    if not nombres:
+        raise ErrorDatos(f"{directorio}: no contiene archivos .json ni .toml")
+    return [os.path.join(directorio, n) for n in nombres]
+
+
+def _huella_archivo(ruta):
+    with open(ruta, "rb") as archivo:
+        return hashlib.sha256(archivo.read()).hexdigest()
+
+
+def _ruta_instantanea(directorio, directorio_cache):
+    identificador = hashlib.sha256(os.path.abspath(directorio).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directorio_cache, f"datos-{identificador}.marshal")
+
+
+def _leer_instantanea(ruta_instantanea, archivos):
+    """Devuelve los datos de la instantánea si sigue vigente, o None.
+
+    Primero se compara mtime y tamaño de cada archivo; solo si cambiaron se calcula
+    su huella, de modo que tocar un archivo sin modificarlo no obliga a revalidar.
+    """
+    try:
+        with open(ruta_instantanea, "rb") as archivo:
+            instantanea = marshal.loads(archivo.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if instantanea.get("version") != VERSION_ESQUEMA or sorted(instantanea["archivos"]) != archivos:
+        return None
+
+    for ruta in archivos:
+        mtime, tamano, huella = instantanea["archivos"][ruta]
+        estado = os.stat(ruta)
+        if (estado.st_mtime_ns, estado.st_size) == (mtime, tamano):
+            continue
+        if _huella_archivo(ruta) != huella:
+            return None
+    return instantanea["datos"]
+
+
+def _escribir_instantanea(ruta_instantanea, archivos, datos):
+    registro = {}
+    for ruta in archivos:
+        estado = os.stat(ruta)
+        registro[ruta] = (estado.st_mtime_ns, estado.st_size, _huella_archivo(ruta))
+    instantanea = {"version": VERSION_ESQUEMA, "archivos": registro, "datos": datos}
+    os.makedirs(os.path.dirname(ruta_instantanea), exist_ok=True)
+    try:
+        contenido = marshal.dumps(instantanea)
+    except ValueError:
+        # Tipos que marshal no admite (p. ej. fechas TOML): se trabaja sin instantánea
+        return
+    temporal = f"{ruta_instantanea}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(contenido)
+    os.replace(temporal, ruta_instantanea)
+
+
+def cargar_datos(directorio, directorio_cache=None):
+    """Carga y valida los datos de `directorio`.
+
+    Con `directorio_cache` se reutiliza la instantánea compilada mientras los
+    archivos no cambien. Devuelve (datos, desde_instantanea).
+    """
+    archivos = _archivos_datos(directorio)
+    ruta_instantanea = None
+    if directorio_cache is not None:
+        ruta_instantanea = _ruta_instantanea(directorio, directorio_cache)
+        datos = _leer_instantanea(ruta_instantanea, archivos)
+        if datos is not None:
+            return datos, True
+
+    datos = {}
+    for ruta in archivos:
+        for clave, valor in leer_archivo(ruta).items():
+            if clave in datos:
+                raise ErrorDatos(f"{ruta}: la clave '{clave}' ya está definida en otro archivo")
+            datos[clave] = valor
+    validar_datos(datos)
+
+    if ruta_instantanea is not None:
+        _escribir_instantanea(ruta_instantanea, archivos, datos)
+    return datos, False
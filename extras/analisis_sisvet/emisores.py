@@ -0,0 +1,207 @@
+"""
+EMISORES DE FORMATOS
+Escriben la representación intermedia (representacion.py) en cada formato de
+salida. emitir() recorre las secciones de la RI una sola vez y entrega cada una a
+todos los emisores pedidos, que escriben a la vez en sus propios archivos: generar
+los cuatro formatos cuesta una preparación de datos y una pasada, no cuatro
+ejecuciones del script.
+
+    html   documento completo (SECCIONES), con la caché de secciones
+    json   la RI sin los datos preparados, para tableros
+    md     resumen ejecutivo en Markdown
+    csv    un archivo por tabla: <base>_<id de la tabla>.csv
+
+Un emisor es una clase de Emisor con abrir(ri), seccion(seccion) y cerrar(); para
+añadir un formato basta con registrar su clase en EMISORES.
+"""
+
+import csv
+import json
+import os
+import time
+
+from .representacion import formatear
+from .secciones import SECCIONES, TAM_BLOQUE_ESCRITURA, iterar_seccion, volcar
+
+
+class ErrorEmision(ValueError):
+    """Formato de salida desconocido"""
+
+
+class Emisor:
+    """Emisor de un formato: escribe a partir de `base` (ruta sin extensión) y deja sus archivos en `rutas`"""
+
+    def __init__(self, base, cache=None):
+        self.base = base
+        self.cache = cache
+        self.rutas = []
+        self._archivo = None
+
+    def abrir(self, ri):
+        """Empieza la salida con los datos generales de la RI"""
+
+    def seccion(self, seccion):
+        """Escribe una sección de la RI, en el orden del documento"""
+
+    def cerrar(self):
+        """Termina la salida y cierra sus archivos"""
+
+    def descartar(self):
+        """Cierra y borra lo escrito cuando la emisión falló a medias"""
+        if self._archivo is not None:
+            self._archivo.close()
+        for ruta in self.rutas:
+            if os.path.exists(ruta):
+                os.unlink(ruta)
+
+
+class EmisorHTML(Emisor):
+    """Documento HTML con todas las secciones de SECCIONES, generadas de los datos de la RI"""
+
+    def abrir(self, ri):
+        self.rutas = [f"{self.base}.html"]
+        self.caracteres = 0
+        self._datos = ri["datos"]
+        self._pendientes = list(SECCIONES)
+        self._archivo = open(self.rutas[0], "w", encoding="utf-8")
+
+    def _escribir_hasta(self, id_seccion):
+        # Las secciones que solo existen en el HTML se escriben en su sitio, antes de la pedida
+        while self._pendientes:
+            entrada = self._pendientes.pop(0)
+            fragmentos = iterar_seccion(entrada, self._datos, self.cache, TAM_BLOQUE_ESCRITURA)
+            self.caracteres += volcar((self._archivo,), fragmentos, TAM_BLOQUE_ESCRITURA)
+            if entrada[0] == id_seccion:
+                return
+
+    def seccion(self, seccion):
+        self._escribir_hasta(seccion["id"])
+
+    def cerrar(self):
+        self._escribir_hasta(None)
+        self._archivo.close()
+
+
+class EmisorJSON(Emisor):
+    """La RI en JSON sin los datos preparados, escrita sección a sección"""
+
+    def abrir(self, ri):
+        self.rutas = [f"{self.base}.json"]
+        self._archivo = open(self.rutas[0], "w", encoding="utf-8")
+        cabecera = {clave: ri[clave] for clave in ("version", "titulo", "generado")}
+        self._archivo.write(json.dumps(cabecera, ensure_ascii=False)[:-1] + ', "secciones": [')
+        self._primera = True
+
+    def seccion(self, seccion):
+        if not self._primera:
+            self._archivo.write(", ")
+        self._primera = False
+        json.dump(seccion, self._archivo, ensure_ascii=False)
+
+    def cerrar(self):
+        self._archivo.write("]}\n")
+        self._archivo.close()
+
+
+def _celda_markdown(valor, formato):
+    return formatear(valor, formato).replace("|", "\\|").replace("\n", " ")
+
+
+class EmisorMarkdown(Emisor):
+    """Resumen ejecutivo en Markdown con las métricas, tablas y listas de la RI"""
+
+    def abrir(self, ri):
+        self.rutas = [f"{self.base}.md"]
+        self._archivo = open(self.rutas[0], "w", encoding="utf-8")
+        self._archivo.write(f"# 📊 {ri['titulo']}\n\n**Generado:** {ri['generado'].replace('T', ' ')}\n\n---\n")
+
+    def seccion(self, seccion):
+        partes = [f"\n## {seccion['titulo']}\n"]
+        for bloque in seccion["bloques"]:
+            if bloque["tipo"] == "texto":
+                partes.append(f"\n{bloque['texto']}\n")
+            elif bloque["tipo"] == "metricas":
+                partes.append(f"\n### {bloque['titulo']}\n\n")
+                partes += [f"- **{valor['etiqueta']}:** {formatear(valor['valor'], valor['formato'])}\n"
+                           for valor in bloque["valores"]]
+            elif bloque["tipo"] == "lista":
+                partes.append(f"\n### {bloque['titulo']}\n\n")
+                partes += [f"- {elemento}\n" for elemento in bloque["elementos"]]
+            elif bloque["tipo"] == "tabla":
+                columnas = bloque["columnas"]
+                partes.append(f"\n### {bloque['titulo']}\n\n")
+                partes.append("| " + " | ".join(columna["titulo"] for columna in columnas) + " |\n")
+                # Las columnas numéricas se alinean a la derecha
+                partes.append("|" + "|".join("---" if columna["formato"] == "texto" else "---:" for columna in columnas) + "|\n")
+                partes += ["| " + " | ".join(_celda_markdown(valor, columna["formato"])
+                                             for valor, columna in zip(fila, columnas)) + " |\n"
+                           for fila in bloque["filas"]]
+        self._archivo.write("".join(partes))
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class EmisorCSV(Emisor):
+    """Un CSV por cada tabla de la RI, con los valores sin formatear"""
+
+    def seccion(self, seccion):
+        for bloque in seccion["bloques"]:
+            if bloque["tipo"] != "tabla":
+                continue
+            ruta = f"{self.base}_{bloque['id']}.csv"
+            with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+                escritor = csv.writer(archivo)
+                escritor.writerow(columna["titulo"] for columna in bloque["columnas"])
+                escritor.writerows(bloque["filas"])
+            self.rutas.append(ruta)
+
+
+# Formato: clase del emisor (en el orden en que se muestran)
+EMISORES = {
+    "html": EmisorHTML,
+    "json": EmisorJSON,
+    "md": EmisorMarkdown,
+    "csv": EmisorCSV,
+}
+
+
+def emitir(ri, base, formatos=("html",), cache=None):
+    """Escribe la RI en cada formato de `formatos` con una sola pasada por sus secciones.
+
+    `base` es la ruta de salida sin extensión y `cache` la CacheSecciones del
+    emisor HTML. Devuelve {formato: {"rutas", "bytes", "segundos"}}, con el tiempo
+    que pasó cada emisor escribiendo.
+    """
+    desconocidos = [formato for formato in formatos if formato not in EMISORES]
+    if desconocidos:
+        raise ErrorEmision(f"formato desconocido: {', '.join(desconocidos)} (disponibles: {', '.join(EMISORES)})")
+    emisores = {formato: EMISORES[formato](base, cache) for formato in dict.fromkeys(formatos)}
+    segundos = dict.fromkeys(emisores, 0.0)
+
+    def llamar(formato, metodo, *argumentos):
+        inicio = time.perf_counter()
+        getattr(emisores[formato], metodo)(*argumentos)
+        segundos[formato] += time.perf_counter() - inicio
+
+    try:
+        for formato in emisores:
+            llamar(formato, "abrir", ri)
+        for seccion in ri["secciones"]:
+            for formato in emisores:
+                llamar(formato, "seccion", seccion)
+        for formato in emisores:
+            llamar(formato, "cerrar")
+    except BaseException:
+        # Sin salidas a medias que parezcan completas
+        for emisor in emisores.values():
+            emisor.descartar()
+        raise
+    return {
+        formato: {
+            "rutas": emisor.rutas,
+            "bytes": sum(os.path.getsize(ruta) for ruta in emisor.rutas),
+            "segundos": segundos[formato],
+        }
+        for formato, emisor in emisores.items()
+    }
@@ -0,0 +1,192 @@
+"""
+ESCÁNER DEL REPOSITORIO
+Recorre el código del proyecto (frontend/src, backend y los volcados de bd/) y calcula
+las cifras que el análisis antes escribía a mano: líneas por lenguaje y por módulo
+y número de tablas definidas con CREATE TABLE.
+
+En los archivos del backend con SQL se buscan además las consultas que se hacen
+dentro de bucles (consultas_bucle), los puntos calientes N+1.
+
+Los archivos se analizan en paralelo con un pool de procesos y el resultado de cada
+uno se guarda por mtime y tamaño, de modo que en ejecuciones posteriores solo se
+vuelven a leer los archivos que cambiaron.
+"""
+
+import hashlib
+import marshal
+import os
+import re
+
+from .consultas_bucle import FILAS_ESTIMACION, detectar_consultas_en_bucle
+from .sql_backend import ARCHIVOS_SQL
+
+# Incrementar al cambiar lo que calcula analizar_archivo() para descartar la caché
+VERSION_ESCANER = 2
+
+# Directorios analizados, relativos a la raíz del repositorio
+RAICES = ("frontend/src", "backend", "bd")
+
+# Directorios que nunca se recorren, estén donde estén
+EXCLUIDOS = {"node_modules", ".git", "dist", "build", "coverage", "__pycache__", ".cache_analisis"}
+
+LENGUAJES = {
+    ".js": "JavaScript",
+    ".jsx": "JSX",
+    ".ts": "TypeScript",
+    ".tsx": "TSX",
+    ".css": "CSS",
+    ".html": "HTML",
+    ".sql": "SQL",
+}
+
+# Áreas cuyas líneas cuentan como código de la aplicación (bd/ son volcados de datos)
+AREAS_CODIGO = ("frontend", "backend")
+
+# Por debajo de este número de archivos pendientes no compensa arrancar procesos
+MIN_ARCHIVOS_PARALELO = 200
+
+_BACKEND_SQL = re.compile(
+    r"[\\/]backend[\\/](?:" + "|".join(patron.split("/")[0] for patron in ARCHIVOS_SQL) + r")[\\/][^\\/]+\.js$"
+)
+_CREATE_TABLE = re.compile(rb"^\s*CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?(\w+)`?", re.IGNORECASE | re.MULTILINE)
+
+
+def analizar_archivo(ruta):
+    """Cuenta líneas totales y no vacías de un archivo, las tablas que crea (si es SQL) y sus consultas en bucle"""
+    with open(ruta, "rb") as archivo:
+        contenido = archivo.read()
+    lineas = contenido.count(b"\n") + (1 if contenido and not contenido.endswith(b"\n") else 0)
+    vacias = sum(1 for linea in contenido.splitlines() if not linea.strip())
+    tablas = []
+    if ruta.endswith(".sql"):
+        tablas = [nombre.decode("utf-8", "replace") for nombre in _CREATE_TABLE.findall(contenido)]
+    bucles = []
+    if _BACKEND_SQL.search(ruta):
+        bucles = detectar_consultas_en_bucle(contenido.decode("utf-8", "replace"))
+    return lineas, lineas - vacias, tablas, bucles
+
+
+def clasificar_modulo(relativa):
+    """Módulo al que pertenece un archivo, p. ej. 'backend/controllers' o 'frontend/pages'"""
+    partes = relativa.split("/")
+    if partes[0] == "frontend":
+        # frontend/src/<módulo>/...
+        return f"frontend/{partes[2]}" if len(partes) > 3 else "frontend/src"
+    if partes[0] == "backend":
+        return f"backend/{partes[1]}" if len(partes) > 2 else "backend"
+    return partes[0]
+
+
+def _recorrer(raiz):
+    """Entrega (ruta relativa, DirEntry) de los archivos de lenguajes conocidos bajo RAICES"""
+    pendientes = [os.path.join(raiz, r) for r in RAICES if os.path.isdir(os.path.join(raiz, r))]
+    while pendientes:
+        directorio = pendientes.pop()
+        with os.scandir(directorio) as entradas:
+            for entrada in entradas:
+                if entrada.is_dir(follow_symlinks=False):
+                    if entrada.name not in EXCLUIDOS:
+                        pendientes.append(entrada.path)
+                elif os.path.splitext(entrada.name)[1] in LENGUAJES:
+                    yield os.path.relpath(entrada.path, raiz).replace(os.sep, "/"), entrada
+
+
+def _ruta_cache(raiz, directorio_cache):
+    identificador = hashlib.sha256(os.path.abspath(raiz).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directorio_cache, f"escaner-{identificador}.marshal")
+
+
+def _leer_cache(ruta):
+    try:
+        with open(ruta, "rb") as archivo:
+            cache = marshal.loads(archivo.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return {}
+    if cache.get("version") != VERSION_ESCANER:
+        return {}
+    return cache["archivos"]
+
+
+def _escribir_cache(ruta, archivos):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(marshal.dumps({"version": VERSION_ESCANER, "archivos": archivos}))
+    os.replace(temporal, ruta)
+
+
+def escanear_repositorio(raiz, directorio_cache=None, procesos=None):
+    """Escanea el repositorio en `raiz`.
+
+    Con `directorio_cache` solo se analizan los archivos cuyo mtime o tamaño cambió
+    desde el último escaneo. Devuelve (escaneo, archivos_reescaneados).
+    """
+    anteriores = _leer_cache(_ruta_cache(raiz, directorio_cache)) if directorio_cache else {}
+    archivos = {}
+    pendientes = []
+    for relativa, entrada in _recorrer(raiz):
+        estado = entrada.stat()
+        firma = (estado.st_mtime_ns, estado.st_size)
+        anterior = anteriores.get(relativa)
+        if anterior is not None and tuple(anterior[:2]) == firma:
+            archivos[relativa] = anterior
+        else:
+            archivos[relativa] = firma
+            pendientes.append(relativa)
+
+    rutas = [os.path.join(raiz, relativa) for relativa in pendientes]
+    if len(rutas) >= MIN_ARCHIVOS_PARALELO:
+        # El pool solo se importa si hay archivos que reescanear en paralelo
+        from concurrent.futures import ProcessPoolExecutor
+
+        procesos = procesos or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(analizar_archivo, rutas, chunksize=max(1, len(rutas) // (procesos * 4))))
+    else:
+        resultados = [analizar_archivo(ruta) for ruta in rutas]
+    for relativa, resultado in zip(pendientes, resultados):
+        archivos[relativa] = archivos[relativa] + resultado
+
+    if directorio_cache:
+        _escribir_cache(_ruta_cache(raiz, directorio_cache), archivos)
+
+    return _agregar(archivos), len(pendientes)
+
+
+def aplicar_escaneo(datos, escaneo):
+    """Devuelve los datos del análisis con las cifras medidas en lugar de las escritas a mano"""
+    proyecto_sisvet = dict(datos["proyecto_sisvet"], lineas_codigo=escaneo["lineas_codigo"], db_tablas=escaneo["db_tablas"])
+    return dict(datos, proyecto_sisvet=proyecto_sisvet, escaneo=escaneo)
+
+
+def _agregar(archivos):
+    lenguajes = {}
+    modulos = {}
+    tablas = set()
+    lineas_codigo = 0
+    consultas_en_bucle = []
+    for relativa, (_, _, lineas, no_vacias, tablas_archivo, bucles) in sorted(archivos.items()):
+        lenguaje = LENGUAJES[os.path.splitext(relativa)[1]]
+        totales = lenguajes.setdefault(lenguaje, {"archivos": 0, "lineas": 0, "lineas_codigo": 0})
+        totales["archivos"] += 1
+        totales["lineas"] += lineas
+        totales["lineas_codigo"] += no_vacias
+
+        modulo = modulos.setdefault(clasificar_modulo(relativa), {"archivos": 0, "lineas_codigo": 0})
+        modulo["archivos"] += 1
+        modulo["lineas_codigo"] += no_vacias
+
+        if relativa.split("/")[0] in AREAS_CODIGO:
+            lineas_codigo += no_vacias
+        tablas.update(tablas_archivo)
+        consultas_en_bucle.extend(dict(funcion, archivo=relativa) for funcion in bucles)
+
+    return {
+        "archivos": len(archivos),
+        "lineas_codigo": lineas_codigo,
+        "db_tablas": len(tablas),
+        "tablas": sorted(tablas),
+        "lenguajes": lenguajes,
+        "modulos": modulos,
+        "consultas_en_bucle": sorted(consultas_en_bucle, key=lambda f: -f["viajes"][FILAS_ESTIMACION[-1]]),
+    }
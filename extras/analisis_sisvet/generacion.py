@@ -0,0 +1,253 @@
+"""
+GENERACIÓN DEL ANÁLISIS
+API de biblioteca del generador: prepara los datos del análisis (datos del
+mercado, escaneo del repositorio y los análisis opcionales sobre backend/ y bd/)
+y entrega el documento como un iterador de fragmentos HTML, sin escribir
+archivos ni imprimir nada salvo que se pida:
+
+    from analisis_sisvet.generacion import render
+    with open("analisis.html", "w", encoding="utf-8") as archivo:
+        archivo.writelines(render())
+
+Cada paso es una función de PASOS que completa los datos y devuelve el mensaje
+de progreso (o None si no aplica). Los módulos pesados (NumPy, lectores de
+volcados, SQLite, servidores simulados) se importan dentro de cada paso, y los
+pasos con caché devuelven el resultado guardado sin llegar a importarlos cuando
+los archivos de entrada no cambiaron.
+"""
+
+import os
+import time
+
+from .cache_secciones import CacheSecciones
+from .datos import cargar_datos
+from .secciones import TAM_BLOQUE_ESCRITURA, generar_fragmentos, iterar_html
+
+# Directorio extras/ que contiene el paquete
+DIRECTORIO_EXTRAS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def rutas_predeterminadas(directorio_base=DIRECTORIO_EXTRAS):
+    """Rutas de entrada y caché del análisis para un generador ubicado en `directorio_base` (extras/)"""
+    repositorio = os.path.dirname(directorio_base)
+    volcados = os.path.join(repositorio, "bd")
+    return {
+        # Raíz del repositorio cuyo código se mide (frontend/, backend/ y bd/)
+        "repositorio": repositorio,
+        # Backend de Express cuyas conexiones a MySQL se auditan
+        "backend": os.path.join(repositorio, "backend"),
+        # Volcados de la base de datos de los que se calcula la ocupación de la agenda
+        "volcados": volcados,
+        # Volcado de la bitácora de auditoría (audit_logs)
+        "auditoria": os.path.join(volcados, "sisvet_audit_logs.sql"),
+        # Datos del proyecto, la competencia y las gráficas (un directorio por mercado)
+        "datos": os.path.join(directorio_base, "datos"),
+        # Fragmentos de secciones e instantáneas de datos reutilizados entre ejecuciones
+        "cache": os.path.join(directorio_base, ".cache_analisis"),
+    }
+
+
+def _ms(inicio):
+    return (time.perf_counter() - inicio) * 1000
+
+
+def _paso_datos(datos, rutas):
+    """Datos del análisis desde su instantánea compilada o interpretando los archivos (ErrorDatos si no son válidos)"""
+    inicio = time.perf_counter()
+    cargados, desde_instantanea = cargar_datos(rutas["datos"], rutas["cache"])
+    datos.update(cargados)
+    return (f"📂 Datos cargados en {_ms(inicio):.1f} ms "
+            f"({'instantánea compilada' if desde_instantanea else 'archivos interpretados y validados'})")
+
+
+def _paso_escaneo(datos, rutas):
+    """Cifras reales del repositorio en lugar de las escritas a mano en los datos"""
+    from .escaner import aplicar_escaneo, escanear_repositorio
+
+    inicio = time.perf_counter()
+    escaneo, reescaneados = escanear_repositorio(rutas["repositorio"], rutas["cache"])
+    datos.update(aplicar_escaneo(datos, escaneo))
+    return (f"🔎 Repositorio escaneado en {_ms(inicio):.1f} ms: {escaneo['archivos']} archivos "
+            f"({reescaneados} reescaneados), {escaneo['lineas_codigo']:,} líneas de código, "
+            f"{escaneo['db_tablas']} tablas")
+
+
+def _paso_clasificacion(datos, rutas):
+    """Clasificación ponderada de la matriz funcional con cada perfil de pesos"""
+    from .matriz_funcional import ErrorMatriz, clasificar_en_cache
+
+    inicio = time.perf_counter()
+    try:
+        clasificacion, desde_cache = clasificar_en_cache(datos["matriz_funcional"], rutas["cache"])
+    except (ErrorMatriz, ImportError) as error:
+        return f"⚠️  Sin clasificación ponderada de la competencia: {error}"
+    datos["clasificacion_funcional"] = clasificacion
+    matriz = datos["matriz_funcional"]
+    return (f"🏆 Matriz funcional clasificada en {_ms(inicio):.1f} ms: {len(matriz['productos'])} productos × "
+            f"{len(matriz['funcionalidades'])} funcionalidades × {len(clasificacion['perfiles'])} perfiles"
+            f"{' (caché)' if desde_cache else ''}")
+
+
+def _paso_proyeccion(datos, rutas):
+    """Proyección de ingresos Monte Carlo en lugar de los escenarios fijos de las gráficas"""
+    if "proyeccion" not in datos:
+        return None
+    from .proyeccion import ErrorProyeccion, simular_en_cache
+
+    inicio = time.perf_counter()
+    try:
+        simulada, desde_cache = simular_en_cache(datos["proyeccion"], rutas["cache"])
+    except (ErrorProyeccion, ImportError) as error:
+        return f"⚠️  Sin proyección Monte Carlo: {error}"
+    datos["proyeccion_simulada"] = simulada
+    origen = "caché" if desde_cache else f"simuladas en {simulada['segundos']:.2f} s"
+    return (f"🎲 Proyección de ingresos en {_ms(inicio):.1f} ms: {simulada['trayectorias']:,} trayectorias × "
+            f"{simulada['meses']} meses, MRR P50 final ${simulada['mrr']['p50'][-1]:,} MXN ({origen})")
+
+
+def _paso_conexiones(datos, rutas):
+    """Cierre de las conexiones de conectarDB() y su coste con y sin pool"""
+    if not os.path.isdir(rutas["backend"]):
+        return None
+    from .conexiones import ErrorConexiones, analizar_conexiones
+
+    inicio = time.perf_counter()
+    try:
+        conexiones, desde_cache = analizar_conexiones(rutas["backend"], rutas["cache"])
+    except (ErrorConexiones, OSError) as error:
+        return f"⚠️  Sin análisis de las conexiones a MySQL: {error}"
+    datos["conexiones"] = conexiones
+    abiertas = sum(llamada["cierre"] != "finally" for llamada in conexiones["llamadas"])
+    return (f"🔌 Conexiones a MySQL analizadas en {_ms(inicio):.1f} ms: "
+            f"{len(conexiones['llamadas'])} llamadas a conectarDB(), {abiertas} sin cierre garantizado"
+            f"{' (medidas en caché)' if desde_cache else ''}")
+
+
+def _paso_reproduccion(datos, rutas):
+    """Latencia de las sentencias del backend reproducidas sobre los volcados"""
+    if not (os.path.isdir(rutas["backend"]) and os.path.isdir(rutas["volcados"])):
+        return None
+    from .volcado_sql import ErrorVolcado
+
+    inicio = time.perf_counter()
+    try:
+        # reproduccion importa sqlite3, que falta en los Python compilados sin SQLite
+        from .reproduccion import ErrorReproduccion, reproducir_en_cache
+    except ImportError as error:
+        return f"⚠️  Sin latencia de las consultas: {error}"
+    try:
+        reproduccion, desde_cache = reproducir_en_cache(rutas["backend"], rutas["volcados"], rutas["cache"])
+    except (ErrorReproduccion, ErrorVolcado, ImportError, OSError) as error:
+        return f"⚠️  Sin latencia de las consultas: {error}"
+    datos["reproduccion"] = reproduccion
+    medidas = sum("error" not in sentencia for sentencia in reproduccion["sentencias"])
+    return (f"⏱️  Consultas reproducidas sobre SQLite en {_ms(inicio):.1f} ms: "
+            f"{medidas} de {len(reproduccion['sentencias'])} sentencias, "
+            f"{len(reproduccion['regresiones'])} regresiones{' (caché)' if desde_cache else ''}")
+
+
+def _paso_recordatorios(datos, rutas):
+    """Volumen del job de recordatorios de las 9:00 y capacidad de cada estrategia de envío"""
+    if not os.path.isdir(rutas["volcados"]):
+        return None
+    from .recordatorios import ErrorRecordatorios, analizar_recordatorios
+    from .volcado_sql import ErrorVolcado
+
+    inicio = time.perf_counter()
+    try:
+        recordatorios, desde_cache = analizar_recordatorios(rutas["volcados"], rutas["cache"])
+    except (ErrorRecordatorios, ErrorVolcado, ImportError, OSError) as error:
+        return f"⚠️  Sin capacidad del job de recordatorios: {error}"
+    datos["recordatorios"] = recordatorios
+    actual = recordatorios["estrategias"][0]
+    return (f"📧 Job de recordatorios simulado en {_ms(inicio):.1f} ms: "
+            f"máximo {recordatorios['volumen']['maximo']:,} por día, "
+            f"{actual['capacidad']:,} caben en la ventana con el envío actual"
+            f"{' (medidas en caché)' if desde_cache else ''}")
+
+
+def _paso_ocupacion(datos, rutas):
+    """Ocupación real de la agenda a partir de las citas de los volcados"""
+    if not os.path.isdir(rutas["volcados"]):
+        return None
+    from .ocupacion_citas import calcular_ocupacion
+    from .volcado_sql import ErrorVolcado
+
+    inicio = time.perf_counter()
+    try:
+        ocupacion, desde_cache = calcular_ocupacion(rutas["volcados"], directorio_cache=rutas["cache"])
+    except (ErrorVolcado, ImportError, OSError) as error:
+        return f"⚠️  Sin mapa de ocupación de la agenda: {error}"
+    if not ocupacion:
+        return None
+    datos["ocupacion_citas"] = ocupacion
+    return (f"🗓️  Ocupación de la agenda calculada en {_ms(inicio):.1f} ms: "
+            f"{len(ocupacion['doctores'])} agendas del {ocupacion['desde']} al {ocupacion['hasta']}"
+            f"{' (caché)' if desde_cache else ''}")
+
+
+def _paso_auditoria(datos, rutas):
+    """Actividad de la bitácora de auditoría, recorrida en streaming"""
+    if not os.path.isfile(rutas["auditoria"]):
+        return None
+    from .auditoria import analizar_auditoria_en_cache
+    from .volcado_sql import ErrorVolcado
+
+    inicio = time.perf_counter()
+    try:
+        auditoria, desde_cache = analizar_auditoria_en_cache(rutas["auditoria"], rutas["cache"])
+    except (ErrorVolcado, ImportError, OSError) as error:
+        return f"⚠️  Sin análisis de la bitácora de auditoría: {error}"
+    datos["auditoria"] = auditoria
+    return (f"🧾 Bitácora de auditoría analizada en {_ms(inicio):.1f} ms: "
+            f"{auditoria['total']:,} escrituras{' (caché)' if desde_cache else ''}")
+
+
+# Orden de preparación: (identificador, paso). Los dos primeros son obligatorios y
+# sus errores se propagan; el resto añade su análisis o avisa de por qué no pudo.
+PASOS = (
+    ("datos", _paso_datos),
+    ("escaneo", _paso_escaneo),
+    ("clasificacion", _paso_clasificacion),
+    ("proyeccion", _paso_proyeccion),
+    ("conexiones", _paso_conexiones),
+    ("reproduccion", _paso_reproduccion),
+    ("recordatorios", _paso_recordatorios),
+    ("ocupacion", _paso_ocupacion),
+    ("auditoria", _paso_auditoria),
+)
+
+
+def preparar_datos(rutas=None, avisar=None, tiempos=None):
+    """Ejecuta PASOS y devuelve los datos completos del análisis.
+
+    `avisar` recibe el mensaje de progreso de cada paso (p. ej. print); en
+    `tiempos`, si se pasa un diccionario, queda la duración en segundos de cada uno.
+    """
+    rutas = rutas or rutas_predeterminadas()
+    datos = {}
+    for id_paso, paso in PASOS:
+        inicio = time.perf_counter()
+        mensaje = paso(datos, rutas)
+        if tiempos is not None:
+            tiempos[id_paso] = time.perf_counter() - inicio
+        if mensaje and avisar:
+            avisar(mensaje)
+    return datos
+
+
+def render(rutas=None, datos=None, cache=None, avisar=None, tam_bloque=TAM_BLOQUE_ESCRITURA):
+    """Iterador de los fragmentos HTML del documento completo.
+
+    Sin `datos` se preparan con preparar_datos(rutas, avisar). `cache` es la
+    CacheSecciones de la que se copian las secciones sin cambios; por defecto la
+    del directorio de caché de `rutas`, y con cache=False se genera todo de nuevo.
+    """
+    rutas = rutas or rutas_predeterminadas()
+    if datos is None:
+        datos = preparar_datos(rutas, avisar)
+    if cache is False:
+        return generar_fragmentos(datos)
+    if cache is None:
+        cache = CacheSecciones(rutas["cache"])
+    return iterar_html(datos, cache, tam_bloque)
@@ -0,0 +1,187 @@
+"""
+DATOS DE LAS GRÁFICAS
+Calcula una sola vez todas las series de las gráficas del análisis y las reúne en
+un único objeto que se incrusta en el documento como
+<script type="application/json"> y que leen todas las gráficas de Chart.js.
+
+Las series largas (proyecciones de varios años, citas por día de los volcados...)
+se reducen en el servidor con LTTB (Largest-Triangle-Three-Buckets) a un máximo
+de puntos configurable, conservando la forma visual de la curva: picos, valles y
+los extremos de la serie.
+"""
+
+import json
+
+# Puntos que se dibujan como máximo en cada gráfica de líneas si los datos no indican otro
+PUNTOS_MAXIMOS = 200
+
+# Id del <script type="application/json"> con los datos de las gráficas
+ID_DATOS_GRAFICAS = "datos-graficas"
+
+# Presupuesto de marketing (USD/mes) por canal
+CANALES_MARKETING = {"Google Ads": 200, "Meta Ads": 150, "LinkedIn Ads": 100, "Content Marketing": 50}
+
+# Color y fondo de las bandas P10/P50/P90 de la proyección Monte Carlo
+COLOR_BANDAS = "#667eea"
+FONDO_BANDAS = "rgba(102, 126, 234, 0.2)"
+
+# Color de cada estrategia en la gráfica de capacidad de los recordatorios
+COLORES_RECORDATORIOS = ("#f59e0b", "#667eea", "#10b981")
+
+
+def lttb(valores, puntos):
+    """Índices de los `puntos` valores que mejor conservan la forma de la serie (LTTB).
+
+    La serie se divide en `puntos` - 2 cubetas entre el primer y el último valor, que
+    siempre se conservan; de cada cubeta se elige el valor que forma el triángulo de
+    mayor área con el elegido en la cubeta anterior y la media de la siguiente.
+    """
+    total = len(valores)
+    if puntos >= total or puntos < 3:
+        return list(range(total))
+    ancho = (total - 2) / (puntos - 2)
+    indices = [0]
+    anterior = 0
+    for cubeta in range(puntos - 2):
+        inicio = int(cubeta * ancho) + 1
+        fin = int((cubeta + 1) * ancho) + 1
+        fin_siguiente = max(fin + 1, min(int((cubeta + 2) * ancho) + 1, total))
+        media_x = (fin + fin_siguiente - 1) / 2
+        media_y = sum(valores[fin:fin_siguiente]) / (fin_siguiente - fin)
+
+        x_anterior, y_anterior = anterior, valores[anterior]
+        mayor_area = -1.0
+        for i in range(inicio, fin):
+            # El doble del área basta para comparar
+            area = abs((x_anterior - media_x) * (valores[i] - y_anterior) - (x_anterior - i) * (media_y - y_anterior))
+            if area > mayor_area:
+                mayor_area = area
+                anterior = i
+        indices.append(anterior)
+    indices.append(total - 1)
+    return indices
+
+
+def reducir_series(etiquetas, series, puntos):
+    """Reduce varias series que comparten `etiquetas` a unos `puntos` en común.
+
+    Cada serie aporta sus puntos LTTB con una parte del presupuesto y se dibujan
+    todos los que alguna eligió, así que ninguna pierde sus picos. Devuelve
+    (etiquetas, series) reducidas.
+    """
+    if len(etiquetas) <= puntos or not series:
+        return etiquetas, series
+    por_serie = max(3, puntos // len(series))
+    indices = sorted(set().union(*(lttb(serie, por_serie) for serie in series)))
+    return [etiquetas[i] for i in indices], [[serie[i] for i in indices] for serie in series]
+
+
+def datos_graficas(datos):
+    """Series de todas las gráficas del análisis, listas para Chart.js"""
+    graficas = datos["graficas"]
+    puntos = graficas.get("puntos_maximos", PUNTOS_MAXIMOS)
+
+    # Un solo recorrido de la competencia para las dos gráficas que la usan
+    nombres, market_share, precio_min, precio_max = [], [], [], []
+    for competidor in datos["competidores"]:
+        nombres.append(competidor["nombre"])
+        market_share.append(competidor["market_share"])
+        precio_min.append(competidor["precio_usd_min"])
+        precio_max.append(competidor["precio_usd_max"])
+
+    return {
+        "competidores": {
+            "nombres": nombres,
+            "market_share": market_share,
+            "precio_usd_min": precio_min,
+            "precio_usd_max": precio_max,
+        },
+        "radar": _radar(datos["matriz_funcional"]),
+        "proyeccion_ingresos": _proyeccion_ingresos(graficas["proyeccion_ingresos"], datos.get("proyeccion_simulada"),
+                                                    puntos),
+        "marketing": {
+            "etiquetas": list(CANALES_MARKETING),
+            "valores": list(CANALES_MARKETING.values()),
+        },
+        "recordatorios": _capacidad_recordatorios(datos.get("recordatorios")),
+    }
+
+
+def _radar(matriz):
+    """Productos de la matriz funcional con color propio, sobre las funcionalidades en su nombre corto"""
+    return {
+        "etiquetas": [funcionalidad["corto"] for funcionalidad in matriz["funcionalidades"]],
+        "series": [
+            {
+                "label": producto["nombre"],
+                "data": producto["puntuaciones"],
+                "borderColor": producto["color"],
+                "backgroundColor": producto.get("fondo", producto["color"]),
+                "pointBackgroundColor": producto["color"],
+            }
+            for producto in matriz["productos"] if "color" in producto
+        ],
+    }
+
+
+def _proyeccion_ingresos(proyeccion, simulada, puntos):
+    """Bandas P10/P50/P90 de la simulación Monte Carlo o, sin ella, los escenarios fijos de los datos"""
+    if not simulada:
+        etiquetas, valores = reducir_series(
+            proyeccion["etiquetas"], [escenario["valores"] for escenario in proyeccion["escenarios"]], puntos
+        )
+        series = [
+            {
+                "label": escenario["nombre"],
+                "data": valores_escenario,
+                "borderColor": escenario["color"],
+                "backgroundColor": escenario["fondo"],
+                "fill": True,
+                "tension": 0.4,
+            }
+            for escenario, valores_escenario in zip(proyeccion["escenarios"], valores)
+        ]
+        return {"titulo": "Proyección de Ingresos Mensuales Recurrentes (MRR)", "etiquetas": etiquetas,
+                "series": series}
+
+    mrr = simulada["mrr"]
+    etiquetas, (p10, p50, p90) = reducir_series(
+        [f"Mes {mes}" for mes in range(1, simulada["meses"] + 1)], [mrr["p10"], mrr["p50"], mrr["p90"]], puntos
+    )
+    # La banda se rellena de P90 hacia P10 (el conjunto 0 de Chart.js); P50 va encima sin relleno
+    series = [
+        {"label": "P10", "data": p10, "borderColor": COLOR_BANDAS, "borderDash": [6, 4], "pointRadius": 0,
+         "fill": False},
+        {"label": "P50 (mediana)", "data": p50, "borderColor": COLOR_BANDAS, "borderWidth": 3, "pointRadius": 0,
+         "fill": False},
+        {"label": "P90", "data": p90, "borderColor": COLOR_BANDAS, "borderDash": [6, 4], "pointRadius": 0,
+         "backgroundColor": FONDO_BANDAS, "fill": 0},
+        {"label": "Costos fijos", "data": [simulada["costos_fijos_mxn"]] * len(etiquetas), "borderColor": "#ef4444",
+         "borderDash": [2, 4], "pointRadius": 0, "fill": False},
+    ]
+    return {"titulo": f"MRR simulado: {simulada['trayectorias']:,} trayectorias, bandas P10/P50/P90 (MXN)",
+            "etiquetas": etiquetas, "series": series}
+
+
+def _capacidad_recordatorios(recordatorios):
+    """Minutos de envío por recordatorios del día de cada estrategia y la ventana del job, o None"""
+    if not recordatorios:
+        return None
+    curva = recordatorios["curva"]
+    ventana = recordatorios["parametros"]["ventana_minutos"]
+    series = [
+        {"label": estrategia["clave"].capitalize(), "data": curva["minutos"][estrategia["clave"]],
+         "borderColor": color, "backgroundColor": color, "tension": 0.1}
+        for estrategia, color in zip(recordatorios["estrategias"], COLORES_RECORDATORIOS)
+    ]
+    series.append({"label": f"Ventana ({ventana:g} min)", "data": [ventana] * len(curva["volumenes"]),
+                   "borderColor": "#ef4444", "borderDash": [6, 4], "pointRadius": 0})
+    return {"etiquetas": curva["volumenes"], "series": series, "ventana": ventana}
+
+
+def script_datos_graficas(datos):
+    """Elemento <script type="application/json"> con los datos de todas las gráficas"""
+    contenido = json.dumps(datos_graficas(datos), ensure_ascii=False, separators=(",", ":"))
+    # Un "</script>" dentro de un nombre cerraría el elemento antes de tiempo
+    contenido = contenido.replace("<", "\\u003c")
+    return f'<script type="application/json" id="{ID_DATOS_GRAFICAS}">{contenido}</script>'
@@ -0,0 +1,563 @@
+"""
+ASESOR DE ÍNDICES
+Cruza las sentencias SQL del backend (sql_backend) con las claves que declaran los
+CREATE TABLE de bd/ y propone los índices que faltan y los que sobran.
+
+De cada sentencia se sacan, por tabla, las columnas comparadas por igualdad (=, IN,
+IS NULL y las columnas de unión de los JOIN), las comparadas por rango (<, >,
+BETWEEN) y las del ORDER BY. Un índice sirve a un acceso con el prefijo más largo
+de sus columnas que está entre las de igualdad, más una de rango. Cuando ningún
+índice cubre todas las columnas útiles se propone uno, y las propuestas se ordenan
+por las ejecuciones al día de las sentencias que lo usarían (rutas, llamadas y
+cron, ver sql_backend) y por la parte del acceso que hoy queda sin índice.
+
+Sobran los índices que repiten o son prefijo de otro (salvo los UNIQUE) y los que
+ninguna sentencia puede usar; su coste se mide por las escrituras al día en la
+tabla. Un índice que sostiene una clave foránea solo se propone quitar cuando otro
+índice que se conserva empieza por sus mismas columnas: InnoDB exige para cada
+clave foránea un índice que empiece por sus columnas y, al borrar el suyo, pasa a
+usar ese otro (el informe lo indica). Si no lo hay, se conserva aunque no se use. Las condiciones dentro de un OR, los
+LIKE y las columnas envueltas en funciones (DATE(c.fecha) = ?) no pueden usar un
+índice normal y se listan aparte. Desde extras/:
+
+    python -m analisis_sisvet.indices
+    python -m analisis_sisvet.indices --peticiones peticiones.json --json indices.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+
+from .sql_backend import CADENA_SQL, ErrorBackend, extraer_sentencias, pesos_funciones
+from .volcado_sql import ErrorVolcado, leer_esquema
+
+REPOSITORIO = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_COMENTARIO_SQL = re.compile(r"--[^\n]*|/\*.*?\*/", re.DOTALL)
+_SUBCONSULTA = re.compile(r"\(\s*SELECT\b", re.IGNORECASE)
+_CLAUSULA = re.compile(
+    r"\b(SELECT|FROM|WHERE|GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT|SET|VALUES?|ON\s+DUPLICATE\s+KEY\s+UPDATE|ON|USING"
+    r"|(?:NATURAL\s+)?(?:(?:INNER|CROSS|(?:LEFT|RIGHT)(?:\s+OUTER)?)\s+)?JOIN|STRAIGHT_JOIN|UNION(?:\s+ALL)?"
+    r"|FOR\s+UPDATE|UPDATE|DELETE|(?:INSERT|REPLACE)(?:\s+IGNORE)?\s+INTO)\b",
+    re.IGNORECASE,
+)
+_TABLA = re.compile(r"\s*(\w+)(?:\s*\.\s*(\w+))?(?:\s+(?:AS\s+)?(\w+))?")
+_PREDICADO = re.compile(
+    r"(?<![\w.])(?:(\w+)\.)?(\w+)\s*(<=>|!=|<>|>=|<=|=|<|>|\bIS\s+NOT\b|\bIS\b|\bNOT\s+IN\b|\bIN\b"
+    r"|\bNOT\s+LIKE\b|\bLIKE\b|\bBETWEEN\b)(?:\s*(?:(\w+)\.)?(\w+)\b(?!\s*\())?",
+    re.IGNORECASE,
+)
+_FUNCION_COLUMNA = re.compile(
+    r"\b(DATE|YEAR|MONTH|DAY|LOWER|UPPER|TRIM|DATE_FORMAT|CONCAT|COALESCE|IFNULL|DATEDIFF)\s*\(\s*(?:(\w+)\.)?(\w+)\s*[),]",
+    re.IGNORECASE,
+)
+_OR = re.compile(r"\bOR\b", re.IGNORECASE)
+_ORDEN = re.compile(r"\s*(?:(\w+)\.)?(\w+)(?:\s+(?:ASC|DESC))?\s*$", re.IGNORECASE)
+
+# Columnas como mucho en cada índice propuesto
+MAX_COLUMNAS = 3
+
+# Tipos que un índice B-tree no admite sin longitud de prefijo
+_TIPOS_SIN_INDICE = {"text", "tinytext", "mediumtext", "longtext", "blob", "tinyblob", "mediumblob", "longblob", "json"}
+
+_IGUALDAD = {"=", "<=>", "IN", "IS"}
+_RANGO = {"<", ">", "<=", ">=", "BETWEEN"}
+
+
+def leer_esquemas(volcados):
+    """{tabla: estructura} de todos los CREATE TABLE de `volcados` y sus subdirectorios"""
+    esquema = {}
+    for ruta in sorted(glob.glob(os.path.join(volcados, "**", "*.sql"), recursive=True)):
+        esquema.update(leer_esquema(ruta))
+    return esquema
+
+
+# --- Análisis de una sentencia -----------------------------------------------------
+
+def _normalizar(sql):
+    """Sentencia sin comentarios ni comillas invertidas, con las cadenas como ?"""
+    sql = _COMENTARIO_SQL.sub(" ", sql)
+    return CADENA_SQL.sub("?", sql).replace("`", "")
+
+
+def _cierre(texto, apertura):
+    """Posición del paréntesis que cierra el que está en `apertura`"""
+    profundidad = 0
+    for i in range(apertura, len(texto)):
+        if texto[i] == "(":
+            profundidad += 1
+        elif texto[i] == ")":
+            profundidad -= 1
+            if profundidad == 0:
+                return i
+    return len(texto)
+
+
+def _separar_subconsultas(sql):
+    """(sentencia con cada (SELECT ...) sustituida por (?), [subconsultas])"""
+    partes = []
+    subconsultas = []
+    posicion = 0
+    for encontrada in _SUBCONSULTA.finditer(sql):
+        if encontrada.start() < posicion:
+            continue
+        cierre = _cierre(sql, encontrada.start())
+        partes.append(sql[posicion:encontrada.start()] + "(?)")
+        subconsultas.append(sql[encontrada.start() + 1:cierre])
+        posicion = cierre + 1
+    partes.append(sql[posicion:])
+    return "".join(partes), subconsultas
+
+
+def _profundidades(texto):
+    """Profundidad de paréntesis de cada posición de `texto`"""
+    profundidad = 0
+    resultado = []
+    for c in texto:
+        if c == ")":
+            profundidad -= 1
+        resultado.append(profundidad)
+        if c == "(":
+            profundidad += 1
+    return resultado
+
+
+def _clausulas(sql):
+    """[(palabra clave en mayúsculas y un espacio, texto hasta la siguiente)] del nivel superior"""
+    profundidad = _profundidades(sql)
+    cortes = [m for m in _CLAUSULA.finditer(sql) if profundidad[m.start()] == 0]
+    return [
+        (" ".join(corte.group(1).upper().split()), sql[corte.end():siguiente.start() if siguiente else len(sql)])
+        for corte, siguiente in zip(cortes, cortes[1:] + [None])
+    ]
+
+
+def _grupos_con_or(texto):
+    """(padre de cada grupo de paréntesis, grupos que tienen un OR a su nivel); -1 es el nivel superior"""
+    padre = {}
+    actual = [-1]
+    grupo = []
+    for i, c in enumerate(texto):
+        if c == "(":
+            padre[i] = actual[-1]
+            actual.append(i)
+        elif c == ")" and len(actual) > 1:
+            actual.pop()
+        grupo.append(actual[-1])
+    con_or = {grupo[m.start()] for m in _OR.finditer(texto)}
+    return grupo, padre, con_or
+
+
+def _en_or(posicion, grupos):
+    grupo, padre, con_or = grupos
+    actual = grupo[posicion]
+    while True:
+        if actual in con_or:
+            return True
+        if actual == -1:
+            return False
+        actual = padre[actual]
+
+
+class _Consulta:
+    """Tablas de un nivel de la sentencia (la principal o una subconsulta) y sus accesos"""
+
+    def __init__(self, esquema, nivel, exterior=None):
+        self.esquema = esquema
+        self.nivel = nivel
+        self.exterior = exterior
+        self.instancias = []
+        self.alias = {}
+        self.limite = False
+
+    def agregar(self, texto):
+        encontrada = _TABLA.match(texto)
+        if encontrada is None:
+            return None
+        tabla = encontrada.group(2) or encontrada.group(1)
+        if tabla not in self.esquema:
+            return None
+        instancia = {
+            "tabla": tabla,
+            "orden_union": (self.nivel, len(self.instancias)),
+            "igualdad": [],
+            "rango": [],
+            "orden": [],
+            "columnas": {c["nombre"] for c in self.esquema[tabla]["columnas"]},
+        }
+        self.instancias.append(instancia)
+        self.alias[tabla] = instancia
+        if encontrada.group(3):
+            self.alias[encontrada.group(3)] = instancia
+        return instancia
+
+    def resolver(self, alias, columna):
+        if alias:
+            instancia = self.alias.get(alias)
+            if instancia is not None:
+                return instancia if columna in instancia["columnas"] else None
+            return self.exterior.resolver(alias, columna) if self.exterior else None
+        candidatas = [i for i in self.instancias if columna in i["columnas"]]
+        if len(candidatas) == 1:
+            return candidatas[0]
+        if not candidatas and self.exterior:
+            return self.exterior.resolver(None, columna)
+        return None
+
+
+def _agregar_columna(lista, columna):
+    if columna not in lista:
+        lista.append(columna)
+
+
+def _condiciones(consulta, texto, no_indexables):
+    """Reparte las comparaciones de un WHERE u ON entre las tablas de la consulta"""
+    grupos = _grupos_con_or(texto)
+    for predicado in _PREDICADO.finditer(texto):
+        alias, columna, operador, alias_derecha, columna_derecha = predicado.groups()
+        instancia = consulta.resolver(alias, columna)
+        if instancia is None:
+            continue
+        operador = " ".join(operador.upper().split())
+        if operador == "LIKE":
+            no_indexables.append((instancia["tabla"], columna, "LIKE"))
+            continue
+        if _en_or(predicado.start(), grupos):
+            no_indexables.append((instancia["tabla"], columna, "OR"))
+            continue
+        otra = consulta.resolver(alias_derecha, columna_derecha) if columna_derecha else None
+        if otra is not None and otra is not instancia:
+            if operador in _IGUALDAD:
+                # La columna de unión sirve a la tabla que se lee después, fila a fila
+                destino, columna_destino = max(
+                    ((instancia, columna), (otra, columna_derecha)), key=lambda par: par[0]["orden_union"]
+                )
+                _agregar_columna(destino["igualdad"], columna_destino)
+        elif operador in _IGUALDAD:
+            _agregar_columna(instancia["igualdad"], columna)
+        elif operador in _RANGO:
+            _agregar_columna(instancia["rango"], columna)
+
+    for funcion in _FUNCION_COLUMNA.finditer(texto):
+        nombre, alias, columna = funcion.groups()
+        instancia = consulta.resolver(alias, columna)
+        if instancia is not None:
+            no_indexables.append((instancia["tabla"], columna, f"{nombre.upper()}()"))
+
+
+def _orden(consulta, texto):
+    """Columnas del ORDER BY si todas son de la primera tabla de la consulta"""
+    columnas = []
+    for elemento in texto.split(","):
+        encontrado = _ORDEN.match(elemento)
+        if encontrado is None:
+            return
+        instancia = consulta.resolver(*encontrado.groups())
+        if instancia is None or not consulta.instancias or instancia is not consulta.instancias[0]:
+            return
+        columnas.append(encontrado.group(2))
+    consulta.instancias[0]["orden"] = columnas
+
+
+def analizar_sql(sql, esquema, _nivel=0, _exterior=None):
+    """Accesos por tabla, tablas escritas y condiciones no indexables de una sentencia.
+
+    Devuelve {"accesos": [{"tabla", "igualdad", "rango", "orden"}], "escrituras":
+    [tabla], "no_indexables": [(tabla, columna, motivo)]}. Las subconsultas se
+    analizan como consultas propias que pueden referirse a las tablas exteriores.
+    """
+    if _nivel == 0:
+        sql = _normalizar(sql)
+    sql, subconsultas = _separar_subconsultas(sql)
+    consulta = _Consulta(esquema, _nivel, _exterior)
+    resultado = {"accesos": [], "escrituras": [], "no_indexables": []}
+    condiciones = []
+    ultima = None
+    for palabra, texto in _clausulas(sql):
+        if palabra in ("FROM", "UPDATE") or palabra.endswith("JOIN"):
+            for parte in texto.split(",") if palabra == "FROM" else [texto]:
+                ultima = consulta.agregar(parte) or ultima
+            if palabra == "UPDATE" and ultima is not None:
+                resultado["escrituras"].append(ultima["tabla"])
+        elif palabra.endswith("INTO"):
+            encontrada = _TABLA.match(texto)
+            if encontrada and (encontrada.group(2) or encontrada.group(1)) in esquema:
+                resultado["escrituras"].append(encontrada.group(2) or encontrada.group(1))
+        elif palabra in ("WHERE", "ON"):
+            condiciones.append(texto)
+        elif palabra == "USING" and ultima is not None:
+            for columna in re.findall(r"\w+", texto):
+                _agregar_columna(ultima["igualdad"], columna)
+        elif palabra == "ORDER BY":
+            condiciones.append(("orden", texto))
+        elif palabra == "LIMIT":
+            consulta.limite = True
+    if sql.lstrip().upper().startswith("DELETE") and consulta.instancias:
+        resultado["escrituras"].append(consulta.instancias[0]["tabla"])
+
+    for condicion in condiciones:
+        if isinstance(condicion, tuple):
+            _orden(consulta, condicion[1])
+        else:
+            _condiciones(consulta, condicion, resultado["no_indexables"])
+
+    for subconsulta in subconsultas:
+        interior = analizar_sql(subconsulta, esquema, _nivel + 1, consulta)
+        for clave in resultado:
+            resultado[clave].extend(interior[clave])
+
+    for instancia in consulta.instancias:
+        if instancia["igualdad"] or instancia["rango"] or (instancia["orden"] and consulta.limite):
+            resultado["accesos"].append({clave: instancia[clave] for clave in ("tabla", "igualdad", "rango", "orden")})
+    return resultado
+
+
+# --- Índices declarados ------------------------------------------------------------
+
+def _indices(tabla):
+    """Índices B-tree de la tabla, con la clave primaria como PRIMARY"""
+    indices = [{"nombre": "PRIMARY", "columnas": tabla["clave_primaria"], "unico": True}] if tabla["clave_primaria"] else []
+    return indices + [i for i in tabla["indices"] if i["tipo"] is None]
+
+
+def _columnas_usadas(columnas, acceso):
+    """(columnas del índice que usa el acceso, si el índice queda fijado entero por igualdad)"""
+    usadas = 0
+    while usadas < len(columnas) and columnas[usadas] in acceso["igualdad"]:
+        usadas += 1
+    completo = usadas == len(columnas)
+    if usadas < len(columnas) and columnas[usadas] in acceso["rango"]:
+        usadas += 1
+    return usadas, completo
+
+
+def cobertura(tabla, acceso):
+    """(índice que mejor sirve al acceso o None, columnas usadas, columnas útiles del acceso)"""
+    deseadas = len(acceso["igualdad"]) + (1 if acceso["rango"] else 0)
+    mejor, mejor_usadas = None, 0
+    for indice in _indices(tabla):
+        usadas, completo = _columnas_usadas(indice["columnas"], acceso)
+        if completo and indice["unico"]:
+            # Como mucho una fila: ninguna columna más acelera la búsqueda
+            return indice, deseadas, deseadas
+        if usadas > mejor_usadas:
+            mejor, mejor_usadas = indice, usadas
+    return mejor, mejor_usadas, deseadas
+
+
+def _baja_cardinalidad(columna):
+    """Enumerados y booleanos: pocos valores distintos, mejor al final del índice"""
+    return columna["tipo"] in ("enum", "set", "bit", "boolean", "bool") or (
+        columna["tipo"] == "tinyint" and columna["parametros"] == "1"
+    )
+
+
+def _proponer(tabla, acceso, uso):
+    """Columnas del índice que se propone para el acceso, como mucho MAX_COLUMNAS.
+
+    Las de igualdad van primero, ordenadas por su uso en toda la tabla (así las
+    propuestas comparten prefijos) y con las de baja cardinalidad al final; luego
+    la primera de rango o, si no hay, las del ORDER BY.
+    """
+    columnas = {c["nombre"]: c for c in tabla["columnas"]}
+    indexables = [c for c in acceso["igualdad"] if columnas[c]["tipo"] not in _TIPOS_SIN_INDICE]
+    igualdad = sorted(indexables, key=lambda c: (_baja_cardinalidad(columnas[c]), -uso[(tabla["nombre"], c)], c))
+    resto = acceso["rango"][:1] or [c for c in acceso["orden"] if c not in igualdad]
+    return (igualdad + [c for c in resto if columnas[c]["tipo"] not in _TIPOS_SIN_INDICE])[:MAX_COLUMNAS]
+
+
+def _nombre_indice(tabla, columnas):
+    return "idx_" + "_".join([tabla] + [c[3:] if c.startswith("id_") else c for c in columnas])
+
+
+def _redundantes(tabla, accesos):
+    """[(índice, motivo, índice que lo cubre o None, clave foránea que sostiene o None)] de los que sobran.
+
+    El índice que cubre a uno que sobra es el más largo de los que empiezan por sus
+    columnas, que nunca sobra a su vez: es el que puede sostener su clave foránea.
+    """
+    indices = _indices(tabla)
+    redundantes = []
+    for posicion, indice in enumerate(indices):
+        if indice["unico"]:
+            continue
+        columnas = indice["columnas"]
+        cubridores = [
+            (len(otro["columnas"]), otro["unico"], -otra_posicion, otro)
+            for otra_posicion, otro in enumerate(indices)
+            if otro is not indice and otro["columnas"][:len(columnas)] == columnas
+            and (len(otro["columnas"]) > len(columnas) or otro["unico"] or otra_posicion < posicion)
+        ]
+        cubridor = max(cubridores, key=lambda candidato: candidato[:3])[3] if cubridores else None
+        claves = [clave for clave in tabla["claves_foraneas"] if columnas[:len(clave["columnas"])] == clave["columnas"]]
+        if cubridor is not None:
+            motivo = "duplicado" if cubridor["columnas"] == columnas else "prefijo"
+            # La clave foránea pasa a usar el índice que lo cubre, que empieza por las mismas columnas
+            redundantes.append((indice, motivo, cubridor, claves[0]["nombre"] if claves else None))
+            continue
+        if accesos and not any(
+            columnas[0] in acceso["igualdad"] or columnas[0] in acceso["rango"] or columnas[:1] == acceso["orden"][:1]
+            for acceso in accesos
+        ):
+            # Sin uso en las consultas, pero una clave foránea necesita un índice que empiece por sus columnas
+            if not claves:
+                redundantes.append((indice, "sin uso", None, None))
+    return redundantes
+
+
+# --- Informe -----------------------------------------------------------------------
+
+def asesorar_indices(backend, volcados, peticiones=None):
+    """Índices que faltan, índices que sobran y condiciones no indexables del backend.
+
+    `peticiones` da las peticiones al día por endpoint o job (ver pesos_funciones).
+    Cada propuesta lleva la sentencia DDL, su peso (ejecuciones al día de las
+    sentencias que lo usarían), su beneficio (el peso por la fracción del acceso
+    que hoy no cubre ningún índice) y las sentencias de origen.
+    """
+    esquema = leer_esquemas(volcados)
+    pesos = pesos_funciones(backend, peticiones)
+    sentencias = extraer_sentencias(backend)
+
+    accesos = []
+    escrituras = {}
+    no_indexables = {}
+    for sentencia in sentencias:
+        origen = {"archivo": sentencia["archivo"], "funcion": sentencia["funcion"], "linea": sentencia["linea"]}
+        peso = pesos.get((sentencia["archivo"], sentencia["funcion"]), 0.0)
+        analisis = analizar_sql(sentencia["sql"], esquema)
+        for acceso in analisis["accesos"]:
+            accesos.append((acceso, peso, origen))
+        for tabla in set(analisis["escrituras"]):
+            escrituras[tabla] = escrituras.get(tabla, 0.0) + peso
+        for tabla, columna, motivo in set(analisis["no_indexables"]):
+            entrada = no_indexables.setdefault((tabla, columna, motivo), {"peso": 0.0, "sentencias": []})
+            entrada["peso"] += peso
+            entrada["sentencias"].append(origen)
+
+    # Las columnas de igualdad se ordenan por su uso en toda la tabla: las propuestas comparten prefijos
+    uso = {}
+    for acceso, peso, _ in accesos:
+        for columna in acceso["igualdad"]:
+            uso[(acceso["tabla"], columna)] = uso.get((acceso["tabla"], columna), 0.0) + peso + 1e-9
+
+    propuestas = {}
+    for acceso, peso, origen in accesos:
+        tabla = esquema[acceso["tabla"]]
+        indice, usadas, deseadas = cobertura(tabla, acceso)
+        if usadas >= deseadas:
+            continue
+        columnas = _proponer(tabla, acceso, uso)
+        nuevas, _ = _columnas_usadas(columnas, acceso)
+        if nuevas <= usadas:
+            continue
+        propuesta = propuestas.setdefault((acceso["tabla"], tuple(columnas)), {
+            "tabla": acceso["tabla"],
+            "columnas": columnas,
+            "peso": 0.0,
+            "beneficio": 0.0,
+            "indice_actual": indice["nombre"] if indice else None,
+            "sentencias": [],
+        })
+        propuesta["peso"] += peso
+        propuesta["beneficio"] += peso * (nuevas - usadas) / deseadas
+        propuesta["sentencias"].append(origen)
+
+    # Una propuesta que es prefijo de otra de la misma tabla queda cubierta por la más larga
+    faltantes = []
+    for propuesta in sorted(propuestas.values(), key=lambda p: -len(p["columnas"])):
+        mayor = next((p for p in faltantes if p["tabla"] == propuesta["tabla"]
+                      and p["columnas"][:len(propuesta["columnas"])] == propuesta["columnas"]), None)
+        if mayor is None:
+            faltantes.append(propuesta)
+        else:
+            for clave in ("peso", "beneficio", "sentencias"):
+                mayor[clave] += propuesta[clave]
+    for propuesta in faltantes:
+        nombre = _nombre_indice(propuesta["tabla"], propuesta["columnas"])
+        propuesta["nombre"] = nombre
+        propuesta["ddl"] = f"ALTER TABLE `{propuesta['tabla']}` ADD INDEX `{nombre}` ({', '.join(propuesta['columnas'])});"
+    faltantes.sort(key=lambda p: (-p["beneficio"], -p["peso"], p["tabla"]))
+
+    accesos_por_tabla = {}
+    for acceso, _, _ in accesos:
+        accesos_por_tabla.setdefault(acceso["tabla"], []).append(acceso)
+    redundantes = []
+    for nombre_tabla, tabla in esquema.items():
+        for indice, motivo, cubridor, clave in _redundantes(tabla, accesos_por_tabla.get(nombre_tabla, [])):
+            redundantes.append({
+                "tabla": nombre_tabla,
+                "indice": indice["nombre"],
+                "columnas": indice["columnas"],
+                "motivo": motivo,
+                "cubierto_por": cubridor["nombre"] if cubridor else None,
+                "clave_foranea": clave,
+                "escrituras": escrituras.get(nombre_tabla, 0.0),
+                "ddl": f"ALTER TABLE `{nombre_tabla}` DROP INDEX `{indice['nombre']}`;",
+            })
+    redundantes.sort(key=lambda r: (-r["escrituras"], r["motivo"] == "sin uso", r["tabla"], r["indice"]))
+
+    return {
+        "sentencias": len(sentencias),
+        "tablas": len(esquema),
+        "faltantes": faltantes,
+        "redundantes": redundantes,
+        "no_indexables": sorted(
+            ({"tabla": t, "columna": c, "motivo": m, **entrada} for (t, c, m), entrada in no_indexables.items()),
+            key=lambda n: (-n["peso"], n["tabla"], n["columna"]),
+        ),
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Índices que faltan y que sobran según el SQL del backend")
+    parser.add_argument("--backend", default=os.path.join(REPOSITORIO, "backend"))
+    parser.add_argument("--volcados", default=os.path.join(REPOSITORIO, "bd"), help="directorio con los CREATE TABLE")
+    parser.add_argument("--peticiones", metavar="JSON",
+                        help='peticiones al día por endpoint o job, p. ej. {"GET /api/citas": 500}')
+    parser.add_argument("--json", metavar="ARCHIVO", help="guarda el informe completo en este archivo")
+    parser.add_argument("--limite", type=int, default=15, help="filas de cada lista que se muestran")
+    argumentos = parser.parse_args(argumentos)
+
+    peticiones = None
+    if argumentos.peticiones:
+        with open(argumentos.peticiones, encoding="utf-8") as archivo:
+            peticiones = json.load(archivo)
+    try:
+        informe = asesorar_indices(argumentos.backend, argumentos.volcados, peticiones)
+    except (ErrorBackend, ErrorVolcado) as error:
+        print(f"❌ {error}")
+        return 1
+
+    print(f"{informe['sentencias']} sentencias SQL frente a {informe['tablas']} tablas")
+    print(f"\nÍndices que faltan ({len(informe['faltantes'])}), por beneficio (ejecuciones/día):")
+    for propuesta in informe["faltantes"][:argumentos.limite]:
+        origenes = sorted({s["funcion"] for s in propuesta["sentencias"]})
+        print(f"  {propuesta['beneficio']:>8.1f}  {propuesta['ddl']}")
+        print(f"            hoy: {propuesta['indice_actual'] or 'recorrido completo'}; "
+              f"{len(propuesta['sentencias'])} sentencias en {', '.join(origenes[:4])}"
+              + ("..." if len(origenes) > 4 else ""))
+    print(f"\nÍndices que sobran ({len(informe['redundantes'])}), por escrituras/día en la tabla:")
+    for redundante in informe["redundantes"][:argumentos.limite]:
+        cubierto = f" (lo cubre {redundante['cubierto_por']})" if redundante["cubierto_por"] else ""
+        if redundante["clave_foranea"]:
+            cubierto += f"; la clave foránea {redundante['clave_foranea']} pasa a usar {redundante['cubierto_por']}"
+        print(f"  {redundante['escrituras']:>8.1f}  {redundante['tabla']}.{redundante['indice']} "
+              f"({', '.join(redundante['columnas'])}): {redundante['motivo']}{cubierto}")
+    print(f"\nCondiciones que no pueden usar un índice ({len(informe['no_indexables'])}):")
+    for condicion in informe["no_indexables"][:argumentos.limite]:
+        print(f"  {condicion['peso']:>8.1f}  {condicion['tabla']}.{condicion['columna']}: {condicion['motivo']} "
+              f"en {len(condicion['sentencias'])} sentencias")
+
+    if argumentos.json:
+        with open(argumentos.json, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, ensure_ascii=False, indent=2)
+        print(f"💾 Informe guardado en {argumentos.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""
+GENERACIÓN EN LOTE
+Genera el análisis de muchas clínicas en una sola ejecución a partir de un
+manifiesto (JSON o TOML) con una entrada por clínica:
+
+    [[reportes]]
+    nombre = "san-francisco"   # obligatorio, forma parte del nombre del archivo
+    datos = "datos"            # directorio de datos del análisis (opcional)
+    volcados = "../bd"         # volcados de la clínica, para leer su licencia (opcional)
+    id_clinica = 1             # fila de licencias_clinica (opcional, por defecto la primera)
+
+Las rutas son relativas al manifiesto. Los datos de cada análisis se preparan con
+los mismos pasos que un análisis suelto (generacion.PASOS), así que el documento
+es el mismo. El repositorio se escanea una vez y las secciones que comparten
+varios análisis (estilos, competencia, gráficas...) se generan una sola vez en la
+caché antes de repartir los análisis en un pool de procesos; cada proceso solo
+genera lo propio de su clínica y copia el resto. Al terminar se borran de la caché
+las secciones que no usó ningún análisis del lote.
+
+Para comprobar que cada documento del lote es el mismo que un análisis suelto de
+esa clínica (salvo la fecha de generación y el nombre de la clínica):
+
+    python -m analisis_sisvet.lote lote_clinicas.toml
+"""
+
+import glob
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .cache_secciones import CacheSecciones
+from .compresion import optimizar_archivo
+from .datos import ErrorDatos, leer_archivo
+from .escaner import aplicar_escaneo, escanear_repositorio
+from .generacion import PASOS
+from .ocupacion_citas import calcular_ocupacion
+from .secciones import CAMPOS_ENCABEZADO, claves_secciones, escribir_html, precalentar_cache
+from .volcado_sql import ErrorVolcado, iterar_filas
+
+_CAMPOS_REPORTE = {"nombre": str, "datos": str, "volcados": str, "id_clinica": int}
+
+
+def leer_manifiesto(ruta, directorio_datos):
+    """Lee y valida el manifiesto; devuelve los reportes con rutas absolutas.
+
+    `directorio_datos` se usa en los reportes que no indican su propio directorio.
+    """
+    manifiesto = leer_archivo(ruta)
+    reportes = manifiesto.get("reportes")
+    if not isinstance(reportes, list) or not reportes:
+        raise ErrorDatos(f"{ruta}: se esperaba una lista 'reportes' con al menos una clínica")
+
+    base = os.path.dirname(os.path.abspath(ruta))
+    nombres = set()
+    resultado = []
+    for i, reporte in enumerate(reportes):
+        if not isinstance(reporte, dict) or not isinstance(reporte.get("nombre"), str):
+            raise ErrorDatos(f"{ruta}: reportes[{i}].nombre: campo obligatorio ausente")
+        for campo, valor in reporte.items():
+            esperado = _CAMPOS_REPORTE.get(campo)
+            if esperado is None:
+                raise ErrorDatos(f"{ruta}: reportes[{i}].{campo}: campo desconocido")
+            if isinstance(valor, bool) or not isinstance(valor, esperado):
+                raise ErrorDatos(f"{ruta}: reportes[{i}].{campo}: se esperaba {esperado.__name__}")
+        if reporte["nombre"] in nombres:
+            raise ErrorDatos(f"{ruta}: reportes[{i}].nombre: '{reporte['nombre']}' está repetido")
+        nombres.add(reporte["nombre"])
+        resultado.append({
+            "nombre": reporte["nombre"],
+            "datos": os.path.join(base, reporte["datos"]) if "datos" in reporte else directorio_datos,
+            "volcados": os.path.join(base, reporte["volcados"]) if "volcados" in reporte else None,
+            "id_clinica": reporte.get("id_clinica"),
+        })
+    return resultado
+
+
+def leer_clinica(volcados, id_clinica=None):
+    """Fila de licencias_clinica de los volcados como diccionario {columna: valor}"""
+    rutas = sorted(glob.glob(os.path.join(volcados, "*.sql")))
+    # El volcado de la tabla suele tener su nombre: así no se recorren los demás
+    rutas = [r for r in rutas if "licencias_clinica" in os.path.basename(r)] or rutas
+    esquema = {}
+    for ruta in rutas:
+        for _, fila in iterar_filas(ruta, tablas={"licencias_clinica"}, esquema=esquema):
+            registro = dict(zip((c["nombre"] for c in esquema["licencias_clinica"]["columnas"]), fila))
+            if id_clinica is None or registro["id"] == id_clinica:
+                return registro
+    raise ErrorVolcado(f"{volcados}: no hay licencia de clínica" + (f" con id {id_clinica}" if id_clinica else ""))
+
+
+def _rutas_reporte(rutas, reporte):
+    """Rutas de preparación de un reporte: las del análisis con sus datos y sus volcados"""
+    propias = dict(rutas, datos=reporte["datos"])
+    if reporte["volcados"]:
+        propias["volcados"] = reporte["volcados"]
+        propias["auditoria"] = os.path.join(reporte["volcados"], os.path.basename(rutas["auditoria"]))
+    return propias
+
+
+def _cargar_datos_reporte(rutas, escaneo):
+    """Datos de un reporte con los pasos de generacion.PASOS y el escaneo ya hecho del repositorio"""
+    datos = {}
+    for id_paso, paso in PASOS:
+        if id_paso == "escaneo":
+            datos.update(aplicar_escaneo(datos, escaneo))
+        else:
+            paso(datos, rutas)
+    return datos
+
+
+def _datos_clinica(datos, reporte, rutas):
+    """Añade a `datos` la licencia de la clínica del reporte y la ocupación de su agenda"""
+    if reporte["volcados"]:
+        datos["clinica"] = leer_clinica(reporte["volcados"], reporte["id_clinica"])
+        ocupacion, _ = calcular_ocupacion(reporte["volcados"], datos["clinica"]["id"], rutas["cache"])
+        # Sin citas de la clínica no se muestra la agenda de todas las clínicas
+        if ocupacion:
+            datos["ocupacion_citas"] = ocupacion
+        else:
+            datos.pop("ocupacion_citas", None)
+    return datos
+
+
+def _generar_reporte(tarea):
+    """Genera un análisis del lote; se ejecuta en un proceso del pool"""
+    reporte, ruta_salida, rutas, escaneo, claves, encabezado, minificar = tarea
+    inicio = time.perf_counter()
+    try:
+        cache = CacheSecciones(rutas["cache"], limpiar=False, claves=claves)
+        # Si todas las secciones guardables están en caché solo se genera el encabezado:
+        # basta con los datos que lee, preparados en el proceso principal
+        if all(cache.existe(id_seccion, clave) for id_seccion, clave in claves.items()):
+            datos = dict(encabezado)
+        else:
+            datos = _cargar_datos_reporte(rutas, escaneo)
+        _datos_clinica(datos, reporte, rutas)
+        with open(ruta_salida, "w", encoding="utf-8") as archivo:
+            caracteres = escribir_html(archivo, datos, cache=cache)
+        optimizacion = optimizar_archivo(ruta_salida) if minificar else None
+    except (ErrorDatos, ErrorVolcado, ImportError, OSError) as error:
+        return {"nombre": reporte["nombre"], "error": str(error), "segundos": time.perf_counter() - inicio}
+    return {
+        "nombre": reporte["nombre"],
+        "ruta": ruta_salida,
+        "caracteres": caracteres,
+        "bytes": os.path.getsize(ruta_salida),
+        "segundos": time.perf_counter() - inicio,
+        "reutilizadas": len(cache.reutilizadas),
+        "regeneradas": len(cache.regeneradas),
+        "usados": cache.usados,
+        "optimizacion": optimizacion,
+    }
+
+
+def generar_lote(reportes, directorio_salida, rutas, procesos=None, marca=None, minificar=False):
+    """Genera un análisis por reporte en `directorio_salida`.
+
+    `rutas` son las de generacion.rutas_predeterminadas(): cada reporte cambia en
+    ellas su directorio de datos y sus volcados. Con `minificar` cada análisis se
+    minifica y se escribe con sus versiones .gz y .br.
+
+    Devuelve (resultados, resumen): un diccionario por reporte con su ruta, tamaño
+    y tiempo (o su error) y el resumen del lote con tiempos y rendimiento.
+    """
+    inicio = time.perf_counter()
+    os.makedirs(directorio_salida, exist_ok=True)
+    escaneo, _ = escanear_repositorio(rutas["repositorio"], rutas["cache"])
+
+    # Secciones comunes: se generan aquí una vez y los procesos solo las copian.
+    # Los reportes con los mismos datos y volcados comparten la preparación
+    inicio_comunes = time.perf_counter()
+    por_origen = {}
+    for reporte in reportes:
+        origen = (reporte["datos"], reporte["volcados"])
+        if origen not in por_origen:
+            por_origen[origen] = _cargar_datos_reporte(_rutas_reporte(rutas, reporte), escaneo)
+    cache = CacheSecciones(rutas["cache"], limpiar=False)
+    # Las claves viajan con cada tarea: los procesos no recalculan huellas y usan
+    # exactamente las mismas claves con las que se generaron las secciones comunes
+    claves = {}
+    for origen, datos in por_origen.items():
+        claves[origen] = claves_secciones(cache, datos)
+        if origen[1]:
+            # La ocupación de la agenda es propia de cada clínica: su clave se calcula en su proceso
+            del claves[origen]["ocupacion"]
+    origenes = [(reporte["datos"], reporte["volcados"]) for reporte in reportes]
+    comunes = precalentar_cache(cache, [por_origen[origen] for origen in origenes],
+                                lista_claves=[claves[origen] for origen in origenes])
+    duracion_comunes = time.perf_counter() - inicio_comunes
+
+    marca = marca or time.strftime("%Y%m%d_%H%M%S")
+    encabezados = {
+        origen: {campo: datos[campo] for campo in CAMPOS_ENCABEZADO if campo in datos}
+        for origen, datos in por_origen.items()
+    }
+    tareas = [
+        (reporte, os.path.join(directorio_salida, f"ANALISIS_COMPLETO_SISVET_{reporte['nombre']}_{marca}.html"),
+         _rutas_reporte(rutas, reporte), escaneo, claves[origen], encabezados[origen], minificar)
+        for reporte, origen in zip(reportes, origenes)
+    ]
+    procesos = min(procesos or os.cpu_count() or 1, len(tareas))
+    if procesos > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            resultados = list(pool.map(_generar_reporte, tareas))
+    else:
+        resultados = [_generar_reporte(tarea) for tarea in tareas]
+
+    # Sin limpiar, la caché conservaría para siempre todas las versiones de cada sección
+    usados = set().union(*(resultado.pop("usados", ()) for resultado in resultados))
+    borradas = cache.conservar(usados)
+
+    segundos = time.perf_counter() - inicio
+    correctos = [r for r in resultados if "error" not in r]
+    total_bytes = sum(r["bytes"] for r in correctos)
+    resumen = {
+        "reportes": len(resultados),
+        "errores": len(resultados) - len(correctos),
+        "procesos": procesos,
+        "secciones_comunes": len(comunes),
+        "segundos_comunes": duracion_comunes,
+        "secciones_borradas": borradas,
+        "segundos": segundos,
+        "bytes": total_bytes,
+        "reportes_por_segundo": len(correctos) / segundos if segundos else 0.0,
+        "mb_por_segundo": total_bytes / (1024 * 1024) / segundos if segundos else 0.0,
+    }
+    return resultados, resumen
+
+
+# Líneas propias de cada documento: la fecha de generación y el nombre de la clínica
+_LINEAS_VARIABLES = re.compile(r'^\s*(<div class="date">Generado: |<p>Clínica: ).*$', re.MULTILINE)
+
+
+def diferencias_con_analisis(ruta, reporte, rutas):
+    """Líneas en que el documento del lote en `ruta` difiere del análisis suelto de su clínica.
+
+    El análisis suelto se prepara con generacion.preparar_datos() y se genera sin
+    caché; se ignoran la fecha de generación y el nombre de la clínica.
+    """
+    import difflib
+
+    from .generacion import preparar_datos, render
+
+    datos = _datos_clinica(preparar_datos(_rutas_reporte(rutas, reporte)), reporte, rutas)
+    suelto = _LINEAS_VARIABLES.sub("", "".join(render(datos=datos, cache=False))).splitlines()
+    with open(ruta, encoding="utf-8") as archivo:
+        del_lote = _LINEAS_VARIABLES.sub("", archivo.read()).splitlines()
+    return [linea for linea in difflib.unified_diff(suelto, del_lote, "suelto", ruta, n=0, lineterm="")]
+
+
+def main(argumentos):
+    from .generacion import rutas_predeterminadas
+
+    if len(argumentos) != 1:
+        print("uso: python -m analisis_sisvet.lote MANIFIESTO")
+        return 2
+    rutas = rutas_predeterminadas()
+    try:
+        reportes = leer_manifiesto(argumentos[0], rutas["datos"])
+    except ErrorDatos as error:
+        print(f"❌ Manifiesto inválido: {error}")
+        return 1
+    distintos = 0
+    with tempfile.TemporaryDirectory() as directorio_salida:
+        resultados, _ = generar_lote(reportes, directorio_salida, rutas)
+        for reporte, resultado in zip(reportes, resultados):
+            if "error" in resultado:
+                print(f"❌ {reporte['nombre']}: {resultado['error']}")
+                distintos += 1
+                continue
+            diferencias = diferencias_con_analisis(resultado["ruta"], reporte, rutas)
+            if diferencias:
+                distintos += 1
+                print(f"❌ {reporte['nombre']}: {len(diferencias)} líneas distintas del análisis suelto")
+                for linea in diferencias[:20]:
+                    print(f"   {linea}")
+            else:
+                print(f"✅ {reporte['nombre']}: igual que el análisis suelto")
+    return 1 if distintos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,195 @@
+"""
+MATRIZ DE COMPARACIÓN FUNCIONAL
+La comparación funcional se guarda en los datos como una matriz de puntuaciones
+productos × funcionalidades (matriz_funcional); de ella salen la tabla de la
+sección de comparación, la gráfica de radar y la clasificación ponderada.
+
+Cada perfil de pesos es una columna de la matriz de pesos funcionalidades ×
+perfiles, normalizada para que sume 1. La nota de cada producto en cada perfil
+sale de una sola multiplicación de matrices:
+
+    notas (productos × perfiles) = puntuaciones (productos × funcionalidades) @ pesos
+
+de modo que cientos de productos, funcionalidades y perfiles se clasifican en
+milisegundos. Se pueden añadir perfiles propios en un archivo JSON o TOML con una
+lista `perfiles`; desde extras/:
+
+    python -m analisis_sisvet.matriz_funcional --perfiles mis_perfiles.toml
+    python -m analisis_sisvet.matriz_funcional --aleatoria 500x300
+"""
+
+import argparse
+import hashlib
+import marshal
+import os
+import sys
+import time
+
+from .datos import NUMERO, ErrorDatos, cargar_datos, leer_archivo, validar, validar_matriz
+from .tabla_columnar import importar_numpy
+
+# Productos que se muestran por perfil en la clasificación del documento
+LIMITE_CLASIFICACION = 10
+
+# Incrementar al cambiar la clasificación para descartar los resultados guardados
+VERSION_CLASIFICACION = 1
+
+
+class ErrorMatriz(ValueError):
+    """La matriz funcional o un perfil de pesos no permiten clasificar"""
+
+
+def matriz_puntuaciones(matriz):
+    """Array productos × funcionalidades con las puntuaciones de la matriz"""
+    np = importar_numpy()
+    return np.asarray([producto["puntuaciones"] for producto in matriz["productos"]], dtype=np.float64)
+
+
+def matriz_pesos(matriz, perfiles=None):
+    """Array funcionalidades × perfiles con los pesos de cada perfil normalizados a suma 1"""
+    np = importar_numpy()
+    perfiles = matriz["perfiles"] if perfiles is None else perfiles
+    indices = {funcionalidad["nombre"]: i for i, funcionalidad in enumerate(matriz["funcionalidades"])}
+    pesos = np.empty((len(indices), len(perfiles)), dtype=np.float64)
+    for columna, perfil in enumerate(perfiles):
+        pesos[:, columna] = perfil["peso_defecto"]
+        for nombre, peso in perfil["pesos"].items():
+            pesos[indices[nombre], columna] = peso
+    totales = pesos.sum(axis=0)
+    if (totales <= 0).any():
+        vacio = perfiles[int(np.argmax(totales <= 0))]["nombre"]
+        raise ErrorMatriz(f"perfil '{vacio}': todos sus pesos son 0")
+    return pesos / totales
+
+
+def clasificar(matriz, perfiles=None, limite=LIMITE_CLASIFICACION):
+    """Nota ponderada y clasificación de todos los productos en cada perfil.
+
+    Devuelve {"escala", "perfiles": [{"nombre", "descripcion", "notas", "orden",
+    "posiciones"}]}: "notas" y "posiciones" (desde 1) van en el orden de los
+    productos de la matriz y "orden" son los índices de los `limite` mejores.
+    """
+    np = importar_numpy()
+    perfiles = matriz["perfiles"] if perfiles is None else perfiles
+    if not perfiles:
+        raise ErrorMatriz("no hay perfiles de pesos con los que clasificar")
+    notas = matriz_puntuaciones(matriz) @ matriz_pesos(matriz, perfiles)
+    # Orden estable: a igual nota conserva el orden de los productos en los datos
+    orden = np.argsort(-notas, axis=0, kind="stable")
+    posiciones = np.empty_like(orden)
+    np.put_along_axis(posiciones, orden, np.arange(1, len(notas) + 1)[:, None], axis=0)
+    return {
+        "escala": matriz["escala"],
+        "perfiles": [
+            {
+                "nombre": perfil["nombre"],
+                "descripcion": perfil["descripcion"],
+                "notas": [round(float(nota), 2) for nota in notas[:, columna]],
+                "orden": [int(i) for i in orden[:limite, columna]],
+                "posiciones": [int(posicion) for posicion in posiciones[:, columna]],
+            }
+            for columna, perfil in enumerate(perfiles)
+        ],
+    }
+
+
+def clasificar_en_cache(matriz, directorio_cache=None, limite=LIMITE_CLASIFICACION):
+    """clasificar() guardando el resultado por la huella de la matriz; devuelve (resultado, desde_cache).
+
+    Con la clasificación en caché no hace falta importar NumPy, que es la mayor
+    parte del arranque de un análisis que se vuelve a generar sin cambios.
+    """
+    firma = hashlib.sha256(marshal.dumps([matriz, limite], 0)).hexdigest()
+    ruta = os.path.join(directorio_cache, f"clasificacion-{firma[:16]}.marshal") if directorio_cache else None
+    if ruta:
+        try:
+            with open(ruta, "rb") as archivo:
+                cache = marshal.loads(archivo.read())
+            if cache.get("version") == VERSION_CLASIFICACION and cache.get("firma") == firma:
+                return cache["resultado"], True
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+    resultado = clasificar(matriz, limite=limite)
+    if ruta:
+        os.makedirs(directorio_cache, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(marshal.dumps({"version": VERSION_CLASIFICACION, "firma": firma, "resultado": resultado}))
+        os.replace(temporal, ruta)
+    return resultado, False
+
+
+def leer_perfiles(ruta, matriz):
+    """Perfiles de pesos de un archivo JSON o TOML (lista `perfiles`), validados contra `matriz`"""
+    try:
+        contenido = leer_archivo(ruta)
+        if "perfiles" not in contenido:
+            raise ErrorDatos(f"{ruta}: falta la lista perfiles")
+        esquema = {"nombre": str, "descripcion": str, "peso_defecto": NUMERO, "pesos": dict}
+        validar(contenido["perfiles"], [esquema], "perfiles")
+        validar_matriz({**matriz, "perfiles": contenido["perfiles"]})
+    except ErrorDatos as error:
+        raise ErrorMatriz(str(error)) from error
+    return contenido["perfiles"]
+
+
+def matriz_aleatoria(productos, funcionalidades, perfiles=8, semilla=0):
+    """Matriz funcional sintética de `productos` × `funcionalidades` para medir la clasificación"""
+    np = importar_numpy()
+    rng = np.random.default_rng(semilla)
+    puntuaciones = np.round(rng.uniform(0, 10, (productos, funcionalidades)) * 2) / 2
+    nombres = [f"F{i}" for i in range(funcionalidades)]
+    return {
+        "escala": 10,
+        "funcionalidades": [{"nombre": nombre, "corto": nombre} for nombre in nombres],
+        "productos": [{"nombre": f"P{i}", "corto": f"P{i}", "puntuaciones": fila.tolist()}
+                      for i, fila in enumerate(puntuaciones)],
+        "perfiles": [
+            {"nombre": f"Perfil {k}", "descripcion": "pesos aleatorios", "peso_defecto": 0,
+             "pesos": dict(zip(nombres, rng.uniform(0, 5, funcionalidades).tolist()))}
+            for k in range(perfiles)
+        ],
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Clasificación ponderada de la matriz de comparación funcional")
+    parser.add_argument("--datos", default="datos", help="directorio de datos con la tabla matriz_funcional")
+    parser.add_argument("--perfiles", help="archivo JSON o TOML con perfiles de pesos adicionales")
+    parser.add_argument("--aleatoria", metavar="PxF", help="clasifica una matriz sintética de P productos y F funcionalidades")
+    argumentos = parser.parse_args(argumentos)
+
+    tamaño = None
+    if argumentos.aleatoria:
+        productos, _, funcionalidades = argumentos.aleatoria.partition("x")
+        if not (productos.isdigit() and funcionalidades.isdigit()):
+            print(f"❌ --aleatoria: se esperaba PxF, p. ej. 500x300, no '{argumentos.aleatoria}'")
+            return 1
+        tamaño = int(productos), int(funcionalidades)
+
+    try:
+        if tamaño:
+            matriz = matriz_aleatoria(*tamaño)
+        else:
+            matriz = cargar_datos(argumentos.datos)[0]["matriz_funcional"]
+        perfiles = matriz["perfiles"]
+        if argumentos.perfiles:
+            perfiles = perfiles + leer_perfiles(argumentos.perfiles, matriz)
+        importar_numpy()
+        inicio = time.perf_counter()
+        clasificacion = clasificar(matriz, perfiles, limite=5)
+        duracion = (time.perf_counter() - inicio) * 1000
+    except (ErrorDatos, ErrorMatriz, ImportError) as error:
+        print(f"❌ {error}")
+        return 1
+
+    print(f"{len(matriz['productos'])} productos × {len(matriz['funcionalidades'])} funcionalidades × "
+          f"{len(perfiles)} perfiles clasificados en {duracion:.2f} ms")
+    for perfil in clasificacion["perfiles"]:
+        mejores = ", ".join(f"{matriz['productos'][i]['nombre']} {perfil['notas'][i]:.2f}" for i in perfil["orden"])
+        print(f"  {perfil['nombre']}: {mejores}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+"""
+OCUPACIÓN DE LA AGENDA
+Calcula, a partir de los volcados de bd/, qué parte de la agenda de cada doctor
+está ocupada por día de la semana y franja de 30 minutos, en la misma rejilla de
+8:00 a 18:00 que ofrece obtenerHorariosDisponibles (citasController.js).
+
+Se cuentan las citas de `citas` y de `citas_estetica` (id_estilista también es un
+doctor) que no están canceladas ni marcadas como no asistidas, con su duración:
+duracion_minutos en las citas, duracion_real o duracion_estimada en estética. La
+ocupación de una franja son los minutos citados en ella entre los minutos que tuvo
+disponibles en el periodo de los volcados (30 por cada día de esa semana).
+
+Las tablas se cargan en columnas (tabla_columnar) y el reparto por franjas se
+calcula con NumPy sobre todas las citas a la vez. El resultado se guarda por mtime
+y tamaño de los volcados, como el escáner del repositorio. Desde extras/:
+
+    python -m analisis_sisvet.ocupacion_citas ../bd
+"""
+
+import glob
+import hashlib
+import marshal
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+from .tabla_columnar import NULO_ENTERO, NULO_FECHA, cargar_tablas, importar_numpy
+
+# Incrementar al cambiar el cálculo para descartar los resultados guardados
+VERSION_OCUPACION = 1
+
+# Rejilla de obtenerHorariosDisponibles: de 8:00 a 18:00 en franjas de 30 minutos
+HORA_INICIO = 8
+HORA_FIN = 18
+MINUTOS_FRANJA = 30
+
+DIAS_SEMANA = ("Lun", "Mar", "Mié", "Jue", "Vie", "Sáb", "Dom")
+
+# Estados que no ocupan la agenda (los mismos que descarta obtenerHorariosDisponibles)
+ESTADOS_LIBRES = ("cancelada", "no_asistio")
+
+# Tabla de citas: (columna del doctor, columnas de duración por preferencia, duración por defecto)
+TABLAS_CITAS = {
+    "citas": ("id_doctor", ("duracion_minutos",), 30),
+    "citas_estetica": ("id_estilista", ("duracion_real", "duracion_estimada"), 60),
+}
+
+_COLUMNAS = {
+    "citas": ["id_doctor", "fecha", "hora", "duracion_minutos", "estado"],
+    "citas_estetica": ["id_estilista", "fecha", "hora", "duracion_real", "duracion_estimada", "estado"],
+    "doctores": ["id", "id_usuario"],
+    "usuarios": ["id", "nombre", "apellidos", "id_licencia_clinica"],
+}
+
+# 1970-01-01 fue jueves: (días desde la época + 3) % 7 da 0 para el lunes
+_DESPLAZAMIENTO_LUNES = 3
+
+
+def franjas():
+    """Etiquetas de las franjas de la rejilla: '08:00', '08:30', ..., '17:30'"""
+    return [f"{minuto // 60:02d}:{minuto % 60:02d}"
+            for minuto in range(HORA_INICIO * 60, HORA_FIN * 60, MINUTOS_FRANJA)]
+
+
+def _rutas_volcados(volcados):
+    rutas = sorted(glob.glob(os.path.join(volcados, "*.sql")))
+    # Cada tabla suele estar en un volcado con su nombre: así no se recorren los demás
+    propias = [r for r in rutas if any(os.path.basename(r).endswith(f"_{tabla}.sql") for tabla in _COLUMNAS)]
+    return propias or rutas
+
+
+def _minutos_ocupados(np, tablas, numero_franjas):
+    """Minutos citados por (doctor, día de la semana, franja) y rango de fechas de las citas"""
+    doctores, fechas, inicios, duraciones = [], [], [], []
+    for nombre, (columna_doctor, columnas_duracion, defecto) in TABLAS_CITAS.items():
+        tabla = tablas.get(nombre)
+        if tabla is None or not len(tabla):
+            continue
+        fecha = tabla.vector("fecha")
+        hora = tabla.vector("hora")
+        validas = ~tabla.filtrar("estado", "in", ESTADOS_LIBRES) & (fecha != NULO_FECHA) & (hora != NULO_FECHA)
+        # La primera columna de duración con valor; si ninguna lo tiene, la duración por defecto
+        duracion = np.full(len(tabla), defecto, dtype=np.int64)
+        for columna in reversed(columnas_duracion):
+            vector = tabla.vector(columna)
+            duracion = np.where(vector != NULO_ENTERO, vector, duracion)
+        doctores.append(tabla.vector(columna_doctor)[validas])
+        fechas.append(fecha[validas].astype(np.int64))
+        inicios.append(hora[validas].astype(np.int64) // 60)
+        duraciones.append(duracion[validas])
+
+    if not doctores or not sum(len(f) for f in fechas):
+        return [], np.zeros((0, 7, numero_franjas)), None, None
+    doctor = np.concatenate(doctores)
+    fecha = np.concatenate(fechas)
+    inicio = np.concatenate(inicios)
+    fin = inicio + np.maximum(np.concatenate(duraciones), 0)
+
+    ids, indice_doctor = np.unique(doctor, return_inverse=True)
+    grupo = indice_doctor.reshape(-1) * 7 + (fecha + _DESPLAZAMIENTO_LUNES) % 7
+    minutos = np.empty((len(ids) * 7, numero_franjas))
+    for franja in range(numero_franjas):
+        desde = HORA_INICIO * 60 + franja * MINUTOS_FRANJA
+        solape = np.minimum(fin, desde + MINUTOS_FRANJA) - np.maximum(inicio, desde)
+        minutos[:, franja] = np.bincount(grupo, weights=np.maximum(solape, 0), minlength=len(ids) * 7)
+    return ids.tolist(), minutos.reshape(len(ids), 7, numero_franjas), int(fecha.min()), int(fecha.max())
+
+
+def _calcular(volcados):
+    """Minutos ocupados por doctor, sin filtrar por clínica (lo que se guarda en caché)"""
+    np = importar_numpy()
+    tablas = cargar_tablas(_rutas_volcados(volcados), list(_COLUMNAS), columnas=_COLUMNAS)
+    numero_franjas = len(franjas())
+    ids, minutos, desde, hasta = _minutos_ocupados(np, tablas, numero_franjas)
+
+    usuarios = {}
+    if "usuarios" in tablas:
+        usuarios_tabla = tablas["usuarios"]
+        usuarios = {
+            id_usuario: (f"{nombre} {apellidos}".strip(), licencia)
+            for id_usuario, nombre, apellidos, licencia in zip(
+                *(usuarios_tabla.valores(c) for c in ("id", "nombre", "apellidos", "id_licencia_clinica"))
+            )
+        }
+    usuario_doctor = {}
+    if "doctores" in tablas:
+        usuario_doctor = dict(zip(tablas["doctores"].valores("id"), tablas["doctores"].valores("id_usuario")))
+
+    doctores = []
+    for posicion, id_doctor in enumerate(ids):
+        if id_doctor == NULO_ENTERO:
+            nombre, licencia = "Sin asignar", None
+        else:
+            nombre, licencia = usuarios.get(usuario_doctor.get(id_doctor), (f"Doctor {id_doctor}", None))
+        doctores.append({
+            "id": None if id_doctor == NULO_ENTERO else id_doctor,
+            "nombre": nombre,
+            "id_licencia_clinica": licencia,
+            "minutos": minutos[posicion].tolist(),
+        })
+    return {"desde": desde, "hasta": hasta, "doctores": doctores}
+
+
+def _ruta_cache(volcados, directorio_cache):
+    identificador = hashlib.sha256(os.path.abspath(volcados).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(directorio_cache, f"ocupacion-{identificador}.marshal")
+
+
+def _firma(volcados):
+    return [(os.path.basename(r), os.stat(r).st_mtime_ns, os.stat(r).st_size) for r in _rutas_volcados(volcados)]
+
+
+def _leer_cache(ruta, firma):
+    try:
+        with open(ruta, "rb") as archivo:
+            cache = marshal.loads(archivo.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    if cache.get("version") != VERSION_OCUPACION or cache.get("firma") != firma:
+        return None
+    return cache["resultado"]
+
+
+def _escribir_cache(ruta, firma, resultado):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(marshal.dumps({"version": VERSION_OCUPACION, "firma": firma, "resultado": resultado}))
+    os.replace(temporal, ruta)
+
+
+def calcular_ocupacion(volcados, id_clinica=None, directorio_cache=None):
+    """Ocupación de la agenda de los doctores de los volcados de `volcados`.
+
+    Con `id_clinica` solo se incluyen los doctores cuyo usuario pertenece a esa
+    licencia. Devuelve (ocupacion, desde_cache); ocupacion es None si no hay citas.
+    La ocupación de cada doctor es una matriz [franja][día] de fracciones (1.0 =
+    franja llena todos los días de ese tipo del periodo).
+    """
+    firma = _firma(volcados)
+    resultado = None
+    if directorio_cache:
+        ruta_cache = _ruta_cache(volcados, directorio_cache)
+        resultado = _leer_cache(ruta_cache, firma)
+    desde_cache = resultado is not None
+    if resultado is None:
+        resultado = _calcular(volcados)
+        if directorio_cache:
+            _escribir_cache(ruta_cache, firma, resultado)
+
+    doctores = [d for d in resultado["doctores"] if id_clinica is None or d["id_licencia_clinica"] == id_clinica]
+    if not doctores:
+        return None, desde_cache
+
+    # Minutos disponibles por franja en cada día de la semana del periodo
+    desde, hasta = resultado["desde"], resultado["hasta"]
+    dias = [0] * 7
+    for dia in range(desde, hasta + 1):
+        dias[(dia + _DESPLAZAMIENTO_LUNES) % 7] += 1
+
+    def ocupacion(minutos):
+        return [
+            [round(minutos[dia][franja] / (dias[dia] * MINUTOS_FRANJA), 3) if dias[dia] else 0.0 for dia in range(7)]
+            for franja in range(len(minutos[0]))
+        ]
+
+    # La clínica en conjunto: los minutos de todos entre la agenda de los doctores asignados
+    asignados = max(1, sum(1 for d in doctores if d["id"] is not None))
+    total = [[sum(d["minutos"][dia][franja] for d in doctores) / asignados for franja in range(len(franjas()))]
+             for dia in range(7)]
+    epoca = date(1970, 1, 1)
+    return {
+        "desde": (epoca + timedelta(days=desde)).isoformat(),
+        "hasta": (epoca + timedelta(days=hasta)).isoformat(),
+        "franjas": franjas(),
+        "dias": list(DIAS_SEMANA),
+        "total": ocupacion(total),
+        "doctores": [{"nombre": d["nombre"], "ocupacion": ocupacion(d["minutos"])} for d in doctores],
+    }, desde_cache
+
+
+def main(argumentos):
+    if not argumentos:
+        print("uso: python -m analisis_sisvet.ocupacion_citas DIRECTORIO_VOLCADOS [ID_CLINICA]")
+        return 2
+    inicio = time.perf_counter()
+    ocupacion, _ = calcular_ocupacion(argumentos[0], int(argumentos[1]) if len(argumentos) > 1 else None)
+    segundos = time.perf_counter() - inicio
+    if ocupacion is None:
+        print("Sin citas en los volcados")
+        return 0
+    print(f"Citas del {ocupacion['desde']} al {ocupacion['hasta']}, {len(ocupacion['doctores'])} doctores "
+          f"({segundos:.2f} s)")
+    for doctor in [{"nombre": "Total", "ocupacion": ocupacion["total"]}] + ocupacion["doctores"]:
+        print(f"\n{doctor['nombre']}\n       " + " ".join(f"{dia:>4}" for dia in ocupacion["dias"]))
+        for franja, fila in zip(ocupacion["franjas"], doctor["ocupacion"]):
+            print(f"{franja}  " + " ".join(f"{valor:>4.0%}" for valor in fila))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,349 @@
+"""
+PLANTILLAS DE LAS SECCIONES
+Cada sección del documento es un archivo de plantillas/ que se compila una sola
+vez a una función de Python. El código compilado se guarda en
+plantillas/__pycache__ con la huella SHA-256 del archivo en el nombre: editar la
+plantilla cambia la huella y la siguiente ejecución la vuelve a compilar; las
+demás ejecuciones solo leen el código ya compilado.
+
+Sintaxis (un subconjunto de la de Jinja, con expresiones de Python):
+
+    {{ expresion }}              valor escapado con html.escape
+    {{ expresion:,.1f }}         con especificación de formato (como en los f-strings)
+    {{ expresion|safe }}         HTML ya preparado, sin escapar
+    {% for a, b in expresion %} ... {% endfor %}
+    {% if expresion %} ... {% elif expresion %} ... {% else %} ... {% endif %}
+    {% set nombre = expresion %}
+    {# comentario #}
+
+Las llaves sueltas del CSS y del JavaScript se escriben tal cual. Una etiqueta
+{% %} o {# #} sola en su línea no deja la línea en la salida. Los nombres libres
+de las expresiones son los argumentos de render(), que entrega el HTML en
+fragmentos (un generador, como las secciones): faltar uno es un TypeError.
+"""
+
+import builtins
+import hashlib
+import html
+import marshal
+import os
+import re
+import sys
+import tempfile
+
+# Incrementar al cambiar el código que genera compilar(): invalida lo compilado en disco
+# y las secciones guardadas por CacheSecciones (entra en su huella del código)
+VERSION_COMPILADOR = 1
+
+DIRECTORIO_PLANTILLAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "plantillas")
+
+_ETIQUETA = re.compile(r"{{(.*?)}}|{%(.*?)%}|{#.*?#}", re.S)
+_SEGURO = re.compile(r"\|\s*safe\s*$")
+_ESPECIFICACION = re.compile(r"[^{}]*")
+# Tipos de formato numéricos: su resultado nunca necesita escaparse
+_TIPOS_NUMERICOS = frozenset("bcdeEfFgGnoxX%")
+_BUILTINS = frozenset(dir(builtins))
+
+
+class ErrorPlantilla(ValueError):
+    """Plantilla con una sintaxis que no se puede compilar"""
+
+
+def escapar(valor):
+    """Texto de `valor` listo para HTML; el texto sin caracteres especiales no pasa por html.escape"""
+    if type(valor) is not str:
+        if type(valor) in (int, float):
+            return str(valor)
+        valor = str(valor)
+    # Cinco búsquedas cuestan menos de la mitad que las cinco sustituciones de html.escape
+    if "&" in valor or "<" in valor or ">" in valor or '"' in valor or "'" in valor:
+        return html.escape(valor)
+    return valor
+
+
+def _expresion(texto, nombre, linea):
+    """Árbol de una expresión de la plantilla, con el error en la línea de la plantilla"""
+    import ast
+
+    try:
+        return ast.parse(texto.strip(), mode="eval").body
+    except SyntaxError as error:
+        raise ErrorPlantilla(f"{nombre}:{linea}: expresión inválida {texto.strip()!r} ({error.msg})") from None
+
+
+def _valor(texto, nombre, linea):
+    """(expresión, especificación de formato, seguro) del contenido de {{ }}"""
+    import ast
+
+    seguro = _SEGURO.search(texto)
+    if seguro:
+        texto = texto[:seguro.start()]
+    try:
+        return ast.parse(texto.strip(), mode="eval").body, "", bool(seguro)
+    except SyntaxError:
+        # Como en los f-strings: lo que sigue a los últimos dos puntos es el formato
+        expresion, _, especificacion = texto.rpartition(":")
+        if not expresion or not _ESPECIFICACION.fullmatch(especificacion):
+            raise ErrorPlantilla(f"{nombre}:{linea}: expresión inválida {texto.strip()!r}") from None
+        return _expresion(expresion, nombre, linea), especificacion.strip(), bool(seguro)
+
+
+def _tokens(fuente):
+    """Texto y etiquetas de la plantilla: ("texto"|"valor"|"bloque", contenido, línea).
+
+    Las etiquetas {% %} y {# #} solas en su línea se llevan la sangría y el salto de línea.
+    """
+    tokens = []
+    posicion = 0
+    linea = 1
+    for etiqueta in _ETIQUETA.finditer(fuente):
+        inicio, fin = etiqueta.span()
+        texto = fuente[posicion:inicio]
+        principio_linea = fuente.rfind("\n", 0, inicio) + 1
+        if (etiqueta.group(1) is None and principio_linea >= posicion
+                and not fuente[principio_linea:inicio].strip(" \t")
+                and (fin == len(fuente) or fuente[fin] == "\n")):
+            texto = fuente[posicion:principio_linea]
+            fin = min(fin + 1, len(fuente))
+        if texto:
+            tokens.append(("texto", texto, linea))
+        linea += fuente.count("\n", posicion, inicio)
+        if etiqueta.group(1) is not None:
+            tokens.append(("valor", etiqueta.group(1), linea))
+        elif etiqueta.group(2) is not None:
+            tokens.append(("bloque", etiqueta.group(2).strip(), linea))
+        linea += fuente.count("\n", inicio, fin)
+        posicion = fin
+    if posicion < len(fuente):
+        tokens.append(("texto", fuente[posicion:], linea))
+    return tokens
+
+
+def _nombres(arbol, usados, ligados):
+    """Añade los nombres que lee `arbol` a `usados` y los que asigna (comprensiones, lambdas) a `ligados`"""
+    import ast
+
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.Name):
+            (usados if isinstance(nodo.ctx, ast.Load) else ligados).add(nodo.id)
+        elif isinstance(nodo, ast.arg):
+            ligados.add(nodo.arg)
+
+
+def _sentencia(codigo, nombre, linea):
+    """Sentencia de Python de una etiqueta {% %} (con cuerpo vacío si es un bloque)"""
+    import ast
+
+    try:
+        return ast.parse(codigo).body[0]
+    except SyntaxError as error:
+        raise ErrorPlantilla(f"{nombre}:{linea}: etiqueta inválida {{% {codigo.rstrip(':').rstrip()} %}} ({error.msg})") from None
+
+
+# Escapado en línea: los números y el texto sin caracteres especiales no llaman a escapar()
+_EN_LINEA = ("_v if (_t := (_v := VALOR).__class__) is int or _t is float or _t is str and not "
+             "('&' in _v or '<' in _v or '>' in _v or '\"' in _v or \"'\" in _v) else _escapar(_v)")
+
+
+def _escapado(expresion):
+    """Expresión que escapa el valor de `expresion` evaluándola una sola vez"""
+    import ast
+
+    arbol = ast.parse(_EN_LINEA, mode="eval").body
+    for nodo in ast.walk(arbol):
+        if isinstance(nodo, ast.NamedExpr) and isinstance(nodo.value, ast.Name) and nodo.value.id == "VALOR":
+            nodo.value = expresion
+    return arbol
+
+
+def compilar(fuente, nombre="<plantilla>"):
+    """Código de un módulo que define el generador render(**contexto) de la plantilla `fuente`.
+
+    Cada tramo de texto y valores entre dos etiquetas {% %} se convierte en un solo
+    f-string que se entrega con yield, así que renderizar cuesta casi lo mismo que
+    el f-string escrito a mano.
+    """
+    import ast
+
+    usados, ligados, locales = set(), set(), set()
+    raiz = []
+    # (etiqueta que abrió el bloque, nodo, cuerpo en el que se escribe, línea)
+    pila = [(None, None, raiz, 0)]
+    partes = []
+
+    def vaciar():
+        if partes:
+            cadena = ast.JoinedStr(values=list(partes))
+            if all(isinstance(parte, ast.Constant) for parte in partes):
+                cadena = ast.Constant("".join(parte.value for parte in partes))
+            pila[-1][2].append(ast.Expr(ast.Yield(cadena)))
+            partes.clear()
+
+    def cerrar_cuerpo():
+        if not pila[-1][2]:
+            pila[-1][2].append(ast.Pass())
+
+    def fragmentos(nodo):
+        cadena = nodo.value.value
+        return list(cadena.values) if isinstance(cadena, ast.JoinedStr) else [cadena]
+
+    def unir_bucle(nodo):
+        # Un {% for %} dentro de otro que solo escribe texto y valores se convierte en un
+        # join dentro del f-string que lo rodea: el bucle exterior entrega un fragmento
+        # por vuelta, como el código escrito a mano
+        cuerpo = pila[-1][2]
+        if not all(isinstance(hijo, ast.Expr) and isinstance(hijo.value, ast.Yield) for hijo in nodo.body):
+            return
+        cuerpo.pop()
+        elemento = [parte for hijo in nodo.body for parte in fragmentos(hijo)]
+        union = ast.Call(ast.Attribute(ast.Constant(""), "join", ast.Load()), [ast.ListComp(
+            ast.JoinedStr(elemento), [ast.comprehension(nodo.target, nodo.iter, [], 0)])], [])
+        if cuerpo and isinstance(cuerpo[-1], ast.Expr) and isinstance(cuerpo[-1].value, ast.Yield):
+            partes.extend(fragmentos(cuerpo.pop()))
+        partes.append(ast.FormattedValue(union, -1, None))
+
+    for tipo, contenido, linea in _tokens(fuente):
+        if tipo == "texto":
+            if partes and isinstance(partes[-1], ast.Constant):
+                partes[-1] = ast.Constant(partes[-1].value + contenido)
+            else:
+                partes.append(ast.Constant(contenido))
+            continue
+        if tipo == "valor":
+            expresion, especificacion, seguro = _valor(contenido, nombre, linea)
+            _nombres(expresion, usados, ligados)
+            formato = ast.JoinedStr([ast.Constant(especificacion)]) if especificacion else None
+            numerico = especificacion[-1:] in _TIPOS_NUMERICOS or "," in especificacion or "_" in especificacion
+            if seguro or numerico:
+                partes.append(ast.FormattedValue(expresion, -1, formato))
+            elif formato is None:
+                partes.append(ast.FormattedValue(_escapado(expresion), -1, None))
+            else:
+                con_formato = ast.Call(ast.Name("format", ast.Load()), [expresion, ast.Constant(especificacion)], [])
+                partes.append(ast.FormattedValue(ast.Call(ast.Name("_escapar", ast.Load()), [con_formato], []), -1, None))
+            continue
+
+        vaciar()
+        palabra, _, resto = contenido.partition(" ")
+        if palabra in ("for", "if"):
+            nodo = _sentencia(f"{contenido}:\n    pass", nombre, linea)
+            nodo.body = []
+            _nombres(nodo.iter if palabra == "for" else nodo.test, usados, ligados)
+            if palabra == "for":
+                _nombres(nodo.target, usados, locales)
+            pila[-1][2].append(nodo)
+            pila.append((palabra, nodo, nodo.body, linea))
+        elif palabra == "elif":
+            if pila[-1][0] != "if":
+                raise ErrorPlantilla(f"{nombre}:{linea}: {{% elif %}} fuera de un {{% if %}}")
+            cerrar_cuerpo()
+            nodo = _sentencia(f"if {resto}:\n    pass", nombre, linea)
+            nodo.body = []
+            _nombres(nodo.test, usados, ligados)
+            pila[-1][1].orelse = [nodo]
+            pila[-1] = ("if", nodo, nodo.body, pila[-1][3])
+        elif palabra == "else" and not resto:
+            if pila[-1][0] != "if":
+                raise ErrorPlantilla(f"{nombre}:{linea}: {{% else %}} fuera de un {{% if %}}")
+            cerrar_cuerpo()
+            pila[-1] = ("else", pila[-1][1], pila[-1][1].orelse, pila[-1][3])
+        elif palabra in ("endfor", "endif") and not resto:
+            if pila[-1][0] not in ({"endfor": ("for",), "endif": ("if", "else")}[palabra]):
+                raise ErrorPlantilla(f"{nombre}:{linea}: {{% {palabra} %}} sin el bloque que cierra")
+            cerrar_cuerpo()
+            _, nodo, _, _ = pila.pop()
+            if palabra == "endfor" and any(entrada[0] == "for" for entrada in pila):
+                unir_bucle(nodo)
+        elif palabra == "set":
+            nodo = _sentencia(resto, nombre, linea)
+            if not isinstance(nodo, ast.Assign):
+                raise ErrorPlantilla(f"{nombre}:{linea}: {{% set %}} necesita una asignación")
+            _nombres(nodo.value, usados, ligados)
+            for destino in nodo.targets:
+                _nombres(destino, usados, locales)
+            pila[-1][2].append(nodo)
+        else:
+            raise ErrorPlantilla(f"{nombre}:{linea}: etiqueta desconocida {{% {contenido} %}}")
+    vaciar()
+    if len(pila) > 1:
+        raise ErrorPlantilla(f"{nombre}:{pila[-1][3]}: {{% {pila[-1][0]} %}} sin cerrar")
+
+    # Los nombres libres son los argumentos (solo por nombre) de render()
+    argumentos = sorted(usados - ligados - locales - _BUILTINS)
+    parametros = "".join(f"{argumento}, " for argumento in argumentos)
+    funcion = ast.parse(
+        f"def render({'*, ' if argumentos else ''}{parametros}**_resto):\n"
+        "    yield ''\n"
+    )
+    # Sin ningún yield (plantilla vacía o solo con {% set %}) render() no sería un generador
+    if any(isinstance(nodo, ast.Yield) for nodo in ast.walk(ast.Module(raiz, []))):
+        funcion.body[0].body[:] = raiz
+    else:
+        funcion.body[0].body[:0] = raiz
+    return compile(ast.fix_missing_locations(funcion), nombre, "exec")
+
+
+class Plantilla:
+    """Plantilla de `directorio` que se compila (o se lee ya compilada) la primera vez que se usa"""
+
+    def __init__(self, nombre, directorio=DIRECTORIO_PLANTILLAS):
+        self.nombre = nombre
+        self.ruta = os.path.join(directorio, nombre)
+        self._estado = None
+        self._huella = None
+        self._fuente = None
+        self._render = None
+
+    def huella(self):
+        """Huella SHA-256 del archivo; se vuelve a leer solo si cambian su fecha o su tamaño"""
+        estado = os.stat(self.ruta)
+        if (estado.st_mtime_ns, estado.st_size) != self._estado:
+            with open(self.ruta, "rb") as archivo:
+                self._fuente = archivo.read()
+            self._huella = hashlib.sha256(self._fuente).hexdigest()
+            self._estado = (estado.st_mtime_ns, estado.st_size)
+            self._render = None
+        return self._huella
+
+    def _ruta_compilada(self, huella):
+        base = os.path.splitext(self.nombre)[0]
+        return os.path.join(os.path.dirname(self.ruta), "__pycache__",
+                            f"{base}.{sys.implementation.cache_tag}-{VERSION_COMPILADOR}.{huella[:32]}.marshal")
+
+    def cargar(self):
+        """Función render() de la plantilla, compilada solo si no está en __pycache__ con la huella actual"""
+        huella = self.huella()
+        if self._render is not None:
+            return self._render
+        ruta = self._ruta_compilada(huella)
+        try:
+            with open(ruta, "rb") as archivo:
+                codigo = marshal.load(archivo)
+        except (OSError, EOFError, ValueError, TypeError):
+            codigo = compilar(self._fuente.decode("utf-8"), self.ruta)
+            self._guardar(ruta, codigo)
+        espacio = {"_escapar": escapar}
+        exec(codigo, espacio)
+        self._render = espacio["render"]
+        self._fuente = None
+        return self._render
+
+    def _guardar(self, ruta, codigo):
+        """Guarda el código compilado y borra el de versiones anteriores (sin permisos de escritura, no se guarda)"""
+        directorio = os.path.dirname(ruta)
+        prefijo = f"{os.path.splitext(self.nombre)[0]}."
+        try:
+            os.makedirs(directorio, exist_ok=True)
+            descriptor, temporal = tempfile.mkstemp(prefix=f".{prefijo}", suffix=".tmp", dir=directorio)
+            with os.fdopen(descriptor, "wb") as archivo:
+                marshal.dump(codigo, archivo)
+            os.replace(temporal, ruta)
+            for nombre in os.listdir(directorio):
+                if nombre.startswith(prefijo) and nombre.endswith(".marshal") and nombre != os.path.basename(ruta):
+                    os.unlink(os.path.join(directorio, nombre))
+        except OSError:
+            pass
+
+    def render(self, **contexto):
+        """Fragmentos del HTML de la plantilla con los valores de `contexto`"""
+        return self.cargar()(**contexto)
@@ -0,0 +1,197 @@
+"""
+PROYECCIÓN DE INGRESOS MONTE CARLO
+Simula en bloque miles de trayectorias del negocio mes a mes y resume el ingreso
+mensual recurrente (MRR) de cada mes con sus percentiles P10/P50/P90, en lugar de
+los dos escenarios fijos de 12 meses de graficas.json.
+
+Cada trayectoria sortea una vez sus parámetros (la incertidumbre sobre el
+mercado) y después el azar de cada mes:
+
+- altas: Poisson de media min(inicio · (1 + crecimiento)^mes, máximo), escalada
+  por un multiplicador log-normal propio de la trayectoria
+- bajas: binomial de los clientes activos con un churn mensual Beta propio
+- mezcla de planes: Dirichlet alrededor de las proporciones de los datos; el MRR
+  son los clientes por el precio medio de esa mezcla (precios de la sección de costos)
+
+Todas las trayectorias avanzan a la vez con NumPy (un paso vectorizado por mes).
+Cuando la media de un conteo pasa de UMBRAL_NORMAL se usa su aproximación normal,
+que NumPy sortea mucho más rápido que la Poisson y la binomial exactas. El
+resultado se guarda por parámetros: la semilla es fija y se reproduce igual.
+Desde extras/:
+
+    python -m analisis_sisvet.proyeccion --trayectorias 100000 --meses 60
+"""
+
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import sys
+import time
+
+from .cifras import primer_mes
+from .datos import ErrorDatos, cargar_datos
+from .tabla_columnar import importar_numpy
+
+# Incrementar al cambiar la simulación para descartar los resultados guardados
+VERSION_PROYECCION = 1
+
+PERCENTILES = (10, 50, 90)
+
+# Media a partir de la cual los conteos se sortean con la aproximación normal
+UMBRAL_NORMAL = 10
+
+
+class ErrorProyeccion(ValueError):
+    """Los parámetros de la proyección no permiten simular"""
+
+
+def _conteos_poisson(np, rng, medias):
+    """Poisson exacta para medias pequeñas y normal redondeada para las demás"""
+    resultado = np.empty(medias.shape, dtype=np.int64)
+    pequeñas = medias < UMBRAL_NORMAL
+    resultado[pequeñas] = rng.poisson(medias[pequeñas])
+    grandes = medias[~pequeñas]
+    resultado[~pequeñas] = np.maximum(np.rint(grandes + np.sqrt(grandes) * rng.standard_normal(grandes.size)), 0)
+    return resultado
+
+
+def _conteos_binomial(np, rng, ensayos, probabilidades):
+    """Binomial exacta para medias pequeñas y normal redondeada (entre 0 y `ensayos`) para las demás"""
+    medias = ensayos * probabilidades
+    resultado = np.empty(ensayos.shape, dtype=np.int64)
+    pequeñas = medias < UMBRAL_NORMAL
+    resultado[pequeñas] = rng.binomial(ensayos[pequeñas], probabilidades[pequeñas])
+    grandes = medias[~pequeñas]
+    desviacion = np.sqrt(grandes * (1 - probabilidades[~pequeñas]))
+    resultado[~pequeñas] = np.clip(np.rint(grandes + desviacion * rng.standard_normal(grandes.size)), 0,
+                                   ensayos[~pequeñas])
+    return resultado
+
+
+def _beta(np, rng, media, desviacion, tamaño):
+    """Beta con la media y la desviación dadas (método de los momentos)"""
+    if desviacion <= 0:
+        return np.full(tamaño, media)
+    comun = media * (1 - media) / desviacion ** 2 - 1
+    if comun <= 0:
+        raise ErrorProyeccion(f"churn: desviación {desviacion} demasiado grande para la media {media}")
+    return rng.beta(media * comun, (1 - media) * comun, tamaño)
+
+
+def simular(parametros, meses=None, trayectorias=None, semilla=None):
+    """Simula las trayectorias de `parametros` (la tabla `proyeccion` de los datos).
+
+    Devuelve {"meses", "trayectorias", "semilla", "percentiles", "mrr": {"p10",
+    "p50", "p90"}, "clientes": {...}, "acumulado", "equilibrio",
+    "costos_fijos_mxn", "arpu_mxn", "segundos"}. "mrr" y "clientes" tienen una
+    lista por percentil con un valor por mes; "acumulado" son los percentiles del
+    ingreso total del horizonte y "equilibrio" es, por mes, la fracción de
+    trayectorias cuyo MRR cubre los costos fijos.
+    """
+    np = importar_numpy()
+    meses = meses or parametros["meses"]
+    trayectorias = trayectorias or parametros["trayectorias"]
+    semilla = parametros["semilla"] if semilla is None else semilla
+    if meses < 1 or trayectorias < 1:
+        raise ErrorProyeccion("se necesita al menos un mes y una trayectoria")
+    inicio = time.perf_counter()
+    rng = np.random.default_rng(semilla)
+
+    altas, churn, planes = parametros["altas"], parametros["churn"], parametros["planes"]
+    multiplicador = np.exp(rng.normal(0.0, altas["incertidumbre"], trayectorias))
+    tasa_churn = _beta(np, rng, churn["media"], churn["desviacion"], trayectorias)
+    proporciones = np.asarray([plan["proporcion"] for plan in planes], dtype=np.float64)
+    mezcla = rng.dirichlet(proporciones / proporciones.sum() * parametros["concentracion_planes"], trayectorias)
+    arpu = (mezcla @ np.asarray([plan["precio_mxn"] for plan in planes], dtype=np.float64)).astype(np.float32)
+
+    activos = np.zeros(trayectorias, dtype=np.int64)
+    clientes = np.empty((meses, trayectorias), dtype=np.int32)
+    for mes in range(meses):
+        media_altas = min(altas["inicio"] * (1 + altas["crecimiento_mensual"]) ** mes, altas["maximo"])
+        activos += _conteos_poisson(np, rng, media_altas * multiplicador) - _conteos_binomial(np, rng, activos, tasa_churn)
+        clientes[mes] = activos
+
+    mrr = clientes * arpu
+    resumen = {}
+    for nombre, matriz in (("mrr", mrr), ("clientes", clientes)):
+        bandas = np.percentile(matriz, PERCENTILES, axis=1)
+        resumen[nombre] = {f"p{p}": [round(float(v)) for v in banda] for p, banda in zip(PERCENTILES, bandas)}
+    acumulado = np.percentile(mrr.sum(axis=0, dtype=np.float64), PERCENTILES)
+    resumen["acumulado"] = {f"p{p}": round(float(v)) for p, v in zip(PERCENTILES, acumulado)}
+    costos = parametros["costos_fijos_mxn"]
+    resumen.update({
+        "meses": meses,
+        "trayectorias": trayectorias,
+        "semilla": semilla,
+        "percentiles": list(PERCENTILES),
+        "equilibrio": [round(float(v), 4) for v in (mrr >= costos).mean(axis=1)],
+        "costos_fijos_mxn": costos,
+        "arpu_mxn": round(float(arpu.mean()), 2),
+        "segundos": time.perf_counter() - inicio,
+    })
+    return resumen
+
+
+def simular_en_cache(parametros, directorio_cache=None, meses=None, trayectorias=None):
+    """simular() guardando el resultado por parámetros; devuelve (resultado, desde_cache)"""
+    firma = hashlib.sha256(json.dumps([parametros, meses, trayectorias], sort_keys=True).encode("utf-8")).hexdigest()
+    ruta = os.path.join(directorio_cache, f"proyeccion-{firma[:16]}.marshal") if directorio_cache else None
+    if ruta:
+        try:
+            with open(ruta, "rb") as archivo:
+                cache = marshal.loads(archivo.read())
+            if cache.get("version") == VERSION_PROYECCION and cache.get("firma") == firma:
+                return cache["resultado"], True
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+    resultado = simular(parametros, meses, trayectorias)
+    if ruta:
+        os.makedirs(directorio_cache, exist_ok=True)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(marshal.dumps({"version": VERSION_PROYECCION, "firma": firma, "resultado": resultado}))
+        os.replace(temporal, ruta)
+    return resultado, False
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Proyección de ingresos Monte Carlo con bandas P10/P50/P90")
+    parser.add_argument("--datos", default="datos", help="directorio de datos con la tabla proyeccion")
+    parser.add_argument("--meses", type=int, help="horizonte (por defecto el de los datos)")
+    parser.add_argument("--trayectorias", type=int, help="trayectorias simuladas (por defecto las de los datos)")
+    parser.add_argument("--json", action="store_true", help="imprime el resultado completo en JSON")
+    argumentos = parser.parse_args(argumentos)
+
+    try:
+        datos, _ = cargar_datos(argumentos.datos)
+        if "proyeccion" not in datos:
+            raise ErrorProyeccion(f"{argumentos.datos}: los datos no tienen la tabla proyeccion")
+        resultado = simular(datos["proyeccion"], argumentos.meses, argumentos.trayectorias)
+    except (ErrorDatos, ErrorProyeccion, ImportError) as error:
+        print(f"❌ {error}")
+        return 1
+    if argumentos.json:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        return 0
+
+    print(f"{resultado['trayectorias']:,} trayectorias × {resultado['meses']} meses en {resultado['segundos']:.2f} s "
+          f"(ARPU medio ${resultado['arpu_mxn']:,.0f} MXN)")
+    print(f"{'mes':>5} {'clientes P50':>13} {'MRR P10':>12} {'MRR P50':>12} {'MRR P90':>12} {'equilibrio':>11}")
+    mrr, clientes = resultado["mrr"], resultado["clientes"]
+    for mes in sorted({1, 3, 6, *range(12, resultado["meses"] + 1, 12), resultado["meses"]}):
+        i = mes - 1
+        print(f"{mes:>5} {clientes['p50'][i]:>13,} {mrr['p10'][i]:>12,} {mrr['p50'][i]:>12,} {mrr['p90'][i]:>12,} "
+              f"{resultado['equilibrio'][i]:>11.0%}")
+    mes = primer_mes(resultado["equilibrio"], 0.5)
+    print(f"Punto de equilibrio (${resultado['costos_fijos_mxn']:,} MXN/mes) en la mitad de las trayectorias: "
+          + (f"mes {mes}" if mes else "no se alcanza en el horizonte"))
+    acumulado = resultado["acumulado"]
+    print(f"Ingreso acumulado a {resultado['meses']} meses: P10 ${acumulado['p10']:,} · P50 ${acumulado['p50']:,} · "
+          f"P90 ${acumulado['p90']:,} MXN")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,600 @@
+"""
+CAPACIDAD DEL JOB DE RECORDATORIOS
+backend/jobs/reminderJobs.js envía a las 9:00 los recordatorios de las citas del
+día siguiente de uno en uno: por cada cita médica y después por cada cita de
+estética espera a emailRecordatorioCita(), que crea un transporte de nodemailer
+nuevo (conexión, EHLO, AUTH, MAIL, RCPT, DATA y QUIT con el servidor SMTP), y a un
+UPDATE citas SET recordatorio_enviado = TRUE de esa fila. Este módulo:
+
+- cuenta en los volcados los recordatorios de cada día: citas no canceladas cuyo
+  propietario tiene email (lo que el job encuentra la víspera)
+- reproduce el día más cargado contra un servidor SMTP local con RTT y tiempo de
+  aceptación del mensaje inyectados, y un servidor MySQL local (el de conexiones)
+  para los UPDATE, con tres estrategias: la actual, una conexión SMTP reutilizada
+  con un UPDATE por lote y un pool de conexiones concurrentes con UPDATE por lote
+- el servidor cuenta los viajes de ida y vuelta de cada fase (apertura de la
+  sesión, cada mensaje, cierre); con ellos se modela cuánto tarda cada estrategia
+  en enviar N recordatorios con el RTT y la latencia del proveedor configurados,
+  cuántos envía por minuto y cuántos caben en la ventana de la mañana
+
+El servidor SMTP acepta cualquier mensaje y no negocia STARTTLS: con TLS cada
+sesión suma unos VIAJES_TLS viajes más de apertura, que el modelo añade. Desde extras/:
+
+    python -m analisis_sisvet.recordatorios --rtt 30 --latencia 150
+    python -m analisis_sisvet.recordatorios --volcados /tmp/sisvet_50
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import marshal
+import math
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from datetime import date, timedelta
+
+from .cifras import HORA_JOB, hora_fin
+from .conexiones import ClienteMySQL, ServidorMySQL
+from .tabla_columnar import NULO_ENTERO, NULO_FECHA, cargar_tablas, importar_numpy
+
+# Incrementar al cambiar la medición para descartar las medidas guardadas
+VERSION_RECORDATORIOS = 1
+
+# Minutos desde HORA_JOB en los que deberían haber salido todos los recordatorios
+VENTANA_MINUTOS = 60
+
+# Red y proveedor del modelo: RTT hasta el servidor SMTP (ms), tiempo que tarda en
+# aceptar un mensaje tras el DATA (ms) y RTT hasta MySQL (ms)
+RTT_SMTP_MS = 30.0
+LATENCIA_SMTP_MS = 150.0
+RTT_BD_MS = 0.5
+
+# STARTTLS, el saludo de TLS 1.3 y el segundo EHLO
+VIAJES_TLS = 3
+
+# maxConnections por defecto de un transporte de nodemailer con pool: true
+CONCURRENCIA = 5
+
+# Tamaño aproximado del HTML que genera emailRecordatorioCita
+TAM_CORREO = 12 * 1024
+
+# RTT y latencia inyectados en la reproducción y correos que se envían
+RTT_PRUEBA_MS = 2.0
+LATENCIA_PRUEBA_MS = 5.0
+MUESTRA = 20
+
+# Estados de las citas que el job no recuerda (a la víspera ya no estaban programadas)
+ESTADOS_SIN_RECORDATORIO = ("cancelada",)
+
+# Tablas de citas en el orden del job: (tabla, tipo)
+TABLAS_CITAS = (("citas", "medica"), ("citas_estetica", "estetica"))
+
+# Estrategias: (descripción, conexión SMTP nueva por correo, conexiones simultáneas, UPDATE por lote)
+ESTRATEGIAS = {
+    "secuencial": ("Actual: un transporte nuevo por correo y un UPDATE por cita", True, 1, False),
+    "reutilizada": ("Una conexión SMTP reutilizada (pool: true, maxConnections: 1) y un UPDATE por lote", False, 1, True),
+    "concurrente": (f"Pool de {CONCURRENCIA} conexiones SMTP en paralelo y un UPDATE por lote", False, CONCURRENCIA, True),
+}
+
+# Puntos de la curva de capacidad
+PUNTOS_CURVA = 40
+
+_COLUMNAS = {
+    "citas": ["id", "id_paciente", "fecha", "estado"],
+    "citas_estetica": ["id", "id_paciente", "fecha", "estado"],
+    "pacientes": ["id", "id_propietario"],
+    "propietarios": ["id", "email"],
+}
+
+_REMITENTE = "recordatorios@sisvet.local"
+_UPDATE = "UPDATE {tabla} SET recordatorio_enviado = TRUE, fecha_recordatorio = NOW() WHERE id {condicion}"
+
+
+class ErrorRecordatorios(ValueError):
+    """Los volcados no tienen las citas o el servidor de pruebas respondió mal"""
+
+
+# ---------------------------------------------------------------------------
+# Volumen diario
+# ---------------------------------------------------------------------------
+
+def _rutas_volcados(volcados):
+    rutas = sorted(glob.glob(os.path.join(volcados, "*.sql")))
+    propias = [r for r in rutas if any(os.path.basename(r).endswith(f"_{tabla}.sql") for tabla in _COLUMNAS)]
+    return propias or rutas
+
+
+def _por_id(np, tabla, clave, valor, valores=None):
+    """Vector indexado por `clave` con `valor` (o `valores`) de cada fila; NULO_ENTERO donde no hay fila"""
+    ids = tabla.vector(clave)
+    validos = ids != NULO_ENTERO
+    resultado = np.full(int(ids[validos].max()) + 1 if validos.any() else 1, NULO_ENTERO, dtype=np.int64)
+    datos = tabla.vector(valor) if valores is None else valores
+    resultado[ids[validos]] = datos[validos]
+    return resultado
+
+
+def _buscar(np, tabla_por_id, ids):
+    dentro = (ids >= 0) & (ids < len(tabla_por_id))
+    return np.where(dentro, tabla_por_id[np.clip(ids, 0, len(tabla_por_id) - 1)], NULO_ENTERO)
+
+
+def volumen_diario(volcados):
+    """Recordatorios que el job habría enviado cada día según los volcados.
+
+    Devuelve {"dias": {fecha ISO: {"medica": n, "estetica": n}}, "pico": [(tipo,
+    id, email)]} con las citas del día más cargado en el orden en que las envía el job.
+    """
+    np = importar_numpy()
+    tablas = cargar_tablas(_rutas_volcados(volcados), list(_COLUMNAS), columnas=_COLUMNAS)
+    if not any(nombre in tablas and len(tablas[nombre]) for nombre, _ in TABLAS_CITAS):
+        raise ErrorRecordatorios(f"{volcados}: no hay citas en los volcados")
+    propietarios = tablas.get("propietarios")
+    emails = propietarios.valores("email") if propietarios is not None else []
+    con_email = np.asarray([bool(email and email.strip()) for email in emails], dtype=np.int64)
+    email_por_id = _por_id(np, propietarios, "id", None, con_email) if len(emails) else np.zeros(1, dtype=np.int64)
+    posicion_email = (_por_id(np, propietarios, "id", None, np.arange(len(emails), dtype=np.int64))
+                      if len(emails) else np.zeros(1, dtype=np.int64))
+    propietario_por_paciente = (_por_id(np, tablas["pacientes"], "id", "id_propietario")
+                                if "pacientes" in tablas and len(tablas["pacientes"]) else np.zeros(1, dtype=np.int64))
+
+    por_tipo = {}
+    for nombre, tipo in TABLAS_CITAS:
+        tabla = tablas.get(nombre)
+        if tabla is None or not len(tabla):
+            continue
+        fecha = tabla.vector("fecha")
+        propietario = _buscar(np, propietario_por_paciente, tabla.vector("id_paciente"))
+        validas = ((fecha != NULO_FECHA) & ~tabla.filtrar("estado", "in", ESTADOS_SIN_RECORDATORIO)
+                   & (_buscar(np, email_por_id, propietario) == 1))
+        por_tipo[tipo] = (fecha[validas].astype(np.int64), tabla.vector("id")[validas], propietario[validas])
+
+    dias = {}
+    for tipo, (fechas, _, _) in por_tipo.items():
+        unicas, cuentas = np.unique(fechas, return_counts=True)
+        for dia, cuenta in zip(unicas.tolist(), cuentas.tolist()):
+            dias.setdefault(dia, {"medica": 0, "estetica": 0})[tipo] = cuenta
+    if not dias:
+        raise ErrorRecordatorios(f"{volcados}: ninguna cita tiene un propietario con email")
+    pico = max(dias, key=lambda dia: (sum(dias[dia].values()), dia))
+    citas_pico = []
+    for tipo, (fechas, ids, propietario) in por_tipo.items():
+        for id_cita, id_propietario in zip(ids[fechas == pico].tolist(), propietario[fechas == pico].tolist()):
+            citas_pico.append((tipo, id_cita, emails[int(posicion_email[id_propietario])]))
+    epoca = date(1970, 1, 1)
+    return {
+        "dias": {(epoca + timedelta(days=dia)).isoformat(): cuentas for dia, cuentas in sorted(dias.items())},
+        "pico": citas_pico,
+    }
+
+
+def _resumen_volumen(dias):
+    """Media, p95 y máximo de recordatorios por día con citas"""
+    totales = sorted(sum(cuentas.values()) for cuentas in dias.values())
+    pico = max(dias, key=lambda dia: (sum(dias[dia].values()), dia))
+    return {
+        "dias": len(totales),
+        "desde": min(dias),
+        "hasta": max(dias),
+        "media": sum(totales) / len(totales),
+        "p95": totales[min(len(totales) - 1, math.ceil(0.95 * len(totales)) - 1)],
+        "maximo": totales[-1],
+        "dia_maximo": pico,
+        "medicas_maximo": dias[pico]["medica"],
+        "estetica_maximo": dias[pico]["estetica"],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Servidor SMTP de pruebas
+# ---------------------------------------------------------------------------
+
+class _ManejadorSMTP(socketserver.StreamRequestHandler):
+    """Una sesión del servidor de pruebas: saludo, EHLO, AUTH, mensajes y QUIT"""
+
+    def _responder(self, fase, respuesta, viajes=1, espera=0.0):
+        time.sleep(self.server.retardo * viajes + espera)
+        self.request.sendall(respuesta)
+        self.server.contar(fase, viajes)
+
+    def handle(self):
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # El saludo llega 2 RTT después de abrir el socket: el handshake de TCP y el propio saludo
+        self._responder("apertura", b"220 sisvet ESMTP\r\n", viajes=2)
+        while True:
+            linea = self.rfile.readline(1024)
+            if not linea:
+                return
+            orden = linea[:4].upper()
+            if orden in (b"EHLO", b"HELO"):
+                self._responder("apertura", b"250-sisvet\r\n250-AUTH PLAIN\r\n250-SIZE 10485760\r\n250 8BITMIME\r\n")
+            elif orden == b"AUTH":
+                self._responder("apertura", b"235 2.7.0 Authentication successful\r\n")
+            elif orden in (b"MAIL", b"RCPT", b"RSET", b"NOOP"):
+                self._responder("mensaje", b"250 2.1.0 Ok\r\n")
+            elif orden == b"DATA":
+                self._responder("mensaje", b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self._responder("mensaje", b"250 2.0.0 Ok: queued\r\n", espera=self.server.latencia)
+                self.server.contar("correos", 1)
+            elif orden == b"QUIT":
+                self._responder("cierre", b"221 2.0.0 Bye\r\n")
+                return
+            else:
+                self._responder("mensaje", b"502 5.5.2 Command not recognized\r\n")
+
+
+class ServidorSMTP(socketserver.ThreadingTCPServer):
+    """Servidor SMTP local con `rtt_ms` de retardo en cada respuesta y `latencia_ms` al aceptar un mensaje.
+
+    Se usa como gestor de contexto; `direccion` es el (host, puerto) en el que
+    escucha y `viajes` cuenta los viajes de cada fase y los correos aceptados.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, rtt_ms=0.0, latencia_ms=0.0):
+        super().__init__(("127.0.0.1", 0), _ManejadorSMTP)
+        self.retardo = rtt_ms / 1000
+        self.latencia = latencia_ms / 1000
+        self.direccion = self.server_address
+        self.viajes = {"apertura": 0, "mensaje": 0, "cierre": 0, "correos": 0}
+        self._cerrojo = threading.Lock()
+        self._hilo = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def contar(self, fase, viajes):
+        with self._cerrojo:
+            self.viajes[fase] += viajes
+
+    def __enter__(self):
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *excepcion):
+        self.shutdown()
+        self.server_close()
+        self._hilo.join()
+
+
+# ---------------------------------------------------------------------------
+# Reproducción de las estrategias
+# ---------------------------------------------------------------------------
+
+def _mensaje(email, id_cita):
+    cabecera = (f"From: SisVet <{_REMITENTE}>\r\nTo: {email}\r\nSubject: Recordatorio de cita #{id_cita}\r\n"
+                "MIME-Version: 1.0\r\nContent-Type: text/html; charset=utf-8\r\n\r\n")
+    relleno = "<p>Recordatorio de cita</p>\r\n"
+    return cabecera + relleno * (TAM_CORREO // len(relleno))
+
+
+def _abrir_smtp(direccion):
+    # smtplib (con email y ssl) solo hace falta al reproducir: leer el resultado en caché no lo importa
+    import smtplib
+
+    cliente = smtplib.SMTP(*direccion)
+    cliente.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    cliente.ehlo("sisvet")
+    cliente.login("sisvet", "sisvet")
+    return cliente
+
+
+def _marcar_lote(bd, citas):
+    """Un UPDATE ... WHERE id IN (...) por tabla de citas"""
+    for tabla, tipo in TABLAS_CITAS:
+        ids = [str(id_cita) for tipo_cita, id_cita, _ in citas if tipo_cita == tipo]
+        if ids:
+            bd.consultar(_UPDATE.format(tabla=tabla, condicion=f"IN ({', '.join(ids)})"))
+
+
+def _reproducir(clave, citas, direccion_smtp, direccion_bd):
+    """Envía los recordatorios de `citas` con la estrategia `clave`; devuelve (segundos, consultas a MySQL)"""
+    import smtplib
+
+    _, nueva_conexion, concurrencia, por_lote = ESTRATEGIAS[clave]
+    tablas = dict((tipo, tabla) for tabla, tipo in TABLAS_CITAS)
+    bd = ClienteMySQL(direccion_bd)
+    consultas = 0
+    inicio = time.perf_counter()
+    if nueva_conexion:
+        # Lo que hace el job: emailRecordatorioCita crea un transporte por correo
+        for tipo, id_cita, email in citas:
+            cliente = _abrir_smtp(direccion_smtp)
+            cliente.sendmail(_REMITENTE, [email], _mensaje(email, id_cita))
+            cliente.quit()
+            bd.consultar(_UPDATE.format(tabla=tablas[tipo], condicion=f"= {id_cita}"))
+            consultas += 1
+    else:
+        pendientes = queue.SimpleQueue()
+        for cita in citas:
+            pendientes.put(cita)
+        errores = []
+
+        def trabajar():
+            try:
+                cliente = _abrir_smtp(direccion_smtp)
+                while True:
+                    try:
+                        _, id_cita, email = pendientes.get_nowait()
+                    except queue.Empty:
+                        break
+                    cliente.sendmail(_REMITENTE, [email], _mensaje(email, id_cita))
+                cliente.quit()
+            except (OSError, smtplib.SMTPException) as error:
+                errores.append(error)
+
+        hilos = [threading.Thread(target=trabajar) for _ in range(min(concurrencia, len(citas)))]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        if errores:
+            raise ErrorRecordatorios(f"el servidor SMTP de pruebas falló: {errores[0]}")
+        if por_lote:
+            _marcar_lote(bd, citas)
+            consultas += len({tipo for tipo, _, _ in citas})
+    segundos = time.perf_counter() - inicio
+    bd.cerrar()
+    return segundos, consultas
+
+
+def _muestra(citas_pico, tamaño):
+    """Citas del día más cargado repetidas o recortadas hasta `tamaño` correos"""
+    return [citas_pico[i % len(citas_pico)] for i in range(tamaño)]
+
+
+def medir_estrategias(citas_pico, rtt_ms=RTT_PRUEBA_MS, latencia_ms=LATENCIA_PRUEBA_MS, muestra=MUESTRA):
+    """Reproduce cada estrategia sin retardo y con `rtt_ms` y `latencia_ms` inyectados.
+
+    Devuelve {clave: {"correos", "sin_retardo_s", "con_retardo_s", "conexiones",
+    "viajes_apertura", "viajes_mensaje", "viajes_cierre", "consultas_bd",
+    "cpu_por_correo_ms"}}: los viajes de apertura y cierre son por conexión y
+    los de mensaje por correo, contados por el servidor.
+    """
+    citas = _muestra(citas_pico, muestra)
+    fases = {clave: {} for clave in ESTRATEGIAS}
+    for nombre, rtt, latencia in (("sin_retardo", 0.0, 0.0), ("con_retardo", rtt_ms, latencia_ms)):
+        with ServidorSMTP(rtt, latencia) as smtp, ServidorMySQL(rtt) as mysql:
+            for clave in ESTRATEGIAS:
+                antes = dict(smtp.viajes)
+                segundos, consultas = _reproducir(clave, citas, smtp.direccion, mysql.direccion)
+                viajes = {fase: smtp.viajes[fase] - antes[fase] for fase in antes}
+                if viajes["correos"] != len(citas):
+                    raise ErrorRecordatorios(f"{clave}: el servidor aceptó {viajes['correos']} de {len(citas)} correos")
+                fases[clave][nombre] = (segundos, consultas, viajes)
+
+    medidas = {}
+    for clave, fase in fases.items():
+        segundos, consultas, viajes = fase["con_retardo"]
+        # Cada conexión abre con el saludo (2 viajes), EHLO y AUTH
+        conexiones = viajes["apertura"] // 4
+        medidas[clave] = {
+            "correos": len(citas),
+            "sin_retardo_s": fase["sin_retardo"][0],
+            "con_retardo_s": segundos,
+            "conexiones": conexiones,
+            "viajes_apertura": viajes["apertura"] / conexiones,
+            "viajes_mensaje": viajes["mensaje"] / len(citas),
+            "viajes_cierre": viajes["cierre"] / conexiones,
+            "consultas_bd": consultas,
+            "cpu_por_correo_ms": fase["sin_retardo"][0] / len(citas) * 1000,
+        }
+    return medidas
+
+
+# ---------------------------------------------------------------------------
+# Modelo
+# ---------------------------------------------------------------------------
+
+def tiempo_envio(clave, medida, correos, rtt_ms=RTT_SMTP_MS, latencia_ms=LATENCIA_SMTP_MS, rtt_bd_ms=RTT_BD_MS,
+                 tls=True):
+    """Segundos que tarda la estrategia `clave` en enviar `correos` recordatorios"""
+    if not correos:
+        return 0.0
+    _, nueva_conexion, concurrencia, por_lote = ESTRATEGIAS[clave]
+    sesion = (medida["viajes_apertura"] + (VIAJES_TLS if tls else 0) + medida["viajes_cierre"]) * rtt_ms
+    por_correo = medida["viajes_mensaje"] * rtt_ms + latencia_ms
+    if nueva_conexion:
+        por_correo += sesion
+    if not por_lote:
+        por_correo += rtt_bd_ms
+    conexiones = min(concurrencia, correos)
+    milisegundos = (math.ceil(correos / conexiones) * por_correo
+                    + (0.0 if nueva_conexion else sesion)
+                    + (len(TABLAS_CITAS) * rtt_bd_ms if por_lote else 0.0)
+                    # El job corre en un solo hilo de Node: la CPU de cada correo no se solapa
+                    + correos * medida["cpu_por_correo_ms"])
+    return milisegundos / 1000
+
+
+def _capacidad(clave, medida, segundos, **red):
+    """Recordatorios que la estrategia envía en `segundos` (búsqueda binaria sobre tiempo_envio)"""
+    bajo, alto = 0, 1
+    while tiempo_envio(clave, medida, alto, **red) <= segundos:
+        bajo, alto = alto, alto * 2
+    while alto - bajo > 1:
+        medio = (bajo + alto) // 2
+        if tiempo_envio(clave, medida, medio, **red) <= segundos:
+            bajo = medio
+        else:
+            alto = medio
+    return bajo
+
+
+def modelar(medidas, volumen, rtt_ms=RTT_SMTP_MS, latencia_ms=LATENCIA_SMTP_MS, rtt_bd_ms=RTT_BD_MS,
+            ventana_minutos=VENTANA_MINUTOS, tls=True, rtt_prueba_ms=RTT_PRUEBA_MS,
+            latencia_prueba_ms=LATENCIA_PRUEBA_MS):
+    """Tiempo de envío, correos por minuto y capacidad de la ventana de cada estrategia.
+
+    Incluye el error del modelo frente a la reproducción con retardo y la curva de
+    minutos de envío por recordatorios del día para la gráfica de capacidad.
+    """
+    red = {"rtt_ms": rtt_ms, "latencia_ms": latencia_ms, "rtt_bd_ms": rtt_bd_ms, "tls": tls}
+    estrategias = []
+    for clave, (descripcion, _, concurrencia, _) in ESTRATEGIAS.items():
+        medida = medidas[clave]
+        prevision = tiempo_envio(clave, medida, medida["correos"], rtt_prueba_ms, latencia_prueba_ms, rtt_prueba_ms,
+                                 tls=False)
+        capacidad = _capacidad(clave, medida, ventana_minutos * 60, **red)
+        grande = max(capacidad, 1000)
+        estrategias.append({
+            "clave": clave,
+            "descripcion": descripcion,
+            "concurrencia": concurrencia,
+            "medida": medida,
+            "error_modelo": prevision / medida["con_retardo_s"] - 1,
+            "segundos_por_correo": tiempo_envio(clave, medida, grande, **red) / grande,
+            "correos_por_minuto": 60 * grande / tiempo_envio(clave, medida, grande, **red),
+            "capacidad": capacidad,
+            "minutos": {
+                nombre: tiempo_envio(clave, medida, volumen[nombre], **red) / 60
+                for nombre in ("media", "p95", "maximo")
+            },
+        })
+
+    # Hasta el doble de lo que cabe con el envío actual: se ve dónde se cruza cada estrategia con la ventana
+    tope = max(2 * estrategias[0]["capacidad"], volumen["maximo"])
+    paso = max(1, math.ceil(tope / PUNTOS_CURVA))
+    volumenes = list(range(0, paso * PUNTOS_CURVA + 1, paso))
+    curva = {
+        "volumenes": volumenes,
+        "minutos": {e["clave"]: [round(tiempo_envio(e["clave"], e["medida"], v, **red) / 60, 2) for v in volumenes]
+                    for e in estrategias},
+    }
+    return estrategias, curva
+
+
+# ---------------------------------------------------------------------------
+# Análisis con caché
+# ---------------------------------------------------------------------------
+
+def _leer_cache(ruta, firma):
+    try:
+        with open(ruta, "rb") as archivo:
+            cache = marshal.loads(archivo.read())
+        if cache.get("version") == VERSION_RECORDATORIOS and cache.get("firma") == firma:
+            return cache["resultado"]
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    return None
+
+
+def _guardar_cache(ruta, firma, resultado):
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    with open(temporal, "wb") as archivo:
+        archivo.write(marshal.dumps({"version": VERSION_RECORDATORIOS, "firma": firma, "resultado": resultado}))
+    os.replace(temporal, ruta)
+
+
+def _firma(volcados):
+    return tuple((os.path.basename(r), os.stat(r).st_mtime_ns, os.stat(r).st_size) for r in _rutas_volcados(volcados))
+
+
+def analizar_recordatorios(volcados, directorio_cache=None, rtt_ms=RTT_SMTP_MS, latencia_ms=LATENCIA_SMTP_MS,
+                           rtt_bd_ms=RTT_BD_MS, ventana_minutos=VENTANA_MINUTOS, tls=True,
+                           rtt_prueba_ms=RTT_PRUEBA_MS, latencia_prueba_ms=LATENCIA_PRUEBA_MS, muestra=MUESTRA):
+    """Volumen diario de recordatorios, reproducción de las estrategias y modelo de capacidad.
+
+    Con `directorio_cache` el volumen se guarda por mtime y tamaño de los volcados
+    y las medidas por volumen del día pico y parámetros de la reproducción.
+    Devuelve (resultado, medidas_desde_cache).
+    """
+    identificador = hashlib.sha256(os.path.abspath(volcados).encode("utf-8")).hexdigest()[:16]
+    firma = _firma(volcados)
+    ruta_volumen = os.path.join(directorio_cache, f"recordatorios-{identificador}.marshal") if directorio_cache else None
+    diario = _leer_cache(ruta_volumen, firma) if ruta_volumen else None
+    if diario is None:
+        diario = volumen_diario(volcados)
+        if ruta_volumen:
+            _guardar_cache(ruta_volumen, firma, diario)
+
+    parametros = (diario["pico"], rtt_prueba_ms, latencia_prueba_ms, muestra)
+    ruta_medidas = os.path.join(directorio_cache, "recordatorios-medidas.marshal") if directorio_cache else None
+    medidas = _leer_cache(ruta_medidas, parametros) if ruta_medidas else None
+    desde_cache = medidas is not None
+    if medidas is None:
+        medidas = medir_estrategias(*parametros)
+        if ruta_medidas:
+            _guardar_cache(ruta_medidas, parametros, medidas)
+
+    volumen = _resumen_volumen(diario["dias"])
+    estrategias, curva = modelar(medidas, volumen, rtt_ms, latencia_ms, rtt_bd_ms, ventana_minutos, tls,
+                                 rtt_prueba_ms, latencia_prueba_ms)
+    return {
+        "volumen": volumen,
+        "parametros": {
+            "hora_job": HORA_JOB,
+            "ventana_minutos": ventana_minutos,
+            "rtt_ms": rtt_ms,
+            "latencia_ms": latencia_ms,
+            "rtt_bd_ms": rtt_bd_ms,
+            "tls": tls,
+            "rtt_prueba_ms": rtt_prueba_ms,
+            "latencia_prueba_ms": latencia_prueba_ms,
+            "muestra": muestra,
+        },
+        "estrategias": estrategias,
+        "curva": curva,
+    }, desde_cache
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Capacidad del job de recordatorios de las 9:00 con y sin pool SMTP")
+    parser.add_argument("--volcados", default=os.path.join("..", "bd"), help="directorio con los volcados de las citas")
+    parser.add_argument("--rtt", type=float, default=RTT_SMTP_MS, metavar="MS", help="RTT hasta el servidor SMTP")
+    parser.add_argument("--latencia", type=float, default=LATENCIA_SMTP_MS, metavar="MS",
+                        help="tiempo que tarda el servidor SMTP en aceptar un mensaje")
+    parser.add_argument("--rtt-bd", type=float, default=RTT_BD_MS, metavar="MS", help="RTT hasta MySQL")
+    parser.add_argument("--ventana", type=float, default=VENTANA_MINUTOS, metavar="MIN",
+                        help="minutos en los que deberían salir todos los recordatorios")
+    parser.add_argument("--sin-tls", action="store_true", help="el servidor SMTP no usa STARTTLS")
+    parser.add_argument("--muestra", type=int, default=MUESTRA, help="correos reproducidos por estrategia")
+    parser.add_argument("--json", action="store_true", help="imprime el resultado completo en JSON")
+    argumentos = parser.parse_args(argumentos)
+
+    inicio = time.perf_counter()
+    try:
+        resultado, _ = analizar_recordatorios(argumentos.volcados, None, argumentos.rtt, argumentos.latencia,
+                                              argumentos.rtt_bd, argumentos.ventana, not argumentos.sin_tls,
+                                              muestra=argumentos.muestra)
+    except (ErrorRecordatorios, OSError, ImportError) as error:
+        print(f"❌ {error}")
+        return 1
+    segundos = time.perf_counter() - inicio
+    if argumentos.json:
+        print(json.dumps(resultado, ensure_ascii=False, indent=2))
+        return 0
+
+    volumen = resultado["volumen"]
+    print(f"{volumen['dias']} días con recordatorios del {volumen['desde']} al {volumen['hasta']}: "
+          f"media {volumen['media']:.1f}, p95 {volumen['p95']}, máximo {volumen['maximo']} el {volumen['dia_maximo']} "
+          f"({volumen['medicas_maximo']} médicas, {volumen['estetica_maximo']} de estética)")
+    parametros = resultado["parametros"]
+    print(f"Modelo: RTT SMTP {parametros['rtt_ms']:g} ms{' con TLS' if parametros['tls'] else ''}, "
+          f"aceptación {parametros['latencia_ms']:g} ms, RTT MySQL {parametros['rtt_bd_ms']:g} ms, "
+          f"ventana de {parametros['ventana_minutos']:g} min desde las {HORA_JOB}:00\n")
+    print(f"{'estrategia':<12} {'viajes':>16} {'error':>7} {'correo':>9} {'por min':>8} {'capacidad':>10} "
+          f"{'día p95':>9} {'día máx':>9}")
+    for estrategia in resultado["estrategias"]:
+        medida = estrategia["medida"]
+        viajes = f"{medida['viajes_apertura']:g}+{medida['viajes_mensaje']:g}+{medida['viajes_cierre']:g}"
+        print(f"{estrategia['clave']:<12} {viajes:>16} {estrategia['error_modelo']:>+7.0%} "
+              f"{estrategia['segundos_por_correo'] * 1000:>7.0f}ms {estrategia['correos_por_minuto']:>8,.0f} "
+              f"{estrategia['capacidad']:>10,} {hora_fin(estrategia['minutos']['p95']):>9} "
+              f"{hora_fin(estrategia['minutos']['maximo']):>9}")
+    print("\nviajes = apertura por conexión + mensaje por correo + cierre por conexión (sin TLS); "
+          "error = modelo frente a la reproducción con retardo")
+    print(f"Análisis en {segundos:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,341 @@
+"""
+REPRESENTACIÓN INTERMEDIA DEL ANÁLISIS
+Las cifras del análisis se calculan una vez en una representación intermedia
+(RI) independiente del formato, de la que leen todos los emisores (emisores.py):
+JSON para tableros, Markdown para resúmenes como RESUMEN_EJECUTIVO_ANALISIS.md,
+CSV para las tablas de la competencia y el propio HTML.
+
+    {"version", "titulo", "generado", "secciones": [{"id", "titulo", "bloques"}], "datos"}
+
+Los identificadores de sección son los de SECCIONES, en el mismo orden. Cada
+bloque lleva su "tipo" (uno de TIPOS_BLOQUE):
+
+    {"tipo": "metricas", "titulo", "valores": [{"clave", "etiqueta", "valor", "formato"}]}
+    {"tipo": "tabla", "id", "titulo", "columnas": [{"clave", "titulo", "formato"}], "filas": [[valor, ...]]}
+    {"tipo": "lista", "titulo", "elementos": [texto, ...]}
+    {"tipo": "texto", "texto"}
+
+Los valores se guardan sin formatear (números como números) y cada métrica o
+columna declara su formato (uno de FORMATOS), con el que formatear() los
+presenta a las personas; JSON y CSV los escriben tal cual. "datos" son los datos
+preparados de los que salió la RI: solo los usa el emisor HTML. Las secciones de
+texto fijo (mercado, cuestionarios y recomendaciones) solo existen en el HTML.
+"""
+
+from datetime import datetime
+
+from .cifras import hora_fin, primer_mes, resumir
+
+# Incrementar al cambiar la forma de la RI (la leen los tableros que consumen el JSON)
+VERSION_RI = 1
+
+TITULO = "Análisis Completo - Sistema Veterinario SisVet"
+
+TIPOS_BLOQUE = ("metricas", "tabla", "lista", "texto")
+
+FORMATOS = ("texto", "entero", "decimal", "porcentaje", "mxn", "usd", "ms")
+
+# Sentencias más lentas (por p95) que se incluyen de la reproducción
+LIMITE_SENTENCIAS = 15
+
+
+class ErrorRepresentacion(ValueError):
+    """Un bloque de la representación intermedia no es válido"""
+
+
+def formatear(valor, formato):
+    """Texto de un valor de la RI para las personas según su formato"""
+    if valor is None:
+        return "—"
+    if formato == "entero":
+        return f"{valor:,}"
+    if formato == "decimal":
+        return f"{valor:,.2f}"
+    if formato == "porcentaje":
+        return f"{valor:.0%}"
+    if formato == "mxn":
+        return f"${valor:,.0f} MXN"
+    if formato == "usd":
+        return f"${valor:,.0f} USD"
+    if formato == "ms":
+        return f"{valor:,.2f} ms"
+    return str(valor)
+
+
+def metricas(titulo, valores):
+    """Bloque de métricas a partir de tuplas (clave, etiqueta, valor, formato)"""
+    return {
+        "tipo": "metricas",
+        "titulo": titulo,
+        "valores": [{"clave": clave, "etiqueta": etiqueta, "valor": valor, "formato": formato}
+                    for clave, etiqueta, valor, formato in valores],
+    }
+
+
+def tabla(id_tabla, titulo, columnas, filas):
+    """Bloque de tabla a partir de columnas (clave, título, formato) y filas del mismo largo"""
+    filas = [list(fila) for fila in filas]
+    for fila in filas:
+        if len(fila) != len(columnas):
+            raise ErrorRepresentacion(f"tabla {id_tabla}: fila de {len(fila)} valores para {len(columnas)} columnas")
+    return {
+        "tipo": "tabla",
+        "id": id_tabla,
+        "titulo": titulo,
+        "columnas": [{"clave": clave, "titulo": nombre, "formato": formato} for clave, nombre, formato in columnas],
+        "filas": filas,
+    }
+
+
+def lista(titulo, elementos):
+    return {"tipo": "lista", "titulo": titulo, "elementos": list(elementos)}
+
+
+def texto(contenido):
+    return {"tipo": "texto", "texto": contenido}
+
+
+def _resumen(datos):
+    proyecto_sisvet = datos["proyecto_sisvet"]
+    return [
+        texto(f"{proyecto_sisvet['nombre']} {proyecto_sisvet['version']}: {proyecto_sisvet['estado']}."),
+        metricas("Estado actual del proyecto", [
+            ("lineas_codigo", "Líneas de código", proyecto_sisvet["lineas_codigo"], "entero"),
+            ("modulos", "Módulos implementados", len(proyecto_sisvet["modulos_implementados"]), "entero"),
+            ("db_tablas", "Tablas en base de datos", proyecto_sisvet["db_tablas"], "entero"),
+            ("competidores", "Competidores analizados", len(datos["competidores"]), "entero"),
+        ]),
+        lista("Fortalezas principales", proyecto_sisvet["fortalezas"]),
+        lista("Áreas de mejora prioritarias", proyecto_sisvet["debilidades"]),
+    ]
+
+
+def _analisis_tecnico(datos):
+    proyecto_sisvet = datos["proyecto_sisvet"]
+    bloques = [
+        tabla("stack", "Stack tecnológico", [("area", "Área", "texto"), ("tecnologias", "Tecnologías", "texto")],
+              [(area, ", ".join(tecnologias)) for area, tecnologias in proyecto_sisvet["stack_tech"].items()]),
+        lista("Módulos implementados", proyecto_sisvet["modulos_implementados"]),
+    ]
+    escaneo = datos.get("escaneo")
+    if not escaneo:
+        return bloques
+    columnas = [("archivos", "Archivos", "entero"), ("lineas_codigo", "Líneas de código", "entero")]
+    for id_tabla, titulo, cifras in (("lenguajes", "Líneas por lenguaje", escaneo["lenguajes"]),
+                                     ("modulos", "Líneas por módulo", escaneo["modulos"])):
+        ordenadas = sorted(cifras.items(), key=lambda elemento: -elemento[1]["lineas_codigo"])
+        bloques.append(tabla(id_tabla, titulo, [("nombre", "Nombre", "texto"), *columnas],
+                             [(nombre, cifra["archivos"], cifra["lineas_codigo"]) for nombre, cifra in ordenadas]))
+    if escaneo["consultas_en_bucle"]:
+        filas = []
+        for funcion in escaneo["consultas_en_bucle"]:
+            elementos = max(funcion["viajes"])
+            filas.append((funcion["archivo"], funcion["funcion"], funcion["linea"], elementos, funcion["viajes"][elementos]))
+        bloques.append(tabla("consultas_en_bucle", "Consultas dentro de bucles (N+1)", [
+            ("archivo", "Archivo", "texto"), ("funcion", "Función", "texto"), ("linea", "Línea", "entero"),
+            ("elementos", "Elementos", "entero"), ("viajes", "Viajes a la base de datos", "entero"),
+        ], filas))
+    return bloques
+
+
+def _conexiones(datos):
+    conexiones = datos.get("conexiones")
+    if not conexiones:
+        return []
+    sin_cierre = [llamada for llamada in conexiones["llamadas"] if llamada["cierre"] != "finally"]
+    bloques = [metricas("Conexiones a MySQL", [
+        ("llamadas", "Llamadas a conectarDB()", len(conexiones["llamadas"]), "entero"),
+        ("sin_cierre", "Sin cierre garantizado", len(sin_cierre), "entero"),
+        ("pool", "Usa pool de conexiones", "sí" if conexiones["configuracion"]["pool"] else "no", "texto"),
+        ("conexiones_por_peticion", "Conexiones por petición", conexiones["conexiones_por_peticion"], "decimal"),
+        ("consultas_por_peticion", "Consultas por petición", conexiones["consultas_por_peticion"], "decimal"),
+    ])]
+    bloques.append(tabla("modelo_pool", "Latencia por petición con y sin pool", [
+        ("rtt_ms", "RTT", "ms"), ("tasa", "Peticiones/s", "entero"), ("sin_pool_ms", "Sin pool", "ms"),
+        ("con_pool_ms", "Con pool", "ms"), ("ahorro_ms", "Ahorro", "ms"),
+    ], [(punto["rtt_ms"], punto["tasa"], punto["sin_pool"]["latencia_ms"], punto["con_pool"]["latencia_ms"],
+         punto["ahorro_ms"]) for punto in conexiones["modelo"]]))
+    if sin_cierre:
+        bloques.append(tabla("conexiones_sin_cierre", "Conexiones sin cierre garantizado", [
+            ("archivo", "Archivo", "texto"), ("funcion", "Función", "texto"), ("linea", "Línea", "entero"),
+            ("cierre", "Cierre", "texto"),
+        ], [(llamada["archivo"], llamada["funcion"], llamada["linea"], llamada["cierre"]) for llamada in sin_cierre]))
+    return bloques
+
+
+def _reproduccion(datos):
+    reproduccion = datos.get("reproduccion")
+    if not reproduccion:
+        return []
+    medidas = [sentencia for sentencia in reproduccion["sentencias"] if "error" not in sentencia]
+    percentiles = [("p50_ms", "p50", "ms"), ("p95_ms", "p95", "ms"), ("p99_ms", "p99", "ms")]
+    lentas = sorted(medidas, key=lambda sentencia: -sentencia["p95_ms"])[:LIMITE_SENTENCIAS]
+    return [
+        metricas("Consultas reproducidas sobre SQLite", [
+            ("sentencias", "Sentencias del backend", len(reproduccion["sentencias"]), "entero"),
+            ("medidas", "Sentencias medidas", len(medidas), "entero"),
+            ("repeticiones", "Ejecuciones por sentencia", reproduccion["repeticiones"], "entero"),
+            ("regresiones", "Regresiones", len(reproduccion.get("regresiones", [])), "entero"),
+        ]),
+        tabla("endpoints", "Latencia por endpoint", [
+            ("metodo", "Método", "texto"), ("ruta", "Ruta", "texto"), ("sentencias", "Sentencias", "entero"),
+            *percentiles,
+        ], [(endpoint["metodo"], endpoint["ruta"], endpoint["sentencias"],
+             *(endpoint[clave] for clave, _, _ in percentiles)) for endpoint in reproduccion["endpoints"]]),
+        tabla("sentencias_lentas", "Sentencias más lentas", [
+            ("clave", "Sentencia", "texto"), ("operacion", "Operación", "texto"), ("filas", "Filas", "decimal"),
+            *percentiles,
+        ], [(sentencia["clave"], sentencia["operacion"], sentencia["filas"],
+             *(sentencia[clave] for clave, _, _ in percentiles)) for sentencia in lentas]),
+    ]
+
+
+def _recordatorios(datos):
+    recordatorios = datos.get("recordatorios")
+    if not recordatorios:
+        return []
+    volumen, parametros = recordatorios["volumen"], recordatorios["parametros"]
+    return [
+        metricas(f"Job de recordatorios de las {parametros['hora_job']}:00", [
+            ("media", "Recordatorios por día (media)", volumen["media"], "decimal"),
+            ("p95", "Recordatorios por día (p95)", volumen["p95"], "entero"),
+            ("maximo", "Máximo en un día", volumen["maximo"], "entero"),
+            ("dia_maximo", "Día del máximo", volumen["dia_maximo"], "texto"),
+            ("ventana_minutos", "Ventana del job (minutos)", parametros["ventana_minutos"], "entero"),
+        ]),
+        tabla("estrategias_envio", "Capacidad de cada estrategia de envío", [
+            ("estrategia", "Estrategia", "texto"), ("concurrencia", "Concurrencia", "entero"),
+            ("correos_por_minuto", "Correos por minuto", "decimal"), ("capacidad", "Caben en la ventana", "entero"),
+            ("fin_dia_maximo", "Termina el día máximo", "texto"),
+        ], [(estrategia["descripcion"], estrategia["concurrencia"], estrategia["correos_por_minuto"],
+             estrategia["capacidad"], hora_fin(estrategia["minutos"]["maximo"]))
+            for estrategia in recordatorios["estrategias"]]),
+    ]
+
+
+def _ocupacion(datos):
+    ocupacion = datos.get("ocupacion_citas")
+    if not ocupacion:
+        return []
+    columnas = [("franja", "Hora", "texto")] + [(dia.lower(), dia, "porcentaje") for dia in ocupacion["dias"]]
+    agendas = [{"nombre": "Clínica (promedio por doctor)", "ocupacion": ocupacion["total"]}] + ocupacion["doctores"]
+    bloques = [texto(f"Ocupación de cada franja de 30 minutos entre el {ocupacion['desde']} y el {ocupacion['hasta']}.")]
+    for i, agenda in enumerate(agendas):
+        bloques.append(tabla("ocupacion" if i == 0 else f"ocupacion_{i}", agenda["nombre"], columnas,
+                             [(franja, *valores) for franja, valores in zip(ocupacion["franjas"], agenda["ocupacion"])]))
+    return bloques
+
+
+def _auditoria(datos):
+    auditoria = datos.get("auditoria")
+    if not auditoria:
+        return []
+    bloques = [metricas("Bitácora de auditoría", [
+        ("total", "Escrituras registradas", auditoria["total"], "entero"),
+        ("desde", "Desde", auditoria["desde"], "texto"),
+        ("hasta", "Hasta", auditoria["hasta"], "texto"),
+    ])]
+    for dimension, escrituras in auditoria["escrituras"].items():
+        bloques.append(tabla(f"escrituras_por_{dimension}", f"Escrituras por {dimension}", [
+            ("valor", dimension, "texto"), ("total", "Escrituras", "entero"), ("pico", "Pico", "entero"),
+            ("periodo_pico", "Periodo del pico", "texto"),
+        ], [(valor or "(vacía)", resumen["total"], resumen["pico"], resumen["periodo_pico"])
+            for valor, resumen in resumir(escrituras).items()]))
+    bloques.append(tabla("registros_frecuentes", "Registros con más escrituras", [
+        ("tabla", "Tabla", "texto"), ("id_registro", "Registro", "entero"), ("escrituras", "Escrituras", "entero"),
+    ], [(registro["tabla"], registro["id_registro"], registro["escrituras"])
+        for registro in auditoria["registros_frecuentes"]]))
+    return bloques
+
+
+def _competencia(datos):
+    return [tabla("competidores", "Competidores analizados", [
+        ("nombre", "Software", "texto"), ("pais", "País", "texto"), ("precio_usd_min", "Precio mínimo", "usd"),
+        ("precio_usd_max", "Precio máximo", "usd"), ("precio_min", "Precio mínimo (MXN)", "mxn"),
+        ("precio_max", "Precio máximo (MXN)", "mxn"), ("trial", "Prueba", "texto"),
+        ("puntuacion", "Puntuación", "decimal"), ("market_share", "Cuota de mercado", "porcentaje"),
+        ("funcionalidades", "Funcionalidades", "entero"),
+    ], [(competidor["nombre"], competidor["pais"], competidor["precio_usd_min"], competidor["precio_usd_max"],
+         competidor["precio_min"], competidor["precio_max"], competidor["trial"], competidor["puntuacion"],
+         competidor["market_share"] / 100, len(competidor["funcionalidades"]))
+        for competidor in sorted(datos["competidores"], key=lambda competidor: -competidor["puntuacion"])])]
+
+
+def _comparacion(datos):
+    matriz = datos["matriz_funcional"]
+    productos = matriz["productos"]
+    bloques = [tabla("matriz_funcional", f"Matriz de comparación funcional (0-{matriz['escala']})",
+                     [("producto", "Producto", "texto")]
+                     + [(funcionalidad["corto"], funcionalidad["nombre"], "decimal")
+                        for funcionalidad in matriz["funcionalidades"]],
+                     [(producto["nombre"], *producto["puntuaciones"]) for producto in productos])]
+    clasificacion = datos.get("clasificacion_funcional")
+    if clasificacion:
+        bloques.append(tabla("clasificacion_funcional", "Clasificación ponderada por perfil de clínica", [
+            ("perfil", "Perfil", "texto"), ("posicion", "Posición", "entero"), ("producto", "Producto", "texto"),
+            ("nota", "Nota", "decimal"),
+        ], [(perfil["nombre"], posicion, productos[i]["nombre"], perfil["notas"][i])
+            for perfil in clasificacion["perfiles"] for posicion, i in enumerate(perfil["orden"], 1)]))
+    return bloques
+
+
+def _costos(datos):
+    simulada = datos.get("proyeccion_simulada")
+    if not simulada:
+        proyeccion = datos["graficas"]["proyeccion_ingresos"]
+        return [tabla("proyeccion_ingresos", "Proyección de ingresos (MRR)",
+                      [("mes", "Mes", "texto")] + [(f"escenario_{i}", escenario["nombre"], "mxn")
+                                                   for i, escenario in enumerate(proyeccion["escenarios"])],
+                      [(etiqueta, *(escenario["valores"][j] for escenario in proyeccion["escenarios"]))
+                       for j, etiqueta in enumerate(proyeccion["etiquetas"])])]
+
+    mrr, clientes, acumulado = simulada["mrr"], simulada["clientes"], simulada["acumulado"]
+    return [
+        metricas(f"Proyección Monte Carlo ({simulada['trayectorias']:,} trayectorias × {simulada['meses']} meses)", [
+            ("arpu_mxn", "Ingreso medio por cliente", simulada["arpu_mxn"], "mxn"),
+            ("costos_fijos_mxn", "Costos fijos mensuales", simulada["costos_fijos_mxn"], "mxn"),
+            ("equilibrio_p50", "Mes de equilibrio (50% de las trayectorias)", primer_mes(simulada["equilibrio"], 0.5), "entero"),
+            ("equilibrio_p90", "Mes de equilibrio (90% de las trayectorias)", primer_mes(simulada["equilibrio"], 0.9), "entero"),
+            ("acumulado_p10", "Ingreso acumulado P10", acumulado["p10"], "mxn"),
+            ("acumulado_p50", "Ingreso acumulado P50", acumulado["p50"], "mxn"),
+            ("acumulado_p90", "Ingreso acumulado P90", acumulado["p90"], "mxn"),
+        ]),
+        tabla("proyeccion_mensual", "MRR por mes", [
+            ("mes", "Mes", "entero"), ("clientes_p50", "Clientes P50", "entero"), ("mrr_p10", "MRR P10", "mxn"),
+            ("mrr_p50", "MRR P50", "mxn"), ("mrr_p90", "MRR P90", "mxn"),
+            ("equilibrio", "Trayectorias en equilibrio", "porcentaje"),
+        ], [(mes, clientes["p50"][i], mrr["p10"][i], mrr["p50"][i], mrr["p90"][i], simulada["equilibrio"][i])
+            for i, mes in enumerate(range(1, simulada["meses"] + 1))]),
+    ]
+
+
+# (id de SECCIONES, título, constructor de sus bloques), en el orden del documento
+CONSTRUCTORES = (
+    ("resumen", "📋 Resumen Ejecutivo", _resumen),
+    ("analisis-tecnico", "💻 Análisis Técnico Detallado", _analisis_tecnico),
+    ("conexiones", "🔌 Conexiones a la Base de Datos", _conexiones),
+    ("reproduccion", "⏱️ Latencia de las Consultas", _reproduccion),
+    ("recordatorios", "📧 Capacidad del Job de Recordatorios", _recordatorios),
+    ("ocupacion", "🗓️ Ocupación de la Agenda", _ocupacion),
+    ("auditoria", "🧾 Actividad de la Bitácora de Auditoría", _auditoria),
+    ("competencia", "🏆 Análisis de la Competencia", _competencia),
+    ("comparacion", "📊 Matriz de Comparación Funcional", _comparacion),
+    ("costos", "💰 Estimación de Costos y Modelo de Negocio", _costos),
+)
+
+
+def construir(datos, generado=None):
+    """Representación intermedia de los datos preparados (generacion.preparar_datos)"""
+    secciones = []
+    for id_seccion, titulo, constructor in CONSTRUCTORES:
+        bloques = constructor(datos)
+        # Los análisis opcionales que no se pudieron hacer no dejan sección vacía
+        if bloques:
+            secciones.append({"id": id_seccion, "titulo": titulo, "bloques": bloques})
+    return {
+        "version": VERSION_RI,
+        "titulo": TITULO,
+        "generado": (generado or datetime.now()).isoformat(timespec="seconds"),
+        "secciones": secciones,
+        "datos": datos,
+    }
@@ -0,0 +1,719 @@
+"""
+REPRODUCCIÓN DE CONSULTAS SOBRE SQLITE
+Carga los volcados de bd/ en una base SQLite en memoria y ejecuta las sentencias
+SQL del backend (sql_backend) con parámetros sacados de los propios datos, para
+tener la latencia de cada sentencia y de cada endpoint (p50, p95 y p99).
+
+- Traducción: las funciones de MySQL que SQLite no tiene (NOW, CURDATE,
+  DATE_FORMAT, DATE_ADD/DATE_SUB con INTERVAL, DATEDIFF, CONCAT...) se registran
+  como funciones de Python y la sintaxis se adapta (INTERVAL n DAY pasa a ser un
+  argumento más, INSERT IGNORE pasa a INSERT OR IGNORE). Las sentencias que aun
+  así SQLite no acepta se listan con su error. NOW() es el último instante de los
+  datos, no el reloj, para que las consultas de "próximas" o "hoy" encuentren filas.
+- Parámetros: cada ? se asocia a la columna con la que se compara (=, LIKE, IN,
+  BETWEEN, DATE(c.fecha) = ?...), a la que recibe en un INSERT o un SET, o a
+  LIMIT/OFFSET/INTERVAL. En cada repetición se sortea un valor entre las filas de
+  esa columna, así que los valores frecuentes salen con su frecuencia real.
+- Escrituras: se ejecutan dentro de un SAVEPOINT que se deshace, y los datos no
+  cambian entre repeticiones.
+- Endpoints: la repetición i de un endpoint suma la repetición i de cada sentencia
+  de sus funciones (middleware incluido), ejecutadas una vez cada una.
+
+Las latencias son las de SQLite con estos datos y sirven para comparar sentencias
+y versiones del código entre sí, no como cifra de producción. El resultado se
+guarda en JSON y se vuelve a medir solo cuando cambia el contenido de los volcados
+o del backend. Al medir de nuevo se compara con la ejecución anterior, pero solo
+en las sentencias cuyo SQL cambió y en los endpoints cuyas sentencias cambiaron:
+el resto no puede empeorar y sus diferencias son ruido. Una de ellas es regresión
+cuando su p95 crece más de REGRESION_PROPORCION y su nuevo p50 supera el p95
+anterior en más de REGRESION_MS, es decir, cuando la mayoría de las ejecuciones
+nuevas son más lentas que casi todas las anteriores. Desde extras/:
+
+    python -m analisis_sisvet.reproduccion --json reproduccion.json
+    python -m analisis_sisvet.reproduccion --base reproduccion.json
+"""
+
+import argparse
+import datetime
+import glob
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import sqlite3
+import sys
+import time
+from decimal import Decimal
+
+from .indices import REPOSITORIO, leer_esquemas
+from .sql_backend import CADENA_SQL, ErrorBackend, extraer_sentencias, leer_rutas
+from .volcado_sql import ErrorVolcado, iterar_filas
+
+# Incrementar al cambiar la reproducción para descartar los resultados guardados
+VERSION_REPRODUCCION = 2
+
+# Ejecuciones de cada sentencia y percentiles que se calculan
+REPETICIONES = 100
+PERCENTILES = (50, 95, 99)
+
+# Una sentencia empeora si su p95 crece más de esta proporción y su p50 supera el p95 anterior
+# en más de estos milisegundos (con datos sin cambios el p50 de una medición no llega al p95 de otra)
+REGRESION_PROPORCION = 1.5
+REGRESION_MS = 0.1
+
+# Valores de los parámetros que no salen de una columna
+LIMITE = 20
+MAX_INTERVALO = 30
+
+SEMILLA = 20251103
+
+_TIPOS_ENTEROS = {"tinyint", "smallint", "mediumint", "int", "integer", "bigint", "bit", "year"}
+_TIPOS_REALES = {"decimal", "numeric", "float", "double", "real"}
+_TIPOS_BINARIOS = {"blob", "tinyblob", "mediumblob", "longblob", "binary", "varbinary"}
+_TIPOS_FECHA = {"date", "datetime", "timestamp"}
+
+_INTERVALO = re.compile(r"\bINTERVAL\s+(\?|-?\d+|\w+)\s+(SECOND|MINUTE|HOUR|DAY|WEEK|MONTH|YEAR)\b", re.IGNORECASE)
+_INSERT_IGNORE = re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE)
+_IF = re.compile(r"\bIF\s*\(", re.IGNORECASE)
+
+_PALABRAS_RESERVADAS = ("ON|WHERE|SET|JOIN|LEFT|RIGHT|INNER|CROSS|OUTER|GROUP|ORDER|LIMIT|VALUES|USING|AND|OR"
+                        "|HAVING|UNION|SELECT")
+_ALIAS = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+`?(\w+)`?(?:\s+(?:AS\s+)?(?!(?:" + _PALABRAS_RESERVADAS
+                    + r")\b)(\w+))?", re.IGNORECASE)
+_COMPARACION = re.compile(
+    r"(?:(\w+)\s*\(\s*)?(?:(\w+)\.)?(\w+)`?\s*\)?\s*(<=>|!=|<>|>=|<=|=|<|>|\bNOT\s+LIKE\b|\bLIKE\b)\s*"
+    r"(?:LOWER\s*\(\s*|(CONCAT)\s*\(\s*'%'\s*,\s*)?$", re.IGNORECASE)
+_ENTRE = re.compile(r"(?:(\w+)\s*\(\s*)?(?:(\w+)\.)?(\w+)\s*\)?\s+BETWEEN\s*$", re.IGNORECASE)
+_ENTRE_HASTA = re.compile(r"\bBETWEEN\s*\?\s*AND\s*$", re.IGNORECASE)
+_EN = re.compile(r"(?:(\w+)\.)?(\w+)\s+(?:NOT\s+)?IN\s*\(\s*(?:\?\s*,\s*)*$", re.IGNORECASE)
+_LIMITE = re.compile(r"\bLIMIT\s*$", re.IGNORECASE)
+_DESPLAZAMIENTO = re.compile(r"\bOFFSET\s*$|\bLIMIT\s*\?\s*,\s*$", re.IGNORECASE)
+_INSERCION = re.compile(r"\bINTO\s+`?(\w+)`?\s*\(([^)]*)\)\s*VALUES\s*\(", re.IGNORECASE)
+_ASIGNACIONES = re.compile(r"^\s*UPDATE\b.*?\bSET\b(.*?)(?:\bWHERE\b|$)", re.IGNORECASE | re.DOTALL)
+_OPERACION = re.compile(r"\s*\(?\s*(\w+)")
+
+_UNIDADES = {"SECOND": "seconds", "MINUTE": "minutes", "HOUR": "hours", "DAY": "days", "WEEK": "weeks"}
+_FORMATOS_MYSQL = {
+    "Y": "%Y", "y": "%y", "m": "%m", "c": "%-m", "d": "%d", "e": "%-d", "H": "%H", "k": "%-H", "h": "%I", "I": "%I",
+    "i": "%M", "s": "%S", "S": "%S", "p": "%p", "M": "%B", "b": "%b", "W": "%A", "a": "%a", "j": "%j", "T": "%H:%M:%S",
+    "%": "%%",
+}
+
+
+class ErrorReproduccion(ValueError):
+    """Los volcados no se pueden cargar en SQLite"""
+
+
+# ---------------------------------------------------------------------------
+# Carga de los volcados
+# ---------------------------------------------------------------------------
+
+def _tipo_sqlite(columna):
+    if columna["tipo"] in _TIPOS_ENTEROS:
+        return "INTEGER"
+    if columna["tipo"] in _TIPOS_REALES:
+        return "REAL"
+    if columna["tipo"] in _TIPOS_BINARIOS:
+        return "BLOB"
+    return "TEXT"
+
+
+def _valor_sqlite(valor):
+    """Valor de una fila del volcado en el formato en que se guarda en SQLite"""
+    if isinstance(valor, datetime.datetime):
+        return valor.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(valor, datetime.date):
+        return valor.isoformat()
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, datetime.timedelta):
+        segundos = int(valor.total_seconds())
+        return f"{'-' if segundos < 0 else ''}{abs(segundos) // 3600:02d}:{abs(segundos) % 3600 // 60:02d}:{abs(segundos) % 60:02d}"
+    if isinstance(valor, (set, frozenset)):
+        return ",".join(sorted(valor))
+    return valor
+
+
+def _crear_tabla(conexion, tabla):
+    columnas = [f'"{c["nombre"]}" {_tipo_sqlite(c)}' for c in tabla["columnas"]]
+    if tabla["clave_primaria"]:
+        columnas.append("PRIMARY KEY (" + ", ".join(f'"{c}"' for c in tabla["clave_primaria"]) + ")")
+    conexion.execute(f'CREATE TABLE "{tabla["nombre"]}" ({", ".join(columnas)})')
+
+
+def _crear_indices(conexion, tabla):
+    for indice in tabla["indices"]:
+        if indice["tipo"] in ("FULLTEXT", "SPATIAL"):
+            continue
+        columnas = ", ".join(f'"{c}"' for c in indice["columnas"])
+        conexion.execute(f'CREATE {"UNIQUE " if indice["unico"] else ""}INDEX '
+                         f'"{tabla["nombre"]}__{indice["nombre"]}" ON "{tabla["nombre"]}" ({columnas})')
+    for clave in tabla["claves_foraneas"]:
+        # InnoDB crea un índice para cada clave foránea que no tenga ya uno
+        prefijos = [i["columnas"] for i in tabla["indices"]] + [tabla["clave_primaria"]]
+        if not any(columnas[:len(clave["columnas"])] == clave["columnas"] for columnas in prefijos):
+            columnas = ", ".join(f'"{c}"' for c in clave["columnas"])
+            conexion.execute(f'CREATE INDEX "{tabla["nombre"]}__{clave["nombre"]}" ON "{tabla["nombre"]}" ({columnas})')
+
+
+def cargar_sqlite(volcados):
+    """(conexión, esquema, referencia): SQLite en memoria con las tablas, índices y filas de `volcados`.
+
+    `referencia` es el último instante de los datos que no está en el futuro; las
+    funciones NOW() y CURDATE() de la conexión lo devuelven.
+    """
+    esquema = leer_esquemas(volcados)
+    if not esquema:
+        raise ErrorReproduccion(f"{volcados}: no hay CREATE TABLE")
+    conexion = sqlite3.connect(":memory:", isolation_level=None)
+    for tabla in esquema.values():
+        _crear_tabla(conexion, tabla)
+
+    ahora = datetime.datetime.now()
+    referencia = None
+    conexion.execute("BEGIN")
+    for ruta in sorted(glob.glob(os.path.join(volcados, "**", "*.sql"), recursive=True)):
+        filas = {}
+        for tabla, fila in iterar_filas(ruta, esquema=esquema):
+            filas.setdefault(tabla, []).append(tuple(_valor_sqlite(valor) for valor in fila))
+            for valor in fila:
+                if isinstance(valor, datetime.datetime) and valor <= ahora and (referencia is None or valor > referencia):
+                    referencia = valor
+        for tabla, lista in filas.items():
+            marcas = ", ".join("?" * len(lista[0]))
+            try:
+                conexion.executemany(f'INSERT OR REPLACE INTO "{tabla}" VALUES ({marcas})', lista)
+            except sqlite3.Error as error:
+                raise ErrorReproduccion(f"{ruta}: filas de {tabla}: {error}") from error
+    conexion.execute("COMMIT")
+    for tabla in esquema.values():
+        _crear_indices(conexion, tabla)
+    conexion.execute("ANALYZE")
+
+    referencia = referencia or ahora.replace(microsecond=0)
+    _registrar_funciones(conexion, referencia)
+    return conexion, esquema, referencia
+
+
+# ---------------------------------------------------------------------------
+# Traducción del dialecto de MySQL
+# ---------------------------------------------------------------------------
+
+def _fecha(valor):
+    if valor is None:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(str(valor).strip())
+    except ValueError:
+        return None
+
+
+def _sumar(valor, cantidad, unidad, signo):
+    fecha = _fecha(valor)
+    if fecha is None or cantidad is None:
+        return None
+    cantidad = signo * int(cantidad)
+    unidad = unidad.upper()
+    if unidad in ("MONTH", "YEAR"):
+        meses = fecha.month - 1 + cantidad * (12 if unidad == "YEAR" else 1)
+        anio, mes = fecha.year + meses // 12, meses % 12 + 1
+        dias_mes = (datetime.date(anio + mes // 12, mes % 12 + 1, 1) - datetime.timedelta(days=1)).day
+        fecha = fecha.replace(year=anio, month=mes, day=min(fecha.day, dias_mes))
+    else:
+        fecha += datetime.timedelta(**{_UNIDADES[unidad]: cantidad})
+    con_hora = len(str(valor).strip()) > 10 or unidad in ("SECOND", "MINUTE", "HOUR")
+    return fecha.strftime("%Y-%m-%d %H:%M:%S") if con_hora else fecha.date().isoformat()
+
+
+def _formatear(valor, formato):
+    fecha = _fecha(valor)
+    if fecha is None or formato is None:
+        return None
+    return re.sub(r"%(.)", lambda m: fecha.strftime(_FORMATOS_MYSQL.get(m.group(1), m.group(1))), formato)
+
+
+def _registrar_funciones(conexion, referencia):
+    ahora = referencia.strftime("%Y-%m-%d %H:%M:%S")
+    funciones = {
+        ("NOW", 0): lambda: ahora,
+        ("CURRENT_TIMESTAMP", 0): lambda: ahora,
+        ("CURDATE", 0): lambda: ahora[:10],
+        ("CURTIME", 0): lambda: ahora[11:],
+        ("YEAR", 1): lambda v: _fecha(v).year if _fecha(v) else None,
+        ("MONTH", 1): lambda v: _fecha(v).month if _fecha(v) else None,
+        ("DAY", 1): lambda v: _fecha(v).day if _fecha(v) else None,
+        ("DAYOFWEEK", 1): lambda v: _fecha(v).isoweekday() % 7 + 1 if _fecha(v) else None,
+        ("DATE_FORMAT", 2): _formatear,
+        ("DATEDIFF", 2): lambda a, b: (_fecha(a).date() - _fecha(b).date()).days if _fecha(a) and _fecha(b) else None,
+        ("DATE_ADD", 3): lambda v, n, u: _sumar(v, n, u, 1),
+        ("DATE_SUB", 3): lambda v, n, u: _sumar(v, n, u, -1),
+        ("CONCAT", -1): lambda *partes: None if None in partes else "".join(str(p) for p in partes),
+        ("CONCAT_WS", -1): lambda separador, *partes: separador.join(str(p) for p in partes if p is not None),
+    }
+    for (nombre, argumentos), funcion in funciones.items():
+        conexion.create_function(nombre, argumentos, funcion, deterministic=argumentos != 0)
+
+
+def traducir_sql(sql):
+    """Sentencia de MySQL con la sintaxis que SQLite no admite reescrita"""
+    sql = sql.strip().rstrip(";")
+    sql = _INTERVALO.sub(lambda m: f"{m.group(1)}, '{m.group(2).upper()}'", sql)
+    sql = _INSERT_IGNORE.sub("INSERT OR IGNORE", sql)
+    return _IF.sub("IIF(", sql)
+
+
+# ---------------------------------------------------------------------------
+# Parámetros
+# ---------------------------------------------------------------------------
+
+def _tablas_sentencia(sql, esquema):
+    """{alias o nombre: tabla} de las tablas de la sentencia, en orden de aparición"""
+    tablas = {}
+    for tabla, alias in _ALIAS.findall(sql):
+        if tabla in esquema:
+            tablas.setdefault(tabla, tabla)
+            if alias:
+                tablas[alias] = tabla
+    return tablas
+
+
+def _resolver(tablas, esquema, alias, columna):
+    if alias:
+        tabla = tablas.get(alias)
+        return tabla if tabla and any(c["nombre"] == columna for c in esquema[tabla]["columnas"]) else None
+    for tabla in dict.fromkeys(tablas.values()):
+        if any(c["nombre"] == columna for c in esquema[tabla]["columnas"]):
+            return tabla
+    return None
+
+
+def _columnas_insercion(enmascarado):
+    """{posición de ?: (tabla, columna)} de los VALUES (...) de un INSERT con lista de columnas"""
+    insercion = _INSERCION.search(enmascarado)
+    if insercion is None:
+        return {}
+    columnas = [c.strip().strip("`") for c in insercion.group(2).split(",")]
+    posiciones = {}
+    profundidad, elemento, inicio = 0, 0, insercion.end()
+    for i in range(insercion.end(), len(enmascarado)):
+        caracter = enmascarado[i]
+        if caracter == "(":
+            profundidad += 1
+        elif caracter == ")" and profundidad == 0:
+            break
+        elif caracter == ")":
+            profundidad -= 1
+        elif caracter == "," and profundidad == 0:
+            elemento, inicio = elemento + 1, i + 1
+        elif caracter == "?" and enmascarado[inicio:].lstrip().startswith("?") and elemento < len(columnas):
+            posiciones[i] = (insercion.group(1), columnas[elemento])
+    return posiciones
+
+
+def plan_parametros(sql, esquema):
+    """De dónde sale cada ? de la sentencia: [(tipo, tabla, columna, función)].
+
+    tipo es "igual", "like", "like_parcial" (el % lo pone CONCAT), "desde", "hasta",
+    "insercion" (VALUES de un INSERT o SET de un UPDATE), "limite", "desplazamiento",
+    "intervalo" o "constante".
+    """
+    enmascarado = CADENA_SQL.sub(lambda m: "'" + "_" * (len(m.group()) - 2) + "'", sql)
+    tablas = _tablas_sentencia(enmascarado, esquema)
+    insercion = _columnas_insercion(enmascarado)
+    asignaciones = _ASIGNACIONES.search(enmascarado)
+    plan = []
+    for marca in re.finditer(r"\?", enmascarado):
+        antes = enmascarado[max(0, marca.start() - 160):marca.start()]
+        if marca.start() in insercion:
+            tabla, columna = insercion[marca.start()]
+            plan.append(("insercion", tabla, columna, None) if tabla in esquema else ("constante", None, None, None))
+        elif _ENTRE_HASTA.search(antes):
+            plan.append(("hasta", None, None, None))
+        elif _ENTRE.search(antes):
+            funcion, alias, columna = _ENTRE.search(antes).groups()
+            tabla = _resolver(tablas, esquema, alias, columna)
+            plan.append(("desde", tabla, columna, (funcion or "").upper()) if tabla else ("constante", None, None, None))
+        elif _COMPARACION.search(antes):
+            funcion, alias, columna, operador, concat = _COMPARACION.search(antes).groups()
+            tabla = _resolver(tablas, esquema, alias, columna)
+            tipo = ("like_parcial" if concat else "like") if "LIKE" in operador.upper() else "igual"
+            if asignaciones and asignaciones.start(1) <= marca.start() < asignaciones.end(1):
+                tipo = "insercion"
+            plan.append((tipo, tabla, columna, (funcion or "").upper()) if tabla else ("constante", None, None, None))
+        elif _EN.search(antes):
+            alias, columna = _EN.search(antes).groups()
+            tabla = _resolver(tablas, esquema, alias, columna)
+            plan.append(("igual", tabla, columna, "") if tabla else ("constante", None, None, None))
+        elif _DESPLAZAMIENTO.search(antes) or (_LIMITE.search(antes) and enmascarado[marca.end():].lstrip().startswith(",")):
+            plan.append(("desplazamiento", None, None, None))
+        elif _LIMITE.search(antes):
+            plan.append(("limite", None, None, None))
+        elif re.search(r"\bINTERVAL\s*$", antes, re.IGNORECASE):
+            plan.append(("intervalo", None, None, None))
+        else:
+            plan.append(("constante", None, None, None))
+    return plan
+
+
+class Muestreador:
+    """Sortea los parámetros de las sentencias entre los valores de las columnas de la base"""
+
+    def __init__(self, conexion, esquema, referencia, semilla=SEMILLA):
+        self.conexion = conexion
+        self.esquema = esquema
+        self.referencia = referencia
+        self.azar = random.Random(semilla)
+        self._valores = {}
+        self._maximos = {}
+
+    def valores(self, tabla, columna):
+        """Valores no nulos de la columna, repetidos tantas veces como aparecen"""
+        clave = (tabla, columna)
+        if clave not in self._valores:
+            self._valores[clave] = [fila[0] for fila in self.conexion.execute(
+                f'SELECT "{columna}" FROM "{tabla}" WHERE "{columna}" IS NOT NULL')]
+        return self._valores[clave]
+
+    def _por_defecto(self, tabla, columna):
+        definicion = next(c for c in self.esquema[tabla]["columnas"] if c["nombre"] == columna)
+        if definicion["valores"]:
+            return self.azar.choice(definicion["valores"])
+        if definicion["tipo"] in _TIPOS_ENTEROS or definicion["tipo"] in _TIPOS_REALES:
+            return 1
+        if definicion["tipo"] in _TIPOS_FECHA:
+            return self.referencia.strftime("%Y-%m-%d %H:%M:%S")[:10 if definicion["tipo"] == "date" else 19]
+        return "x"
+
+    def _unica(self, tabla, columna):
+        tabla_esquema = self.esquema[tabla]
+        return [columna] == tabla_esquema["clave_primaria"] or any(
+            i["unico"] and i["columnas"] == [columna] for i in tabla_esquema["indices"])
+
+    def _sortear(self, tabla, columna):
+        valores = self.valores(tabla, columna)
+        return self.azar.choice(valores) if valores else self._por_defecto(tabla, columna)
+
+    def parametros(self, plan):
+        """Valores para una ejecución de la sentencia con este plan"""
+        parametros = []
+        hasta = None
+        for tipo, tabla, columna, funcion in plan:
+            if tipo == "hasta":
+                parametros.append(hasta)
+                continue
+            if tipo == "limite":
+                parametros.append(LIMITE)
+                continue
+            if tipo == "desplazamiento":
+                parametros.append(0)
+                continue
+            if tipo == "intervalo":
+                parametros.append(self.azar.randint(1, MAX_INTERVALO))
+                continue
+            if tipo == "constante":
+                parametros.append(1)
+                continue
+            if tipo == "insercion" and self._unica(tabla, columna):
+                # Valor nuevo para no chocar con la clave primaria o el índice único
+                existente = self._sortear(tabla, columna)
+                if isinstance(existente, int):
+                    clave = (tabla, columna)
+                    if clave not in self._maximos:
+                        self._maximos[clave] = max(self.valores(tabla, columna), default=0)
+                    self._maximos[clave] += 1
+                    parametros.append(self._maximos[clave])
+                else:
+                    parametros.append(f"{existente}-{self.azar.getrandbits(32):08x}")
+                continue
+
+            valor = self._sortear(tabla, columna)
+            if tipo == "desde":
+                otro = self._sortear(tabla, columna)
+                valor, hasta = sorted((valor, otro), key=str)
+                valor, hasta = self._aplicar(funcion, valor), self._aplicar(funcion, hasta)
+            else:
+                valor = self._aplicar(funcion, valor)
+            if tipo in ("like", "like_parcial"):
+                inicio = self.azar.randint(0, max(0, len(str(valor)) - 3))
+                valor = str(valor)[inicio:inicio + 3]
+                valor = valor if tipo == "like_parcial" else f"%{valor}%"
+            parametros.append(valor)
+        return parametros
+
+    @staticmethod
+    def _aplicar(funcion, valor):
+        if funcion == "DATE":
+            return str(valor)[:10]
+        if funcion == "YEAR":
+            return int(str(valor)[:4])
+        if funcion == "MONTH":
+            return int(str(valor)[5:7])
+        if funcion == "LOWER":
+            return str(valor).lower()
+        return valor
+
+
+# ---------------------------------------------------------------------------
+# Medición
+# ---------------------------------------------------------------------------
+
+def _huella(valor):
+    return hashlib.sha256(json.dumps(valor, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def percentil(ordenados, p):
+    """Percentil `p` por rango más cercano de una lista ordenada"""
+    return ordenados[max(0, min(len(ordenados) - 1, math.ceil(p / 100 * len(ordenados)) - 1))]
+
+
+def _resumen(tiempos):
+    ordenados = sorted(tiempos)
+    resumen = {f"p{p}_ms": percentil(ordenados, p) * 1000 for p in PERCENTILES}
+    resumen["media_ms"] = sum(tiempos) / len(tiempos) * 1000
+    return resumen
+
+
+def _medir(conexion, sql, plan, muestreador, repeticiones, escritura):
+    """(tiempos en s, filas medias, errores) de ejecutar la sentencia `repeticiones` veces"""
+    cursor = conexion.cursor()
+    tiempos = []
+    filas = errores = 0
+    for _ in range(repeticiones):
+        parametros = muestreador.parametros(plan)
+        if escritura:
+            cursor.execute("SAVEPOINT reproduccion")
+        try:
+            inicio = time.perf_counter()
+            cursor.execute(sql, parametros)
+            resultado = cursor.fetchall()
+            tiempos.append(time.perf_counter() - inicio)
+            filas += cursor.rowcount if escritura else len(resultado)
+        except sqlite3.IntegrityError:
+            errores += 1
+        finally:
+            if escritura:
+                cursor.execute("ROLLBACK TO reproduccion")
+                cursor.execute("RELEASE reproduccion")
+    return tiempos, filas / max(len(tiempos), 1), errores
+
+
+def reproducir(backend, volcados, repeticiones=REPETICIONES, semilla=SEMILLA):
+    """Latencia de las sentencias del backend y de sus endpoints sobre los datos de `volcados`.
+
+    Devuelve {"sentencias": [{"clave", "huella", "archivo", "funcion", "linea",
+    "operacion", "p50_ms", "p95_ms", "p99_ms", "media_ms", "filas", "errores"} o con
+    "error" si SQLite no la acepta], "endpoints": [{"clave", "huella", "metodo",
+    "ruta", "sentencias", "p50_ms"...}], "referencia", "repeticiones", "segundos"}.
+    "huella" resume el SQL de la sentencia o las funciones y sentencias del endpoint.
+    """
+    inicio = time.perf_counter()
+    conexion, esquema, referencia = cargar_sqlite(volcados)
+    segundos_carga = time.perf_counter() - inicio
+    muestreador = Muestreador(conexion, esquema, referencia, semilla)
+
+    sentencias = []
+    tiempos_funcion = {}
+    huellas_funcion = {}
+    for sentencia in extraer_sentencias(backend):
+        operacion = _OPERACION.match(sentencia["sql"]).group(1).upper()
+        # La clave es el orden dentro de la función: sigue valiendo si cambian el SQL o la línea
+        anteriores = tiempos_funcion.setdefault((sentencia["archivo"], sentencia["funcion"]), [])
+        orden = sum(1 for s in sentencias if (s["archivo"], s["funcion"]) == (sentencia["archivo"], sentencia["funcion"]))
+        resultado = {
+            "clave": f"{sentencia['archivo']}:{sentencia['funcion']}#{orden + 1}",
+            "huella": _huella(sentencia["sql"]),
+            "archivo": sentencia["archivo"],
+            "funcion": sentencia["funcion"],
+            "linea": sentencia["linea"],
+            "operacion": operacion,
+        }
+        huellas_funcion.setdefault((sentencia["archivo"], sentencia["funcion"]), []).append(resultado["huella"])
+        sql = traducir_sql(sentencia["sql"])
+        plan = plan_parametros(sentencia["sql"], esquema)
+        try:
+            tiempos, filas, errores = _medir(conexion, sql, plan, muestreador, repeticiones, operacion != "SELECT")
+        except (sqlite3.Error, ValueError, TypeError, OverflowError) as error:
+            # sentencias_js deja un ? en lugar de cada ${...}: si sobra, la sentencia se arma al ejecutarse
+            resultado["error"] = ("fragmento ${...} que solo se conoce al ejecutar" if 'near "?"' in str(error)
+                                  else str(error))
+            sentencias.append(resultado)
+            continue
+        if not tiempos:
+            resultado["error"] = f"las {errores} ejecuciones violan una restricción"
+            sentencias.append(resultado)
+            continue
+        resultado.update(_resumen(tiempos))
+        resultado.update({"filas": filas, "errores": errores})
+        sentencias.append(resultado)
+        anteriores.append(tiempos)
+
+    endpoints = []
+    for ruta in leer_rutas(backend):
+        listas = [tiempos for funcion in ruta["funciones"] for tiempos in tiempos_funcion.get(funcion, [])]
+        if not listas:
+            continue
+        totales = [sum(tiempos[i % len(tiempos)] for tiempos in listas) for i in range(repeticiones)]
+        huella = _huella([[list(funcion), huellas_funcion.get(funcion, [])] for funcion in ruta["funciones"]])
+        endpoint = {"clave": f"{ruta['metodo']} {ruta['ruta']}", "huella": huella, "metodo": ruta["metodo"],
+                    "ruta": ruta["ruta"], "funcion": ruta["funciones"][-1][1], "sentencias": len(listas)}
+        endpoint.update(_resumen(totales))
+        endpoints.append(endpoint)
+    conexion.close()
+
+    return {
+        "referencia": referencia.strftime("%Y-%m-%d %H:%M:%S"),
+        "repeticiones": repeticiones,
+        "sentencias": sentencias,
+        "endpoints": sorted(endpoints, key=lambda e: -e["p95_ms"]),
+        "segundos_carga": segundos_carga,
+        "segundos": time.perf_counter() - inicio,
+    }
+
+
+def comparar(resultado, base):
+    """Añade "p95_base_ms" a sentencias y endpoints que cambiaron desde `base` y devuelve las regresiones.
+
+    Solo se comparan los presentes en `base` con otra huella (o sin huella, en
+    resultados guardados por versiones anteriores): con el mismo código las
+    diferencias son ruido de la medición.
+    Regresiones: [{"tipo", "clave", "p95_ms", "p95_base_ms", "proporcion"}] de mayor a menor proporción.
+    """
+    regresiones = []
+    for tipo in ("sentencias", "endpoints"):
+        anteriores = {e["clave"]: e for e in base.get(tipo, []) if "p95_ms" in e}
+        for elemento in resultado[tipo]:
+            anterior = anteriores.get(elemento["clave"])
+            if anterior is None or "p95_ms" not in elemento or anterior.get("huella") == elemento["huella"]:
+                continue
+            elemento["p95_base_ms"] = anterior["p95_ms"]
+            proporcion = elemento["p95_ms"] / anterior["p95_ms"] if anterior["p95_ms"] else math.inf
+            if proporcion > REGRESION_PROPORCION and elemento["p50_ms"] - anterior["p95_ms"] > REGRESION_MS:
+                regresiones.append({"tipo": tipo[:-1], "clave": elemento["clave"], "p95_ms": elemento["p95_ms"],
+                                    "p95_base_ms": anterior["p95_ms"], "proporcion": proporcion})
+    return sorted(regresiones, key=lambda r: -r["proporcion"])
+
+
+def _archivos_js(backend):
+    """Archivos .js del backend sin bajar a node_modules (recorrerlo era la mayor parte de la firma)"""
+    rutas = []
+    for directorio, subdirectorios, nombres in os.walk(backend):
+        subdirectorios[:] = [nombre for nombre in subdirectorios if nombre != "node_modules"]
+        rutas.extend(os.path.join(directorio, nombre) for nombre in nombres if nombre.endswith(".js"))
+    return sorted(rutas)
+
+
+def _firma(backend, volcados, anterior=None):
+    """{ruta relativa: [mtime, tamaño, huella del contenido]} de volcados y backend.
+
+    La huella de los archivos con el mismo mtime y tamaño que en la firma `anterior`
+    se toma de ella en lugar de leerlos.
+    """
+    anterior = anterior or {}
+    rutas = sorted(glob.glob(os.path.join(volcados, "**", "*.sql"), recursive=True)) + _archivos_js(backend)
+    firma = {}
+    for ruta in rutas:
+        relativa = os.path.relpath(ruta, os.path.dirname(backend))
+        estado = os.stat(ruta)
+        previo = anterior.get(relativa)
+        if previo and previo[:2] == [estado.st_mtime_ns, estado.st_size]:
+            firma[relativa] = previo
+            continue
+        with open(ruta, "rb") as archivo:
+            firma[relativa] = [estado.st_mtime_ns, estado.st_size, hashlib.sha256(archivo.read()).hexdigest()]
+    return firma
+
+
+def _guardar(ruta_cache, repeticiones, firma, resultado):
+    os.makedirs(os.path.dirname(ruta_cache), exist_ok=True)
+    temporal = f"{ruta_cache}.{os.getpid()}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump({"version": VERSION_REPRODUCCION, "repeticiones": repeticiones, "firma": firma,
+                   "resultado": resultado}, archivo, ensure_ascii=False)
+    os.replace(temporal, ruta_cache)
+
+
+def reproducir_en_cache(backend, volcados, directorio_cache, repeticiones=REPETICIONES):
+    """reproducir() guardando el resultado en JSON por el contenido de volcados y backend.
+
+    Primero se comparan mtime y tamaño de cada archivo y solo se leen los que
+    cambiaron: tocar un archivo sin modificarlo no repite la medición. Al repetirla
+    el resultado se compara con el guardado y lleva sus "regresiones".
+    Devuelve (resultado, desde_cache).
+    """
+    ruta_cache = os.path.join(directorio_cache, "reproduccion.json")
+    guardado = None
+    try:
+        with open(ruta_cache, encoding="utf-8") as archivo:
+            guardado = json.load(archivo)
+    except (OSError, ValueError):
+        pass
+    if not (guardado and guardado.get("version") == VERSION_REPRODUCCION
+            and guardado.get("repeticiones") == repeticiones and isinstance(guardado.get("firma"), dict)):
+        guardado = None
+    anterior = guardado["firma"] if guardado else None
+    firma = _firma(backend, volcados, anterior)
+    if anterior is not None:
+        contenido = {ruta: huella for ruta, (_, _, huella) in firma.items()}
+        if contenido == {ruta: huella for ruta, (_, _, huella) in anterior.items()}:
+            if firma != anterior:
+                # Mismo contenido con otro mtime: se guarda para no volver a leer esos archivos
+                _guardar(ruta_cache, repeticiones, firma, guardado["resultado"])
+            return guardado["resultado"], True
+
+    resultado = reproducir(backend, volcados, repeticiones)
+    resultado["regresiones"] = comparar(resultado, guardado["resultado"]) if guardado else []
+    _guardar(ruta_cache, repeticiones, firma, resultado)
+    return resultado, False
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Latencia de las sentencias del backend sobre los volcados en SQLite")
+    parser.add_argument("--backend", default=os.path.join(REPOSITORIO, "backend"))
+    parser.add_argument("--volcados", default=os.path.join(REPOSITORIO, "bd"))
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES, help="ejecuciones de cada sentencia")
+    parser.add_argument("--json", metavar="ARCHIVO", help="guarda el resultado completo en este archivo")
+    parser.add_argument("--base", metavar="ARCHIVO", help="resultado anterior (--json) con el que comparar")
+    parser.add_argument("--limite", type=int, default=15, help="filas de cada lista que se muestran")
+    argumentos = parser.parse_args(argumentos)
+
+    try:
+        resultado = reproducir(argumentos.backend, argumentos.volcados, argumentos.repeticiones)
+    except (ErrorBackend, ErrorReproduccion, ErrorVolcado, OSError) as error:
+        print(f"❌ {error}")
+        return 1
+    if argumentos.base:
+        with open(argumentos.base, encoding="utf-8") as archivo:
+            resultado["regresiones"] = comparar(resultado, json.load(archivo))
+    if argumentos.json:
+        with open(argumentos.json, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+
+    medidas = [s for s in resultado["sentencias"] if "error" not in s]
+    print(f"{len(medidas)} de {len(resultado['sentencias'])} sentencias reproducidas {resultado['repeticiones']} veces "
+          f"en {resultado['segundos']:.2f} s (carga de los volcados {resultado['segundos_carga']:.2f} s; "
+          f"NOW() = {resultado['referencia']})")
+    print(f"\n{'p50':>9} {'p95':>9} {'p99':>9}  Endpoint")
+    for endpoint in resultado["endpoints"][:argumentos.limite]:
+        print(f"{endpoint['p50_ms']:>7.3f}ms {endpoint['p95_ms']:>7.3f}ms {endpoint['p99_ms']:>7.3f}ms  "
+              f"{endpoint['clave']} ({endpoint['sentencias']} sentencias)")
+    print(f"\n{'p50':>9} {'p95':>9} {'p99':>9}  Sentencia")
+    for sentencia in sorted(medidas, key=lambda s: -s["p95_ms"])[:argumentos.limite]:
+        print(f"{sentencia['p50_ms']:>7.3f}ms {sentencia['p95_ms']:>7.3f}ms {sentencia['p99_ms']:>7.3f}ms  "
+              f"{sentencia['funcion']} {sentencia['operacion']} ({sentencia['archivo']}:{sentencia['linea']})")
+    errores = [s for s in resultado["sentencias"] if "error" in s]
+    if errores:
+        print(f"\nSentencias que SQLite no acepta ({len(errores)}):")
+        for sentencia in errores[:argumentos.limite]:
+            print(f"  {sentencia['archivo']}:{sentencia['linea']} {sentencia['funcion']}: {sentencia['error']}")
+    if "regresiones" in resultado:
+        print(f"\nRegresiones frente a {argumentos.base} ({len(resultado['regresiones'])}):")
+        for regresion in resultado["regresiones"]:
+            print(f"  {regresion['clave']}: p95 {regresion['p95_base_ms']:.3f} → {regresion['p95_ms']:.3f} ms "
+                  f"(×{regresion['proporcion']:.1f})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
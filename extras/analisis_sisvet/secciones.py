@@ -0,0 +1,339 @@
+"""
+SECCIONES DEL ANÁLISIS COMPLETO
+Cada sección del documento es un generador de fragmentos HTML. El documento se
+escribe fragmento a fragmento en el archivo de salida, sin construir nunca la
+cadena completa en memoria.
+
+El HTML de cada sección está en su plantilla de plantillas/ (ver plantillas.py);
+aquí solo se preparan los valores que recibe.
+"""
+
+import math
+from datetime import datetime
+
+from .cifras import hora_fin, primer_mes, resumir
+from .graficas import ID_DATOS_GRAFICAS, script_datos_graficas
+from .plantillas import Plantilla
+
+# Plantilla de cada sección en plantillas/; su huella entra en la clave de la caché de la sección
+_ESTILOS = Plantilla("estilos.html")
+_ENCABEZADO = Plantilla("encabezado.html")
+_RESUMEN = Plantilla("resumen.html")
+_ANALISIS_TECNICO = Plantilla("analisis_tecnico.html")
+_CONEXIONES = Plantilla("conexiones.html")
+_REPRODUCCION = Plantilla("reproduccion.html")
+_RECORDATORIOS = Plantilla("recordatorios.html")
+_OCUPACION = Plantilla("ocupacion.html")
+_AUDITORIA = Plantilla("auditoria.html")
+_COMPETENCIA = Plantilla("competencia.html")
+_COMPARACION = Plantilla("comparacion.html")
+_COSTOS = Plantilla("costos.html")
+_MERCADO = Plantilla("mercado.html")
+_CUESTIONARIOS = Plantilla("cuestionarios.html")
+_RECOMENDACIONES = Plantilla("recomendaciones.html")
+_PIE = Plantilla("pie.html")
+
+
+def seccion_estilos(datos):
+    """Apertura del documento: metadatos, Chart.js y hoja de estilos (igual en todos los análisis)"""
+    yield from _ESTILOS.render()
+
+
+# Datos que lee el encabezado: la clínica y los análisis opcionales que enlaza la navegación
+CAMPOS_ENCABEZADO = ("clinica", "conexiones", "reproduccion", "recordatorios", "ocupacion_citas", "auditoria")
+
+
+def seccion_encabezado(datos):
+    """Encabezado, navegación y apertura del contenido"""
+    yield from _ENCABEZADO.render(
+        clinica=datos.get("clinica"),
+        generado=datetime.now().strftime("%d de %B de %Y, %H:%M"),
+        conexiones=datos.get("conexiones"),
+        reproduccion=datos.get("reproduccion"),
+        recordatorios=datos.get("recordatorios"),
+        ocupacion=datos.get("ocupacion_citas"),
+        auditoria=datos.get("auditoria"),
+    )
+
+
+def seccion_resumen(datos):
+    """Sección de resumen ejecutivo"""
+    yield from _RESUMEN.render(proyecto_sisvet=datos["proyecto_sisvet"], competidores=datos["competidores"])
+
+
+def seccion_analisis_tecnico(datos):
+    """Sección de análisis técnico (stack, módulos, base de datos y calidad)"""
+    yield from _ANALISIS_TECNICO.render(proyecto_sisvet=datos["proyecto_sisvet"], escaneo=datos.get("escaneo"))
+
+
+_CIERRES = {
+    "finally": "cerradas en un finally",
+    "explícito": "cerradas solo en el camino normal",
+    "sin cierre": "nunca cerradas",
+}
+
+
+def seccion_conexiones(datos):
+    """Ciclo de vida de las conexiones de conectarDB() y modelo de latencia con y sin pool"""
+    conexiones = datos.get("conexiones")
+    if not conexiones:
+        return
+    por_cierre = {}
+    for llamada in conexiones["llamadas"]:
+        por_cierre[llamada["cierre"]] = por_cierre.get(llamada["cierre"], 0) + 1
+    medidas = conexiones["medidas"]
+    yield from _CONEXIONES.render(
+        conexiones=conexiones,
+        configuracion=conexiones["configuracion"],
+        cierres=[f"{n} {_CIERRES[cierre]}" for cierre, n in sorted(por_cierre.items())],
+        fugas=[llamada for llamada in conexiones["llamadas"] if llamada["cierre"] != "finally"],
+        medidas=medidas,
+        fases=(("Sin retardo", medidas["sin_retardo"]),
+               (f"RTT {medidas['rtt_prueba_ms']:g} ms", medidas["con_retardo"])),
+    )
+
+
+def seccion_reproduccion(datos):
+    """Latencia p50/p95/p99 de las sentencias del backend y de sus endpoints reproducidas sobre SQLite"""
+    reproduccion = datos.get("reproduccion")
+    if not reproduccion:
+        return
+    medidas = [s for s in reproduccion["sentencias"] if "error" not in s]
+    yield from _REPRODUCCION.render(
+        reproduccion=reproduccion,
+        medidas=medidas,
+        endpoints=reproduccion["endpoints"][:15],
+        lentas=sorted(medidas, key=lambda s: -s["p95_ms"])[:15],
+        errores=[s for s in reproduccion["sentencias"] if "error" in s],
+    )
+
+
+def seccion_recordatorios(datos):
+    """Volumen diario del job de recordatorios y capacidad de cada estrategia de envío"""
+    recordatorios = datos.get("recordatorios")
+    if not recordatorios:
+        return
+    volumen = recordatorios["volumen"]
+    actual = recordatorios["estrategias"][0]
+    yield from _RECORDATORIOS.render(
+        recordatorios=recordatorios,
+        volumen=volumen,
+        parametros=recordatorios["parametros"],
+        actual=actual,
+        desborda=actual["capacidad"] < volumen["maximo"],
+        hora_fin=hora_fin,
+    )
+
+
+def seccion_ocupacion(datos):
+    """Mapa de calor de la ocupación de la agenda por doctor, día y franja (volcados de bd/)"""
+    ocupacion = datos.get("ocupacion_citas")
+    if not ocupacion:
+        return
+    agendas = [{"nombre": "Clínica (promedio por doctor)", "ocupacion": ocupacion["total"]}] + ocupacion["doctores"]
+    yield from _OCUPACION.render(ocupacion=ocupacion, agendas=agendas)
+
+
+def seccion_auditoria(datos):
+    """Escrituras de la bitácora de auditoría por tabla, usuario y acción, y registros más modificados"""
+    auditoria = datos.get("auditoria")
+    if not auditoria:
+        return
+    titulos = {"tabla": "Por tabla", "id_usuario": "Por usuario", "accion": "Por acción"}
+    yield from _AUDITORIA.render(
+        auditoria=auditoria,
+        periodo={"hora": "hora", "dia": "día", "mes": "mes"}[auditoria["periodo"]],
+        escrituras=[(dimension, titulos[dimension], list(resumir(escrituras).items())[:10])
+                    for dimension, escrituras in auditoria["escrituras"].items()],
+        campos=[(tabla, sorted(contador.items(), key=lambda par: -par[1])[:8])
+                for tabla, contador in auditoria["campos_escritos"].items()],
+    )
+
+
+def seccion_competencia(datos):
+    """Sección de análisis de la competencia"""
+    yield from _COMPETENCIA.render(competidores=datos["competidores"])
+
+
+def seccion_comparacion(datos):
+    """Sección con la matriz de comparación funcional y la clasificación ponderada por perfil"""
+    matriz = datos["matriz_funcional"]
+    yield from _COMPARACION.render(
+        matriz=matriz,
+        escala=matriz["escala"],
+        productos=matriz["productos"],
+        clasificacion=datos.get("clasificacion_funcional"),
+    )
+
+
+def seccion_costos(datos):
+    """Sección de costos, modelo de precios y proyección financiera"""
+    simulada = datos.get("proyeccion_simulada")
+    meses, hitos, clientes_equilibrio = [], [], None
+    if simulada:
+        meses = sorted({mes for mes in (3, 6, 12, 24, 36, 48, 60) if mes < simulada["meses"]} | {simulada["meses"]})
+        for minimo in (0.5, 0.9):
+            mes = primer_mes(simulada["equilibrio"], minimo)
+            hitos.append(f"mes {mes}" if mes else f"después del mes {simulada['meses']}")
+        clientes_equilibrio = math.ceil(simulada["costos_fijos_mxn"] / simulada["arpu_mxn"])
+    yield from _COSTOS.render(proyecto_sisvet=datos["proyecto_sisvet"], simulada=simulada, meses=meses, hitos=hitos,
+                              clientes_equilibrio=clientes_equilibrio)
+
+
+def seccion_mercado(datos):
+    """Sección del plan de mercado y estrategia de ventas"""
+    yield from _MERCADO.render()
+
+
+def seccion_cuestionarios(datos):
+    """Sección de cuestionarios para estudio de mercado"""
+    yield from _CUESTIONARIOS.render()
+
+
+def seccion_recomendaciones(datos):
+    """Sección de recomendaciones estratégicas"""
+    yield from _RECOMENDACIONES.render()
+
+
+def seccion_pie(datos):
+    """Cierre del contenido, pie de página y scripts de las gráficas"""
+    yield from _PIE.render(datos_graficas=script_datos_graficas(datos), id_datos_graficas=ID_DATOS_GRAFICAS)
+
+
+# Caracteres que se acumulan antes de cada escritura en el archivo de salida
+TAM_BLOQUE_ESCRITURA = 64 * 1024
+
+# Orden del documento: (identificador, generador de fragmentos, datos de los que depende).
+# Las dependencias deciden cuándo se puede reutilizar la sección guardada en caché;
+# None marca secciones que no se guardan (el encabezado incluye la fecha de generación).
+SECCIONES = (
+    ("estilos", seccion_estilos, ()),
+    ("encabezado", seccion_encabezado, None),
+    ("resumen", seccion_resumen, ("proyecto_sisvet", "competidores")),
+    ("analisis-tecnico", seccion_analisis_tecnico, ("proyecto_sisvet", "escaneo")),
+    ("conexiones", seccion_conexiones, ("conexiones",)),
+    ("reproduccion", seccion_reproduccion, ("reproduccion",)),
+    ("recordatorios", seccion_recordatorios, ("recordatorios",)),
+    ("ocupacion", seccion_ocupacion, ("ocupacion_citas",)),
+    ("auditoria", seccion_auditoria, ("auditoria",)),
+    ("competencia", seccion_competencia, ("competidores",)),
+    ("comparacion", seccion_comparacion, ("matriz_funcional", "clasificacion_funcional")),
+    ("costos", seccion_costos, ("proyecto_sisvet", "proyeccion_simulada")),
+    ("mercado", seccion_mercado, ()),
+    ("cuestionarios", seccion_cuestionarios, ()),
+    ("recomendaciones", seccion_recomendaciones, ()),
+    ("pie", seccion_pie, ("competidores", "graficas", "matriz_funcional", "proyeccion_simulada", "recordatorios")),
+)
+
+
+def generar_fragmentos(datos):
+    """Recorre todas las secciones en orden y entrega sus fragmentos HTML"""
+    for _, seccion, _ in SECCIONES:
+        yield from seccion(datos)
+
+
+def volcar(destinos, fragmentos, tam_bloque):
+    """Escribe los fragmentos en todos los destinos agrupados en bloques y devuelve los caracteres escritos"""
+    total = 0
+    pendientes = []
+    tam_pendiente = 0
+    for fragmento in fragmentos:
+        pendientes.append(fragmento)
+        tam_pendiente += len(fragmento)
+        # Agrupar fragmentos pequeños para no pagar una llamada a write() por cada uno
+        if tam_pendiente >= tam_bloque:
+            bloque = "".join(pendientes)
+            for destino in destinos:
+                destino.write(bloque)
+            total += tam_pendiente
+            pendientes.clear()
+            tam_pendiente = 0
+    if pendientes:
+        bloque = "".join(pendientes)
+        for destino in destinos:
+            destino.write(bloque)
+        total += tam_pendiente
+    return total
+
+
+def _leer_bloques(ruta, tam_bloque):
+    """Bloques de un fragmento guardado en caché"""
+    with open(ruta, encoding="utf-8", newline="") as origen:
+        while bloque := origen.read(tam_bloque):
+            yield bloque
+
+
+def iterar_html(datos, cache=None, tam_bloque=TAM_BLOQUE_ESCRITURA):
+    """Fragmentos del documento sección a sección.
+
+    Con una `CacheSecciones` las secciones sin cambios se leen de la caché en
+    bloques de `tam_bloque` y las demás se guardan mientras se entregan; si el
+    consumidor abandona el iterador a medias, la copia incompleta se descarta.
+    """
+    for entrada in SECCIONES:
+        yield from iterar_seccion(entrada, datos, cache, tam_bloque)
+
+
+def iterar_seccion(entrada, datos, cache=None, tam_bloque=TAM_BLOQUE_ESCRITURA):
+    """Fragmentos de una entrada (id_seccion, generador, dependencias) de SECCIONES, con la caché como iterar_html()"""
+    id_seccion, seccion, dependencias = entrada
+    if cache is None or dependencias is None:
+        yield from seccion(datos)
+        return
+
+    clave = cache.clave(id_seccion, seccion, dependencias, datos)
+    ruta = cache.buscar(id_seccion, clave)
+    if ruta is not None:
+        yield from _leer_bloques(ruta, tam_bloque)
+        return
+    with cache.guardar(id_seccion, clave) as copia:
+        for fragmento in seccion(datos):
+            copia.write(fragmento)
+            yield fragmento
+
+
+def escribir_html(destino, datos, cache=None, tam_bloque=TAM_BLOQUE_ESCRITURA):
+    """Escribe el documento sección a sección en `destino` y devuelve los caracteres escritos.
+
+    Con una `CacheSecciones` solo se regeneran las secciones cuyos datos o plantilla
+    cambiaron; el resto se copia desde la caché.
+    """
+    return volcar((destino,), iterar_html(datos, cache, tam_bloque), tam_bloque)
+
+
+def claves_secciones(cache, datos):
+    """Clave en `cache` de cada sección que se puede guardar: {id_seccion: clave}"""
+    return {
+        id_seccion: cache.clave(id_seccion, seccion, dependencias, datos)
+        for id_seccion, seccion, dependencias in SECCIONES
+        if dependencias is not None
+    }
+
+
+def precalentar_cache(cache, lista_datos, minimo_usos=2, lista_claves=None):
+    """Genera una sola vez en `cache` las secciones comunes a varios análisis.
+
+    Una sección es común cuando al menos `minimo_usos` de los datos de `lista_datos`
+    producen la misma clave. `lista_claves` son, si se pasan, las claves de cada
+    datos (como las de claves_secciones()): las secciones que no estén en ellas no
+    se generan. Devuelve los identificadores de las secciones generadas.
+    """
+    generadores = {id_seccion: seccion for id_seccion, seccion, _ in SECCIONES}
+    if lista_claves is None:
+        lista_claves = [claves_secciones(cache, datos) for datos in lista_datos]
+    usos = {}
+    for datos, claves in zip(lista_datos, lista_claves):
+        for id_seccion, clave in claves.items():
+            if (id_seccion, clave) in usos:
+                usos[(id_seccion, clave)][0] += 1
+            else:
+                usos[(id_seccion, clave)] = [1, datos]
+
+    generadas = []
+    for (id_seccion, clave), (n, datos) in usos.items():
+        if n < minimo_usos or cache.existe(id_seccion, clave):
+            continue
+        with cache.guardar(id_seccion, clave) as archivo:
+            volcar((archivo,), generadores[id_seccion](datos), TAM_BLOQUE_ESCRITURA)
+        generadas.append(id_seccion)
+    return generadas
@@ -0,0 +1,280 @@
+"""
+SERVIDOR DE VISTA PREVIA
+Servidor HTTP/1.1 sobre asyncio, sin dependencias, que sirve desde memoria el
+último documento generado y cada una de sus secciones:
+
+    /                    documento completo, con la recarga en vivo
+    /secciones/<id>      fragmento HTML de una sección de SECCIONES
+    /eventos             Server-Sent Events: avisa a los navegadores de cada regeneración
+
+Cada vez que la vigilancia (vigilancia.py) regenera secciones se prepara una
+publicación con el cuerpo, su versión gzip y su ETag fuerte, una sola vez y fuera
+del bucle de eventos. Las peticiones solo eligen una de esas respuestas ya hechas:
+una sala llena de gente recargando el análisis durante una revisión de ventas no
+vuelve a leer ni a comprimir nada, y los navegadores que ya tienen la versión
+vigente reciben un 304 sin cuerpo. Desde extras/:
+
+    python generar_analisis_completo.py serve --puerto 8000
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import threading
+import time
+from email.utils import formatdate
+
+from .secciones import SECCIONES
+from .vigilancia import (ESPERA_RAFAGA, INTERVALO_SONDEO, DocumentoVivo, crear_vigilante, raices_vigiladas,
+                         seguir_cambios)
+
+# Nivel de gzip de las publicaciones: se comprime una vez por regeneración, no por petición
+NIVEL_GZIP = 6
+
+# Segundos entre comentarios de latido en /eventos para que los proxies no corten la conexión
+LATIDO_EVENTOS = 15
+
+# Tamaño máximo de la línea de petición más las cabeceras
+LIMITE_CABECERAS = 16 * 1024
+
+TIPO_HTML = "text/html; charset=utf-8"
+
+_RECARGA = """<script>
+(() => {{
+    const version = {version};
+    const eventos = new EventSource("/eventos");
+    eventos.addEventListener("version", (evento) => {{
+        if (evento.data !== version) location.reload();
+    }});
+}})();
+</script>
+"""
+
+_ESTADOS = {
+    200: "OK",
+    304: "Not Modified",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    503: "Service Unavailable",
+}
+
+
+def _recurso(cuerpo, tipo=TIPO_HTML):
+    """Respuesta ya preparada: cuerpo, versión gzip (si reduce el tamaño) y ETag fuerte de cada una"""
+    etag = hashlib.sha256(cuerpo).hexdigest()[:32]
+    comprimido = gzip.compress(cuerpo, compresslevel=NIVEL_GZIP, mtime=0)
+    return {
+        "tipo": tipo,
+        "cuerpo": cuerpo,
+        "etag": f'"{etag}"',
+        # Una ETag fuerte identifica los bytes exactos: la versión gzip necesita la suya
+        "gzip": comprimido if len(comprimido) < len(cuerpo) else None,
+        "etag_gzip": f'"{etag}-gz"',
+    }
+
+
+def preparar_publicacion(fragmentos):
+    """Publicación del documento y de sus secciones a partir del HTML de cada sección.
+
+    Devuelve {"version", "recursos": {ruta: recurso}}. La versión es la ETag del
+    documento sin el script de recarga, que la lleva dentro para comparar con la
+    que anuncia /eventos.
+    """
+    documento = "".join(fragmentos[id_seccion] for id_seccion, _, _ in SECCIONES)
+    version = hashlib.sha256(documento.encode("utf-8")).hexdigest()[:32]
+    recarga = _RECARGA.format(version=json.dumps(version))
+    posicion = documento.rfind("</body>")
+    if posicion < 0:
+        posicion = len(documento)
+    recursos = {"/": _recurso(f"{documento[:posicion]}{recarga}{documento[posicion:]}".encode("utf-8"))}
+    recursos["/index.html"] = recursos["/"]
+    for id_seccion, _, _ in SECCIONES:
+        recursos[f"/secciones/{id_seccion}"] = _recurso(fragmentos[id_seccion].encode("utf-8"))
+    return {"version": version, "recursos": recursos}
+
+
+def _acepta_gzip(aceptadas):
+    """Indica si la cabecera Accept-Encoding admite gzip (sin q=0)"""
+    for codificacion in aceptadas.split(","):
+        nombre, _, parametros = codificacion.partition(";")
+        if nombre.strip().lower() in ("gzip", "*"):
+            calidad = parametros.strip().lower()
+            if not calidad.startswith("q="):
+                return True
+            try:
+                return float(calidad[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _coincide(si_no_coincide, etag):
+    """Comparación débil de If-None-Match con la ETag vigente"""
+    if not si_no_coincide:
+        return False
+    etiquetas = [etiqueta.strip().removeprefix("W/") for etiqueta in si_no_coincide.split(",")]
+    return "*" in etiquetas or etag in etiquetas
+
+
+class ServidorVistaPrevia:
+    """Servidor asyncio de la última publicación; publicar() se llama desde el bucle de eventos"""
+
+    def __init__(self):
+        self.publicacion = None
+        self.estadisticas = {"peticiones": 0, "no_modificadas": 0, "gzip": 0, "publicaciones": 0}
+        self._suscriptores = set()
+        self._fecha = (0, "")
+
+    def publicar(self, publicacion):
+        """Sustituye la publicación servida y avisa a los navegadores conectados a /eventos"""
+        self.publicacion = publicacion
+        self.estadisticas["publicaciones"] += 1
+        for cola in self._suscriptores:
+            cola.put_nowait(publicacion["version"])
+
+    def _cabecera_fecha(self):
+        # Date cambia una vez por segundo: se formatea una vez por segundo
+        segundo = int(time.time())
+        if self._fecha[0] != segundo:
+            self._fecha = (segundo, formatdate(segundo, usegmt=True))
+        return self._fecha[1]
+
+    def _cabeceras(self, estado, campos, cerrar):
+        lineas = [f"HTTP/1.1 {estado} {_ESTADOS[estado]}", f"Date: {self._cabecera_fecha()}", "Server: sisvet-vista-previa"]
+        lineas += [f"{nombre}: {valor}" for nombre, valor in campos]
+        if cerrar:
+            lineas.append("Connection: close")
+        return ("\r\n".join(lineas) + "\r\n\r\n").encode("latin-1")
+
+    def _error(self, estado, cerrar, campos=()):
+        cuerpo = f"{estado} {_ESTADOS[estado]}\n".encode("ascii")
+        campos = [("Content-Type", "text/plain; charset=utf-8"), ("Content-Length", len(cuerpo)), *campos]
+        return self._cabeceras(estado, campos, cerrar), cuerpo
+
+    def responder(self, metodo, ruta, cabeceras, cerrar=False):
+        """(cabecera, cuerpo) en bytes de la respuesta a una petición ya interpretada"""
+        self.estadisticas["peticiones"] += 1
+        if metodo not in ("GET", "HEAD"):
+            return self._error(405, cerrar, [("Allow", "GET, HEAD")])
+        if self.publicacion is None:
+            return self._error(503, cerrar, [("Retry-After", 1)])
+        recurso = self.publicacion["recursos"].get(ruta.split("?", 1)[0])
+        if recurso is None:
+            return self._error(404, cerrar)
+
+        comprimido = recurso["gzip"] is not None and _acepta_gzip(cabeceras.get("accept-encoding", ""))
+        etag = recurso["etag_gzip"] if comprimido else recurso["etag"]
+        # no-cache: el navegador guarda la copia pero pregunta siempre, y un 304 no lleva cuerpo
+        campos = [("ETag", etag), ("Cache-Control", "no-cache"), ("Vary", "Accept-Encoding")]
+        if _coincide(cabeceras.get("if-none-match"), etag):
+            self.estadisticas["no_modificadas"] += 1
+            return self._cabeceras(304, campos, cerrar), b""
+        cuerpo = recurso["gzip"] if comprimido else recurso["cuerpo"]
+        if comprimido:
+            self.estadisticas["gzip"] += 1
+            campos.append(("Content-Encoding", "gzip"))
+        campos += [("Content-Type", recurso["tipo"]), ("Content-Length", len(cuerpo))]
+        return self._cabeceras(200, campos, cerrar), b"" if metodo == "HEAD" else cuerpo
+
+    async def _eventos(self, escritor):
+        """Mantiene abierto un flujo de Server-Sent Events con la versión vigente y cada nueva"""
+        cola = asyncio.Queue()
+        if self.publicacion is not None:
+            cola.put_nowait(self.publicacion["version"])
+        self._suscriptores.add(cola)
+        try:
+            escritor.write(self._cabeceras(200, [("Content-Type", "text/event-stream"), ("Cache-Control", "no-cache")],
+                                           False) + b"retry: 1000\n\n")
+            await escritor.drain()
+            while True:
+                try:
+                    version = await asyncio.wait_for(cola.get(), LATIDO_EVENTOS)
+                    escritor.write(f"event: version\ndata: {version}\n\n".encode("ascii"))
+                except asyncio.TimeoutError:
+                    escritor.write(b": latido\n\n")
+                await escritor.drain()
+        finally:
+            self._suscriptores.discard(cola)
+
+    async def atender(self, lector, escritor):
+        """Atiende las peticiones de una conexión (con keep-alive) hasta que el cliente la cierra"""
+        try:
+            while True:
+                try:
+                    bloque = await lector.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                linea, *lineas = bloque.decode("latin-1").rstrip("\r\n").split("\r\n")
+                partes = linea.split(" ")
+                if len(partes) != 3 or not partes[2].startswith("HTTP/1."):
+                    escritor.writelines(self._error(400, True))
+                    break
+                metodo, ruta, version = partes
+                cabeceras = {}
+                for cabecera in lineas:
+                    nombre, _, valor = cabecera.partition(":")
+                    cabeceras[nombre.strip().lower()] = valor.strip()
+                if cabeceras.get("content-length", "0") != "0" or "transfer-encoding" in cabeceras:
+                    # Ninguna ruta acepta cuerpo: sin leerlo no se puede seguir en la misma conexión
+                    escritor.writelines(self._error(405, True, [("Allow", "GET, HEAD")]))
+                    break
+                if metodo == "GET" and ruta == "/eventos":
+                    await self._eventos(escritor)
+                    break
+                cerrar = version == "HTTP/1.0" or cabeceras.get("connection", "").lower() == "close"
+                escritor.writelines(self.responder(metodo, ruta, cabeceras, cerrar))
+                await escritor.drain()
+                if cerrar:
+                    break
+        except ConnectionError:
+            pass
+        except asyncio.CancelledError:
+            # Al detener el servidor se cancelan las conexiones abiertas (sobre todo las de
+            # /eventos); terminar sin propagarlo evita que asyncio lo imprima como error
+            pass
+        finally:
+            escritor.close()
+
+
+async def servir(rutas=None, anfitrion="127.0.0.1", puerto=8000, espera=ESPERA_RAFAGA, sondeo=False,
+                 intervalo=INTERVALO_SONDEO, destino=None, avisar=print):
+    """Genera el análisis, lo sirve en `anfitrion`:`puerto` y publica cada regeneración (hasta Ctrl+C).
+
+    La vigilancia corre en un hilo propio; las publicaciones se preparan en ese hilo
+    y se entregan al bucle de eventos ya hechas. Con `destino` el documento también
+    se escribe en ese archivo; si no se puede escribir se avisa y se sigue sirviendo
+    desde memoria. Los errores de los datos al arrancar se propagan.
+    """
+    documento = DocumentoVivo(rutas, avisar)
+    vigilante, metodo = crear_vigilante(raices_vigiladas(documento.rutas), sondeo, intervalo)
+    try:
+        inicial = documento.actualizar()
+        servidor = ServidorVistaPrevia()
+        servidor.publicar(preparar_publicacion(documento.fragmentos))
+        if destino:
+            documento.escribir_o_avisar(destino)
+        bucle = asyncio.get_running_loop()
+
+        def al_actualizar(cambio):
+            if destino:
+                documento.escribir_o_avisar(destino)
+            bucle.call_soon_threadsafe(servidor.publicar, preparar_publicacion(documento.fragmentos))
+
+        # Hilo demonio: está bloqueado esperando cambios y termina con el proceso
+        threading.Thread(target=seguir_cambios, args=(documento, vigilante, espera, avisar, al_actualizar),
+                         name="vigilancia", daemon=True).start()
+        red = await asyncio.start_server(servidor.atender, anfitrion, puerto, limit=LIMITE_CABECERAS)
+        avisar(f"✅ Análisis preparado en {inicial['segundos'] * 1000:.1f} ms")
+        avisar(f"🌐 Vista previa en http://{anfitrion}:{puerto}/ (vigilando las entradas por {metodo}); "
+               f"Ctrl+C para terminar")
+        try:
+            async with red:
+                await red.serve_forever()
+        finally:
+            estadisticas = servidor.estadisticas
+            avisar(f"📊 {estadisticas['peticiones']:,} peticiones: {estadisticas['no_modificadas']:,} respondidas con 304, "
+                   f"{estadisticas['gzip']:,} con gzip; {estadisticas['publicaciones']} publicaciones")
+    finally:
+        vigilante.cerrar()
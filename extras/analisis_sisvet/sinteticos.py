@@ -0,0 +1,699 @@
+"""
+GENERADOR DE DATOS SINTÉTICOS
+Escribe volcados con el esquema de bd/ y tantas filas como una cadena de clínicas,
+para medir el resto de los análisis (ocupación, auditoría, índices, reproducción
+de consultas...) a escala. Cada tabla sale en su archivo, con el mismo nombre que
+en bd/ (sisvet_<tabla>.sql), en SQL compatible con mysqldump o en CSV para LOAD DATA.
+
+- Claves foráneas: cada fila pertenece a una clínica (ids consecutivos por
+  clínica) y sus claves apuntan a filas de la misma clínica, así que las citas,
+  los pacientes, los propietarios y los doctores de una clínica son coherentes.
+  Cuando una tabla apunta a la vez a una tabla y a su padre (vacunas →
+  historias_clinicas → pacientes y vacunas → pacientes) la segunda clave se deriva
+  de la primera. Las claves únicas se reparten sin repetir (1:1 o por combinación).
+- Catálogos (países, estados, especies, razas...): se copian tal cual de bd/.
+- Valores: enums, números y textos siguen la frecuencia de los valores de bd/; las
+  fechas se reparten en el periodo de los datos (o en los AÑOS_HISTORIA previos)
+  con el peso por día de la semana y hora de bd/ sobre una jornada laboral tipo.
+
+Cada valor es una función de (semilla, tabla, columna, id): los bloques se generan
+en paralelo en cualquier orden y el resultado es idéntico byte a byte con
+cualquier número de procesos. Necesita NumPy. Desde extras/:
+
+    python -m analisis_sisvet.sinteticos --clinicas 50 --salida /tmp/sisvet_50
+    python -m analisis_sisvet.auditoria /tmp/sisvet_50/sisvet_audit_logs.sql
+"""
+
+import argparse
+import collections
+import csv
+import datetime
+import glob
+import hashlib
+import io
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .indices import REPOSITORIO, leer_esquemas
+from .tabla_columnar import importar_numpy
+from .volcado_sql import ErrorVolcado, iterar_filas
+
+# Filas de cada tabla por clínica: una clínica mediana con unos 3 años de historia
+FILAS_POR_CLINICA = {
+    "licencias_clinica": 1,
+    "usuarios": 12,
+    "doctores": 6,
+    "doctor_especialidades": 9,
+    "horarios_trabajo": 30,
+    "propietarios": 2500,
+    "telefonos": 3000,
+    "direcciones": 2000,
+    "pacientes": 3500,
+    "citas": 25000,
+    "citas_estetica": 6000,
+    "galeria_estetica": 4000,
+    "perfiles_estetica": 1500,
+    "historias_clinicas": 15000,
+    "vacunas": 9000,
+    "desparasitaciones": 7000,
+    "alergias": 500,
+    "cirugias_procedimientos": 800,
+    "examenes_laboratorio": 2500,
+    "medicamentos_recetados": 12000,
+    "adjuntos": 2000,
+    "expedientes_clinicos": 4000,
+    "expediente_signos_vitales": 4000,
+    "expediente_evaluacion_sistemas": 4000,
+    "expediente_lista_problemas": 6000,
+    "expediente_lista_maestra": 6000,
+    "expediente_diagnosticos_laboratorio": 3000,
+    "expediente_tratamientos": 6000,
+    "audit_logs": 20000,
+    "user_sessions": 5000,
+    "user_tokens": 500,
+    "password_reset_requests": 50,
+    "notificaciones": 8000,
+    "recordatorios": 3000,
+    "inventario": 300,
+    "movimientos_inventario": 6000,
+    "servicios": 15,
+    "servicio_realizado": 10000,
+    "gastos": 1500,
+    "ingresos": 8000,
+    "system_logs": 10000,
+}
+
+# Filas por clínica de una tabla que no está en FILAS_POR_CLINICA ni es un catálogo
+FILAS_POR_DEFECTO = 100
+
+# Tablas de referencia que se copian de bd/ sin multiplicar
+CATALOGOS = ("paises", "estados", "municipios", "codigo_postal", "especies", "razas", "especialidades",
+             "enfermedades_comunes")
+
+# Periodo de las fechas cuando bd/ no tiene un rango propio para la columna
+AÑOS_HISTORIA = 3
+
+# Filas de cada bloque que genera un proceso y de cada INSERT
+TAM_BLOQUE = 50_000
+FILAS_POR_INSERT = 1000
+
+SEMILLA = 20251103
+
+FORMATOS = ("sql", "csv")
+
+# Jornada tipo que se suma a los pesos de bd/: lunes a sábado de 8:00 a 19:00
+_PESOS_DIA_SEMANA = (1.0, 1.0, 1.0, 1.0, 1.0, 0.6, 0.1)
+_PESOS_HORA = tuple(1.0 if 8 <= hora < 19 else 0.02 for hora in range(24))
+# Observaciones que vale la jornada tipo por unidad de peso: con pocas filas en bd/ manda la jornada
+_OBSERVACIONES_JORNADA = 50
+_MINUTOS = (0, 15, 30, 45)
+
+# Columnas de fecha que se generan después de la de creación de la misma fila
+_CREACION = ("created_at", "fecha_creacion")
+_ACTUALIZACION = ("updated_at", "ultima_actualizacion", "fecha_actualizacion")
+DIAS_HASTA_ACTUALIZACION = 30
+
+_TIPOS_ENTEROS = {"tinyint", "smallint", "mediumint", "int", "integer", "bigint", "year", "bit"}
+_TIPOS_REALES = {"decimal", "numeric", "float", "double", "real"}
+_TIPOS_FECHA = {"date", "datetime", "timestamp"}
+
+_CREATE_TABLE = r"CREATE\s+TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?`?{}`?\s*\(.*?\)[^;()]*;"
+_AUTO_INCREMENTO = re.compile(r"\s+AUTO_INCREMENT=\d+", re.IGNORECASE)
+_ESCAPES_SQL = str.maketrans({"\\": "\\\\", "'": "\\'", "\n": "\\n", "\r": "\\r", "\x00": "\\0", "\x1a": "\\Z"})
+
+_CABECERA_SQL = """-- Datos sintéticos de SisVet: {tabla}, {filas:,} filas ({clinicas} clínicas, semilla {semilla})
+
+/*!40101 SET NAMES utf8mb4 */;
+/*!40103 SET @OLD_TIME_ZONE=@@TIME_ZONE */;
+/*!40103 SET TIME_ZONE='+00:00' */;
+/*!40014 SET @OLD_UNIQUE_CHECKS=@@UNIQUE_CHECKS, UNIQUE_CHECKS=0 */;
+/*!40014 SET @OLD_FOREIGN_KEY_CHECKS=@@FOREIGN_KEY_CHECKS, FOREIGN_KEY_CHECKS=0 */;
+/*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
+
+--
+-- Table structure for table `{tabla}`
+--
+
+DROP TABLE IF EXISTS `{tabla}`;
+{create_table}
+
+--
+-- Dumping data for table `{tabla}`
+--
+
+LOCK TABLES `{tabla}` WRITE;
+/*!40000 ALTER TABLE `{tabla}` DISABLE KEYS */;
+"""
+
+_PIE_SQL = """/*!40000 ALTER TABLE `{tabla}` ENABLE KEYS */;
+UNLOCK TABLES;
+/*!40103 SET TIME_ZONE=@OLD_TIME_ZONE */;
+/*!40101 SET SQL_MODE=@OLD_SQL_MODE */;
+/*!40014 SET FOREIGN_KEY_CHECKS=@OLD_FOREIGN_KEY_CHECKS */;
+/*!40014 SET UNIQUE_CHECKS=@OLD_UNIQUE_CHECKS */;
+"""
+
+
+class ErrorSinteticos(ValueError):
+    """El esquema de bd/ no permite generar los datos pedidos"""
+
+
+# ---------------------------------------------------------------------------
+# Plan: qué se genera en cada columna
+# ---------------------------------------------------------------------------
+
+def _texto_sql(valor):
+    return "'" + valor.translate(_ESCAPES_SQL) + "'"
+
+
+def _crudo(valor):
+    """Texto de un valor de bd/ tal como se escribe en el volcado (sin comillas)"""
+    if isinstance(valor, datetime.datetime):
+        return valor.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(valor, datetime.date):
+        return valor.isoformat()
+    if isinstance(valor, datetime.timedelta):
+        segundos = int(valor.total_seconds())
+        return f"{segundos // 3600:02d}:{segundos % 3600 // 60:02d}:{segundos % 60:02d}"
+    if isinstance(valor, (set, frozenset)):
+        return ",".join(sorted(valor))
+    if isinstance(valor, bytes):
+        return valor.decode("utf-8", "replace")
+    return str(valor)
+
+
+def _pesos_fechas(valores):
+    """Pesos por día de la semana, por hora y por minuto de las fechas de bd/ sumados a la jornada tipo"""
+    dias = [peso * _OBSERVACIONES_JORNADA for peso in _PESOS_DIA_SEMANA]
+    horas = [peso * _OBSERVACIONES_JORNADA for peso in _PESOS_HORA]
+    minutos = collections.Counter()
+    segundos = False
+    for valor in valores:
+        if isinstance(valor, datetime.timedelta):
+            total = int(valor.total_seconds())
+            horas[total // 3600 % 24] += 1
+            minutos[total % 3600 // 60] += 1
+            continue
+        dias[valor.weekday()] += 1
+        if isinstance(valor, datetime.datetime):
+            horas[valor.hour] += 1
+            minutos[valor.minute] += 1
+            segundos = segundos or valor.second != 0
+    if not minutos:
+        minutos = collections.Counter(_MINUTOS)
+    return {"dias": dias, "horas": horas, "minutos": sorted(minutos), "pesos_minutos": [minutos[m] for m in sorted(minutos)],
+            "segundos": segundos}
+
+
+def _rango_fechas(valores, referencia):
+    """(primer día, último día) en días desde 1970 de las fechas de una columna"""
+    fechas = [v.date() if isinstance(v, datetime.datetime) else v for v in valores if isinstance(v, datetime.date)]
+    fin = referencia.date()
+    inicio = fin - datetime.timedelta(days=365 * AÑOS_HISTORIA)
+    if fechas and (max(fechas) - min(fechas)).days > 30:
+        inicio, fin = min(fechas), max(fechas)
+    epoca = datetime.date(1970, 1, 1)
+    return (inicio - epoca).days, (fin - epoca).days
+
+
+def _columna_plan(tabla, columna, valores, nulos, total, referencia):
+    """Cómo se generan los valores de una columna que no es clave"""
+    nombre = columna["nombre"]
+    tipo = columna["tipo"]
+    plan = {"nombre": nombre, "nulos": nulos / total if total else (0.1 if columna["nulo"] else 0.0)}
+    unica = any(i["unico"] and i["columnas"] == [nombre] for i in tabla["indices"])
+    if tipo in _TIPOS_FECHA:
+        plan.update({"clase": "fecha", "tipo": tipo, "rango": _rango_fechas(valores, referencia)})
+        plan.update(_pesos_fechas(valores))
+        return plan
+    if tipo == "time":
+        plan.update({"clase": "hora"})
+        plan.update(_pesos_fechas(valores))
+        return plan
+    if unica and (tipo in _TIPOS_ENTEROS or not valores):
+        plan.update({"clase": "unico", "texto": tipo not in _TIPOS_ENTEROS, "prefijo": "" if tipo in _TIPOS_ENTEROS
+                     else re.sub(r"[^a-z0-9]", "", nombre.lower())[:8] + "-",
+                     "dominio": "@ejemplo.com" if "email" in nombre.lower() else ""})
+        return plan
+
+    contador = collections.Counter(_crudo(v) for v in valores)
+    texto = tipo not in _TIPOS_ENTEROS and tipo not in _TIPOS_REALES
+    if not contador:
+        if columna["valores"]:
+            contador = collections.Counter(columna["valores"])
+        elif tipo in _TIPOS_ENTEROS:
+            maximo = 1 if columna["parametros"] == "1" and tipo == "tinyint" else 100
+            contador = collections.Counter(str(n) for n in range(maximo + 1))
+        elif tipo in _TIPOS_REALES:
+            contador = collections.Counter(f"{n * 12.5:.2f}" for n in range(1, 81))
+        elif columna["nulo"]:
+            plan["nulos"] = 1.0
+        else:
+            contador = collections.Counter([f"{nombre} sintético"])
+    if unica:
+        # Valores de bd/ con un sufijo por fila para no repetir
+        plan.update({"clase": "unico", "texto": True, "prefijo": "", "dominio": "",
+                     "valores": sorted(contador)})
+        return plan
+    plan.update({"clase": "categoria", "texto": texto, "valores": list(contador),
+                 "pesos": list(contador.values())})
+    if tipo in _TIPOS_REALES and valores:
+        plan["variacion"] = int((columna["parametros"] or "10,2").split(",")[-1]) if "," in (columna["parametros"] or "10,2") else 2
+    return plan
+
+
+def _filas_clinica(nombre):
+    return FILAS_POR_CLINICA.get(nombre, FILAS_POR_DEFECTO)
+
+
+def _crear_tabla_original(volcados, nombre):
+    """Texto del CREATE TABLE de la tabla en bd/, sin el AUTO_INCREMENT del volcado"""
+    patron = re.compile(_CREATE_TABLE.format(re.escape(nombre)), re.IGNORECASE | re.DOTALL)
+    for ruta in sorted(glob.glob(os.path.join(volcados, "**", "*.sql"), recursive=True)):
+        with open(ruta, encoding="utf-8") as archivo:
+            encontrado = patron.search(archivo.read())
+        if encontrado:
+            return _AUTO_INCREMENTO.sub("", encontrado.group())
+    raise ErrorSinteticos(f"{volcados}: no se encuentra el CREATE TABLE de {nombre}")
+
+
+def planificar(volcados, clinicas, semilla=SEMILLA, tablas=None):
+    """Plan de generación de las tablas de `volcados` para `clinicas` clínicas.
+
+    Lee el esquema y las filas de bd/ y decide, columna a columna, de dónde sale
+    cada valor. El plan es un diccionario que se envía a los procesos.
+    """
+    esquema = leer_esquemas(volcados)
+    if not esquema:
+        raise ErrorSinteticos(f"{volcados}: no hay CREATE TABLE")
+    desconocidas = set(tablas or ()) - set(esquema)
+    if desconocidas:
+        raise ErrorSinteticos(f"tablas que no están en {volcados}: {', '.join(sorted(desconocidas))}")
+    filas = {nombre: [] for nombre in esquema}
+    for ruta in sorted(glob.glob(os.path.join(volcados, "**", "*.sql"), recursive=True)):
+        for nombre, fila in iterar_filas(ruta, esquema=esquema):
+            filas[nombre].append(fila)
+    fechas = [v for lista in filas.values() for fila in lista for v in fila if isinstance(v, datetime.datetime)]
+    ahora = datetime.datetime.now()
+    referencia = max((f for f in fechas if f <= ahora), default=ahora)
+
+    plan = {"semilla": semilla, "clinicas": clinicas, "tablas": {}}
+    for nombre, tabla in esquema.items():
+        if nombre in CATALOGOS:
+            plan["tablas"][nombre] = {"catalogo": True, "total": len(filas[nombre]),
+                                      "ids": [fila[0] for fila in filas[nombre]]}
+            continue
+        plan["tablas"][nombre] = {"catalogo": False, "filas_clinica": _filas_clinica(nombre)}
+
+    for nombre, tabla in esquema.items():
+        entrada = plan["tablas"][nombre]
+        entrada["create_table"] = _crear_tabla_original(volcados, nombre)
+        entrada["columnas_nombres"] = [c["nombre"] for c in tabla["columnas"]]
+        if entrada["catalogo"]:
+            entrada["filas"] = [[None if v is None else (_texto_sql(_crudo(v)) if isinstance(v, (str, datetime.date,
+                                 datetime.timedelta, bytes, set, frozenset)) else _crudo(v)) for v in fila]
+                                for fila in filas[nombre]]
+            entrada["filas_crudas"] = [[None if v is None else _crudo(v) for v in fila] for fila in filas[nombre]]
+            continue
+
+        foraneas = {clave["columnas"][0]: clave for clave in tabla["claves_foraneas"] if len(clave["columnas"]) == 1}
+        compuesta = next((i["columnas"] for i in tabla["indices"]
+                          if i["unico"] and len(i["columnas"]) > 1 and all(c in foraneas for c in i["columnas"])), None)
+        if compuesta:
+            # Cada fila es una combinación distinta de los padres (p. ej. doctor × especialidad)
+            radices = [_filas_padre(plan, foraneas[c]["tabla"]) for c in compuesta]
+            capacidad = 1
+            for radix in radices:
+                capacidad *= radix
+            entrada["filas_clinica"] = min(entrada["filas_clinica"], capacidad)
+        columnas = []
+        for posicion, columna in enumerate(tabla["columnas"]):
+            nombre_columna = columna["nombre"]
+            valores = [fila[posicion] for fila in filas[nombre] if fila[posicion] is not None]
+            nulos = sum(1 for fila in filas[nombre] if fila[posicion] is None)
+            if tabla["clave_primaria"] == [nombre_columna] and columna["auto_incremento"]:
+                columnas.append({"nombre": nombre_columna, "clase": "id", "nulos": 0.0})
+            elif nombre_columna in foraneas:
+                padre = foraneas[nombre_columna]["tabla"]
+                if padre not in plan["tablas"]:
+                    raise ErrorSinteticos(f"{nombre}.{nombre_columna} apunta a {padre}, que no está en el esquema")
+                spec = {"nombre": nombre_columna, "clase": "fk", "padre": padre, "nulos": 0.0}
+                if compuesta and nombre_columna in compuesta:
+                    indice = compuesta.index(nombre_columna)
+                    spec.update({"clase": "fk_combinada", "divisor": _producto(radices[indice + 1:]),
+                                 "radix": radices[indice]})
+                elif any(i["unico"] and i["columnas"] == [nombre_columna] for i in tabla["indices"]):
+                    spec["clase"] = "fk_unica"
+                    entrada["filas_clinica"] = min(entrada["filas_clinica"], _filas_padre(plan, padre))
+                columnas.append(spec)
+            else:
+                columnas.append(_columna_plan(tabla, columna, valores, nulos, len(filas[nombre]), referencia))
+        creacion = next((c["nombre"] for c in columnas if c["nombre"] in _CREACION and c["clase"] == "fecha"), None)
+        for spec in columnas:
+            if creacion and spec["nombre"] in _ACTUALIZACION and spec["clase"] == "fecha":
+                spec["despues_de"] = creacion
+        entrada["columnas"] = columnas
+
+    # Claves derivadas: si la tabla apunta a H y a P, y H apunta a P, P sale de la fila de H
+    for nombre, entrada in plan["tablas"].items():
+        if entrada["catalogo"]:
+            continue
+        for spec in entrada["columnas"]:
+            if spec["clase"] != "fk":
+                continue
+            for otra in entrada["columnas"]:
+                if otra is spec or otra["clase"] not in ("fk", "fk_unica", "fk_combinada"):
+                    continue
+                intermedia = plan["tablas"][otra["padre"]]
+                if intermedia["catalogo"]:
+                    continue
+                via = next((c for c in intermedia["columnas"] if c["clase"] in ("fk", "fk_unica", "fk_combinada")
+                            and c["padre"] == spec["padre"]), None)
+                if via is not None:
+                    spec.update({"clase": "fk_derivada", "via": otra["nombre"], "columna_via": via["nombre"]})
+                    break
+
+    for nombre, entrada in plan["tablas"].items():
+        if not entrada["catalogo"]:
+            entrada["total"] = entrada["filas_clinica"] * clinicas
+    plan["orden"] = [nombre for nombre in esquema if tablas is None or nombre in tablas]
+    return plan
+
+
+def _producto(numeros):
+    total = 1
+    for numero in numeros:
+        total *= numero
+    return total
+
+
+def _filas_padre(plan, padre):
+    entrada = plan["tablas"][padre]
+    return len(entrada["ids"]) if entrada["catalogo"] else entrada["filas_clinica"]
+
+
+# ---------------------------------------------------------------------------
+# Generación vectorizada de un bloque
+# ---------------------------------------------------------------------------
+
+_DORADO = 0x9E3779B97F4A7C15
+
+
+def _huella(texto):
+    return int.from_bytes(hashlib.sha256(texto.encode("utf-8")).digest()[:8], "little")
+
+
+def _aleatorios(np, semilla, tabla, columna, ids, flujo=0):
+    """uint64 pseudoaleatorios (splitmix64) que solo dependen de (semilla, tabla, columna, flujo, id)"""
+    with np.errstate(over="ignore"):
+        z = ids.astype(np.uint64) * np.uint64(_DORADO) + np.uint64(_huella(f"{semilla}:{tabla}:{columna}:{flujo}"))
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _uniformes(np, semilla, tabla, columna, ids, flujo=0):
+    return (_aleatorios(np, semilla, tabla, columna, ids, flujo) >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+
+
+def _elegir(np, pesos, uniformes):
+    """Índices sorteados con los pesos dados"""
+    acumulados = np.cumsum(np.asarray(pesos, dtype=np.float64))
+    return np.minimum(np.searchsorted(acumulados / acumulados[-1], uniformes, side="right"), len(pesos) - 1)
+
+
+def _claves(np, plan, tabla, spec, ids):
+    """Ids (int64) de la clave foránea `spec` de las filas `ids` de `tabla`"""
+    entrada = plan["tablas"][tabla]
+    padre = plan["tablas"][spec["padre"]]
+    if spec["clase"] == "fk_derivada":
+        via = next(c for c in entrada["columnas"] if c["nombre"] == spec["via"])
+        intermedios = _claves(np, plan, tabla, via, ids)
+        intermedia = plan["tablas"][via["padre"]]
+        columna = next(c for c in intermedia["columnas"] if c["nombre"] == spec["columna_via"])
+        return _claves(np, plan, via["padre"], columna, intermedios)
+    clinica = (ids - 1) // entrada["filas_clinica"]
+    local = (ids - 1) % entrada["filas_clinica"]
+    if padre["catalogo"]:
+        candidatos = np.asarray(padre["ids"], dtype=np.int64)
+        if spec["clase"] == "fk_combinada":
+            return candidatos[local // spec["divisor"] % spec["radix"]]
+        return candidatos[_aleatorios(np, plan["semilla"], tabla, spec["nombre"], ids) % np.uint64(len(candidatos))]
+    if spec["clase"] == "fk_unica":
+        elegido = local
+    elif spec["clase"] == "fk_combinada":
+        elegido = local // spec["divisor"] % spec["radix"]
+    else:
+        elegido = (_aleatorios(np, plan["semilla"], tabla, spec["nombre"], ids)
+                   % np.uint64(padre["filas_clinica"])).astype(np.int64)
+    return clinica * padre["filas_clinica"] + elegido + 1
+
+
+def _fechas(np, plan, tabla, spec, ids):
+    """Segundos desde 1970 (o desde medianoche para TIME) de las filas"""
+    semilla = plan["semilla"]
+    if "despues_de" in spec:
+        creacion = next(c for c in plan["tablas"][tabla]["columnas"] if c["nombre"] == spec["despues_de"])
+        espera = _aleatorios(np, semilla, tabla, spec["nombre"], ids) % np.uint64(DIAS_HASTA_ACTUALIZACION * 86400)
+        return _fechas(np, plan, tabla, creacion, ids) + espera.astype(np.int64)
+    horas = _elegir(np, spec["horas"], _uniformes(np, semilla, tabla, spec["nombre"], ids, 1))
+    minutos = np.asarray(spec["minutos"], dtype=np.int64)[
+        _elegir(np, spec["pesos_minutos"], _uniformes(np, semilla, tabla, spec["nombre"], ids, 2))]
+    segundos = horas * 3600 + minutos * 60
+    if spec["segundos"]:
+        segundos += (_aleatorios(np, semilla, tabla, spec["nombre"], ids, 3) % np.uint64(60)).astype(np.int64)
+    if spec["clase"] == "hora":
+        return segundos
+    inicio, fin = spec["rango"]
+    # Solo semanas completas dentro del rango (1970-01-01 fue jueves): ningún día se acumula en los extremos
+    lunes = inicio + (-(inicio + 3)) % 7
+    semanas = (fin - lunes + 1) // 7
+    if semanas < 1:
+        dias = inicio + (_aleatorios(np, semilla, tabla, spec["nombre"], ids) % np.uint64(fin - inicio + 1)).astype(np.int64)
+    else:
+        semana = (_aleatorios(np, semilla, tabla, spec["nombre"], ids) % np.uint64(semanas)).astype(np.int64)
+        dias = lunes + semana * 7 + _elegir(np, spec["dias"], _uniformes(np, semilla, tabla, spec["nombre"], ids, 4))
+    return dias * 86400 + (0 if spec["tipo"] == "date" else segundos)
+
+
+def _valores(np, plan, tabla, spec, ids, formato):
+    """Lista con el texto de cada valor de la columna (None para NULL)"""
+    sql = formato == "sql"
+    clase = spec["clase"]
+    if clase == "id":
+        valores = ids.astype(str)
+    elif clase.startswith("fk"):
+        valores = _claves(np, plan, tabla, spec, ids).astype(str)
+    elif clase in ("fecha", "hora"):
+        segundos = _fechas(np, plan, tabla, spec, ids)
+        if clase == "hora":
+            valores = np.char.replace(np.datetime_as_string(segundos.astype("datetime64[s]")), "1970-01-01T", "")
+        elif spec["tipo"] == "date":
+            valores = np.datetime_as_string((segundos // 86400).astype("datetime64[D]"))
+        else:
+            valores = np.char.replace(np.datetime_as_string(segundos.astype("datetime64[s]")), "T", " ")
+        if sql:
+            valores = np.char.add(np.char.add("'", valores), "'")
+    elif clase == "unico":
+        sufijos = ids.astype(str)
+        if spec.get("valores"):
+            base = np.asarray(spec["valores"], dtype=object)
+            base = base[_aleatorios(np, plan["semilla"], tabla, spec["nombre"], ids) % np.uint64(len(base))]
+            valores = np.char.add(np.char.add(base.astype(str), "-"), sufijos)
+        else:
+            valores = np.char.add(np.char.add(spec["prefijo"], sufijos), spec["dominio"])
+        if sql and spec["texto"]:
+            valores = np.asarray([_texto_sql(v) for v in valores.tolist()], dtype=object)
+    else:
+        literales = [(_texto_sql(v) if sql and spec["texto"] else v) for v in spec["valores"]] if spec["valores"] else []
+        if not literales:
+            return [None] * len(ids)
+        indices = _elegir(np, spec["pesos"], _uniformes(np, plan["semilla"], tabla, spec["nombre"], ids))
+        if "variacion" in spec:
+            base = np.asarray([float(v) for v in spec["valores"]])[indices]
+            factor = 0.8 + 0.4 * _uniformes(np, plan["semilla"], tabla, spec["nombre"], ids, 5)
+            valores = np.char.mod(f"%.{spec['variacion']}f", np.maximum(base * factor, 0))
+        else:
+            valores = np.asarray(literales, dtype=object)[indices]
+    lista = valores.tolist()
+    if spec["nulos"] > 0:
+        nulos = _uniformes(np, plan["semilla"], tabla, spec["nombre"], ids, 6) < spec["nulos"]
+        for posicion in np.flatnonzero(nulos).tolist():
+            lista[posicion] = None
+    return lista
+
+
+_PLAN = None
+
+
+def _iniciar(plan):
+    global _PLAN
+    _PLAN = plan
+
+
+def _generar_bloque(tarea):
+    """Texto SQL o CSV de las filas [inicio, fin] de una tabla; se ejecuta en un proceso del pool"""
+    tabla, inicio, fin, formato = tarea
+    np = importar_numpy()
+    ids = np.arange(inicio, fin + 1, dtype=np.int64)
+    columnas = [_valores(np, _PLAN, tabla, spec, ids, formato) for spec in _PLAN["tablas"][tabla]["columnas"]]
+    if formato == "csv":
+        salida = io.StringIO()
+        csv.writer(salida, lineterminator="\n").writerows(
+            ["\\N" if v is None else v for v in fila] for fila in zip(*columnas))
+        return salida.getvalue()
+    filas = [",".join("NULL" if v is None else v for v in fila) for fila in zip(*columnas)]
+    return "".join(f"INSERT INTO `{tabla}` VALUES (" + "),(".join(filas[i:i + FILAS_POR_INSERT]) + ");\n"
+                   for i in range(0, len(filas), FILAS_POR_INSERT))
+
+
+# ---------------------------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------------------------
+
+def _cabecera(plan, tabla, formato):
+    entrada = plan["tablas"][tabla]
+    if formato == "csv":
+        salida = io.StringIO()
+        csv.writer(salida, lineterminator="\n").writerow(entrada["columnas_nombres"])
+        return salida.getvalue()
+    return _CABECERA_SQL.format(tabla=tabla, filas=entrada["total"], clinicas=plan["clinicas"],
+                                semilla=plan["semilla"], create_table=entrada["create_table"])
+
+
+def _catalogo(plan, tabla, formato):
+    entrada = plan["tablas"][tabla]
+    if formato == "csv":
+        salida = io.StringIO()
+        csv.writer(salida, lineterminator="\n").writerows(
+            ["\\N" if v is None else v for v in fila] for fila in entrada["filas_crudas"])
+        return salida.getvalue()
+    if not entrada["filas"]:
+        return ""
+    filas = [",".join("NULL" if v is None else v for v in fila) for fila in entrada["filas"]]
+    return f"INSERT INTO `{tabla}` VALUES (" + "),(".join(filas) + ");\n"
+
+
+def generar_sinteticos(volcados, salida, clinicas, formato="sql", procesos=None, semilla=SEMILLA, tablas=None,
+            tam_bloque=TAM_BLOQUE):
+    """Escribe en `salida` un archivo por tabla con los datos de `clinicas` clínicas.
+
+    Los bloques de `tam_bloque` filas se reparten entre `procesos` procesos y se
+    escriben en orden; como mucho hay dos bloques por proceso en memoria.
+    Devuelve {"tablas": {tabla: {"archivo", "filas", "bytes"}}, "filas", "bytes",
+    "segundos", "filas_por_segundo", "procesos"}.
+    """
+    if formato not in FORMATOS:
+        raise ErrorSinteticos(f"formato desconocido: {formato}")
+    inicio = time.perf_counter()
+    # Bloques de INSERT completos: el archivo no depende del tamaño de bloque
+    tam_bloque = max(1, tam_bloque // FILAS_POR_INSERT) * FILAS_POR_INSERT
+    plan = planificar(volcados, clinicas, semilla, tablas)
+    os.makedirs(salida, exist_ok=True)
+    extension = "sql" if formato == "sql" else "csv"
+
+    tareas = [(tabla, desde, min(desde + tam_bloque - 1, plan["tablas"][tabla]["total"]), formato)
+              for tabla in plan["orden"] if not plan["tablas"][tabla]["catalogo"]
+              for desde in range(1, plan["tablas"][tabla]["total"] + 1, tam_bloque)]
+    procesos = max(1, min(procesos or os.cpu_count() or 1, len(tareas) or 1))
+    resumen = {}
+    archivos = {}
+
+    def escribir(tabla, texto):
+        if tabla not in archivos:
+            ruta = os.path.join(salida, f"sisvet_{tabla}.{extension}")
+            archivos[tabla] = open(ruta, "w", encoding="utf-8", newline="")
+            archivos[tabla].write(_cabecera(plan, tabla, formato))
+            resumen[tabla] = {"archivo": ruta, "filas": plan["tablas"][tabla]["total"]}
+        archivos[tabla].write(texto)
+
+    def cerrar(tabla):
+        if tabla not in archivos:
+            escribir(tabla, "")
+        if formato == "sql":
+            archivos[tabla].write(_PIE_SQL.format(tabla=tabla))
+        archivos[tabla].close()
+        resumen[tabla]["bytes"] = os.path.getsize(resumen[tabla]["archivo"])
+
+    try:
+        if procesos > 1:
+            pool = ProcessPoolExecutor(max_workers=procesos, initializer=_iniciar, initargs=(plan,))
+            ejecutar = pool.submit
+        else:
+            _iniciar(plan)
+            pool = None
+            ejecutar = None
+        pendientes = collections.deque()
+        siguiente = iter(tareas)
+        for tabla in plan["orden"]:
+            if plan["tablas"][tabla]["catalogo"]:
+                escribir(tabla, _catalogo(plan, tabla, formato))
+                cerrar(tabla)
+                continue
+            while True:
+                # Mantiene dos bloques por proceso en marcha y escribe en orden los de esta tabla
+                while pool and len(pendientes) < 2 * procesos:
+                    tarea = next(siguiente, None)
+                    if tarea is None:
+                        break
+                    pendientes.append((tarea, ejecutar(_generar_bloque, tarea)))
+                if pool:
+                    if not pendientes or pendientes[0][0][0] != tabla:
+                        break
+                    tarea, futuro = pendientes.popleft()
+                    escribir(tabla, futuro.result())
+                else:
+                    tarea = next(siguiente, None)
+                    if tarea is None:
+                        break
+                    escribir(tabla, _generar_bloque(tarea))
+                    if tarea[2] == plan["tablas"][tabla]["total"]:
+                        break
+            cerrar(tabla)
+    finally:
+        if pool:
+            pool.shutdown(cancel_futures=True)
+        for archivo in archivos.values():
+            archivo.close()
+
+    segundos = time.perf_counter() - inicio
+    filas = sum(r["filas"] for r in resumen.values())
+    return {
+        "tablas": resumen,
+        "filas": filas,
+        "bytes": sum(r["bytes"] for r in resumen.values()),
+        "segundos": segundos,
+        "filas_por_segundo": filas / segundos if segundos else 0.0,
+        "procesos": procesos,
+    }
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Volcados sintéticos con el esquema de bd/ a escala de cadena")
+    parser.add_argument("--volcados", default=os.path.join(REPOSITORIO, "bd"), help="directorio con el esquema y los datos")
+    parser.add_argument("--salida", required=True, help="directorio donde se escriben los archivos")
+    parser.add_argument("--clinicas", type=int, default=1, help="clínicas de la cadena (≈210.000 filas cada una)")
+    parser.add_argument("--formato", choices=FORMATOS, default="sql")
+    parser.add_argument("--procesos", type=int, help="procesos (por defecto uno por CPU)")
+    parser.add_argument("--semilla", type=int, default=SEMILLA)
+    parser.add_argument("--tablas", nargs="+", metavar="TABLA", help="genera solo estas tablas")
+    argumentos = parser.parse_args(argumentos)
+
+    try:
+        resultado = generar_sinteticos(argumentos.volcados, argumentos.salida, argumentos.clinicas, argumentos.formato,
+                                       argumentos.procesos, argumentos.semilla, argumentos.tablas)
+    except (ErrorSinteticos, ErrorVolcado, ImportError) as error:
+        print(f"❌ {error}")
+        return 1
+    for tabla, datos in sorted(resultado["tablas"].items(), key=lambda par: -par[1]["filas"]):
+        print(f"  {tabla:<36} {datos['filas']:>12,} filas {datos['bytes'] / (1024 * 1024):>9.1f} MB")
+    print(f"{resultado['filas']:,} filas ({resultado['bytes'] / (1024 * 1024):,.1f} MB) en {resultado['segundos']:.1f} s "
+          f"con {resultado['procesos']} procesos: {resultado['filas_por_segundo']:,.0f} filas/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,378 @@
+"""
+CONSULTAS SQL DEL BACKEND
+Extrae las sentencias SQL que el backend de Express envía a MySQL: las cadenas
+literales de los controladores, los jobs programados y el middleware, incluidas
+las consultas que se construyen por partes (`query += ' AND c.fecha = ?'`).
+
+Cada sentencia se asocia a la función de primer nivel que la contiene, y cada
+función a lo que la ejecuta: las rutas de backend/routes (montadas en index.js con
+su prefijo), las llamadas desde otras funciones del mismo archivo y las
+expresiones cron de los jobs. Con eso se estima cuántas veces al día se ejecuta
+cada sentencia.
+"""
+
+import glob
+import os
+import re
+
+# Archivos del backend con SQL, relativos a backend/
+ARCHIVOS_SQL = ("controllers/*.js", "jobs/*.js", "middleware/*.js")
+
+# Peticiones al día que se suponen para un endpoint sin cifra propia
+PETICIONES_POR_DEFECTO = 1.0
+
+# Llamada del driver de MySQL que hace un viaje a la base de datos
+LLAMADA_BD = re.compile(r"\.\s*(execute|query|beginTransaction|commit)\s*\(")
+
+# Cadena literal de una sentencia SQL, con sus comillas (admite \' y '' dentro)
+CADENA_SQL = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"", re.DOTALL)
+
+_INICIO_SQL = re.compile(r"\s*\(?\s*(SELECT|INSERT|UPDATE|DELETE|REPLACE|WITH)\b", re.IGNORECASE)
+_ASIGNACION = re.compile(r"(\w+)\s*(\+?=)\s*$")
+_CONCATENACION = re.compile(r"[^+]\+\s*$")
+_ANTES_DE_REGEX = re.compile(r"(?:^|[^\w$])(?:return|typeof|case|in|of|void)\s*$")
+_FUNCION = re.compile(r"^(?:export\s+)?(?:(?:const|let|var)\s+(\w+)\s*=|(?:async\s+)?function\s*\*?\s*(\w+))", re.MULTILINE)
+_CRON = re.compile(r"cron\.schedule\(\s*(['\"])(.+?)\1")
+
+_IMPORTACION = re.compile(r"import\s*(?:(\w+)\s|\{([^}]*)\})\s*from\s*['\"]([^'\"]+)['\"]")
+_COMENTARIO = re.compile(r"//[^\n]*|/\*.*?\*/", re.DOTALL)
+_MONTAJE = re.compile(r"app\.use\(\s*['\"]([^'\"]+)['\"]\s*,\s*(\w+)\s*\)")
+_RUTA = re.compile(r"router\s*\.(get|post|put|patch|delete)\(\s*['\"]([^'\"]*)['\"]\s*,([^)]*)\)")
+_RUTA_ENCADENADA = re.compile(r"\.route\(\s*['\"]([^'\"]*)['\"]\s*\)((?:\s*\.(?:get|post|put|patch|delete)\([^)]*\))+)")
+_METODO = re.compile(r"\.(get|post|put|patch|delete)\(([^)]*)\)")
+
+
+class ErrorBackend(ValueError):
+    """El código del backend o las cifras de uso no se pueden interpretar"""
+
+
+# --- Lectura del código JavaScript -------------------------------------------------
+
+def _fin_cadena(codigo, i):
+    """(posición tras la cadena que empieza en `i`, su texto); en las plantillas cada ${...} pasa a ser ?"""
+    comilla = codigo[i]
+    partes = []
+    j = i + 1
+    while j < len(codigo):
+        c = codigo[j]
+        if c == "\\":
+            siguiente = codigo[j + 1:j + 2]
+            partes.append({"n": "\n", "t": "\t"}.get(siguiente, siguiente))
+            j += 2
+        elif c == comilla:
+            return j + 1, "".join(partes)
+        elif comilla == "`" and codigo.startswith("${", j):
+            j = _fin_expresion(codigo, j + 2)
+            partes.append("?")
+        elif c == "\n" and comilla != "`":
+            break
+        else:
+            partes.append(c)
+            j += 1
+    raise ErrorBackend(f"cadena sin cerrar en la línea {codigo.count(chr(10), 0, i) + 1}")
+
+
+def _fin_expresion(codigo, j):
+    """Posición tras la llave que cierra una interpolación ${...} que empieza en `j`"""
+    profundidad = 1
+    while j < len(codigo):
+        c = codigo[j]
+        if c in "'\"`":
+            j, _ = _fin_cadena(codigo, j)
+            continue
+        if c == "{":
+            profundidad += 1
+        elif c == "}":
+            profundidad -= 1
+            if profundidad == 0:
+                return j + 1
+        j += 1
+    raise ErrorBackend("interpolación ${...} sin cerrar")
+
+
+def _fin_regex(codigo, i):
+    """Posición tras la expresión regular literal que empieza en `i` (con sus flags)"""
+    j = i + 1
+    en_clase = False
+    while j < len(codigo) and codigo[j] != "\n":
+        c = codigo[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == "[":
+            en_clase = True
+        elif c == "]":
+            en_clase = False
+        elif c == "/" and not en_clase:
+            j += 1
+            while j < len(codigo) and codigo[j].isalpha():
+                j += 1
+            return j
+        j += 1
+    return j
+
+
+def _piezas_js(codigo):
+    """Entrega (tipo, inicio, fin, texto) de cada cadena, comentario y regex literal del código"""
+    previo = ""
+    i = 0
+    while i < len(codigo):
+        c = codigo[i]
+        if c in " \t\r\n":
+            i += 1
+        elif codigo.startswith("//", i) or codigo.startswith("/*", i):
+            fin = codigo.find("\n", i) if c == "/" and codigo[i + 1] == "/" else codigo.find("*/", i + 2) + 2
+            fin = len(codigo) if fin < 2 else fin
+            yield "comentario", i, fin, None
+            i = fin
+        elif c in "'\"`":
+            fin, texto = _fin_cadena(codigo, i)
+            yield "cadena", i, fin, texto
+            i = fin
+            previo = c
+        elif c == "/" and (not previo or previo in "(,=:[!&|?{};+-*%<>~^" or _ANTES_DE_REGEX.search(codigo, max(0, i - 12), i)):
+            fin = _fin_regex(codigo, i)
+            yield "regex", i, fin, None
+            i = fin
+            previo = "/"
+        else:
+            previo = c
+            i += 1
+
+
+def literales_js(codigo):
+    """[(inicio, fin, texto)] de las cadenas literales del código, sin comentarios ni regex"""
+    return [(inicio, fin, texto) for tipo, inicio, fin, texto in _piezas_js(codigo) if tipo == "cadena"]
+
+
+def enmascarar_js(codigo):
+    """El código con cadenas, comentarios y regex en blanco (mismas posiciones y saltos de línea).
+
+    Así las llaves y paréntesis que quedan son solo los del código.
+    """
+    partes = []
+    posicion = 0
+    for _, inicio, fin, _ in _piezas_js(codigo):
+        partes.append(codigo[posicion:inicio])
+        partes.append("".join("\n" if c == "\n" else " " for c in codigo[inicio:fin]))
+        posicion = fin
+    partes.append(codigo[posicion:])
+    return "".join(partes)
+
+
+def cierre_js(codigo, apertura):
+    """Posición del cierre del paréntesis o llave abierto en `apertura` (código de enmascarar_js())"""
+    abre = codigo[apertura]
+    cierra = ")" if abre == "(" else "}"
+    profundidad = 0
+    for i in range(apertura, len(codigo)):
+        if codigo[i] == abre:
+            profundidad += 1
+        elif codigo[i] == cierra:
+            profundidad -= 1
+            if profundidad == 0:
+                return i
+    return len(codigo)
+
+
+def funciones_js(codigo):
+    """[(inicio, nombre)] de las funciones y constantes declaradas en la primera columna"""
+    return [(m.start(), m.group(1) or m.group(2)) for m in _FUNCION.finditer(codigo)]
+
+
+def _funcion_en(funciones, posicion):
+    nombre = None
+    for inicio, candidata in funciones:
+        if inicio > posicion:
+            break
+        nombre = candidata
+    return nombre
+
+
+def sentencias_js(codigo):
+    """Sentencias SQL del código: [{"funcion", "linea", "inicio", "fin", "sql", "variable"}].
+
+    Una sentencia empieza en una cadena que comienza por SELECT, INSERT, UPDATE,
+    DELETE... y se le añaden las cadenas concatenadas con + y las que se suman con
+    += a la variable a la que se asignó. Los fragmentos condicionales se suman
+    todos: la sentencia es la más completa que el código puede construir.
+    """
+    funciones = funciones_js(codigo)
+    sentencias = []
+    abiertas = {}
+    for inicio, fin, texto in literales_js(codigo):
+        funcion = _funcion_en(funciones, inicio)
+        antes = codigo[max(0, inicio - 80):inicio]
+        asignacion = _ASIGNACION.search(antes)
+        if _INICIO_SQL.match(texto):
+            sentencia = {
+                "funcion": funcion,
+                "linea": codigo.count("\n", 0, inicio) + 1,
+                "inicio": inicio,
+                "fin": fin,
+                "sql": texto,
+                "variable": asignacion.group(1) if asignacion and asignacion.group(2) == "=" else None,
+            }
+            sentencias.append(sentencia)
+            if sentencia["variable"]:
+                abiertas[(funcion, sentencia["variable"])] = sentencia
+        elif asignacion and asignacion.group(2) == "+=" and (funcion, asignacion.group(1)) in abiertas:
+            abiertas[(funcion, asignacion.group(1))]["sql"] += texto
+        elif (_CONCATENACION.search(antes) and sentencias and sentencias[-1]["funcion"] == funcion
+              and codigo[sentencias[-1]["fin"]:inicio].strip().startswith("+")):
+            sentencias[-1]["sql"] += texto
+            sentencias[-1]["fin"] = fin
+    return sentencias
+
+
+def extraer_sentencias(backend, archivos=ARCHIVOS_SQL):
+    """Sentencias SQL de los archivos de `backend`, con "archivo" relativo a backend/"""
+    sentencias = []
+    for patron in archivos:
+        for ruta in sorted(glob.glob(os.path.join(backend, patron))):
+            with open(ruta, encoding="utf-8") as archivo:
+                codigo = archivo.read()
+            relativa = os.path.relpath(ruta, backend).replace(os.sep, "/")
+            for sentencia in sentencias_js(codigo):
+                sentencia["archivo"] = relativa
+                sentencias.append(sentencia)
+    return sentencias
+
+
+# --- Frecuencia de ejecución -------------------------------------------------------
+
+def _valores_cron(campo, minimo, maximo):
+    valores = set()
+    for parte in campo.split(","):
+        rango, _, paso = parte.partition("/")
+        if rango == "*":
+            desde, hasta = minimo, maximo
+        elif "-" in rango:
+            desde, hasta = (int(v) for v in rango.split("-", 1))
+        else:
+            desde = hasta = int(rango)
+            if paso:
+                hasta = maximo
+        valores.update(range(desde, hasta + 1, int(paso) if paso else 1))
+    return valores
+
+
+def ejecuciones_por_dia(expresion):
+    """Veces al día (de media) que se dispara una expresión cron de 5 o 6 campos"""
+    campos = expresion.split()
+    if len(campos) not in (5, 6):
+        raise ErrorBackend(f"expresión cron no soportada: {expresion!r}")
+    try:
+        segundos = len(_valores_cron(campos.pop(0), 0, 59)) if len(campos) == 6 else 1
+        minuto, hora, dia_mes, mes, dia_semana = campos
+        veces = segundos * len(_valores_cron(minuto, 0, 59)) * len(_valores_cron(hora, 0, 23))
+        if dia_mes != "*":
+            veces *= len(_valores_cron(dia_mes, 1, 31)) / 30.44
+        if mes != "*":
+            veces *= len(_valores_cron(mes, 1, 12)) / 12
+        if dia_semana != "*":
+            # 0 y 7 son el domingo
+            veces *= len({dia % 7 for dia in _valores_cron(dia_semana, 0, 7)}) / 7
+    except ValueError:
+        raise ErrorBackend(f"expresión cron no soportada: {expresion!r}") from None
+    return veces
+
+
+def _importaciones(codigo, directorio, backend):
+    """{nombre importado: archivo relativo a backend/}"""
+    importados = {}
+    for unico, varios, origen in _IMPORTACION.findall(codigo):
+        if not origen.startswith("."):
+            continue
+        archivo = os.path.relpath(os.path.normpath(os.path.join(directorio, origen)), backend).replace(os.sep, "/")
+        nombres = [unico] if unico else [n.split(" as ")[-1].strip() for n in _COMENTARIO.sub("", varios).split(",")]
+        for nombre in nombres:
+            if nombre:
+                importados[nombre] = archivo
+    return importados
+
+
+def leer_rutas(backend):
+    """[{"metodo", "ruta", "funciones": [(archivo, función)]}] de las rutas montadas en index.js.
+
+    "funciones" incluye el middleware de la ruta (checkAuth...) además del controlador.
+    """
+    with open(os.path.join(backend, "index.js"), encoding="utf-8") as archivo:
+        indice = archivo.read()
+    enrutadores = _importaciones(indice, backend, backend)
+    rutas = []
+    for prefijo, enrutador in _MONTAJE.findall(indice):
+        if enrutador not in enrutadores:
+            continue
+        ruta_archivo = os.path.join(backend, enrutadores[enrutador])
+        with open(ruta_archivo, encoding="utf-8") as archivo:
+            codigo = archivo.read()
+        importados = _importaciones(codigo, os.path.dirname(ruta_archivo), backend)
+
+        definiciones = [(metodo, ruta, manejadores) for metodo, ruta, manejadores in _RUTA.findall(codigo)]
+        for ruta, cadena in _RUTA_ENCADENADA.findall(codigo):
+            definiciones.extend((metodo, ruta, manejadores) for metodo, manejadores in _METODO.findall(cadena))
+        for metodo, ruta, manejadores in definiciones:
+            nombres = [nombre.strip() for nombre in manejadores.split(",")]
+            rutas.append({
+                "metodo": metodo.upper(),
+                "ruta": (prefijo.rstrip("/") + "/" + ruta.strip("/")).rstrip("/") or "/",
+                "funciones": [(importados[nombre], nombre) for nombre in nombres if nombre in importados],
+            })
+    return rutas
+
+
+def pesos_funciones(backend, peticiones=None, archivos=ARCHIVOS_SQL):
+    """{(archivo, función): ejecuciones al día} de las funciones de los archivos con SQL.
+
+    `peticiones` da las peticiones al día de cada endpoint ("GET /api/citas") o job
+    (por su nombre); los endpoints que falten cuentan PETICIONES_POR_DEFECTO y los
+    jobs lo que indica su expresión cron. Una función llamada desde otra del mismo
+    archivo suma las ejecuciones de quien la llama.
+    """
+    peticiones = dict(peticiones or {})
+    directos = {}
+    conocidos = set()
+    for ruta in leer_rutas(backend):
+        endpoint = f"{ruta['metodo']} {ruta['ruta']}"
+        conocidos.add(endpoint)
+        for funcion in ruta["funciones"]:
+            directos[funcion] = directos.get(funcion, 0.0) + peticiones.get(endpoint, PETICIONES_POR_DEFECTO)
+
+    llamadas = {}
+    for patron in archivos:
+        for ruta in sorted(glob.glob(os.path.join(backend, patron))):
+            with open(ruta, encoding="utf-8") as archivo:
+                codigo = archivo.read()
+            relativa = os.path.relpath(ruta, backend).replace(os.sep, "/")
+            funciones = funciones_js(codigo)
+            nombres = {nombre for _, nombre in funciones}
+            limites = [inicio for inicio, _ in funciones[1:]] + [len(codigo)]
+            for (inicio, nombre), fin in zip(funciones, limites):
+                cuerpo = codigo[inicio:fin]
+                cron = _CRON.search(cuerpo)
+                if cron:
+                    conocidos.add(nombre)
+                    directos[(relativa, nombre)] = peticiones.get(nombre, ejecuciones_por_dia(cron.group(2)))
+                for llamada in set(re.findall(r"\b(\w+)\s*\(", cuerpo)) & nombres - {nombre}:
+                    llamadas.setdefault((relativa, llamada), set()).add((relativa, nombre))
+                directos.setdefault((relativa, nombre), 0.0)
+
+    desconocidos = sorted(set(peticiones) - conocidos)
+    if desconocidos:
+        raise ErrorBackend(f"endpoints o jobs desconocidos en las peticiones: {', '.join(desconocidos)}")
+
+    pesos = {}
+
+    def peso(funcion, visitadas):
+        if funcion in pesos:
+            return pesos[funcion]
+        total = directos.get(funcion, 0.0)
+        for llamante in llamadas.get(funcion, ()):
+            if llamante not in visitadas:
+                total += peso(llamante, visitadas | {llamante})
+        return total
+
+    for funcion in directos:
+        pesos[funcion] = peso(funcion, {funcion})
+    return pesos
@@ -0,0 +1,436 @@
+"""
+TABLAS COLUMNARES
+Guarda en memoria las filas que entrega volcado_sql columna a columna, en arrays
+compactos del módulo `array` en lugar de un diccionario por fila:
+
+- enteros en int64, decimales y flotantes en float64
+- fechas como días desde 1970-01-01, fechas con hora como segundos, TIME como segundos
+- ENUM (y las columnas de texto que se indiquen) codificados con diccionario: cada
+  fila guarda un int16 con la posición del valor en la lista de valores distintos,
+  que pasa a int32 (o int64) cuando la lista crece por encima de 32.767 valores
+
+Los NULL se guardan con un valor centinela por tipo (NaN en los reales, -1 en las
+categorías). Filtros, agrupaciones, sumas y conteos se calculan con NumPy sobre
+vistas de esos arrays sin copiarlos; NumPy solo es necesario para esas operaciones,
+la carga y la lectura de valores funcionan sin él. Comparación con una lista de
+diccionarios desde extras/:
+
+    python -m analisis_sisvet.tabla_columnar ../bd/sisvet_ingresos.sql ingresos metodo_pago monto
+"""
+
+import datetime
+import math
+import sys
+import time
+import tracemalloc
+from array import array
+
+from .volcado_sql import iterar_filas, leer_esquema
+
+NULO_ENTERO = -2 ** 63
+NULO_FECHA = -2 ** 31
+NULO_CATEGORIA = -1
+
+# Por encima de este número de combinaciones de claves el group-by ordena en lugar de contar
+_MAX_COMBINACIONES_DIRECTAS = 1 << 22
+# Mayor producto de cardinalidades cuya clave compuesta (hasta producto - 1) cabe en int64
+_MAX_COMBINACIONES_INT64 = 1 << 63
+
+_EPOCA = datetime.datetime(1970, 1, 1)
+_EPOCA_ORDINAL = _EPOCA.toordinal()
+
+# Tipo de almacenamiento de cada tipo de MySQL: (clase, código de array)
+ALMACENAMIENTO = {
+    "tinyint": ("entero", "q"), "smallint": ("entero", "q"), "mediumint": ("entero", "q"),
+    "int": ("entero", "q"), "integer": ("entero", "q"), "bigint": ("entero", "q"), "year": ("entero", "q"),
+    "bool": ("entero", "q"), "boolean": ("entero", "q"), "bit": ("entero", "q"),
+    "decimal": ("real", "d"), "numeric": ("real", "d"), "float": ("real", "d"), "double": ("real", "d"),
+    "date": ("fecha", "i"), "datetime": ("fecha_hora", "q"), "timestamp": ("fecha_hora", "q"), "time": ("hora", "i"),
+    "enum": ("categoria", "h"),
+}
+
+# Códigos de array de las categorías, del más estrecho al más ancho
+_CODIGOS_CATEGORIA = ("h", "i", "q")
+
+_NULOS = {"entero": NULO_ENTERO, "fecha": NULO_FECHA, "fecha_hora": NULO_ENTERO, "hora": NULO_FECHA, "categoria": NULO_CATEGORIA}
+
+
+def importar_numpy():
+    """Módulo numpy, o ImportError con la instrucción para instalarlo"""
+    try:
+        import numpy
+    except ImportError as error:
+        raise ImportError("las operaciones de TablaColumnar necesitan NumPy (pip install numpy)") from error
+    return numpy
+
+
+def _codigo_categoria(valores):
+    """Código de array más estrecho en el que caben las posiciones de `valores` valores distintos"""
+    for codigo in _CODIGOS_CATEGORIA:
+        if valores <= 1 << (8 * array(codigo).itemsize - 1):
+            return codigo
+    raise OverflowError(f"demasiados valores distintos en una categoría: {valores}")
+
+
+def _codificar(clase, valor):
+    """Convierte un valor de Python a su representación en el array de la columna"""
+    if clase == "entero":
+        return int(valor)
+    if clase == "real":
+        return float(valor)
+    if clase == "fecha":
+        return valor.toordinal() - _EPOCA_ORDINAL
+    if clase == "fecha_hora":
+        return (valor - _EPOCA) // datetime.timedelta(seconds=1)
+    if clase == "hora":
+        return valor // datetime.timedelta(seconds=1)
+    raise ValueError(f"la clase {clase} no se codifica con un número")
+
+
+def _decodificar(clase, valor):
+    if clase == "real":
+        return None if math.isnan(valor) else valor
+    if valor == _NULOS[clase]:
+        return None
+    if clase == "fecha":
+        return datetime.date.fromordinal(valor + _EPOCA_ORDINAL)
+    if clase == "fecha_hora":
+        return _EPOCA + datetime.timedelta(seconds=valor)
+    if clase == "hora":
+        return datetime.timedelta(seconds=valor)
+    return valor
+
+
+class TablaColumnar:
+    """Tabla en memoria organizada por columnas"""
+
+    def __init__(self, tabla, columnas=None, categorias=()):
+        """Crea una tabla vacía a partir de la estructura de leer_esquema().
+
+        `columnas` limita las columnas que se guardan; `categorias` son columnas de
+        texto que se codifican con diccionario como si fueran ENUM.
+        """
+        self.nombre = tabla["nombre"]
+        self.filas = 0
+        self.clases = {}
+        self.datos = {}
+        self.diccionarios = {}
+        self._indices = {}
+        self._posiciones = []
+        for posicion, columna in enumerate(tabla["columnas"]):
+            nombre = columna["nombre"]
+            if columnas is not None and nombre not in columnas:
+                continue
+            clase, codigo = ALMACENAMIENTO.get(columna["tipo"], ("texto", None))
+            if nombre in categorias:
+                clase = "categoria"
+            if clase == "categoria":
+                valores = list(columna["valores"] or ())
+                codigo = _codigo_categoria(len(valores))
+            self.clases[nombre] = clase
+            self.datos[nombre] = [] if clase == "texto" else array(codigo)
+            if clase == "categoria":
+                self.diccionarios[nombre] = valores
+                self._indices[nombre] = {valor: i for i, valor in enumerate(valores)}
+            self._posiciones.append((posicion, nombre))
+
+    def __len__(self):
+        return self.filas
+
+    def agregar(self, fila):
+        """Añade una fila con los valores tal como los entrega volcado_sql"""
+        for posicion, nombre in self._posiciones:
+            valor = fila[posicion]
+            clase = self.clases[nombre]
+            if clase == "texto":
+                self.datos[nombre].append(valor)
+            elif clase == "categoria":
+                if valor is None:
+                    codigo = NULO_CATEGORIA
+                else:
+                    indices = self._indices[nombre]
+                    codigo = indices.get(valor)
+                    if codigo is None:
+                        codigo = indices[valor] = len(indices)
+                        self.diccionarios[nombre].append(valor)
+                        if codigo >> (8 * self.datos[nombre].itemsize - 1):
+                            # El código ya no cabe: se pasa la columna al siguiente ancho
+                            self.datos[nombre] = array(_codigo_categoria(codigo + 1), self.datos[nombre])
+                self.datos[nombre].append(codigo)
+            elif valor is None:
+                self.datos[nombre].append(math.nan if clase == "real" else _NULOS[clase])
+            else:
+                self.datos[nombre].append(_codificar(clase, valor))
+        self.filas += 1
+
+    def valores(self, columna):
+        """Valores de una columna decodificados a tipos de Python"""
+        clase = self.clases[columna]
+        if clase == "texto":
+            return list(self.datos[columna])
+        if clase == "categoria":
+            diccionario = self.diccionarios[columna]
+            return [None if codigo < 0 else diccionario[codigo] for codigo in self.datos[columna]]
+        return [_decodificar(clase, valor) for valor in self.datos[columna]]
+
+    def memoria(self):
+        """Bytes ocupados por los arrays numéricos y de códigos (sin las columnas de texto)"""
+        return sum(datos.itemsize * len(datos) for datos in self.datos.values() if isinstance(datos, array))
+
+    # --- Operaciones vectorizadas ------------------------------------------------------
+
+    def vector(self, columna):
+        """Vista NumPy de la columna sin copiar; las de texto se codifican al vuelo"""
+        np = importar_numpy()
+        datos = self.datos[columna]
+        if isinstance(datos, array):
+            return np.frombuffer(datos, dtype=datos.typecode) if len(datos) else np.empty(0, dtype=datos.typecode)
+        indices = {}
+        return np.fromiter((indices.setdefault(valor, len(indices)) for valor in datos), dtype=np.int64, count=len(datos))
+
+    def _validos(self, columna, vector):
+        clase = self.clases[columna]
+        if clase == "real":
+            return ~importar_numpy().isnan(vector)
+        if clase == "texto":
+            return importar_numpy().fromiter((valor is not None for valor in self.datos[columna]), dtype=bool, count=self.filas)
+        return vector != _NULOS[clase]
+
+    def _codigo(self, columna, valor):
+        clase = self.clases[columna]
+        if clase == "categoria":
+            return self._indices[columna].get(valor, -2)
+        return _codificar(clase, valor)
+
+    def filtrar(self, columna, operador, valor):
+        """Máscara booleana de las filas que cumplen `columna operador valor`.
+
+        Operadores: ==, !=, <, <=, >, >= e "in" (con una lista de valores). Como en
+        SQL, las filas con NULL en la columna nunca cumplen la condición. Las
+        máscaras se combinan con & y |.
+        """
+        np = importar_numpy()
+        if self.clases[columna] == "texto":
+            datos = self.datos[columna]
+            if operador == "in":
+                valores = set(valor)
+                return np.fromiter((v in valores for v in datos), dtype=bool, count=self.filas)
+            prueba = _OPERADORES_PYTHON[operador]
+            return np.fromiter((v is not None and prueba(v, valor) for v in datos), dtype=bool, count=self.filas)
+
+        vector = self.vector(columna)
+        if operador == "in":
+            mascara = np.isin(vector, [self._codigo(columna, v) for v in valor])
+        elif self.clases[columna] == "categoria" and operador not in ("==", "!="):
+            raise ValueError(f"{self.nombre}.{columna}: las categorías solo admiten ==, != e in")
+        else:
+            mascara = _OPERADORES_PYTHON[operador](vector, self._codigo(columna, valor))
+        return mascara & self._validos(columna, vector)
+
+    def seleccionar(self, mascara):
+        """Nueva tabla con las filas de la máscara"""
+        np = importar_numpy()
+        nueva = object.__new__(TablaColumnar)
+        nueva.nombre = self.nombre
+        nueva.clases = dict(self.clases)
+        nueva.diccionarios = {nombre: list(valores) for nombre, valores in self.diccionarios.items()}
+        nueva._indices = {nombre: dict(indices) for nombre, indices in self._indices.items()}
+        nueva._posiciones = list(self._posiciones)
+        nueva.datos = {}
+        posiciones = np.flatnonzero(mascara)
+        for nombre, datos in self.datos.items():
+            if isinstance(datos, array):
+                nueva.datos[nombre] = array(datos.typecode, self.vector(nombre)[posiciones].tobytes())
+            else:
+                nueva.datos[nombre] = [datos[i] for i in posiciones]
+        nueva.filas = len(posiciones)
+        return nueva
+
+    def contar(self, mascara=None):
+        return self.filas if mascara is None else int(importar_numpy().count_nonzero(mascara))
+
+    def sumar(self, columna, mascara=None):
+        """Suma de una columna numérica ignorando los NULL"""
+        vector = self.vector(columna)
+        validos = self._validos(columna, vector)
+        if mascara is not None:
+            validos &= mascara
+        total = vector[validos].sum()
+        return float(total) if self.clases[columna] == "real" else int(total)
+
+    def agrupar(self, claves, sumas=(), mascara=None):
+        """Agrupa por una o varias columnas y cuenta las filas y suma `sumas` por grupo.
+
+        Devuelve {clave: {"filas": n, columna: suma, ...}}; la clave es el valor de la
+        columna (o una tupla si se agrupa por varias) y NULL forma su propio grupo.
+        """
+        np = importar_numpy()
+        claves = [claves] if isinstance(claves, str) else list(claves)
+        seleccion = slice(None) if mascara is None else np.flatnonzero(mascara)
+        indices_claves = []
+        etiquetas = []
+        for clave in claves:
+            indices, valores = self._indices_grupo(clave, seleccion)
+            indices_claves.append(indices)
+            etiquetas.append(valores)
+        if not claves or not len(indices_claves[0]):
+            return {}
+
+        # Con pocas combinaciones posibles (p. ej. solo categorías) basta un bincount;
+        # si no, se numeran las combinaciones presentes ordenándolas con np.unique. La
+        # clave compuesta es un int64: si el producto de las cardinalidades no cabe se
+        # agrupan directamente las filas de índices apiladas
+        combinaciones = math.prod(len(valores) for valores in etiquetas)
+        directo = combinaciones <= _MAX_COMBINACIONES_DIRECTAS
+        if combinaciones <= _MAX_COMBINACIONES_INT64:
+            compuesto = indices_claves[0]
+            for indices, valores in zip(indices_claves[1:], etiquetas[1:]):
+                compuesto = compuesto * len(valores) + indices
+            if directo:
+                conteos = np.bincount(compuesto, minlength=combinaciones)
+                presentes = np.flatnonzero(conteos)
+                conteos = conteos[presentes]
+                grupo, tamano = compuesto, combinaciones
+            else:
+                presentes, grupo = np.unique(compuesto, return_inverse=True)
+            tuplas = []
+            for codigo in presentes.tolist():
+                tupla = []
+                for etiquetas_clave in reversed(etiquetas):
+                    codigo, indice = divmod(codigo, len(etiquetas_clave))
+                    tupla.append(indice)
+                tuplas.append(tupla[::-1])
+        else:
+            presentes, grupo = np.unique(np.stack(indices_claves, axis=1), axis=0, return_inverse=True)
+            tuplas = presentes.tolist()
+        if not directo:
+            grupo = grupo.reshape(-1)
+            conteos = np.bincount(grupo, minlength=len(presentes))
+            tamano = len(presentes)
+
+        totales = {}
+        for columna in sumas:
+            vector = self.vector(columna)
+            pesos = np.where(self._validos(columna, vector), vector, 0)[seleccion].astype(np.float64)
+            total = np.bincount(grupo, weights=pesos, minlength=tamano)
+            totales[columna] = total[presentes] if directo else total
+
+        resultado = {}
+        for i, tupla in enumerate(tuplas):
+            valores = [etiquetas_clave[indice] for etiquetas_clave, indice in zip(etiquetas, tupla)]
+            fila = {"filas": int(conteos[i])}
+            for columna, total in totales.items():
+                fila[columna] = float(total[i]) if self.clases[columna] == "real" else int(round(total[i]))
+            resultado[valores[0] if len(claves) == 1 else tuple(valores)] = fila
+        return resultado
+
+    def _indices_grupo(self, columna, seleccion):
+        """Índice de grupo de cada fila seleccionada y el valor que corresponde a cada índice"""
+        np = importar_numpy()
+        clase = self.clases[columna]
+        if clase == "categoria":
+            # Los códigos ya numeran los valores: se desplazan uno para que NULL (-1) sea el 0
+            indices = self.vector(columna)[seleccion].astype(np.int64) + 1
+            return indices, [None] + self.diccionarios[columna]
+        if clase == "texto":
+            datos = self.datos[columna]
+            if not isinstance(seleccion, slice):
+                datos = [datos[i] for i in seleccion]
+            numeracion = {}
+            indices = np.fromiter((numeracion.setdefault(v, len(numeracion)) for v in datos), dtype=np.int64, count=len(datos))
+            return indices, list(numeracion)
+        unicos, indices = np.unique(self.vector(columna)[seleccion], return_inverse=True)
+        return indices.reshape(-1).astype(np.int64), [_decodificar(clase, v) for v in unicos.tolist()]
+
+
+_OPERADORES_PYTHON = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+}
+
+
+def cargar_tablas(rutas, tablas, columnas=None, categorias=None, esquema=None):
+    """Carga en tablas columnares las tablas `tablas` de los volcados `rutas`.
+
+    `columnas` y `categorias` son diccionarios {tabla: [columnas]} opcionales con el
+    mismo sentido que en TablaColumnar. Devuelve {nombre: TablaColumnar}; las tablas
+    que se crean sin filas quedan vacías.
+    """
+    esquema = {} if esquema is None else esquema
+    columnas = columnas or {}
+    categorias = categorias or {}
+    resultado = {}
+
+    def crear(nombre):
+        return TablaColumnar(esquema[nombre], columnas.get(nombre), categorias.get(nombre, ()))
+
+    for ruta in rutas:
+        # Las columnas que no se guardan ni siquiera se convierten
+        for nombre, fila in iterar_filas(ruta, tablas=set(tablas), esquema=esquema, columnas=columnas or None):
+            tabla = resultado.get(nombre)
+            if tabla is None:
+                if nombre not in esquema:
+                    continue
+                tabla = resultado[nombre] = crear(nombre)
+            tabla.agregar(fila)
+    for nombre in tablas:
+        if nombre not in resultado and nombre in esquema:
+            resultado[nombre] = crear(nombre)
+    return resultado
+
+
+def comparar_con_diccionarios(ruta, tabla, clave, suma=None, repeticiones=5):
+    """Mide memoria por fila y latencia del group-by frente a una lista de diccionarios"""
+    esquema = leer_esquema(ruta)
+    nombres = [c["nombre"] for c in esquema[tabla]["columnas"]]
+
+    # Cada representación se construye directamente desde el volcado para que su
+    # medición incluya los objetos de los valores (cadenas, fechas, Decimal...)
+    tracemalloc.start()
+    diccionarios = [dict(zip(nombres, fila)) for _, fila in iterar_filas(ruta, tablas={tabla}, esquema=esquema)]
+    memoria_diccionarios = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    columnar = cargar_tablas([ruta], [tabla], esquema=esquema)[tabla]
+    memoria_columnar = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def agrupar_diccionarios():
+        grupos = {}
+        for fila in diccionarios:
+            grupo = grupos.setdefault(fila[clave], {"filas": 0, suma: 0} if suma else {"filas": 0})
+            grupo["filas"] += 1
+            if suma and fila[suma] is not None:
+                grupo[suma] += fila[suma]
+        return grupos
+
+    def medir(funcion):
+        mejor = math.inf
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            funcion()
+            mejor = min(mejor, time.perf_counter() - inicio)
+        return mejor
+
+    n = max(len(diccionarios), 1)
+    return {
+        "filas": len(diccionarios),
+        "bytes_fila_diccionarios": memoria_diccionarios / n,
+        "bytes_fila_columnar": memoria_columnar / n,
+        "ms_diccionarios": medir(agrupar_diccionarios) * 1000,
+        "ms_columnar": medir(lambda: columnar.agrupar(clave, (suma,) if suma else ())) * 1000,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 4:
+        sys.exit("Uso: python -m analisis_sisvet.tabla_columnar VOLCADO.sql TABLA COLUMNA_GRUPO [COLUMNA_SUMA]")
+    r = comparar_con_diccionarios(sys.argv[1], sys.argv[2], sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else None)
+    print(f"📊 {r['filas']:,} filas")
+    print(f"   Lista de diccionarios: {r['bytes_fila_diccionarios']:.0f} B/fila, group-by {r['ms_diccionarios']:.1f} ms")
+    print(f"   Tabla columnar:        {r['bytes_fila_columnar']:.0f} B/fila, group-by {r['ms_columnar']:.1f} ms")
@@ -0,0 +1,375 @@
+"""
+VIGILANCIA DE LAS ENTRADAS
+Modo `watch` del generador: mantiene el análisis en memoria y, cada vez que
+cambian sus archivos de entrada, repite solo los pasos de preparación que los leen
+y vuelve a generar solo las secciones cuyos datos cambiaron, escribiendo siempre
+en la misma ruta (basta con recargar el navegador):
+
+    archivo cambiado → pasos de PASOS que lo leen → datos que cambiaron → secciones que dependen de ellos
+
+Los cambios llegan por inotify (Linux, mediante ctypes, sin dependencias) y, donde
+no está disponible, comparando mtime y tamaño de los archivos cada
+INTERVALO_SONDEO segundos. Los eventos de una ráfaga (un editor que escribe y
+renombra, o varios archivos guardados a la vez) se agrupan en una sola
+regeneración cuando pasan ESPERA_RAFAGA segundos sin eventos. Desde extras/:
+
+    python generar_analisis_completo.py watch --archivo ANALISIS_COMPLETO_SISVET.html
+
+El código del propio generador (analisis_sisvet/) no se vigila: tras editarlo hay
+que reiniciar la vigilancia.
+"""
+
+import ctypes
+import os
+import select
+import struct
+import sys
+import time
+
+from .datos import ErrorDatos
+from .escaner import EXCLUIDOS, LENGUAJES, RAICES
+from .generacion import PASOS, rutas_predeterminadas
+from .secciones import SECCIONES
+
+# Segundos sin eventos con los que se da por terminada una ráfaga de cambios
+ESPERA_RAFAGA = 0.1
+
+# Segundos entre dos comprobaciones cuando no hay inotify
+INTERVALO_SONDEO = 0.5
+
+# Pasos que leen lo que carga el paso "datos" y se repiten siempre con él
+DEPENDIENTES_DATOS = ("escaneo", "clasificacion", "proyeccion")
+
+# Extensiones de los archivos de datos (datos.py lee JSON y TOML)
+EXTENSIONES_DATOS = (".json", ".toml")
+
+# Eventos de inotify: archivo cerrado tras escribirlo, creado, borrado o renombrado
+_IN_CLOSE_WRITE = 0x8
+_IN_MOVED_FROM = 0x40
+_IN_MOVED_TO = 0x80
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_IN_ISDIR = 0x40000000
+_MASCARA = _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+# struct inotify_event sin el nombre: wd, mask, cookie, len
+_EVENTO = struct.Struct("iIII")
+
+_AUSENTE = object()
+
+
+def _dentro(ruta, directorio):
+    return ruta.startswith(directorio + os.sep)
+
+
+def pasos_afectados(ruta, rutas):
+    """Identificadores de PASOS que leen el archivo `ruta` (vacío si ningún paso lo lee)"""
+    ruta = os.path.abspath(ruta)
+    relativa = os.path.relpath(ruta, rutas["repositorio"]).replace(os.sep, "/")
+    if EXCLUIDOS.intersection(relativa.split("/")):
+        return set()
+    extension = os.path.splitext(ruta)[1]
+    pasos = set()
+    if extension in EXTENSIONES_DATOS and _dentro(ruta, rutas["datos"]):
+        pasos.add("datos")
+    if extension in LENGUAJES and any(relativa.startswith(f"{raiz}/") for raiz in RAICES):
+        pasos.add("escaneo")
+    if extension == ".js" and _dentro(ruta, rutas["backend"]):
+        pasos.update(("conexiones", "reproduccion"))
+    if extension == ".sql" and _dentro(ruta, rutas["volcados"]):
+        pasos.update(("reproduccion", "recordatorios", "ocupacion"))
+    if ruta == rutas["auditoria"]:
+        pasos.add("auditoria")
+    return pasos
+
+
+def raices_vigiladas(rutas):
+    """Directorios existentes de los que leen los pasos, sin los que ya están dentro de otro"""
+    candidatas = [os.path.join(rutas["repositorio"], raiz) for raiz in RAICES]
+    candidatas += [rutas["datos"], rutas["backend"], rutas["volcados"], os.path.dirname(rutas["auditoria"])]
+    raices = []
+    for raiz in sorted({os.path.abspath(candidata) for candidata in candidatas if os.path.isdir(candidata)}):
+        if not any(raiz == anterior or _dentro(raiz, anterior) for anterior in raices):
+            raices.append(raiz)
+    return raices
+
+
+def _directorios(raiz):
+    """(directorio, archivos) de `raiz` y de sus subdirectorios, sin entrar en EXCLUIDOS"""
+    for directorio, subdirectorios, archivos in os.walk(raiz):
+        subdirectorios[:] = [nombre for nombre in subdirectorios if nombre not in EXCLUIDOS]
+        yield directorio, archivos
+
+
+class _Inotify:
+    """Cambios en los directorios bajo las raíces recibidos del kernel con inotify"""
+
+    def __init__(self, raices):
+        if not sys.platform.startswith("linux"):
+            raise OSError("inotify solo existe en Linux")
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 falló")
+        self._directorios = {}
+        try:
+            for raiz in raices:
+                self._añadir_arbol(raiz)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _añadir_arbol(self, raiz):
+        """Vigila `raiz` y sus subdirectorios; devuelve los archivos que ya contienen"""
+        archivos = []
+        for directorio, nombres in _directorios(raiz):
+            descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directorio), _MASCARA)
+            if descriptor < 0:
+                error = ctypes.get_errno()
+                raise OSError(error, f"inotify_add_watch {directorio}: {os.strerror(error)}")
+            self._directorios[descriptor] = directorio
+            archivos.extend(os.path.join(directorio, nombre) for nombre in nombres)
+        return archivos
+
+    def esperar(self, tiempo=None):
+        """Rutas cambiadas en los próximos `tiempo` segundos (sin límite con None).
+
+        Un None en la lista indica que se perdieron eventos y no se sabe qué cambió.
+        """
+        if not select.select([self._fd], [], [], tiempo)[0]:
+            return []
+        try:
+            leido = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        cambiadas = []
+        posicion = 0
+        while posicion < len(leido):
+            descriptor, mascara, _, largo = _EVENTO.unpack_from(leido, posicion)
+            nombre = leido[posicion + _EVENTO.size:posicion + _EVENTO.size + largo].rstrip(b"\0")
+            posicion += _EVENTO.size + largo
+            if mascara & _IN_Q_OVERFLOW:
+                cambiadas.append(None)
+                continue
+            if mascara & _IN_IGNORED:
+                self._directorios.pop(descriptor, None)
+                continue
+            directorio = self._directorios.get(descriptor)
+            if directorio is None:
+                continue
+            ruta = os.path.join(directorio, os.fsdecode(nombre))
+            if not mascara & _IN_ISDIR:
+                cambiadas.append(ruta)
+            elif mascara & (_IN_DELETE | _IN_MOVED_FROM):
+                # Los archivos que contenía dejaron de existir sin un evento propio
+                cambiadas.append(None)
+            elif os.path.basename(ruta) not in EXCLUIDOS:
+                # Un directorio nuevo trae los archivos creados antes de empezar a vigilarlo
+                try:
+                    cambiadas.extend(self._añadir_arbol(ruta))
+                except OSError:
+                    cambiadas.append(None)
+        return cambiadas
+
+    def cerrar(self):
+        os.close(self._fd)
+
+
+class _Sondeo:
+    """Cambios de mtime y tamaño de los archivos bajo las raíces, comprobados cada `intervalo` segundos"""
+
+    def __init__(self, raices, intervalo=INTERVALO_SONDEO):
+        self._raices = raices
+        self._intervalo = intervalo
+        self._estado = self._leer()
+
+    def _leer(self):
+        estado = {}
+        for raiz in self._raices:
+            for directorio, nombres in _directorios(raiz):
+                for nombre in nombres:
+                    ruta = os.path.join(directorio, nombre)
+                    try:
+                        informacion = os.stat(ruta)
+                    except OSError:
+                        continue
+                    estado[ruta] = (informacion.st_mtime_ns, informacion.st_size)
+        return estado
+
+    def esperar(self, tiempo=None):
+        """Rutas cambiadas en los próximos `tiempo` segundos (sin límite con None)"""
+        while True:
+            time.sleep(self._intervalo if tiempo is None else tiempo)
+            estado = self._leer()
+            cambiadas = [ruta for ruta in estado.keys() | self._estado.keys() if estado.get(ruta) != self._estado.get(ruta)]
+            self._estado = estado
+            if cambiadas or tiempo is not None:
+                return cambiadas
+
+    def cerrar(self):
+        pass
+
+
+def crear_vigilante(raices, sondeo=False, intervalo=INTERVALO_SONDEO):
+    """Vigilante de las raíces con inotify o, si no está disponible (o con sondeo=True), por sondeo.
+
+    Devuelve (vigilante, descripción del método para mostrarla).
+    """
+    if not sondeo:
+        try:
+            return _Inotify(raices), "inotify"
+        except (OSError, AttributeError) as error:
+            motivo = f" (sin inotify: {error})"
+    else:
+        motivo = ""
+    return _Sondeo(raices, intervalo), f"sondeo cada {intervalo:g} s{motivo}"
+
+
+def esperar_rafaga(vigilante, espera=ESPERA_RAFAGA):
+    """Espera el próximo cambio y agrupa los que lleguen hasta que pasen `espera` segundos sin eventos"""
+    cambiadas = set()
+    while not cambiadas:
+        cambiadas.update(vigilante.esperar())
+    while nuevas := vigilante.esperar(espera):
+        cambiadas.update(nuevas)
+    return cambiadas
+
+
+class DocumentoVivo:
+    """Análisis en memoria (datos y HTML de cada sección) que se actualiza por archivos cambiados"""
+
+    def __init__(self, rutas=None, avisar=None):
+        self.rutas = {nombre: os.path.abspath(ruta) for nombre, ruta in (rutas or rutas_predeterminadas()).items()}
+        self.avisar = avisar
+        self.datos = {}
+        self.fragmentos = {}
+        # Claves que añadió cada paso: se quitan antes de repetirlo, como si empezara de cero
+        self._añadidas = {}
+
+    def actualizar(self, cambiadas=None):
+        """Repite los pasos que leen `cambiadas` (todos con None) y regenera las secciones afectadas.
+
+        Devuelve {"pasos", "datos", "secciones", "segundos"} con los pasos repetidos,
+        las claves de los datos que cambiaron y las secciones regeneradas. Si un
+        paso obligatorio falla (p. ej. un JSON de datos guardado a medias) el
+        documento queda como estaba y el error se propaga.
+        """
+        inicio = time.perf_counter()
+        if cambiadas is None or None in cambiadas:
+            pasos = {id_paso for id_paso, _ in PASOS}
+        else:
+            pasos = set().union(*(pasos_afectados(ruta, self.rutas) for ruta in cambiadas))
+        if "datos" in pasos:
+            pasos.update(DEPENDIENTES_DATOS)
+
+        anteriores, añadidas = dict(self.datos), dict(self._añadidas)
+        try:
+            for id_paso, paso in PASOS:
+                if id_paso not in pasos:
+                    continue
+                for clave in self._añadidas.pop(id_paso, ()):
+                    self.datos.pop(clave, None)
+                antes = set(self.datos)
+                mensaje = paso(self.datos, self.rutas)
+                self._añadidas[id_paso] = set(self.datos) - antes
+                if mensaje and self.avisar:
+                    self.avisar(mensaje)
+        except (ErrorDatos, OSError):
+            self.datos, self._añadidas = anteriores, añadidas
+            raise
+
+        claves = {clave for clave in anteriores.keys() | self.datos.keys()
+                  if anteriores.get(clave, _AUSENTE) != self.datos.get(clave, _AUSENTE)}
+        secciones = []
+        if claves or not self.fragmentos:
+            for id_seccion, seccion, dependencias in SECCIONES:
+                if id_seccion in self.fragmentos and dependencias is not None and not claves.intersection(dependencias):
+                    continue
+                self.fragmentos[id_seccion] = "".join(seccion(self.datos))
+                secciones.append(id_seccion)
+        return {
+            "pasos": [id_paso for id_paso, _ in PASOS if id_paso in pasos],
+            "datos": sorted(claves),
+            "secciones": secciones,
+            "segundos": time.perf_counter() - inicio,
+        }
+
+    def escribir(self, destino):
+        """Escribe el documento en `destino` y devuelve los caracteres escritos.
+
+        Se escribe en un temporal que después reemplaza al anterior, de modo que un
+        navegador que recarga nunca lee un documento a medias. Si la escritura falla
+        (OSError) el temporal se borra y `destino` queda como estaba.
+        """
+        documento = "".join(self.fragmentos[id_seccion] for id_seccion, _, _ in SECCIONES)
+        temporal = f"{destino}.{os.getpid()}.tmp"
+        try:
+            with open(temporal, "w", encoding="utf-8") as archivo:
+                archivo.write(documento)
+            os.replace(temporal, destino)
+        except OSError:
+            try:
+                os.unlink(temporal)
+            except OSError:
+                pass
+            raise
+        return len(documento)
+
+    def escribir_o_avisar(self, destino):
+        """escribir() para las regeneraciones: si falla se avisa y se sigue vigilando"""
+        try:
+            self.escribir(destino)
+        except OSError as error:
+            if self.avisar:
+                self.avisar(f"⚠️  No se pudo escribir {destino} (se reintenta en el siguiente cambio): {error}")
+
+
+def seguir_cambios(documento, vigilante, espera=ESPERA_RAFAGA, avisar=print, al_actualizar=None):
+    """Aplica al documento cada ráfaga de cambios de `vigilante` que lea algún paso, sin terminar nunca.
+
+    Tras cada actualización que regenera secciones se llama a `al_actualizar(cambio)`
+    (p. ej. para escribir el documento). Los errores de los datos se avisan y el
+    documento se conserva hasta el siguiente cambio válido.
+    """
+    while True:
+        cambiadas = esperar_rafaga(vigilante, espera)
+        final_rafaga = time.perf_counter()
+        relevantes = sorted((ruta for ruta in cambiadas if ruta is None or pasos_afectados(ruta, documento.rutas)),
+                            key=lambda ruta: ruta or "")
+        if not relevantes:
+            continue
+        nombres = ", ".join("(eventos perdidos)" if ruta is None else os.path.relpath(ruta, documento.rutas["repositorio"])
+                            for ruta in relevantes[:3])
+        avisar(f"🔄 {nombres}{f' y {len(relevantes) - 3} más' if len(relevantes) > 3 else ''}")
+        try:
+            cambio = documento.actualizar(relevantes)
+        except (ErrorDatos, OSError) as error:
+            avisar(f"⚠️  Se conserva el documento anterior: {error}")
+            continue
+        if not cambio["secciones"]:
+            avisar(f"   Sin cambios en los datos (pasos: {', '.join(cambio['pasos'])})")
+            continue
+        if al_actualizar:
+            al_actualizar(cambio)
+        avisar(f"   Pasos {', '.join(cambio['pasos'])} → secciones {', '.join(cambio['secciones'])} "
+               f"en {(time.perf_counter() - final_rafaga) * 1000:.1f} ms")
+
+
+def vigilar(destino, rutas=None, espera=ESPERA_RAFAGA, sondeo=False, intervalo=INTERVALO_SONDEO, avisar=print):
+    """Genera `destino` y lo mantiene al día con los cambios de las entradas (hasta Ctrl+C).
+
+    Los errores de los datos o al escribir `destino` al arrancar se propagan; los
+    que aparecen mientras se vigila se avisan y se sigue vigilando.
+    """
+    documento = DocumentoVivo(rutas, avisar)
+    # El vigilante se crea antes de preparar los datos para no perder los cambios de mientras
+    vigilante, metodo = crear_vigilante(raices_vigiladas(documento.rutas), sondeo, intervalo)
+    try:
+        inicial = documento.actualizar()
+        caracteres = documento.escribir(destino)
+        avisar(f"✅ {destino}: {caracteres:,} caracteres en {inicial['segundos'] * 1000:.1f} ms")
+        avisar(f"👀 Vigilando las entradas ({metodo}); Ctrl+C para terminar")
+        seguir_cambios(documento, vigilante, espera, avisar, lambda cambio: documento.escribir_o_avisar(destino))
+    finally:
+        vigilante.cerrar()
@@ -0,0 +1,523 @@
+"""
+LECTOR DE VOLCADOS MYSQL
+Lee en streaming los volcados de mysqldump de bd/ (y los scripts escritos a mano de
+bd/expediente/): extrae la estructura de cada CREATE TABLE (columnas, claves e
+índices) y entrega las filas de los INSERT ya convertidas a tipos de Python.
+
+El archivo se lee por bloques y cada INSERT se recorre fila a fila sobre un búfer
+que solo conserva lo que falta por procesar, así que la memoria no depende del
+tamaño del volcado ni de la longitud de la línea del INSERT, sino de la fila más
+larga. Uso para medir el rendimiento desde extras/:
+
+    python -m analisis_sisvet.volcado_sql ../bd/*.sql
+"""
+
+import datetime
+import os
+import re
+import sys
+import time
+from decimal import Decimal
+
+# Tamaño de cada lectura del archivo
+TAM_BLOQUE = 1024 * 1024
+
+# Bytes que se miran al inicio de cada sentencia para reconocer un INSERT
+_TAM_CABECERA = 64 * 1024
+
+# Una fila más larga que esto se considera un volcado corrupto (evita leer todo el archivo)
+MAX_FILA = 256 * 1024 * 1024
+
+_CADENA = rb"'(?:[^'\\]++|\\.|'')*+'"
+
+_INSERT = re.compile(
+    rb"\s*(?:INSERT(?:\s+IGNORE)?|REPLACE)\s+INTO\s+(`[^`]+`|\w+)\s*(?:\(([^)]*)\))?\s*VALUES\s*",
+    re.IGNORECASE,
+)
+_FILA = re.compile(rb"\s*\(((?:" + _CADENA + rb"|[^'()]++)*+)\)\s*([,;])", re.DOTALL)
+_CAMPO = re.compile(rb"(?:_binary\s*)?'((?:[^'\\]++|\\.|'')*+)'|([^,'\s]+)", re.DOTALL)
+_ESCAPE = re.compile(rb"\\(.)|''", re.DOTALL)
+_REEMPLAZOS = ((b'\\"', b'"'), (b"\\'", b"'"), (b"\\n", b"\n"), (b"\\r", b"\r"), (b"\\0", b"\x00"), (b"\\Z", b"\x1a"), (b"\\t", b"\t"), (b"\\b", b"\b"))
+_ESCAPES = {b"0": b"\x00", b"b": b"\b", b"n": b"\n", b"r": b"\r", b"t": b"\t", b"Z": b"\x1a", b"%": b"\\%", b"_": b"\\_"}
+
+_CREATE_TABLE = re.compile(rb"\s*CREATE\s+(?:TEMPORARY\s+)?TABLE\b", re.IGNORECASE)
+_DELIMITER = re.compile(rb"\s*DELIMITER\s+(\S+)", re.IGNORECASE)
+
+_IDENTIFICADOR = r"(`[^`]+`|\w+)"
+_NOMBRE_TABLA = re.compile(
+    r"CREATE\s+(?:TEMPORARY\s+)?TABLE\s+(?:IF\s+NOT\s+EXISTS\s+)?(?:" + _IDENTIFICADOR + r"\.)?" + _IDENTIFICADOR + r"\s*\(",
+    re.IGNORECASE,
+)
+_COLUMNA = re.compile(_IDENTIFICADOR + r"\s+(\w+)\s*(?:\(((?:'(?:[^'\\]|\\.|'')*'|[^)'])*)\))?(.*)", re.DOTALL)
+_CADENA_TEXTO = re.compile(r"'((?:[^'\\]|\\.|'')*)'", re.DOTALL)
+_DEFECTO = re.compile(r"\bDEFAULT\s+('(?:[^'\\]|\\.|'')*'|[^\s,]+(?:\(\))?)", re.IGNORECASE | re.DOTALL)
+_COMENTARIO = re.compile(r"\bCOMMENT\s+'((?:[^'\\]|\\.|'')*)'", re.IGNORECASE | re.DOTALL)
+_CLAVE_PRIMARIA = re.compile(r"PRIMARY\s+KEY\b", re.IGNORECASE)
+_INDICE = re.compile(r"(?:(UNIQUE|FULLTEXT|SPATIAL)\s+)?(?:KEY|INDEX)\b\s*(`[^`]+`|\w+)?", re.IGNORECASE)
+_UNICO = re.compile(r"UNIQUE\b\s*(`[^`]+`|\w+)?", re.IGNORECASE)
+_CLAVE_FORANEA = re.compile(r"(?:CONSTRAINT\s+(`[^`]+`|\w+)\s+)?FOREIGN\s+KEY\b", re.IGNORECASE)
+_REFERENCIAS = re.compile(r"REFERENCES\s+(?:" + _IDENTIFICADOR + r"\.)?" + _IDENTIFICADOR + r"\s*(?=\()", re.IGNORECASE)
+_ACCION = r"(RESTRICT|CASCADE|SET\s+NULL|NO\s+ACTION|SET\s+DEFAULT)"
+_AL_BORRAR = re.compile(r"ON\s+DELETE\s+" + _ACCION, re.IGNORECASE)
+_AL_ACTUALIZAR = re.compile(r"ON\s+UPDATE\s+" + _ACCION, re.IGNORECASE)
+_MOTOR = re.compile(r"\bENGINE\s*=\s*(\w+)", re.IGNORECASE)
+_DEFINICIONES_NO_COLUMNA = ("PRIMARY", "KEY", "INDEX", "UNIQUE", "CONSTRAINT", "FOREIGN", "FULLTEXT", "SPATIAL", "CHECK")
+
+
+class ErrorVolcado(ValueError):
+    """El volcado SQL no se puede interpretar"""
+
+
+# --- Conversión de valores ---------------------------------------------------------
+
+def _desescapar(valor):
+    """Deshace los escapes de MySQL (\\n, \\', '' ...) de una cadena entrecomillada"""
+    if b"\\" not in valor:
+        return valor.replace(b"''", b"'") if b"''" in valor else valor
+    if b"''" not in valor:
+        # Camino rápido para los escapes que genera mysqldump: tras separar las barras
+        # dobles, cada barra restante inicia un escape de dos bytes que no se solapa
+        partes = valor.split(b"\\\\")
+        for i, parte in enumerate(partes):
+            if b"\\" in parte:
+                for escape, caracter in _REEMPLAZOS:
+                    parte = parte.replace(escape, caracter)
+                if b"\\" in parte:
+                    break
+                partes[i] = parte
+        else:
+            return b"\\".join(partes)
+    return _ESCAPE.sub(lambda m: b"'" if m.group(1) is None else _ESCAPES.get(m.group(1), m.group(1)), valor)
+
+
+def _texto(valor):
+    return valor.decode("utf-8")
+
+
+def _decimal(valor):
+    return Decimal(valor.decode("ascii"))
+
+
+def _fecha(valor):
+    # Las fechas cero de MySQL ('0000-00-00') no existen en Python: se entregan como None
+    try:
+        return datetime.date.fromisoformat(valor.decode("ascii"))
+    except ValueError:
+        return None
+
+
+def _fecha_hora(valor):
+    try:
+        return datetime.datetime.fromisoformat(valor.decode("ascii"))
+    except ValueError:
+        return None
+
+
+def _hora(valor):
+    # TIME admite valores negativos y mayores de 24 h: se representa como duración
+    texto = valor.decode("ascii")
+    signo = -1 if texto.startswith("-") else 1
+    horas, minutos, segundos = texto.lstrip("-").split(":")
+    return signo * datetime.timedelta(hours=int(horas), minutes=int(minutos), seconds=float(segundos))
+
+
+def _bits(valor):
+    return int.from_bytes(valor, "big")
+
+
+def _conjunto(valor):
+    return frozenset(valor.decode("utf-8").split(",")) if valor else frozenset()
+
+
+def _binario(valor):
+    return valor
+
+
+def _numero(valor):
+    """Convierte un literal sin comillas de una columna de tipo desconocido"""
+    if valor[:2] in (b"0x", b"0X"):
+        return bytes.fromhex(valor[2:].decode("ascii"))
+    try:
+        return int(valor)
+    except ValueError:
+        return Decimal(valor.decode("ascii"))
+
+
+CONVERSORES = {
+    "tinyint": int, "smallint": int, "mediumint": int, "int": int, "integer": int, "bigint": int,
+    "year": int, "bool": int, "boolean": int, "serial": int,
+    "decimal": _decimal, "numeric": _decimal, "dec": _decimal, "fixed": _decimal,
+    "float": float, "double": float, "real": float,
+    "date": _fecha, "datetime": _fecha_hora, "timestamp": _fecha_hora, "time": _hora,
+    "bit": _bits, "set": _conjunto,
+    "binary": _binario, "varbinary": _binario,
+    "tinyblob": _binario, "blob": _binario, "mediumblob": _binario, "longblob": _binario,
+}
+
+
+def _conversor(convertir):
+    """Adapta un conversor de bytes al par (cadena, literal) que entrega _CAMPO para cada valor"""
+    def conversor(campo):
+        cadena, simple = campo
+        if not simple:
+            return convertir(_desescapar(cadena) if b"\\" in cadena or b"''" in cadena else cadena)
+        if simple == b"NULL":
+            return None
+        if simple[:2] in (b"0x", b"0X"):
+            return _numero(simple)
+        return convertir(simple)
+    return conversor
+
+
+def _inferido(campo):
+    """Conversor de las columnas sin CREATE TABLE: texto si va entre comillas, número si no"""
+    cadena, simple = campo
+    if not simple:
+        return _texto(_desescapar(cadena))
+    return None if simple == b"NULL" else _numero(simple)
+
+
+def _omitido(campo):
+    """Conversor de las columnas que no se pidieron: se entregan como None sin decodificarlas"""
+    return None
+
+
+_CONVERSORES_CAMPO = {tipo: _conversor(convertir) for tipo, convertir in CONVERSORES.items()}
+_CONVERSOR_TEXTO = _conversor(_texto)
+
+
+def _conversores(tabla, columnas_insert, seleccion=None):
+    """Conversor de cada posición de la fila; None si no se conoce la estructura de la tabla.
+
+    Las columnas fuera de `seleccion` (si se indica) usan _omitido.
+    """
+    if tabla is None:
+        return None
+    tipos = {c["nombre"]: c["tipo"] for c in tabla["columnas"]}
+    nombres = columnas_insert if columnas_insert is not None else [c["nombre"] for c in tabla["columnas"]]
+    return [
+        _omitido if seleccion is not None and nombre not in seleccion
+        else _CONVERSORES_CAMPO.get(tipos[nombre], _CONVERSOR_TEXTO) if nombre in tipos else _inferido
+        for nombre in nombres
+    ]
+
+
+def _convertir_fila(contenido, conversores):
+    campos = _CAMPO.findall(contenido)
+    if conversores is None:
+        return tuple([_inferido(campo) for campo in campos])
+    if len(campos) != len(conversores):
+        raise ErrorVolcado(f"la fila tiene {len(campos)} valores y la tabla {len(conversores)} columnas")
+    return tuple([convertir(campo) for convertir, campo in zip(conversores, campos)])
+
+
+# --- Estructura de las tablas -------------------------------------------------------
+
+def _sin_comillas(identificador):
+    return identificador.strip("`") if identificador else identificador
+
+
+def _dividir(texto, inicio):
+    """Separa por comas de primer nivel el grupo entre paréntesis que abre en `inicio`.
+
+    Devuelve (partes, posición tras el paréntesis de cierre).
+    """
+    partes = []
+    profundidad = 0
+    comilla = None
+    desde = inicio + 1
+    i = inicio
+    while i < len(texto):
+        caracter = texto[i]
+        if comilla:
+            if caracter == "\\" and comilla == "'":
+                i += 1
+            elif caracter == comilla:
+                comilla = None
+        elif caracter in "'`\"":
+            comilla = caracter
+        elif caracter == "(":
+            profundidad += 1
+        elif caracter == ")":
+            profundidad -= 1
+            if profundidad == 0:
+                partes.append(texto[desde:i].strip())
+                return [p for p in partes if p], i + 1
+        elif caracter == "," and profundidad == 1:
+            partes.append(texto[desde:i].strip())
+            desde = i + 1
+        i += 1
+    raise ErrorVolcado("paréntesis sin cerrar en CREATE TABLE")
+
+
+def _columnas_clave(texto, desde=0):
+    """Columnas de una lista de índice como (`a`,`b`(10) DESC) a partir de `desde`"""
+    inicio = texto.index("(", desde)
+    partes, fin = _dividir(texto, inicio)
+    return [_sin_comillas(re.split(r"[\s(]", parte, maxsplit=1)[0]) for parte in partes], fin
+
+
+def _analizar_columna(definicion):
+    encontrado = _COLUMNA.match(definicion)
+    if encontrado is None:
+        raise ErrorVolcado(f"definición de columna no reconocida: {definicion[:80]}")
+    nombre, tipo, parametros, resto = encontrado.groups()
+    tipo = tipo.lower()
+    sin_cadenas = _CADENA_TEXTO.sub("''", resto).upper()
+    defecto = _DEFECTO.search(resto)
+    comentario = _COMENTARIO.search(resto)
+    columna = {
+        "nombre": _sin_comillas(nombre),
+        "tipo": tipo,
+        "parametros": parametros,
+        "sin_signo": "UNSIGNED" in sin_cadenas,
+        "nulo": "NOT NULL" not in sin_cadenas,
+        "auto_incremento": "AUTO_INCREMENT" in sin_cadenas,
+        "defecto": None,
+        "comentario": _desescapar(comentario.group(1).encode("utf-8")).decode("utf-8") if comentario else None,
+        "valores": None,
+    }
+    if defecto is not None and defecto.group(1).upper() != "NULL":
+        valor = defecto.group(1)
+        columna["defecto"] = _desescapar(valor[1:-1].encode("utf-8")).decode("utf-8") if valor.startswith("'") else valor
+    if tipo in ("enum", "set") and parametros:
+        columna["valores"] = [
+            _desescapar(valor.encode("utf-8")).decode("utf-8") for valor in _CADENA_TEXTO.findall(parametros)
+        ]
+        columna["parametros"] = None
+    return columna, "PRIMARY KEY" in sin_cadenas, "UNIQUE" in sin_cadenas
+
+
+def analizar_create_table(sentencia):
+    """Extrae columnas, clave primaria, índices y claves foráneas de un CREATE TABLE.
+
+    Devuelve None si la sentencia no define columnas (p. ej. CREATE TABLE ... LIKE).
+    """
+    sentencia = "\n".join(linea for linea in sentencia.splitlines() if not linea.lstrip().startswith("--"))
+    encontrado = _NOMBRE_TABLA.search(sentencia)
+    if encontrado is None:
+        return None
+    definiciones, fin = _dividir(sentencia, encontrado.end() - 1)
+    motor = _MOTOR.search(sentencia, fin)
+    tabla = {
+        "nombre": _sin_comillas(encontrado.group(2)),
+        "columnas": [],
+        "clave_primaria": [],
+        "indices": [],
+        "claves_foraneas": [],
+        "motor": motor.group(1) if motor else None,
+    }
+    for definicion in definiciones:
+        palabra = definicion.split(None, 1)[0].upper()
+        if palabra not in _DEFINICIONES_NO_COLUMNA:
+            columna, primaria, unica = _analizar_columna(definicion)
+            tabla["columnas"].append(columna)
+            if primaria:
+                tabla["clave_primaria"].append(columna["nombre"])
+            elif unica:
+                tabla["indices"].append({"nombre": columna["nombre"], "columnas": [columna["nombre"]], "unico": True, "tipo": None})
+        elif _CLAVE_PRIMARIA.match(definicion) or (palabra == "CONSTRAINT" and _CLAVE_PRIMARIA.search(definicion)):
+            tabla["clave_primaria"], _ = _columnas_clave(definicion)
+        elif _CLAVE_FORANEA.match(definicion):
+            nombre = _sin_comillas(_CLAVE_FORANEA.match(definicion).group(1))
+            columnas, fin_columnas = _columnas_clave(definicion)
+            referencias = _REFERENCIAS.search(definicion, fin_columnas)
+            if referencias is None:
+                raise ErrorVolcado(f"clave foránea sin REFERENCES: {definicion[:80]}")
+            columnas_referidas, _ = _columnas_clave(definicion, referencias.end())
+            al_borrar = _AL_BORRAR.search(definicion)
+            al_actualizar = _AL_ACTUALIZAR.search(definicion)
+            tabla["claves_foraneas"].append({
+                "nombre": nombre,
+                "columnas": columnas,
+                "tabla": _sin_comillas(referencias.group(2)),
+                "referencias": columnas_referidas,
+                "al_borrar": " ".join(al_borrar.group(1).upper().split()) if al_borrar else "RESTRICT",
+                "al_actualizar": " ".join(al_actualizar.group(1).upper().split()) if al_actualizar else "RESTRICT",
+            })
+        elif _INDICE.match(definicion) or _UNICO.match(definicion):
+            indice = _INDICE.match(definicion)
+            tipo, nombre = indice.groups() if indice else ("UNIQUE", _UNICO.match(definicion).group(1))
+            columnas, _ = _columnas_clave(definicion)
+            tabla["indices"].append({
+                "nombre": _sin_comillas(nombre) or columnas[0],
+                "columnas": columnas,
+                "unico": (tipo or "").upper() == "UNIQUE",
+                "tipo": tipo.upper() if tipo and tipo.upper() != "UNIQUE" else None,
+            })
+    return tabla
+
+
+# --- Lectura en streaming ----------------------------------------------------------
+
+class _Lector:
+    """Búfer sobre el archivo que descarta lo ya consumido en cada recarga"""
+
+    def __init__(self, archivo, tam_bloque):
+        self.archivo = archivo
+        self.tam_bloque = tam_bloque
+        self.buf = b""
+        self.pos = 0
+        self.consumidos = 0
+        self.fin = False
+
+    def cargar(self):
+        """Añade un bloque al búfer; devuelve False si ya no queda nada por leer"""
+        if self.fin:
+            return False
+        bloque = self.archivo.read(self.tam_bloque)
+        if not bloque:
+            self.fin = True
+            return False
+        self.consumidos += self.pos
+        self.buf = self.buf[self.pos:] + bloque
+        self.pos = 0
+        return True
+
+    def asegurar(self, n):
+        while len(self.buf) - self.pos < n and self.cargar():
+            pass
+
+    def linea(self):
+        """Siguiente línea sin el salto final, o None al terminar el archivo"""
+        desde = self.pos
+        while True:
+            fin = self.buf.find(b"\n", desde)
+            if fin >= 0:
+                linea = self.buf[self.pos:fin]
+                self.pos = fin + 1
+                return linea
+            desde = len(self.buf) - self.pos
+            if not self.cargar():
+                if self.pos >= len(self.buf):
+                    return None
+                linea = self.buf[self.pos:]
+                self.pos = len(self.buf)
+                return linea
+
+    def posicion(self):
+        return self.consumidos + self.pos
+
+
+def _termina_sentencia(linea, delimitador):
+    texto = linea.rstrip()
+    return texto.endswith(delimitador) and not texto.lstrip().startswith(b"--")
+
+
+def iterar_filas(ruta, tablas=None, esquema=None, tam_bloque=TAM_BLOQUE, columnas=None):
+    """Recorre el volcado `ruta` y entrega (tabla, fila) por cada fila de sus INSERT.
+
+    Las filas son tuplas con valores de Python: int, Decimal, float, str, bytes,
+    date, datetime, timedelta (TIME) o None (NULL). `tablas` limita las tablas
+    cuyas filas se convierten (el resto se salta sin decodificar). `esquema` es un
+    diccionario que se completa con la estructura de cada CREATE TABLE leído; si
+    ya contiene una tabla definida en otro archivo se usa para tipar sus filas.
+    `columnas` ({tabla: columnas}) limita las columnas que se convierten en las
+    tablas indicadas; las demás llegan como None y cuestan mucho menos.
+    """
+    esquema = {} if esquema is None else esquema
+    delimitador = b";"
+    with open(ruta, "rb") as archivo:
+        lector = _Lector(archivo, tam_bloque)
+        while True:
+            lector.asegurar(_TAM_CABECERA)
+            insert = _INSERT.match(lector.buf, lector.pos)
+            if insert is not None:
+                yield from _filas_insert(ruta, lector, insert, tablas, esquema, columnas)
+                continue
+
+            linea = lector.linea()
+            if linea is None:
+                return
+            texto = linea.strip()
+            if not texto or texto.startswith((b"--", b"#")):
+                continue
+            cambio = _DELIMITER.match(texto)
+            if cambio is not None:
+                delimitador = cambio.group(1)
+                continue
+
+            if _CREATE_TABLE.match(texto):
+                lineas = [linea]
+                while not _termina_sentencia(linea, delimitador):
+                    linea = lector.linea()
+                    if linea is None:
+                        raise ErrorVolcado(f"{ruta}: CREATE TABLE sin terminar")
+                    lineas.append(linea)
+                try:
+                    tabla = analizar_create_table(b"\n".join(lineas).decode("utf-8"))
+                except ErrorVolcado as error:
+                    raise ErrorVolcado(f"{ruta}: {error}") from error
+                if tabla is not None:
+                    esquema[tabla["nombre"]] = tabla
+                continue
+
+            # Cualquier otra sentencia (SET, LOCK, vistas, rutinas...) se descarta línea a línea
+            while not _termina_sentencia(linea, delimitador):
+                linea = lector.linea()
+                if linea is None:
+                    return
+
+
+def _filas_insert(ruta, lector, insert, tablas, esquema, columnas):
+    nombre = _sin_comillas(insert.group(1).decode("utf-8"))
+    columnas_insert = None
+    if insert.group(2) is not None:
+        columnas_insert = [_sin_comillas(c.strip()) for c in insert.group(2).decode("utf-8").split(",")]
+    convertir = tablas is None or nombre in tablas
+    seleccion = None if columnas is None else columnas.get(nombre)
+    conversores = _conversores(esquema.get(nombre), columnas_insert, seleccion) if convertir else None
+    lector.pos = insert.end()
+    while True:
+        fila = _FILA.match(lector.buf, lector.pos)
+        # Una coincidencia que llega al final del búfer puede estar incompleta (número o cadena cortados)
+        if fila is None or (fila.end() == len(lector.buf) and not lector.fin):
+            if len(lector.buf) - lector.pos > MAX_FILA:
+                raise ErrorVolcado(f"{ruta}: fila de {nombre} mayor que {MAX_FILA} bytes (byte {lector.posicion()})")
+            if lector.cargar():
+                continue
+            if fila is None:
+                raise ErrorVolcado(f"{ruta}: fila mal formada en el INSERT de {nombre} (byte {lector.posicion()})")
+        lector.pos = fila.end()
+        if convertir:
+            try:
+                yield nombre, _convertir_fila(fila.group(1), conversores)
+            except (ErrorVolcado, ValueError) as error:
+                raise ErrorVolcado(f"{ruta}: {nombre} (byte {lector.posicion()}): {error}") from error
+        if fila.group(2) == b";":
+            return
+
+
+def leer_esquema(ruta, tam_bloque=TAM_BLOQUE):
+    """Estructura de las tablas que crea el volcado, sin convertir ninguna fila"""
+    esquema = {}
+    for _ in iterar_filas(ruta, tablas=(), esquema=esquema, tam_bloque=tam_bloque):
+        pass
+    return esquema
+
+
+def medir_rendimiento(rutas, tam_bloque=TAM_BLOQUE):
+    """Lee y convierte todas las filas de `rutas`; devuelve bytes, filas, segundos y MB/s"""
+    total_bytes = sum(os.path.getsize(ruta) for ruta in rutas)
+    filas = 0
+    inicio = time.perf_counter()
+    for ruta in rutas:
+        for _ in iterar_filas(ruta, tam_bloque=tam_bloque):
+            filas += 1
+    segundos = time.perf_counter() - inicio
+    return {
+        "bytes": total_bytes,
+        "filas": filas,
+        "segundos": segundos,
+        "mb_por_segundo": total_bytes / (1024 * 1024) / segundos if segundos else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("Uso: python -m analisis_sisvet.volcado_sql ARCHIVO.sql [...]")
+    resultado = medir_rendimiento(sys.argv[1:])
+    print(
+        f"📦 {resultado['bytes'] / (1024 * 1024):.1f} MB, {resultado['filas']:,} filas en "
+        f"{resultado['segundos']:.2f} s ({resultado['mb_por_segundo']:.1f} MB/s)"
+    )
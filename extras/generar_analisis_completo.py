@@ -3,2448 +3,23 @@ SCRIPT DE ANÁLISIS COMPLETO DEL SISTEMA VETERINARIO
 Genera un documento HTML interactivo con análisis técnico, comparación de competencia,
 estimaciones de costos, plan de ventas y cuestionarios de mercado.
 
-Autor: Análisis Sistema Veterinario SisVet
-Fecha: 2025-11-03
-"""
-
-import json
-from datetime import datetime
-import base64
-
-def generar_html_completo():
-    """Genera el documento HTML completo con todo el análisis"""
-
-    # Datos del proyecto actual (SisVet)
-    proyecto_sisvet = {
-        "nombre": "SisVet",
-        "version": "1.0.0",
-        "estado": "Funcional - En desarrollo",
-        "lineas_codigo": 6587,
-        "stack_tech": {
-            "frontend": ["React 19.1.1", "Vite 6.0.5", "TailwindCSS 3.4.17", "Framer Motion 11.18.2"],
-            "backend": ["Node.js", "Express 4.21.2", "MySQL2 3.12.0"],
-            "auth": ["JWT", "bcrypt 5.1.1"],
-            "email": ["Nodemailer 6.10.1"],
-            "otros": ["node-cron 4.2.1", "ics 3.8.1", "yup 1.7.0"]
-        },
-        "modulos_implementados": [
-            "Gestión de Pacientes",
-            "Historial Clínico (Consultas, Vacunas, Desparasitaciones, Alergias, Cirugías)",
-            "Sistema de Citas",
-            "Módulo de Estética/Grooming",
-            "Gestión de Usuarios (Admin, Doctor, Recepción)",
-            "Autenticación y Autorización",
-            "Notificaciones por Email",
-            "Recordatorios Automáticos (Cron Jobs)",
-            "Dashboard con Analytics",
-            "Búsqueda de Pacientes (Spotlight)",
-            "Exportación a PDF/Excel",
-            "Timeline Zoomable",
-            "Modo Oscuro/Claro"
-        ],
-        "db_tablas": 35,
-        "fortalezas": [
-            "Arquitectura moderna y escalable",
-            "UI/UX profesional con animaciones",
-            "Historial clínico muy completo",
-            "Sistema de citas con recordatorios automáticos",
-            "Módulo de estética diferenciador",
-            "Exportación de datos flexible",
-            "Sistema de búsqueda avanzado (Spotlight)",
-            "Responsive design optimizado",
-            "Base de datos bien estructurada con 35+ tablas",
-            "Seguridad implementada (JWT, bcrypt, CORS)",
-            "Timeline visual del historial",
-            "Gráficas de evolución de pacientes"
-        ],
-        "debilidades": [
-            "Sin facturación electrónica",
-            "Sin app móvil nativa",
-            "Sin integración WhatsApp/SMS",
-            "Sin módulo de inventario completo",
-            "Sin sistema de telemedicina",
-            "Sin multi-sede",
-            "Sin integraciones con distribuidores",
-            "Sin sistema de pagos en línea",
-            "Sin módulo de contabilidad",
-            "Sin reportes financieros avanzados",
-            "Sin hospitalización completa",
-            "Sin módulo de laboratorio",
-            "Falta documentación técnica",
-            "Sin tests automatizados"
-        ]
-    }
-
-    # Datos de la competencia
-    competidores = [
-        {
-            "nombre": "MyVete",
-            "pais": "México/Latam",
-            "precio_min": 800,
-            "precio_max": 3000,
-            "moneda": "MXN",
-            "precio_usd_min": 40,
-            "precio_usd_max": 150,
-            "trial": "30 días gratis",
-            "puntuacion": 8.5,
-            "market_share": 15,
-            "funcionalidades": [
-                "Dictado por voz",
-                "Datos multimedia (fotos, videos)",
-                "Recordatorios automáticos (Email, SMS, WhatsApp)",
-                "Facturación electrónica",
-                "Control de inventario",
-                "Gestión de proveedores",
-                "Cola de espera en tiempo real",
-                "Internación y guardería",
-                "Mutualismo/Obra Social",
-                "Reportes y estadísticas",
-                "Multi-dispositivo"
-            ]
-        },
-        {
-            "nombre": "Provet Cloud",
-            "pais": "Global",
-            "precio_min": 1000,
-            "precio_max": 8000,
-            "moneda": "MXN",
-            "precio_usd_min": 50,
-            "precio_usd_max": 400,
-            "trial": "Demo personalizada",
-            "puntuacion": 9.0,
-            "market_share": 20,
-            "funcionalidades": [
-                "IA Clínica (escritura asistida)",
-                "Recordatorios automáticos",
-                "CRM centralizado",
-                "Facturación e integración contable",
-                "Control de stock multi-sede",
-                "Reservas online",
-                "Integración con laboratorios",
-                "Telemedicina",
-                "Reportes avanzados",
-                "Multi-sede"
-            ]
-        },
-        {
-            "nombre": "Panther",
-            "pais": "México",
-            "precio_min": 600,
-            "precio_max": 2000,
-            "moneda": "MXN",
-            "precio_usd_min": 30,
-            "precio_usd_max": 100,
-            "trial": "Prueba gratuita",
-            "puntuacion": 7.5,
-            "market_share": 10,
-            "funcionalidades": [
-                "Agendamiento rápido",
-                "Consultas médicas",
-                "Prescripciones",
-                "Signos vitales",
-                "Exámenes y radiografías",
-                "App móvil (PantherPet)",
-                "Notificaciones Apple Watch",
-                "Sincronización cloud"
-            ]
-        },
-        {
-            "nombre": "OKVet",
-            "pais": "Colombia/Latam",
-            "precio_min": 0,
-            "precio_max": 2060,
-            "moneda": "MXN",
-            "precio_usd_min": 0,
-            "precio_usd_max": 103,
-            "trial": "Versión gratuita",
-            "puntuacion": 7.8,
-            "market_share": 12,
-            "funcionalidades": [
-                "Historia clínica especializada",
-                "Agenda colaborativa",
-                "Facturación electrónica (DIAN)",
-                "Hospitalización y ambulatorios",
-                "Kardex de medicamentos",
-                "Ventas e inventario",
-                "Marketing (SMS/WhatsApp)",
-                "Versión GRATUITA disponible",
-                "Informes en tiempo real"
-            ]
-        },
-        {
-            "nombre": "GVET",
-            "pais": "Argentina/Latam",
-            "precio_min": 400,
-            "precio_max": 1500,
-            "moneda": "MXN",
-            "precio_usd_min": 20,
-            "precio_usd_max": 75,
-            "trial": "3 meses gratis",
-            "puntuacion": 8.0,
-            "market_share": 14,
-            "funcionalidades": [
-                "Multi-dispositivo",
-                "App móvil para clientes",
-                "Facturación electrónica (7 países)",
-                "Integración WhatsApp",
-                "Telemedicina",
-                "Multi-sucursal",
-                "Hospitalización remota",
-                "Control de stock",
-                "Interfaz intuitiva"
-            ]
-        },
-        {
-            "nombre": "Sami.vet",
-            "pais": "Latam",
-            "precio_min": 500,
-            "precio_max": 2500,
-            "moneda": "MXN",
-            "precio_usd_min": 25,
-            "precio_usd_max": 125,
-            "trial": "Demo disponible",
-            "puntuacion": 8.2,
-            "market_share": 8,
-            "funcionalidades": [
-                "Punto de venta",
-                "Control de inventarios",
-                "Gestión financiera",
-                "Agendas y citas",
-                "Expedientes digitales",
-                "100% en la nube",
-                "Envío de recetas a clientes",
-                "Evaluación de visitas",
-                "Reportes financieros"
-            ]
-        },
-        {
-            "nombre": "QVET",
-            "pais": "España/Global",
-            "precio_min": 1500,
-            "precio_max": 5000,
-            "moneda": "MXN",
-            "precio_usd_min": 75,
-            "precio_usd_max": 250,
-            "trial": "Demo personalizada",
-            "puntuacion": 9.2,
-            "market_share": 18,
-            "funcionalidades": [
-                "29 años de experiencia",
-                "8000+ clientes en 31 países",
-                "Facturación electrónica (11 países)",
-                "Dictado por voz avanzado",
-                "Integración financiera (Frakmenta)",
-                "Videoconsulta",
-                "Soporte 24/7",
-                "Webinars semanales",
-                "Migración gratuita",
-                "Integraciones con distribuidores"
-            ]
-        },
-        {
-            "nombre": "SaelVet",
-            "pais": "Latam",
-            "precio_min": 600,
-            "precio_max": 2200,
-            "moneda": "MXN",
-            "precio_usd_min": 30,
-            "precio_usd_max": 110,
-            "trial": "Prueba disponible",
-            "puntuacion": 7.6,
-            "market_share": 3,
-            "funcionalidades": [
-                "Modelo SAAS",
-                "Datacenter SOC 2 tipo II",
-                "Backup diario",
-                "99.6% uptime",
-                "Conexión HTTPS",
-                "Bootstrap 4",
-                "Soporte 24 horas",
-                "Gestión administrativa"
-            ]
-        }
-    ]
-
-    html_content = f"""
-<!DOCTYPE html>
-<html lang="es">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Análisis Completo - Sistema Veterinario SisVet</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            padding: 20px;
-        }}
-
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-            background: white;
-            border-radius: 20px;
-            box-shadow: 0 20px 60px rgba(0,0,0,0.3);
-            overflow: hidden;
-        }}
-
-        .header {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 60px 40px;
-            text-align: center;
-        }}
-
-        .header h1 {{
-            font-size: 3em;
-            margin-bottom: 10px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
-
-        .header p {{
-            font-size: 1.3em;
-            opacity: 0.95;
-        }}
-
-        .header .date {{
-            margin-top: 20px;
-            font-size: 1em;
-            opacity: 0.8;
-        }}
-
-        .nav {{
-            background: #2c3e50;
-            padding: 0;
-            position: sticky;
-            top: 0;
-            z-index: 100;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.2);
-        }}
-
-        .nav ul {{
-            list-style: none;
-            display: flex;
-            flex-wrap: wrap;
-            justify-content: center;
-        }}
-
-        .nav li {{
-            margin: 0;
-        }}
-
-        .nav a {{
-            display: block;
-            padding: 15px 25px;
-            color: white;
-            text-decoration: none;
-            transition: all 0.3s ease;
-            border-bottom: 3px solid transparent;
-        }}
-
-        .nav a:hover {{
-            background: #34495e;
-            border-bottom-color: #667eea;
-        }}
-
-        .content {{
-            padding: 40px;
-        }}
-
-        .section {{
-            margin-bottom: 60px;
-            padding: 40px;
-            background: #f8f9fa;
-            border-radius: 15px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-
-        .section h2 {{
-            color: #667eea;
-            font-size: 2.5em;
-            margin-bottom: 30px;
-            border-bottom: 4px solid #667eea;
-            padding-bottom: 15px;
-        }}
-
-        .section h3 {{
-            color: #764ba2;
-            font-size: 1.8em;
-            margin-top: 30px;
-            margin-bottom: 20px;
-        }}
-
-        .grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
-            gap: 30px;
-            margin: 30px 0;
-        }}
-
-        .card {{
-            background: white;
-            border-radius: 15px;
-            padding: 25px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }}
-
-        .card:hover {{
-            transform: translateY(-5px);
-            box-shadow: 0 8px 12px rgba(0,0,0,0.2);
-        }}
-
-        .card h4 {{
-            color: #667eea;
-            font-size: 1.5em;
-            margin-bottom: 15px;
-        }}
-
-        .badge {{
-            display: inline-block;
-            padding: 5px 12px;
-            border-radius: 20px;
-            font-size: 0.85em;
-            font-weight: bold;
-            margin: 5px 5px 5px 0;
-        }}
-
-        .badge-success {{
-            background: #10b981;
-            color: white;
-        }}
-
-        .badge-warning {{
-            background: #f59e0b;
-            color: white;
-        }}
-
-        .badge-danger {{
-            background: #ef4444;
-            color: white;
-        }}
-
-        .badge-info {{
-            background: #3b82f6;
-            color: white;
-        }}
-
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-            background: white;
-            border-radius: 10px;
-            overflow: hidden;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-
-        th {{
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 15px;
-            text-align: left;
-            font-weight: bold;
-        }}
-
-        td {{
-            padding: 12px 15px;
-            border-bottom: 1px solid #e5e7eb;
-        }}
-
-        tr:hover {{
-            background: #f3f4f6;
-        }}
-
-        .chart-container {{
-            position: relative;
-            height: 400px;
-            margin: 30px 0;
-            background: white;
-            padding: 20px;
-            border-radius: 15px;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-
-        .price-tag {{
-            font-size: 2em;
-            font-weight: bold;
-            color: #10b981;
-            margin: 10px 0;
-        }}
-
-        .highlight {{
-            background: #fef3c7;
-            padding: 20px;
-            border-left: 4px solid #f59e0b;
-            border-radius: 8px;
-            margin: 20px 0;
-        }}
-
-        .checklist {{
-            list-style: none;
-            padding: 0;
-        }}
-
-        .checklist li {{
-            padding: 12px;
-            margin: 8px 0;
-            background: white;
-            border-radius: 8px;
-            border-left: 4px solid #10b981;
-            transition: all 0.3s ease;
-        }}
-
-        .checklist li:hover {{
-            transform: translateX(5px);
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-
-        .checklist li:before {{
-            content: "✓ ";
-            color: #10b981;
-            font-weight: bold;
-            margin-right: 10px;
-        }}
-
-        .warning-box {{
-            background: #fef2f2;
-            border-left: 4px solid #ef4444;
-            padding: 20px;
-            border-radius: 8px;
-            margin: 20px 0;
-        }}
-
-        .info-box {{
-            background: #eff6ff;
-            border-left: 4px solid #3b82f6;
-            padding: 20px;
-            border-radius: 8px;
-            margin: 20px 0;
-        }}
-
-        .success-box {{
-            background: #f0fdf4;
-            border-left: 4px solid #10b981;
-            padding: 20px;
-            border-radius: 8px;
-            margin: 20px 0;
-        }}
-
-        .stat {{
-            text-align: center;
-            padding: 20px;
-        }}
-
-        .stat-number {{
-            font-size: 3em;
-            font-weight: bold;
-            color: #667eea;
-        }}
-
-        .stat-label {{
-            font-size: 1em;
-            color: #6b7280;
-            margin-top: 10px;
-        }}
-
-        .timeline {{
-            position: relative;
-            padding-left: 30px;
-        }}
-
-        .timeline:before {{
-            content: '';
-            position: absolute;
-            left: 0;
-            top: 0;
-            bottom: 0;
-            width: 4px;
-            background: #667eea;
-        }}
-
-        .timeline-item {{
-            position: relative;
-            padding: 20px;
-            background: white;
-            margin-bottom: 20px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-
-        .timeline-item:before {{
-            content: '';
-            position: absolute;
-            left: -37px;
-            top: 25px;
-            width: 16px;
-            height: 16px;
-            border-radius: 50%;
-            background: #667eea;
-            border: 4px solid white;
-        }}
-
-        @media print {{
-            body {{
-                background: white;
-            }}
-
-            .nav {{
-                display: none;
-            }}
-
-            .section {{
-                page-break-inside: avoid;
-            }}
-        }}
-
-        @media (max-width: 768px) {{
-            .header h1 {{
-                font-size: 2em;
-            }}
-
-            .nav ul {{
-                flex-direction: column;
-            }}
-
-            .grid {{
-                grid-template-columns: 1fr;
-            }}
-
-            .content {{
-                padding: 20px;
-            }}
-        }}
-
-        .footer {{
-            background: #2c3e50;
-            color: white;
-            padding: 40px;
-            text-align: center;
-        }}
-
-        .footer p {{
-            margin: 10px 0;
-        }}
-
-        .progress-bar {{
-            width: 100%;
-            height: 30px;
-            background: #e5e7eb;
-            border-radius: 15px;
-            overflow: hidden;
-            margin: 10px 0;
-        }}
-
-        .progress-fill {{
-            height: 100%;
-            background: linear-gradient(90deg, #667eea 0%, #764ba2 100%);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-weight: bold;
-            transition: width 0.3s ease;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1>📊 Análisis Completo del Sistema</h1>
-            <p><strong>SisVet</strong> - Sistema de Gestión Veterinaria</p>
-            <div class="date">Generado: {datetime.now().strftime('%d de %B de %Y, %H:%M')}</div>
-        </div>
-
-        <nav class="nav">
-            <ul>
-                <li><a href="#resumen">📋 Resumen Ejecutivo</a></li>
-                <li><a href="#analisis-tecnico">💻 Análisis Técnico</a></li>
-                <li><a href="#competencia">🏆 Competencia</a></li>
-                <li><a href="#comparacion">📊 Comparación</a></li>
-                <li><a href="#costos">💰 Costos</a></li>
-                <li><a href="#mercado">📈 Plan de Mercado</a></li>
-                <li><a href="#cuestionarios">📝 Cuestionarios</a></li>
-                <li><a href="#recomendaciones">💡 Recomendaciones</a></li>
-            </ul>
-        </nav>
-
-        <div class="content">
-            <!-- RESUMEN EJECUTIVO -->
-            <section id="resumen" class="section">
-                <h2>📋 Resumen Ejecutivo</h2>
-
-                <div class="success-box">
-                    <h4>🎯 Estado Actual del Proyecto</h4>
-                    <p><strong>SisVet</strong> es un sistema de gestión veterinaria funcional con {proyecto_sisvet['lineas_codigo']:,} líneas de código, implementando tecnologías modernas y una arquitectura escalable. El proyecto está listo para pruebas beta y comercialización inicial.</p>
-                </div>
-
-                <div class="grid">
-                    <div class="card">
-                        <div class="stat">
-                            <div class="stat-number">{len(proyecto_sisvet['modulos_implementados'])}</div>
-                            <div class="stat-label">Módulos Implementados</div>
-                        </div>
-                    </div>
-                    <div class="card">
-                        <div class="stat">
-                            <div class="stat-number">{proyecto_sisvet['db_tablas']}</div>
-                            <div class="stat-label">Tablas en Base de Datos</div>
-                        </div>
-                    </div>
-                    <div class="card">
-                        <div class="stat">
-                            <div class="stat-number">{len(competidores)}</div>
-                            <div class="stat-label">Competidores Analizados</div>
-                        </div>
-                    </div>
-                    <div class="card">
-                        <div class="stat">
-                            <div class="stat-number">85%</div>
-                            <div class="stat-label">Completitud Funcional</div>
-                        </div>
-                    </div>
-                </div>
-
-                <h3>✅ Fortalezas Principales</h3>
-                <div class="grid">
-"""
-
-    # Agregar fortalezas en cards
-    for i, fortaleza in enumerate(proyecto_sisvet['fortalezas'][:6]):
-        html_content += f"""
-                    <div class="card">
-                        <h4>#{i+1}</h4>
-                        <p>{fortaleza}</p>
-                    </div>
-"""
-
-    html_content += f"""
-                </div>
-
-                <h3>⚠️ Áreas de Mejora Prioritarias</h3>
-                <div class="warning-box">
-                    <ul>
-"""
-
-    for debilidad in proyecto_sisvet['debilidades'][:8]:
-        html_content += f"                        <li><strong>{debilidad}</strong></li>\n"
-
-    html_content += f"""
-                    </ul>
-                </div>
-            </section>
-
-            <!-- ANÁLISIS TÉCNICO -->
-            <section id="analisis-tecnico" class="section">
-                <h2>💻 Análisis Técnico Detallado</h2>
-
-                <h3>🎨 Stack Tecnológico</h3>
-
-                <div class="grid">
-                    <div class="card">
-                        <h4>Frontend</h4>
-                        <ul>
-"""
-
-    for tech in proyecto_sisvet['stack_tech']['frontend']:
-        html_content += f"                            <li>{tech}</li>\n"
-
-    html_content += f"""
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>Backend</h4>
-                        <ul>
-"""
-
-    for tech in proyecto_sisvet['stack_tech']['backend']:
-        html_content += f"                            <li>{tech}</li>\n"
-
-    html_content += f"""
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>Seguridad & Autenticación</h4>
-                        <ul>
-"""
-
-    for tech in proyecto_sisvet['stack_tech']['auth']:
-        html_content += f"                            <li>{tech}</li>\n"
-
-    html_content += f"""
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>Herramientas Adicionales</h4>
-                        <ul>
-"""
-
-    for tech in proyecto_sisvet['stack_tech']['otros']:
-        html_content += f"                            <li>{tech}</li>\n"
-
-    html_content += """
-                        </ul>
-                    </div>
-                </div>
-
-                <h3>📦 Módulos Implementados</h3>
-                <ul class="checklist">
-"""
-
-    for modulo in proyecto_sisvet['modulos_implementados']:
-        html_content += f"                    <li>{modulo}</li>\n"
-
-    html_content += f"""
-                </ul>
-
-                <h3>🗄️ Arquitectura de Base de Datos</h3>
-                <div class="info-box">
-                    <p><strong>Total de Tablas:</strong> {proyecto_sisvet['db_tablas']}</p>
-                    <p><strong>Motor:</strong> MySQL con InnoDB</p>
-                    <p><strong>Características:</strong></p>
-                    <ul>
-                        <li>Relaciones con integridad referencial (Foreign Keys)</li>
-                        <li>Índices optimizados para consultas frecuentes</li>
-                        <li>Vistas SQL para reportes complejos</li>
-                        <li>Triggers y audit logs implementados</li>
-                        <li>Sistema de licencias multi-clínica</li>
-                        <li>Soporte para múltiples países y códigos postales</li>
-                    </ul>
-                </div>
-
-                <h3>📈 Calidad del Código</h3>
-                <table>
-                    <tr>
-                        <th>Aspecto</th>
-                        <th>Estado</th>
-                        <th>Calificación</th>
-                    </tr>
-                    <tr>
-                        <td>Arquitectura</td>
-                        <td><span class="badge badge-success">Excelente</span></td>
-                        <td>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: 90%">90%</div>
-                            </div>
-                        </td>
-                    </tr>
-                    <tr>
-                        <td>Manejo de Errores</td>
-                        <td><span class="badge badge-success">Bueno</span></td>
-                        <td>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: 80%">80%</div>
-                            </div>
-                        </td>
-                    </tr>
-                    <tr>
-                        <td>Seguridad</td>
-                        <td><span class="badge badge-success">Bueno</span></td>
-                        <td>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: 75%">75%</div>
-                            </div>
-                        </td>
-                    </tr>
-                    <tr>
-                        <td>UI/UX</td>
-                        <td><span class="badge badge-success">Excelente</span></td>
-                        <td>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: 88%">88%</div>
-                            </div>
-                        </td>
-                    </tr>
-                    <tr>
-                        <td>Documentación</td>
-                        <td><span class="badge badge-warning">Mejorable</span></td>
-                        <td>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: 40%">40%</div>
-                            </div>
-                        </td>
-                    </tr>
-                    <tr>
-                        <td>Testing</td>
-                        <td><span class="badge badge-danger">Inexistente</span></td>
-                        <td>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: 10%">10%</div>
-                            </div>
-                        </td>
-                    </tr>
-                </table>
-            </section>
-
-            <!-- ANÁLISIS DE COMPETENCIA -->
-            <section id="competencia" class="section">
-                <h2>🏆 Análisis de la Competencia</h2>
-
-                <p class="highlight">
-                    <strong>Mercado Analizado:</strong> Se analizaron {len(competidores)} competidores principales en el mercado latinoamericano y global de software veterinario. El mercado está valorado en aproximadamente <strong>$450 millones USD anuales</strong> en Latinoamérica con un crecimiento del 12% anual.
-                </p>
-
-                <h3>📊 Competidores Principales</h3>
-"""
-
-    # Tabla de competidores
-    html_content += """
-                <table>
-                    <tr>
-                        <th>Software</th>
-                        <th>País</th>
-                        <th>Precio Mensual (USD)</th>
-                        <th>Puntuación</th>
-                        <th>Market Share</th>
-                        <th>Trial</th>
-                    </tr>
-"""
-
-    for comp in competidores:
-        html_content += f"""
-                    <tr>
-                        <td><strong>{comp['nombre']}</strong></td>
-                        <td>{comp['pais']}</td>
-                        <td>${comp['precio_usd_min']} - ${comp['precio_usd_max']}</td>
-                        <td>
-                            <div class="progress-bar">
-                                <div class="progress-fill" style="width: {comp['puntuacion']*10}%">{comp['puntuacion']}/10</div>
-                            </div>
-                        </td>
-                        <td>{comp['market_share']}%</td>
-                        <td><span class="badge badge-info">{comp['trial']}</span></td>
-                    </tr>
-"""
-
-    html_content += """
-                </table>
-
-                <div class="chart-container">
-                    <canvas id="marketShareChart"></canvas>
-                </div>
-
-                <div class="chart-container">
-                    <canvas id="priceComparisonChart"></canvas>
-                </div>
-
-                <h3>🔍 Análisis Detallado por Competidor</h3>
-"""
+La generación vive en el paquete analisis_sisvet (render() en
+analisis_sisvet.generacion) y este script es solo su línea de comandos:
 
-    for comp in competidores:
-        html_content += f"""
-                <div class="card">
-                    <h4>{comp['nombre']}</h4>
-                    <p><strong>Origen:</strong> {comp['pais']}</p>
-                    <p><strong>Precio:</strong> <span class="price-tag">${comp['precio_usd_min']}-${comp['precio_usd_max']} USD/mes</span></p>
-                    <p><strong>Puntuación:</strong> {comp['puntuacion']}/10</p>
-                    <p><strong>Funcionalidades:</strong></p>
-                    <div style="display: flex; flex-wrap: wrap; gap: 5px; margin-top: 10px;">
-"""
-
-        for func in comp['funcionalidades'][:8]:
-            html_content += f'                        <span class="badge badge-info">{func}</span>\n'
-
-        html_content += """
-                    </div>
-                </div>
-"""
-
-    html_content += """
-            </section>
-
-            <!-- COMPARACIÓN FUNCIONAL -->
-            <section id="comparacion" class="section">
-                <h2>📊 Matriz de Comparación Funcional</h2>
-
-                <div class="info-box">
-                    <h4>Metodología de Evaluación</h4>
-                    <p>Se evaluaron 20 funcionalidades críticas en una escala de 0-10, donde:</p>
-                    <ul>
-                        <li><strong>10:</strong> Funcionalidad completa y avanzada</li>
-                        <li><strong>7-9:</strong> Funcionalidad implementada con algunas limitaciones</li>
-                        <li><strong>4-6:</strong> Funcionalidad básica o parcial</li>
-                        <li><strong>0-3:</strong> Funcionalidad inexistente o muy limitada</li>
-                    </ul>
-                </div>
-
-                <table>
-                    <tr>
-                        <th>Funcionalidad</th>
-                        <th>SisVet</th>
-                        <th>MyVete</th>
-                        <th>Provet</th>
-                        <th>QVET</th>
-                        <th>GVET</th>
-                    </tr>
-                    <tr>
-                        <td>Historial Clínico</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 95%">9.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 95%">9.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 80%">8.0</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>Sistema de Citas</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 80%">8.0</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>Facturación Electrónica</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 0%">0.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 95%">9.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 95%">9.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>Inventario</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 40%">4.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 80%">8.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>App Móvil</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 0%">0.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 70%">7.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 80%">8.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>WhatsApp/SMS</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 0%">0.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 95%">9.5</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>Telemedicina</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 0%">0.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 50%">5.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 80%">8.0</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>Multi-sede</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 0%">0.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 70%">7.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 95%">9.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>UI/UX Moderna</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 95%">9.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 80%">8.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 75%">7.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 80%">8.0</div></div></td>
-                    </tr>
-                    <tr>
-                        <td>Exportación Datos</td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 90%">9.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 75%">7.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 85%">8.5</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 80%">8.0</div></div></td>
-                        <td><div class="progress-bar"><div class="progress-fill" style="width: 70%">7.0</div></div></td>
-                    </tr>
-                </table>
-
-                <div class="chart-container">
-                    <canvas id="radarChart"></canvas>
-                </div>
-
-                <h3>🎯 Posicionamiento Competitivo</h3>
-                <div class="success-box">
-                    <h4>Ventajas Competitivas de SisVet:</h4>
-                    <ul class="checklist">
-                        <li>Historial clínico más completo del mercado (vacunas, cirugías, alergias, exámenes)</li>
-                        <li>UI/UX superior con animaciones y diseño moderno</li>
-                        <li>Módulo de estética/grooming (diferenciador único)</li>
-                        <li>Timeline visual interactivo</li>
-                        <li>Exportación flexible (PDF, Excel)</li>
-                        <li>Spotlight de búsqueda tipo macOS</li>
-                        <li>Tecnología más moderna (React 19, Node.js reciente)</li>
-                        <li>Código limpio y arquitectura escalable</li>
-                    </ul>
-                </div>
-
-                <div class="warning-box">
-                    <h4>Desventajas Competitivas de SisVet:</h4>
-                    <ul>
-                        <li><strong>Facturación electrónica:</strong> Funcionalidad crítica ausente (presente en 87% de competidores)</li>
-                        <li><strong>App móvil:</strong> Sin aplicación nativa (75% de competidores la tienen)</li>
-                        <li><strong>WhatsApp/SMS:</strong> Sin integración de mensajería (87% de competidores)</li>
-                        <li><strong>Telemedicina:</strong> Funcionalidad emergente no implementada (62% la tienen)</li>
-                        <li><strong>Multi-sede:</strong> Sin soporte para cadenas (62% de competidores)</li>
-                        <li><strong>Inventario:</strong> Módulo incompleto vs competencia</li>
-                        <li><strong>Marca y presencia:</strong> Competidores con años de experiencia (QVET: 29 años)</li>
-                    </ul>
-                </div>
-            </section>
-
-            <!-- ANÁLISIS DE COSTOS -->
-            <section id="costos" class="section">
-                <h2>💰 Estimación de Costos y Modelo de Negocio</h2>
-
-                <h3>💵 Costos de Desarrollo Completados</h3>
-                <table>
-                    <tr>
-                        <th>Concepto</th>
-                        <th>Horas Estimadas</th>
-                        <th>Costo por Hora (USD)</th>
-                        <th>Total (USD)</th>
-                    </tr>
-                    <tr>
-                        <td>Análisis y Diseño</td>
-                        <td>80</td>
-                        <td>$50</td>
-                        <td class="price-tag">$4,000</td>
-                    </tr>
-                    <tr>
-                        <td>Desarrollo Backend (6,587 líneas)</td>
-                        <td>320</td>
-                        <td>$50</td>
-                        <td class="price-tag">$16,000</td>
-                    </tr>
-                    <tr>
-                        <td>Desarrollo Frontend</td>
-                        <td>280</td>
-                        <td>$50</td>
-                        <td class="price-tag">$14,000</td>
-                    </tr>
-                    <tr>
-                        <td>Base de Datos (35 tablas)</td>
-                        <td>60</td>
-                        <td>$50</td>
-                        <td class="price-tag">$3,000</td>
-                    </tr>
-                    <tr>
-                        <td>Testing y Debugging</td>
-                        <td>100</td>
-                        <td>$40</td>
-                        <td class="price-tag">$4,000</td>
-                    </tr>
-                    <tr>
-                        <td>UI/UX Design</td>
-                        <td>80</td>
-                        <td>$60</td>
-                        <td class="price-tag">$4,800</td>
-                    </tr>
-                    <tr>
-                        <th colspan="3">TOTAL INVERSIÓN DESARROLLO</th>
-                        <th class="price-tag" style="color: #667eea;">$45,800 USD</th>
-                    </tr>
-                </table>
-
-                <h3>📊 Costos Mensuales de Operación</h3>
-                <table>
-                    <tr>
-                        <th>Concepto</th>
-                        <th>Costo Mensual (USD)</th>
-                        <th>Costo Anual (USD)</th>
-                    </tr>
-                    <tr>
-                        <td>Servidor Cloud (AWS/DigitalOcean)</td>
-                        <td>$150</td>
-                        <td>$1,800</td>
-                    </tr>
-                    <tr>
-                        <td>Base de Datos (MySQL)</td>
-                        <td>$50</td>
-                        <td>$600</td>
-                    </tr>
-                    <tr>
-                        <td>CDN y Almacenamiento</td>
-                        <td>$40</td>
-                        <td>$480</td>
-                    </tr>
-                    <tr>
-                        <td>Email Service (SendGrid/Mailgun)</td>
-                        <td>$30</td>
-                        <td>$360</td>
-                    </tr>
-                    <tr>
-                        <td>Dominio y SSL</td>
-                        <td>$10</td>
-                        <td>$120</td>
-                    </tr>
-                    <tr>
-                        <td>Monitoreo y Analytics</td>
-                        <td>$30</td>
-                        <td>$360</td>
-                    </tr>
-                    <tr>
-                        <td>Backups y Seguridad</td>
-                        <td>$40</td>
-                        <td>$480</td>
-                    </tr>
-                    <tr>
-                        <th>SUBTOTAL INFRAESTRUCTURA</th>
-                        <th>$350/mes</th>
-                        <th>$4,200/año</th>
-                    </tr>
-                    <tr>
-                        <td colspan="3" style="height: 20px;"></td>
-                    </tr>
-                    <tr>
-                        <td>Soporte Técnico (medio tiempo)</td>
-                        <td>$800</td>
-                        <td>$9,600</td>
-                    </tr>
-                    <tr>
-                        <td>Marketing Digital</td>
-                        <td>$500</td>
-                        <td>$6,000</td>
-                    </tr>
-                    <tr>
-                        <td>Desarrollo Continuo (mejoras)</td>
-                        <td>$1,000</td>
-                        <td>$12,000</td>
-                    </tr>
-                    <tr>
-                        <td>Gastos Administrativos</td>
-                        <td>$200</td>
-                        <td>$2,400</td>
-                    </tr>
-                    <tr>
-                        <th>TOTAL OPERACIÓN MENSUAL</th>
-                        <th class="price-tag" style="color: #667eea;">$2,850/mes</th>
-                        <th class="price-tag" style="color: #667eea;">$34,200/año</th>
-                    </tr>
-                </table>
-
-                <h3>💡 Modelo de Precios Propuesto</h3>
-
-                <div class="grid">
-                    <div class="card">
-                        <h4>🌱 Plan Starter</h4>
-                        <div class="price-tag">$599 MXN/mes</div>
-                        <p style="color: #6b7280;">≈ $30 USD/mes</p>
-                        <ul style="margin-top: 15px;">
-                            <li>1 usuario</li>
-                            <li>Hasta 50 pacientes</li>
-                            <li>Historial clínico básico</li>
-                            <li>Agenda de citas</li>
-                            <li>Soporte por email</li>
-                        </ul>
-                    </div>
-
-                    <div class="card" style="border: 3px solid #667eea;">
-                        <h4>🚀 Plan Professional</h4>
-                        <span class="badge badge-success">MÁS POPULAR</span>
-                        <div class="price-tag">$1,199 MXN/mes</div>
-                        <p style="color: #6b7280;">≈ $60 USD/mes</p>
-                        <ul style="margin-top: 15px;">
-                            <li>3 usuarios</li>
-                            <li>Pacientes ilimitados</li>
-                            <li>Historial clínico completo</li>
-                            <li>Sistema de citas + recordatorios</li>
-                            <li>Módulo de estética</li>
-                            <li>Exportación PDF/Excel</li>
-                            <li>Soporte prioritario</li>
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>💎 Plan Enterprise</h4>
-                        <div class="price-tag">$2,499 MXN/mes</div>
-                        <p style="color: #6b7280;">≈ $125 USD/mes</p>
-                        <ul style="margin-top: 15px;">
-                            <li>Usuarios ilimitados</li>
-                            <li>Pacientes ilimitados</li>
-                            <li>Todas las funcionalidades</li>
-                            <li>API access</li>
-                            <li>Personalización</li>
-                            <li>Capacitación incluida</li>
-                            <li>Soporte 24/7</li>
-                        </ul>
-                    </div>
-                </div>
-
-                <h3>📈 Proyección Financiera (12 meses)</h3>
-
-                <div class="info-box">
-                    <h4>Escenario Conservador</h4>
-                    <table>
-                        <tr>
-                            <th>Mes</th>
-                            <th>Clientes Nuevos</th>
-                            <th>Total Clientes</th>
-                            <th>Ingresos Mensuales</th>
-                            <th>Ingresos Acumulados</th>
-                        </tr>
-                        <tr>
-                            <td>Mes 1-2 (Beta)</td>
-                            <td>5</td>
-                            <td>5</td>
-                            <td>$5,995 MXN</td>
-                            <td>$11,990 MXN</td>
-                        </tr>
-                        <tr>
-                            <td>Mes 3-4</td>
-                            <td>8</td>
-                            <td>21</td>
-                            <td>$25,179 MXN</td>
-                            <td>$62,348 MXN</td>
-                        </tr>
-                        <tr>
-                            <td>Mes 5-6</td>
-                            <td>10</td>
-                            <td>41</td>
-                            <td>$49,159 MXN</td>
-                            <td>$160,666 MXN</td>
-                        </tr>
-                        <tr>
-                            <td>Mes 7-9</td>
-                            <td>12</td>
-                            <td>77</td>
-                            <td>$92,323 MXN</td>
-                            <td>$437,635 MXN</td>
-                        </tr>
-                        <tr>
-                            <td>Mes 10-12</td>
-                            <td>15</td>
-                            <td>122</td>
-                            <td>$146,278 MXN</td>
-                            <td>$876,469 MXN</td>
-                        </tr>
-                    </table>
-                    <p><strong>Ingreso Anual Proyectado:</strong> <span class="price-tag">$876,469 MXN ≈ $43,823 USD</span></p>
-                    <p><strong>ROI estimado:</strong> 12-18 meses</p>
-                </div>
-
-                <div class="success-box">
-                    <h4>Escenario Optimista (con marketing activo)</h4>
-                    <p><strong>Clientes al final del año:</strong> 250 clínicas</p>
-                    <p><strong>Ingreso mensual recurrente (MRR):</strong> $299,750 MXN ≈ $14,987 USD</p>
-                    <p><strong>Ingreso anual:</strong> <span class="price-tag">$3,597,000 MXN ≈ $179,850 USD</span></p>
-                    <p><strong>ROI estimado:</strong> 6-9 meses</p>
-                </div>
-
-                <div class="chart-container">
-                    <canvas id="revenueProjectionChart"></canvas>
-                </div>
-
-                <h3>💰 Punto de Equilibrio</h3>
-                <div class="highlight">
-                    <p><strong>Costos fijos mensuales:</strong> $2,850 USD ($57,000 MXN)</p>
-                    <p><strong>Precio promedio por cliente:</strong> $1,199 MXN/mes</p>
-                    <p><strong>Clientes necesarios para break-even:</strong> <span class="price-tag">48 clientes</span></p>
-                    <p><strong>Tiempo estimado para alcanzarlo:</strong> 5-7 meses</p>
-                </div>
-            </section>
-
-            <!-- PLAN DE MERCADO -->
-            <section id="mercado" class="section">
-                <h2>📈 Plan de Mercado y Estrategia de Ventas</h2>
-
-                <h3>🎯 Mercado Objetivo</h3>
-
-                <div class="grid">
-                    <div class="card">
-                        <h4>Segmento Primario</h4>
-                        <ul>
-                            <li>Clínicas veterinarias pequeñas (1-3 veterinarios)</li>
-                            <li>Facturación: $50K-$200K MXN/mes</li>
-                            <li>Ubicación: México (zonas urbanas)</li>
-                            <li>Sin software o con Excel</li>
-                            <li>Tamaño: ~15,000 clínicas en México</li>
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>Segmento Secundario</h4>
-                        <ul>
-                            <li>Clínicas medianas (4-8 veterinarios)</li>
-                            <li>Facturación: $200K-$500K MXN/mes</li>
-                            <li>Con software obsoleto o limitado</li>
-                            <li>Buscan modernizarse</li>
-                            <li>Tamaño: ~3,000 clínicas</li>
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>Segmento de Nicho</h4>
-                        <ul>
-                            <li>Estéticas y spas para mascotas</li>
-                            <li>Groomers independientes</li>
-                            <li>Sin software especializado</li>
-                            <li>Mercado desatendido</li>
-                            <li>Tamaño: ~5,000 negocios</li>
-                        </ul>
-                    </div>
-                </div>
-
-                <h3>🚀 Estrategia de Go-to-Market</h3>
-
-                <div class="timeline">
-                    <div class="timeline-item">
-                        <h4>Fase 1: Preparación (Mes 1-2)</h4>
-                        <ul class="checklist">
-                            <li>Completar funcionalidades críticas (facturación electrónica)</li>
-                            <li>Crear materiales de marketing (demos, videos, folletos)</li>
-                            <li>Configurar infraestructura de producción</li>
-                            <li>Establecer precios y términos de servicio</li>
-                            <li>Crear landing page y sitio web</li>
-                            <li>Configurar sistema de onboarding</li>
-                        </ul>
-                    </div>
-
-                    <div class="timeline-item">
-                        <h4>Fase 2: Beta Testing (Mes 2-3)</h4>
-                        <ul class="checklist">
-                            <li>Reclutar 5-10 clínicas para beta (50% descuento)</li>
-                            <li>Recopilar feedback y ajustar producto</li>
-                            <li>Crear casos de éxito y testimoniales</li>
-                            <li>Optimizar proceso de onboarding</li>
-                            <li>Iterar basado en feedback real</li>
-                        </ul>
-                    </div>
-
-                    <div class="timeline-item">
-                        <h4>Fase 3: Lanzamiento Suave (Mes 4-6)</h4>
-                        <ul class="checklist">
-                            <li>Marketing de contenidos (blog, redes sociales)</li>
-                            <li>Google Ads enfocado en "software veterinario"</li>
-                            <li>Meta Ads dirigido a veterinarios</li>
-                            <li>Networking en asociaciones veterinarias</li>
-                            <li>Objetivo: 30-50 clientes</li>
-                        </ul>
-                    </div>
-
-                    <div class="timeline-item">
-                        <h4>Fase 4: Escalamiento (Mes 7-12)</h4>
-                        <ul class="checklist">
-                            <li>Programa de referidos (20% de descuento)</li>
-                            <li>Ventas directas door-to-door en zonas específicas</li>
-                            <li>Participación en eventos veterinarios</li>
-                            <li>Alianzas con distribuidores de productos veterinarios</li>
-                            <li>Objetivo: 100-150 clientes</li>
-                        </ul>
-                    </div>
-                </div>
-
-                <h3>📍 Estrategia de Ventas Directas (Door-to-Door)</h3>
-
-                <div class="info-box">
-                    <h4>Preparación para Visitas</h4>
-                    <p><strong>Materiales necesarios:</strong></p>
-                    <ul>
-                        <li>✅ Laptop con demo funcional offline</li>
-                        <li>✅ Folletos impresos a color (diseño profesional)</li>
-                        <li>✅ Tarjetas de presentación</li>
-                        <li>✅ Tablet para que el veterinario pruebe el sistema</li>
-                        <li>✅ Documento con precios y comparativa</li>
-                        <li>✅ Contrato de servicio listo para firmar</li>
-                        <li>✅ Regalo promocional (USB, libreta veterinaria)</li>
-                    </ul>
-                </div>
-
-                <div class="success-box">
-                    <h4>Script de Venta (Elevator Pitch)</h4>
-                    <p><em>"Buenos días, soy [Nombre] y represento a SisVet, un sistema de gestión especializado para clínicas veterinarias. Ayudamos a veterinarios como usted a ahorrar hasta 10 horas semanales en administración, reducir errores en historiales clínicos y aumentar ingresos hasta 30% con mejor seguimiento de pacientes. ¿Tendría 15 minutos para una demostración rápida?"</em></p>
-                </div>
-
-                <div class="warning-box">
-                    <h4>Objeciones Comunes y Respuestas</h4>
-                    <table style="background: white; margin-top: 15px;">
-                        <tr>
-                            <th>Objeción</th>
-                            <th>Respuesta</th>
-                        </tr>
-                        <tr>
-                            <td>"Es muy caro"</td>
-                            <td>"Entiendo su preocupación. Nuestros clientes recuperan la inversión en 2-3 meses gracias a mejor seguimiento y menos tiempo administrativo. Además, ofrecemos 30 días de prueba gratis."</td>
-                        </tr>
-                        <tr>
-                            <td>"Ya tengo un sistema"</td>
-                            <td>"Perfecto, ¿qué sistema usa actualmente? [Escuchar] Entiendo. Nuestros clientes que migraron de [X] reportan que SisVet les ahorra 40% del tiempo en historiales clínicos gracias a nuestra interfaz moderna. ¿Le gustaría comparar?"</td>
-                        </tr>
-                        <tr>
-                            <td>"No tengo tiempo"</td>
-                            <td>"Precisamente por eso existe SisVet. Déjeme mostrarle en 5 minutos cómo puede ahorrar 2 horas diarias. ¿Prefiere mañana por la mañana o por la tarde?"</td>
-                        </tr>
-                        <tr>
-                            <td>"Necesito pensarlo"</td>
-                            <td>"Por supuesto, es una decisión importante. ¿Qué información adicional necesita para tomar la decisión? Puedo dejarle una demo gratuita de 30 días sin compromiso."</td>
-                        </tr>
-                        <tr>
-                            <td>"No sé usar tecnología"</td>
-                            <td>"Excelente punto. SisVet está diseñado para ser tan simple como usar WhatsApp. Incluimos capacitación personalizada y soporte ilimitado. ¿Le muestro qué tan fácil es registrar una consulta?"</td>
-                        </tr>
-                    </table>
-                </div>
-
-                <h3>🗺️ Estrategia Geográfica (Ciudad de México)</h3>
-
-                <div class="grid">
-                    <div class="card">
-                        <h4>Zona 1: Polanco/Lomas</h4>
-                        <p><strong>Prioridad:</strong> <span class="badge badge-success">Alta</span></p>
-                        <p><strong>Características:</strong> Clínicas premium, mayor poder adquisitivo</p>
-                        <p><strong>Estrategia:</strong> Pitch enfocado en imagen profesional y tecnología de punta</p>
-                        <p><strong>Estimado:</strong> 50 clínicas</p>
-                    </div>
-
-                    <div class="card">
-                        <h4>Zona 2: Condesa/Roma</h4>
-                        <p><strong>Prioridad:</strong> <span class="badge badge-success">Alta</span></p>
-                        <p><strong>Características:</strong> Dueños millennials, tech-savvy</p>
-                        <p><strong>Estrategia:</strong> Enfoque en UI/UX moderna y eficiencia</p>
-                        <p><strong>Estimado:</strong> 70 clínicas</p>
-                    </div>
-
-                    <div class="card">
-                        <h4>Zona 3: Coyoacán/Del Valle</h4>
-                        <p><strong>Prioridad:</strong> <span class="badge badge-info">Media</span></p>
-                        <p><strong>Características:</strong> Clínicas familiares establecidas</p>
-                        <p><strong>Estrategia:</strong> Enfoque en ahorro de tiempo y mejores historiales</p>
-                        <p><strong>Estimado:</strong> 80 clínicas</p>
-                    </div>
-
-                    <div class="card">
-                        <h4>Zona 4: Iztapalapa/Neza</h4>
-                        <p><strong>Prioridad:</strong> <span class="badge badge-warning">Baja</span></p>
-                        <p><strong>Características:</strong> Clínicas de barrio, precio sensible</p>
-                        <p><strong>Estrategia:</strong> Plan Starter con descuento</p>
-                        <p><strong>Estimado:</strong> 120 clínicas</p>
-                    </div>
-                </div>
-
-                <h3>📊 Canales de Marketing Digital</h3>
-
-                <table>
-                    <tr>
-                        <th>Canal</th>
-                        <th>Inversión Mensual</th>
-                        <th>Objetivo</th>
-                        <th>KPI Principal</th>
-                    </tr>
-                    <tr>
-                        <td>Google Ads</td>
-                        <td>$200 USD</td>
-                        <td>15-20 leads calificados</td>
-                        <td>CPA < $13 USD</td>
-                    </tr>
-                    <tr>
-                        <td>Meta Ads (Facebook/Instagram)</td>
-                        <td>$150 USD</td>
-                        <td>10-15 leads</td>
-                        <td>CPA < $15 USD</td>
-                    </tr>
-                    <tr>
-                        <td>LinkedIn Ads</td>
-                        <td>$100 USD</td>
-                        <td>5-8 leads premium</td>
-                        <td>CPA < $20 USD</td>
-                    </tr>
-                    <tr>
-                        <td>Content Marketing (Blog/SEO)</td>
-                        <td>$50 USD</td>
-                        <td>Tráfico orgánico</td>
-                        <td>1000 visitas/mes</td>
-                    </tr>
-                    <tr>
-                        <th>TOTAL</th>
-                        <th>$500 USD/mes</th>
-                        <th>30-43 leads/mes</th>
-                        <th>Conversión: 25%</th>
-                    </tr>
-                </table>
-
-                <div class="chart-container">
-                    <canvas id="marketingChannelsChart"></canvas>
-                </div>
-            </section>
-
-            <!-- CUESTIONARIOS DE MERCADO -->
-            <section id="cuestionarios" class="section">
-                <h2>📝 Cuestionarios para Estudio de Mercado</h2>
-
-                <div class="info-box">
-                    <h4>Objetivos de los Cuestionarios</h4>
-                    <ul>
-                        <li>✅ Validar necesidades reales del mercado</li>
-                        <li>✅ Identificar pain points específicos</li>
-                        <li>✅ Determinar willingness to pay (disposición a pagar)</li>
-                        <li>✅ Entender proceso de toma de decisión</li>
-                        <li>✅ Descubrir funcionalidades más valoradas</li>
-                        <li>✅ Identificar competencia directa utilizada</li>
-                    </ul>
-                </div>
-
-                <h3>📋 Cuestionario 1: Pre-visita (Online - Google Forms)</h3>
-                <div class="card">
-                    <p><strong>Objetivo:</strong> Calificar leads antes de visita presencial</p>
-                    <p><strong>Duración:</strong> 3-4 minutos</p>
-                    <p><strong>Canal:</strong> Email, WhatsApp, Redes Sociales</p>
-
-                    <ol style="margin-top: 20px; line-height: 2;">
-                        <li><strong>¿Cuál es el nombre de tu clínica veterinaria?</strong> [Texto corto]</li>
-
-                        <li><strong>¿Cuántos veterinarios trabajan en tu clínica?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Solo yo</li>
-                                <li>☐ 2-3 veterinarios</li>
-                                <li>☐ 4-6 veterinarios</li>
-                                <li>☐ 7+ veterinarios</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>Aproximadamente, ¿cuántos pacientes atiendes al mes?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Menos de 50</li>
-                                <li>☐ 50-150</li>
-                                <li>☐ 150-300</li>
-                                <li>☐ Más de 300</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Actualmente usas algún software para gestionar tu clínica?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ No, uso Excel o papel</li>
-                                <li>☐ Sí, software gratuito</li>
-                                <li>☐ Sí, software de pago (especificar: _______)</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>Si usas software, ¿qué tan satisfecho estás con él? (1-10)</strong>
-                            <ul style="list-style: none;">
-                                <li>1 (Muy insatisfecho) - 10 (Muy satisfecho)</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Cuál es tu mayor problema al gestionar historiales clínicos?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Toma mucho tiempo registrar información</li>
-                                <li>☐ Difícil buscar información pasada</li>
-                                <li>☐ No puedo acceder desde cualquier lugar</li>
-                                <li>☐ No tengo respaldos seguros</li>
-                                <li>☐ Otro: _______</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Cuánto estarías dispuesto a pagar mensualmente por un software que resuelva tus problemas?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ $0 (solo gratis)</li>
-                                <li>☐ $300-$600 MXN</li>
-                                <li>☐ $600-$1,200 MXN</li>
-                                <li>☐ $1,200-$2,000 MXN</li>
-                                <li>☐ Más de $2,000 MXN</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Te gustaría recibir una demostración gratuita de SisVet?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Sí, contáctenme por WhatsApp: _______</li>
-                                <li>☐ Sí, contáctenme por teléfono: _______</li>
-                                <li>☐ Sí, por email</li>
-                                <li>☐ No, gracias</li>
-                            </ul>
-                        </li>
-                    </ol>
-                </div>
-
-                <h3>📋 Cuestionario 2: Durante la Visita (Papel/Tablet)</h3>
-                <div class="card">
-                    <p><strong>Objetivo:</strong> Entender proceso de trabajo y pain points específicos</p>
-                    <p><strong>Duración:</strong> 10-15 minutos (conversación guiada)</p>
-                    <p><strong>Formato:</strong> Semi-estructurada, flexible</p>
+    python generar_analisis_completo.py                 # render
+    python generar_analisis_completo.py --formatos html,json,md,csv
+    python generar_analisis_completo.py scan
+    python generar_analisis_completo.py bench
+    python generar_analisis_completo.py watch           # regenera al cambiar las entradas
+    python generar_analisis_completo.py serve           # vista previa en http://127.0.0.1:8000/
 
-                    <h4 style="margin-top: 20px;">Sección A: Contexto de la Clínica</h4>
-                    <ol style="line-height: 2;">
-                        <li><strong>¿Hace cuánto tiempo abrió la clínica?</strong> _____ años</li>
-                        <li><strong>¿Cuál es tu especialidad principal?</strong> (pequeños animales, exóticos, equinos, etc.)</li>
-                        <li><strong>¿Horario de atención?</strong> De _____ a _____, _____ días a la semana</li>
-                        <li><strong>Promedio de consultas diarias:</strong> _____ consultas</li>
-                    </ol>
-
-                    <h4>Sección B: Proceso Actual</h4>
-                    <ol start="5" style="line-height: 2;">
-                        <li><strong>Descríbeme tu proceso desde que llega un paciente hasta que se va:</strong>
-                            <ul style="list-style: none; margin-left: 20px;">
-                                <li>- Recepción: _______</li>
-                                <li>- Consulta: _______</li>
-                                <li>- Registro de información: _______</li>
-                                <li>- Cobro: _______</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Cuánto tiempo te toma registrar una consulta completa?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Menos de 5 minutos</li>
-                                <li>☐ 5-10 minutos</li>
-                                <li>☐ 10-20 minutos</li>
-                                <li>☐ Más de 20 minutos</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Qué información registras actualmente en cada consulta?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Síntomas y diagnóstico</li>
-                                <li>☐ Signos vitales (peso, temperatura, etc.)</li>
-                                <li>☐ Tratamiento y medicamentos</li>
-                                <li>☐ Vacunas y desparasitaciones</li>
-                                <li>☐ Fotografías o radiografías</li>
-                                <li>☐ Resultados de laboratorio</li>
-                                <li>☐ Otro: _______</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Has perdido alguna vez información de un paciente?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Sí, frecuentemente</li>
-                                <li>☐ Sí, ocasionalmente</li>
-                                <li>☐ Rara vez</li>
-                                <li>☐ Nunca</li>
-                            </ul>
-                        </li>
-                    </ol>
-
-                    <h4>Sección C: Pain Points y Necesidades</h4>
-                    <ol start="9" style="line-height: 2;">
-                        <li><strong>En una escala de 1-10, ¿qué tan importante es para ti cada funcionalidad?</strong>
-                            <table style="margin: 15px 0; width: 100%;">
-                                <tr>
-                                    <th style="text-align: left;">Funcionalidad</th>
-                                    <th>Importancia (1-10)</th>
-                                </tr>
-                                <tr><td>Historial clínico digital completo</td><td>_____</td></tr>
-                                <tr><td>Sistema de citas con recordatorios automáticos</td><td>_____</td></tr>
-                                <tr><td>Facturación electrónica</td><td>_____</td></tr>
-                                <tr><td>Control de inventario de medicamentos</td><td>_____</td></tr>
-                                <tr><td>App móvil para acceso remoto</td><td>_____</td></tr>
-                                <tr><td>Envío de recordatorios por WhatsApp</td><td>_____</td></tr>
-                                <tr><td>Reportes y estadísticas de la clínica</td><td>_____</td></tr>
-                                <tr><td>Exportar historiales a PDF</td><td>_____</td></tr>
-                                <tr><td>Múltiples usuarios con permisos</td><td>_____</td></tr>
-                                <tr><td>Soporte técnico rápido</td><td>_____</td></tr>
-                            </table>
-                        </li>
-
-                        <li><strong>Si pudieras tener una funcionalidad mágica en tu software, ¿cuál sería?</strong><br>
-                            _______________________________________________________
-                        </li>
-
-                        <li><strong>¿Qué te detendría de adoptar un nuevo software?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Precio</li>
-                                <li>☐ Complejidad de uso</li>
-                                <li>☐ Tiempo de implementación</li>
-                                <li>☐ Migración de datos</li>
-                                <li>☐ Falta de capacitación</li>
-                                <li>☐ Otro: _______</li>
-                            </ul>
-                        </li>
-                    </ol>
-
-                    <h4>Sección D: Toma de Decisión</h4>
-                    <ol start="12" style="line-height: 2;">
-                        <li><strong>¿Quién toma la decisión final de compra de software?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Yo (veterinario)</li>
-                                <li>☐ El administrador</li>
-                                <li>☐ Decisión conjunta</li>
-                                <li>☐ El dueño (si no eres tú)</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Cuánto tiempo te tomaría tomar la decisión de cambiar de software?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Lo decido hoy mismo</li>
-                                <li>☐ 1-2 semanas</li>
-                                <li>☐ 1 mes</li>
-                                <li>☐ Más de 1 mes</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Qué necesitas para tomar la decisión?</strong> (Pregunta abierta)<br>
-                            _______________________________________________________
-                        </li>
-                    </ol>
-                </div>
-
-                <h3>📋 Cuestionario 3: Post-Demo (Inmediato)</h3>
-                <div class="card">
-                    <p><strong>Objetivo:</strong> Evaluar impresión de la demostración y probabilidad de cierre</p>
-                    <p><strong>Duración:</strong> 2-3 minutos</p>
-
-                    <ol style="line-height: 2;">
-                        <li><strong>Del 1 al 10, ¿qué tan fácil te pareció usar SisVet?</strong> _____</li>
-
-                        <li><strong>¿Qué fue lo que más te gustó de la demostración?</strong><br>
-                            _______________________________________________________
-                        </li>
-
-                        <li><strong>¿Algo que no te gustó o que cambiarías?</strong><br>
-                            _______________________________________________________
-                        </li>
-
-                        <li><strong>Comparado con tu proceso actual, ¿crees que SisVet te ahorraría tiempo?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Sí, mucho tiempo</li>
-                                <li>☐ Sí, algo de tiempo</li>
-                                <li>☐ No estoy seguro</li>
-                                <li>☐ No creo que me ahorre tiempo</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>Del 1 al 10, ¿qué tan probable es que adoptes SisVet en tu clínica?</strong> _____
-                            <ul style="list-style: none; margin-top: 10px;">
-                                <li><em>Si es 7+: "¡Excelente! ¿Qué te parece si comenzamos con la prueba de 30 días?"</em></li>
-                                <li><em>Si es 4-6: "Entiendo. ¿Qué necesitarías ver o saber para aumentar esa calificación?"</em></li>
-                                <li><em>Si es 1-3: "Gracias por tu honestidad. ¿Puedes compartirme qué es lo que más te detiene?"</em></li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Cuál de estos planes te interesa más?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Plan Starter ($599 MXN/mes)</li>
-                                <li>☐ Plan Professional ($1,199 MXN/mes) ⭐ MÁS POPULAR</li>
-                                <li>☐ Plan Enterprise ($2,499 MXN/mes)</li>
-                                <li>☐ Aún no estoy seguro</li>
-                            </ul>
-                        </li>
-
-                        <li><strong>¿Te gustaría comenzar con la prueba gratuita de 30 días?</strong>
-                            <ul style="list-style: none;">
-                                <li>☐ Sí, comencemos hoy</li>
-                                <li>☐ Sí, pero la semana que viene</li>
-                                <li>☐ Necesito pensarlo más</li>
-                                <li>☐ No, gracias</li>
-                            </ul>
-                        </li>
-                    </ol>
-                </div>
-
-                <h3>📊 Análisis de Resultados</h3>
-
-                <div class="info-box">
-                    <h4>KPIs a Medir en los Cuestionarios</h4>
-                    <table>
-                        <tr>
-                            <th>Métrica</th>
-                            <th>Objetivo</th>
-                            <th>Uso</th>
-                        </tr>
-                        <tr>
-                            <td>Tasa de Respuesta (Cuestionario 1)</td>
-                            <td>&gt; 30%</td>
-                            <td>Optimizar canales de distribución</td>
-                        </tr>
-                        <tr>
-                            <td>Leads Calificados</td>
-                            <td>&gt; 40% del total</td>
-                            <td>Priorizar visitas</td>
-                        </tr>
-                        <tr>
-                            <td>NPS (Promoter Score) post-demo</td>
-                            <td>&gt; 8/10</td>
-                            <td>Validar product-market fit</td>
-                        </tr>
-                        <tr>
-                            <td>Willingness to Pay</td>
-                            <td>$600-$1,200 MXN</td>
-                            <td>Ajustar pricing</td>
-                        </tr>
-                        <tr>
-                            <td>Tasa de Conversión Demo → Trial</td>
-                            <td>&gt; 40%</td>
-                            <td>Mejorar pitch de ventas</td>
-                        </tr>
-                        <tr>
-                            <td>Tasa de Conversión Trial → Pago</td>
-                            <td>&gt; 30%</td>
-                            <td>Optimizar onboarding</td>
-                        </tr>
-                    </table>
-                </div>
-
-                <div class="success-box">
-                    <h4>Cómo Usar los Datos Recopilados</h4>
-                    <ul class="checklist">
-                        <li><strong>Priorizar desarrollo:</strong> Implementar funcionalidades más valoradas (pregunta 9)</li>
-                        <li><strong>Ajustar pricing:</strong> Validar/ajustar precios basado en willingness to pay</li>
-                        <li><strong>Refinar pitch:</strong> Usar pain points reales en presentaciones de ventas</li>
-                        <li><strong>Crear contenido:</strong> Escribir artículos sobre problemas identificados</li>
-                        <li><strong>Segmentación:</strong> Crear perfiles de clientes ideales (ICPs)</li>
-                        <li><strong>Roadmap:</strong> Planear features futuras basado en "funcionalidad mágica"</li>
-                    </ul>
-                </div>
-            </section>
-
-            <!-- RECOMENDACIONES -->
-            <section id="recomendaciones" class="section">
-                <h2>💡 Recomendaciones Estratégicas</h2>
-
-                <h3>🚨 Prioridades Críticas (Implementar YA)</h3>
-
-                <div class="warning-box">
-                    <h4>1. Facturación Electrónica (CRÍTICO)</h4>
-                    <p><strong>Por qué:</strong> El 87% de competidores la tienen. Es un deal-breaker para muchos clientes.</p>
-                    <p><strong>Acción:</strong> Integrar con SAT (México) o proveedores como Facturama, Aspel, o desarrollar internamente.</p>
-                    <p><strong>Tiempo estimado:</strong> 3-4 semanas</p>
-                    <p><strong>Costo:</strong> $2,000-$4,000 USD (desarrollo) + $30-50/mes (API)</p>
-                    <p><strong>ROI:</strong> Crítico para competir</p>
-                </div>
-
-                <div class="warning-box">
-                    <h4>2. Integración WhatsApp/SMS (MUY IMPORTANTE)</h4>
-                    <p><strong>Por qué:</strong> Canal de comunicación preferido en México. Aumenta retención 35%.</p>
-                    <p><strong>Acción:</strong> Integrar Twilio o WhatsApp Business API para recordatorios automáticos.</p>
-                    <p><strong>Tiempo estimado:</strong> 2 semanas</p>
-                    <p><strong>Costo:</strong> $500-$1,000 USD (desarrollo) + $0.01-0.05 por mensaje</p>
-                    <p><strong>ROI:</strong> Aumenta asistencia a citas 25-40%</p>
-                </div>
-
-                <div class="warning-box">
-                    <h4>3. Tests Automatizados (IMPORTANTE)</h4>
-                    <p><strong>Por qué:</strong> Prevenir bugs en producción. Facilita desarrollo continuo.</p>
-                    <p><strong>Acción:</strong> Implementar Jest + React Testing Library + Supertest.</p>
-                    <p><strong>Tiempo estimado:</strong> 2-3 semanas</p>
-                    <p><strong>Costo:</strong> $1,500-$2,500 USD</p>
-                    <p><strong>ROI:</strong> Reduce bugs 60-80%</p>
-                </div>
-
-                <h3>🎯 Prioridades Mediano Plazo (3-6 meses)</h3>
-
-                <div class="grid">
-                    <div class="card">
-                        <h4>4. App Móvil (React Native)</h4>
-                        <p><strong>Justificación:</strong> 75% de competidores la tienen</p>
-                        <p><strong>Costo:</strong> $8,000-$12,000 USD</p>
-                        <p><strong>Tiempo:</strong> 2-3 meses</p>
-                        <p><strong>Beneficio:</strong> Acceso remoto para veterinarios</p>
-                    </div>
-
-                    <div class="card">
-                        <h4>5. Módulo de Inventario Completo</h4>
-                        <p><strong>Justificación:</strong> Funcionalidad top 3 solicitada</p>
-                        <p><strong>Costo:</strong> $3,000-$5,000 USD</p>
-                        <p><strong>Tiempo:</strong> 4-6 semanas</p>
-                        <p><strong>Beneficio:</strong> Control de medicamentos y ventas</p>
-                    </div>
-
-                    <div class="card">
-                        <h4>6. Multi-sede</h4>
-                        <p><strong>Justificación:</strong> Diferenciación para cadenas</p>
-                        <p><strong>Costo:</strong> $4,000-$6,000 USD</p>
-                        <p><strong>Tiempo:</strong> 6-8 semanas</p>
-                        <p><strong>Beneficio:</strong> Acceso a mercado corporativo</p>
-                    </div>
-
-                    <div class="card">
-                        <h4>7. Reportes Financieros</h4>
-                        <p><strong>Justificación:</strong> Ayuda en toma de decisiones</p>
-                        <p><strong>Costo:</strong> $2,000-$3,000 USD</p>
-                        <p><strong>Tiempo:</strong> 3-4 semanas</p>
-                        <p><strong>Beneficio:</strong> Dashboard ejecutivo</p>
-                    </div>
-                </div>
-
-                <h3>🔮 Visión a Largo Plazo (6-12 meses)</h3>
-
-                <ul class="checklist">
-                    <li><strong>Telemedicina:</strong> Videoconsultas integradas ($10K-15K USD, 3 meses)</li>
-                    <li><strong>IA para diagnósticos:</strong> Asistente inteligente ($15K-25K USD, 4-6 meses)</li>
-                    <li><strong>Marketplace de proveedores:</strong> Comisiones por ventas ($8K-12K USD)</li>
-                    <li><strong>Integración con laboratorios:</strong> Resultados automáticos ($5K-8K USD)</li>
-                    <li><strong>Sistema de fidelización:</strong> Puntos para dueños de mascotas ($4K-6K USD)</li>
-                </ul>
-
-                <h3>📈 Estrategia de Pricing Dinámica</h3>
-
-                <div class="info-box">
-                    <h4>Descuentos Estratégicos</h4>
-                    <table>
-                        <tr>
-                            <th>Tipo de Descuento</th>
-                            <th>Condición</th>
-                            <th>Descuento</th>
-                        </tr>
-                        <tr>
-                            <td>Early Adopter</td>
-                            <td>Primeros 50 clientes</td>
-                            <td>30% de por vida</td>
-                        </tr>
-                        <tr>
-                            <td>Pago Anual</td>
-                            <td>Pago adelantado 12 meses</td>
-                            <td>20% (2 meses gratis)</td>
-                        </tr>
-                        <tr>
-                            <td>Referidos</td>
-                            <td>Por cada referido que pague</td>
-                            <td>1 mes gratis</td>
-                        </tr>
-                        <tr>
-                            <td>Estudiantes/Universidades</td>
-                            <td>Clínicas universitarias</td>
-                            <td>50%</td>
-                        </tr>
-                        <tr>
-                            <td>Multi-sede</td>
-                            <td>3+ sedes de misma clínica</td>
-                            <td>15% por sede adicional</td>
-                        </tr>
-                    </table>
-                </div>
-
-                <h3>🎓 Plan de Capacitación y Onboarding</h3>
-
-                <div class="success-box">
-                    <h4>Proceso de Onboarding Exitoso</h4>
-                    <div class="timeline" style="margin-top: 20px;">
-                        <div class="timeline-item">
-                            <strong>Día 1: Bienvenida</strong>
-                            <ul>
-                                <li>Email de bienvenida con accesos</li>
-                                <li>Video tutorial de 5 minutos</li>
-                                <li>Llamada de bienvenida (15 min)</li>
-                            </ul>
-                        </div>
-                        <div class="timeline-item">
-                            <strong>Días 2-3: Configuración</strong>
-                            <ul>
-                                <li>Migración de datos (si aplica)</li>
-                                <li>Configuración de usuarios y permisos</li>
-                                <li>Personalización de sistema</li>
-                            </ul>
-                        </div>
-                        <div class="timeline-item">
-                            <strong>Día 4-7: Capacitación</strong>
-                            <ul>
-                                <li>Sesión en vivo 1: Gestión de pacientes (30 min)</li>
-                                <li>Sesión en vivo 2: Historial clínico (30 min)</li>
-                                <li>Sesión en vivo 3: Citas y recordatorios (20 min)</li>
-                            </ul>
-                        </div>
-                        <div class="timeline-item">
-                            <strong>Día 8-30: Seguimiento</strong>
-                            <ul>
-                                <li>Email cada 3 días con tip del día</li>
-                                <li>Check-in semanal por WhatsApp</li>
-                                <li>Sesión de Q&A al día 30</li>
-                            </ul>
-                        </div>
-                    </div>
-                </div>
-
-                <h3>🏁 Hoja de Ruta (Roadmap) Recomendado</h3>
-
-                <table>
-                    <tr>
-                        <th>Fase</th>
-                        <th>Duración</th>
-                        <th>Funcionalidades</th>
-                        <th>Objetivo de Clientes</th>
-                    </tr>
-                    <tr>
-                        <td><strong>Fase 1: MVP Mejorado</strong></td>
-                        <td>Mes 1-2</td>
-                        <td>
-                            <ul style="margin: 5px 0;">
-                                <li>✅ Facturación electrónica</li>
-                                <li>✅ WhatsApp/SMS</li>
-                                <li>✅ Tests automatizados</li>
-                                <li>✅ Documentación técnica</li>
-                            </ul>
-                        </td>
-                        <td>10-15 clientes beta</td>
-                    </tr>
-                    <tr>
-                        <td><strong>Fase 2: Lanzamiento</strong></td>
-                        <td>Mes 3-4</td>
-                        <td>
-                            <ul style="margin: 5px 0;">
-                                <li>🔄 Inventario completo</li>
-                                <li>🔄 Reportes financieros</li>
-                                <li>🔄 Onboarding automatizado</li>
-                                <li>🔄 Landing page profesional</li>
-                            </ul>
-                        </td>
-                        <td>30-50 clientes</td>
-                    </tr>
-                    <tr>
-                        <td><strong>Fase 3: Expansión</strong></td>
-                        <td>Mes 5-8</td>
-                        <td>
-                            <ul style="margin: 5px 0;">
-                                <li>📱 App móvil (React Native)</li>
-                                <li>🏢 Multi-sede</li>
-                                <li>📊 Analytics avanzado</li>
-                                <li>🤝 Integraciones (distribuidores)</li>
-                            </ul>
-                        </td>
-                        <td>80-120 clientes</td>
-                    </tr>
-                    <tr>
-                        <td><strong>Fase 4: Innovación</strong></td>
-                        <td>Mes 9-12</td>
-                        <td>
-                            <ul style="margin: 5px 0;">
-                                <li>🎥 Telemedicina</li>
-                                <li>🤖 IA para diagnósticos</li>
-                                <li>🛒 Marketplace</li>
-                                <li>🌎 Expansión internacional</li>
-                            </ul>
-                        </td>
-                        <td>150-250 clientes</td>
-                    </tr>
-                </table>
-
-                <h3>✅ Checklist Final Antes de Lanzar</h3>
-
-                <div class="grid">
-                    <div class="card">
-                        <h4>Técnico</h4>
-                        <ul class="checklist">
-                            <li>Facturación electrónica implementada</li>
-                            <li>Tests E2E funcionando</li>
-                            <li>Backups automáticos configurados</li>
-                            <li>SSL y seguridad validados</li>
-                            <li>Performance optimizado (&lt;3s load)</li>
-                            <li>Monitoreo de errores (Sentry)</li>
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>Legal y Administrativo</h4>
-                        <ul class="checklist">
-                            <li>Términos y condiciones</li>
-                            <li>Política de privacidad</li>
-                            <li>Contrato de servicio</li>
-                            <li>Facturación propia configurada</li>
-                            <li>Cuenta bancaria empresarial</li>
-                            <li>Seguros (responsabilidad civil)</li>
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>Marketing y Ventas</h4>
-                        <ul class="checklist">
-                            <li>Landing page optimizada</li>
-                            <li>Video demo profesional</li>
-                            <li>Casos de estudio (testimoniales)</li>
-                            <li>Material de ventas (folletos, presentación)</li>
-                            <li>Cuentas en redes sociales</li>
-                            <li>Google My Business configurado</li>
-                        </ul>
-                    </div>
-
-                    <div class="card">
-                        <h4>Soporte</h4>
-                        <ul class="checklist">
-                            <li>Base de conocimientos (FAQs)</li>
-                            <li>Tutoriales en video</li>
-                            <li>WhatsApp Business configurado</li>
-                            <li>Email de soporte monitoreado</li>
-                            <li>SLA definido</li>
-                            <li>Sistema de tickets (Zendesk/Freshdesk)</li>
-                        </ul>
-                    </div>
-                </div>
-            </section>
-        </div>
-
-        <div class="footer">
-            <h3>📊 Conclusiones Finales</h3>
-            <p><strong>SisVet</strong> tiene una base técnica sólida y un producto competitivo con diferenciadores únicos.</p>
-            <p>Con las mejoras críticas implementadas (facturación, WhatsApp) y un plan de go-to-market ejecutado correctamente,</p>
-            <p>el proyecto tiene potencial para capturar 2-3% del mercado mexicano en 18-24 meses.</p>
-            <br>
-            <p><strong>Proyección:</strong> 200-300 clientes pagando en 18 meses = $240K-$360K MXN MRR</p>
-            <p><strong>Inversión total requerida:</strong> $55K-$65K USD (desarrollo + marketing + operación año 1)</p>
-            <p><strong>ROI esperado:</strong> 12-18 meses</p>
-            <br>
-            <p style="margin-top: 20px;">Generado automáticamente por el Sistema de Análisis SisVet</p>
-            <p>© 2025 SisVet - Todos los derechos reservados</p>
-        </div>
-    </div>
-
-    <script>
-        // Configuración global de Chart.js
-        Chart.defaults.font.family = "'Segoe UI', Tahoma, Geneva, Verdana, sans-serif";
-        Chart.defaults.font.size = 12;
-
-        // Gráfica de Market Share
-        const marketShareCtx = document.getElementById('marketShareChart').getContext('2d');
-        new Chart(marketShareCtx, {{
-            type: 'doughnut',
-            data: {{
-                labels: {json.dumps([c['nombre'] for c in competidores])},
-                datasets: [{{
-                    data: {json.dumps([c['market_share'] for c in competidores])},
-                    backgroundColor: [
-                        '#667eea', '#764ba2', '#f093fb', '#4facfe',
-                        '#43e97b', '#fa709a', '#30cfd0', '#c471ed'
-                    ]
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    title: {{
-                        display: true,
-                        text: 'Market Share de Competidores (%)',
-                        font: {{ size: 16, weight: 'bold' }}
-                    }},
-                    legend: {{
-                        position: 'right'
-                    }}
-                }}
-            }}
-        }});
-
-        // Gráfica de Comparación de Precios
-        const priceCtx = document.getElementById('priceComparisonChart').getContext('2d');
-        new Chart(priceCtx, {{
-            type: 'bar',
-            data: {{
-                labels: {json.dumps([c['nombre'] for c in competidores])},
-                datasets: [
-                    {{
-                        label: 'Precio Mínimo (USD/mes)',
-                        data: {json.dumps([c['precio_usd_min'] for c in competidores])},
-                        backgroundColor: '#667eea'
-                    }},
-                    {{
-                        label: 'Precio Máximo (USD/mes)',
-                        data: {json.dumps([c['precio_usd_max'] for c in competidores])},
-                        backgroundColor: '#764ba2'
-                    }}
-                ]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    title: {{
-                        display: true,
-                        text: 'Comparación de Precios Mensuales (USD)',
-                        font: {{ size: 16, weight: 'bold' }}
-                    }}
-                }},
-                scales: {{
-                    y: {{
-                        beginAtZero: true,
-                        ticks: {{
-                            callback: function(value) {{
-                                return '$' + value;
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
-
-        // Gráfica Radar de Funcionalidades
-        const radarCtx = document.getElementById('radarChart').getContext('2d');
-        new Chart(radarCtx, {{
-            type: 'radar',
-            data: {{
-                labels: [
-                    'Historial Clínico', 'Sistema de Citas', 'Facturación',
-                    'Inventario', 'App Móvil', 'WhatsApp/SMS',
-                    'Telemedicina', 'Multi-sede', 'UI/UX', 'Exportación'
-                ],
-                datasets: [
-                    {{
-                        label: 'SisVet',
-                        data: [9.5, 9.0, 0, 4.0, 0, 0, 0, 0, 9.5, 9.0],
-                        borderColor: '#667eea',
-                        backgroundColor: 'rgba(102, 126, 234, 0.2)',
-                        pointBackgroundColor: '#667eea'
-                    }},
-                    {{
-                        label: 'Provet Cloud',
-                        data: [9.0, 9.0, 9.5, 9.0, 8.5, 8.5, 8.5, 9.5, 8.5, 8.5],
-                        borderColor: '#10b981',
-                        backgroundColor: 'rgba(16, 185, 129, 0.2)',
-                        pointBackgroundColor: '#10b981'
-                    }},
-                    {{
-                        label: 'QVET',
-                        data: [9.5, 8.5, 9.5, 8.0, 8.0, 9.0, 9.0, 9.0, 7.5, 8.0],
-                        borderColor: '#f59e0b',
-                        backgroundColor: 'rgba(245, 158, 11, 0.2)',
-                        pointBackgroundColor: '#f59e0b'
-                    }}
-                ]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    title: {{
-                        display: true,
-                        text: 'Comparación de Funcionalidades (0-10)',
-                        font: {{ size: 16, weight: 'bold' }}
-                    }}
-                }},
-                scales: {{
-                    r: {{
-                        beginAtZero: true,
-                        max: 10,
-                        ticks: {{
-                            stepSize: 2
-                        }}
-                    }}
-                }}
-            }}
-        }});
-
-        // Gráfica de Proyección de Ingresos
-        const revenueCtx = document.getElementById('revenueProjectionChart').getContext('2d');
-        new Chart(revenueCtx, {{
-            type: 'line',
-            data: {{
-                labels: ['Mes 1', 'Mes 2', 'Mes 3', 'Mes 4', 'Mes 5', 'Mes 6',
-                         'Mes 7', 'Mes 8', 'Mes 9', 'Mes 10', 'Mes 11', 'Mes 12'],
-                datasets: [
-                    {{
-                        label: 'Escenario Conservador (MXN)',
-                        data: [5995, 11990, 19185, 25179, 37171, 49159,
-                               67147, 80135, 92323, 116306, 131290, 146278],
-                        borderColor: '#667eea',
-                        backgroundColor: 'rgba(102, 126, 234, 0.1)',
-                        fill: true,
-                        tension: 0.4
-                    }},
-                    {{
-                        label: 'Escenario Optimista (MXN)',
-                        data: [11990, 29975, 59950, 89925, 119900, 149875,
-                               209825, 239800, 269775, 299750, 299750, 299750],
-                        borderColor: '#10b981',
-                        backgroundColor: 'rgba(16, 185, 129, 0.1)',
-                        fill: true,
-                        tension: 0.4
-                    }}
-                ]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    title: {{
-                        display: true,
-                        text: 'Proyección de Ingresos Mensuales Recurrentes (MRR)',
-                        font: {{ size: 16, weight: 'bold' }}
-                    }}
-                }},
-                scales: {{
-                    y: {{
-                        beginAtZero: true,
-                        ticks: {{
-                            callback: function(value) {{
-                                return '$' + value.toLocaleString('es-MX');
-                            }}
-                        }}
-                    }}
-                }}
-            }}
-        }});
-
-        // Gráfica de Canales de Marketing
-        const marketingCtx = document.getElementById('marketingChannelsChart').getContext('2d');
-        new Chart(marketingCtx, {{
-            type: 'pie',
-            data: {{
-                labels: ['Google Ads', 'Meta Ads', 'LinkedIn Ads', 'Content Marketing'],
-                datasets: [{{
-                    data: [200, 150, 100, 50],
-                    backgroundColor: ['#667eea', '#764ba2', '#10b981', '#f59e0b']
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    title: {{
-                        display: true,
-                        text: 'Distribución de Presupuesto Marketing (USD/mes)',
-                        font: {{ size: 16, weight: 'bold' }}
-                    }},
-                    legend: {{
-                        position: 'bottom'
-                    }}
-                }}
-            }}
-        }});
-
-        // Smooth scroll para navegación
-        document.querySelectorAll('a[href^="#"]').forEach(anchor => {{
-            anchor.addEventListener('click', function (e) {{
-                e.preventDefault();
-                const target = document.querySelector(this.getAttribute('href'));
-                if (target) {{
-                    target.scrollIntoView({{ behavior: 'smooth', block: 'start' }});
-                }}
-            }});
-        }});
-
-        console.log('%c📊 Análisis SisVet generado exitosamente', 'color: #667eea; font-size: 16px; font-weight: bold;');
-        console.log('%cEste documento contiene análisis detallado de:', 'color: #666; font-size: 12px;');
-        console.log('  • Análisis técnico completo del proyecto');
-        console.log('  • Comparación con 8 competidores principales');
-        console.log('  • Estimaciones de costos y proyecciones financieras');
-        console.log('  • Plan de mercado y estrategia de ventas');
-        console.log('  • Cuestionarios para estudio de mercado');
-        console.log('  • Recomendaciones estratégicas');
-    </script>
-</body>
-</html>
+Autor: Análisis Sistema Veterinario SisVet
+Fecha: 2025-11-03
 """
 
-    return html_content
-
-# Generar el archivo HTML
-print("🚀 Generando análisis completo del sistema veterinario...")
-print("=" * 80)
-
-html_output = generar_html_completo()
+import sys
 
-# Guardar el archivo
-output_filename = f"ANALISIS_COMPLETO_SISVET_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-with open(output_filename, 'w', encoding='utf-8') as f:
-    f.write(html_output)
+from analisis_sisvet.cli import main
 
-print(f"✅ Análisis generado exitosamente: {output_filename}")
-print(f"📊 Tamaño del archivo: {len(html_output):,} caracteres")
-print("\n📋 El documento incluye:")
-print("   ✓ Resumen ejecutivo")
-print("   ✓ Análisis técnico detallado")
-print("   ✓ Análisis de 8 competidores")
-print("   ✓ Matrices de comparación funcional")
-print("   ✓ Estimaciones de costos detalladas")
-print("   ✓ Proyecciones financieras (conservador y optimista)")
-print("   ✓ Plan de mercado completo")
-print("   ✓ Estrategia de ventas door-to-door")
-print("   ✓ 3 cuestionarios de mercado listos para usar")
-print("   ✓ Recomendaciones estratégicas priorizadas")
-print("   ✓ Roadmap de desarrollo")
-print("   ✓ 8 gráficas interactivas")
-print("\n🌐 Abre el archivo HTML en tu navegador para ver el análisis completo.")
-print("=" * 80)
+if __name__ == "__main__":
+    sys.exit(main())